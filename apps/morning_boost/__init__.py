@@ -1,8 +1,21 @@
 """
 morning_boost 패키지 엔트리 포인트.
 uvicorn 에서 `apps.morning_boost:app` 으로 쓸 수 있게 해 둔다.
+
+하위 모듈(router, lifespan 등)만 import 할 때 앱 전체가 만들어지지 않도록
+app / create_app 은 처음 접근할 때 불러온다.
 """
 
-from .main import create_app
 
-app = create_app()
+def __getattr__(name):
+    if name == "create_app":
+        from .main import create_app
+
+        return create_app
+    if name == "app":
+        from .main import create_app
+
+        app = create_app()
+        globals()["app"] = app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,49 @@
+# apps/morning_boost/app_setup.py
+"""
+엔트리 포인트(main.py / stt_diary/main.py / apps/morning_boost/main.py)가 같이 쓰는 미들웨어 / 예외 핸들러.
+
+install_common(app) 하나로
+- 업로드 크기 제한  : upload_paths 로 들어오는 본문이 상한을 넘으면 바로 413 (+ 큰 파일은 임시 파일로)
+- 메트릭          : metrics_paths 요청의 단계별/요청별 지연 (Prometheus 포맷, GET /metrics)
+- 요청 예산        : /boost 요청마다 OpenAI 호출 예산(call_policy), 넘기면 504
+- OpenAI 과부하    : limiter 대기열이 가득 차면 요청을 쌓아 두지 않고 바로 503 + Retry-After
+- 일기 조회 장애    : 백엔드 장애로 최신 일기를 모르면 "일기 없음"으로 치지 않고 502
+
+CORS 처럼 앱마다 다른 미들웨어는 install_common 전에 각 엔트리 포인트에서 붙인다.
+"""
+
+from typing import Iterable
+
+from fastapi import FastAPI
+
+from apps.morning_boost.call_policy import DeadlineExceeded, DeadlineMiddleware, deadline_handler
+from apps.morning_boost.diary_cache import DiaryUnavailable
+from apps.morning_boost.diary_client import diary_unavailable_handler
+from apps.morning_boost.metrics import MetricsMiddleware, metrics_endpoint
+from apps.morning_boost.openai_limiter import OpenAIOverloaded, overloaded_handler
+from stt_diary.src.core.upload import UploadSizeLimitMiddleware, configure_upload_spooling
+
+
+def install_common(
+    app: FastAPI,
+    metrics_paths: Iterable[str] = ("/boost", "/diary"),
+    upload_paths: Iterable[str] = ("/diary/stt",),
+) -> None:
+    """
+    공용 미들웨어 / 예외 핸들러를 붙인다. 나중에 붙인 미들웨어가 바깥쪽이라 순서는
+    Deadline → Metrics → UploadSizeLimit → (앞서 붙인 CORS 등) → 라우터.
+
+    :param metrics_paths: 지연을 기록할 경로 prefix
+    :param upload_paths: 업로드 크기를 제한할 경로 prefix (비우면 제한 안 함, /diary/stt 가 없는 앱)
+    """
+    upload_paths = list(upload_paths)
+    if upload_paths:
+        configure_upload_spooling()
+        app.add_middleware(UploadSizeLimitMiddleware, paths=upload_paths)
+    app.add_middleware(MetricsMiddleware, paths=list(metrics_paths))
+    app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+    app.add_middleware(DeadlineMiddleware, paths=["/boost"])
+
+    app.add_exception_handler(OpenAIOverloaded, overloaded_handler)
+    app.add_exception_handler(DeadlineExceeded, deadline_handler)
+    app.add_exception_handler(DiaryUnavailable, diary_unavailable_handler)
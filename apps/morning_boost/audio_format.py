@@ -0,0 +1,252 @@
+# apps/morning_boost/audio_format.py
+"""
+응원 음성 출력 포맷 협상 + 로컬 트랜스코딩.
+
+모바일에서는 mp3 보다 opus / aac 가 같은 음성 품질에 훨씬 작다.
+/boost 계열 엔드포인트는 `?format=opus&bitrate=24k` 쿼리나 Accept 헤더로 포맷을 고른다.
+
+- 비트레이트를 안 주면 OpenAI speech API 가 그 포맷으로 바로 만들어 준다 (트랜스코딩 없음)
+- 비트레이트를 주면 OpenAI 에서 pcm(24kHz 16bit mono) 원본을 받아 pydub(ffmpeg)로 인코딩한다
+  인코딩은 CPU 를 쓰므로 프로세스 풀에서 돌려 이벤트 루프를 막지 않는다
+- TTS 캐시에는 포맷 + 비트레이트별로 따로 들어간다 (pcm 원본도 캐시되어 다른 비트레이트는 OpenAI 재호출 없음)
+
+설정: configs/morning_boost.yaml 의 audio_format 섹션.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from apps.morning_boost.metrics import stage
+from apps.morning_boost.utils import load_section
+
+DEFAULT_AUDIO_FORMAT_CONFIG: Dict[str, Any] = {
+    "default": "mp3",
+    "allowed_bitrates": ["16k", "24k", "32k", "48k", "64k", "96k", "128k"],
+    "transcode_workers": 2,
+}
+
+_config: Optional[Dict[str, Any]] = None
+
+# OpenAI speech API 의 pcm 출력 형식
+PCM_FRAME_RATE = 24000
+PCM_SAMPLE_WIDTH = 2
+PCM_CHANNELS = 1
+
+
+@dataclass(frozen=True)
+class _Codec:
+    ext: str
+    media_type: str
+    container: str          # ffmpeg -f
+    codec: Optional[str]    # ffmpeg -acodec
+    lossy: bool
+    concat: bool            # 파일 여러 개를 바이트 그대로 이어 붙여도 재생되는지 (문장 단위 스트리밍)
+
+
+CODECS: Dict[str, _Codec] = {
+    "mp3": _Codec("mp3", "audio/mpeg", "mp3", "libmp3lame", True, True),
+    "opus": _Codec("opus", "audio/ogg", "ogg", "libopus", True, False),   # OpenAI opus 도 Ogg 컨테이너
+    "aac": _Codec("aac", "audio/aac", "adts", "aac", True, True),         # ADTS 프레임마다 헤더
+    "wav": _Codec("wav", "audio/wav", "wav", None, False, False),
+    "flac": _Codec("flac", "audio/flac", "flac", "flac", False, False),
+}
+
+# Accept 헤더의 미디어 타입 → 포맷
+MEDIA_TYPES: Dict[str, str] = {
+    "audio/mpeg": "mp3",
+    "audio/mp3": "mp3",
+    "audio/mpeg3": "mp3",
+    "audio/ogg": "opus",
+    "audio/opus": "opus",
+    "audio/aac": "aac",
+    "audio/x-aac": "aac",
+    "audio/aacp": "aac",
+    "audio/wav": "wav",
+    "audio/x-wav": "wav",
+    "audio/wave": "wav",
+    "audio/vnd.wave": "wav",
+    "audio/flac": "flac",
+    "audio/x-flac": "flac",
+}
+
+
+@dataclass(frozen=True)
+class AudioFormat:
+    name: str
+    bitrate: Optional[str] = None
+
+    @property
+    def codec(self) -> _Codec:
+        return CODECS[self.name]
+
+    @property
+    def ext(self) -> str:
+        return self.codec.ext
+
+    @property
+    def media_type(self) -> str:
+        return self.codec.media_type
+
+    @property
+    def variant(self) -> str:
+        """
+        캐시 / single-flight 키에 쓰는 이름. 예: mp3, opus-24k
+        """
+        return f"{self.name}-{self.bitrate}" if self.bitrate else self.name
+
+    @property
+    def needs_transcode(self) -> bool:
+        return self.bitrate is not None
+
+
+def load_audio_format_config() -> Dict[str, Any]:
+    return load_section("audio_format", DEFAULT_AUDIO_FORMAT_CONFIG)
+
+
+def get_audio_format_config() -> Dict[str, Any]:
+    """
+    요청마다 포맷을 협상하므로 yaml 은 처음 한 번만 읽어 둔다.
+    """
+    global _config
+    if _config is None:
+        _config = load_audio_format_config()
+    return _config
+
+
+def _parse_accept(accept: str) -> List[Tuple[str, float]]:
+    """
+    "audio/ogg; codecs=opus, audio/mpeg;q=0.5" → [("audio/ogg", 1.0), ("audio/mpeg", 0.5)] (q 높은 순, 같으면 적힌 순)
+    """
+    entries = []
+    for index, part in enumerate(accept.split(",")):
+        media_type, *params = [p.strip() for p in part.split(";")]
+        if not media_type:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        entries.append((media_type.lower(), q, index))
+    entries.sort(key=lambda e: (-e[1], e[2]))
+    return [(media_type, q) for media_type, q, _ in entries]
+
+
+def negotiate_audio_format(
+    accept: Optional[str] = None,
+    format: Optional[str] = None,
+    bitrate: Optional[str] = None,
+    cfg: Optional[Dict[str, Any]] = None,
+) -> AudioFormat:
+    """
+    쿼리(format / bitrate) → Accept 헤더 → 기본값(audio_format.default) 순서로 출력 포맷을 정한다.
+    Accept 에 지원하는 오디오 타입이 없으면 (예: application/json 만 있는 예전 클라이언트) 기본값.
+    format / bitrate 값이 잘못됐으면 ValueError.
+    """
+    cfg = cfg or get_audio_format_config()
+    name = cfg["default"]
+
+    if format:
+        name = format.lower()
+        if name not in CODECS:
+            raise ValueError(f"지원하지 않는 format 입니다: {format} (가능: {', '.join(CODECS)})")
+    elif accept:
+        excluded = set()
+        for media_type, q in _parse_accept(accept):
+            if q <= 0:
+                excluded.add(MEDIA_TYPES.get(media_type, media_type))
+                continue
+            if media_type in MEDIA_TYPES and MEDIA_TYPES[media_type] not in excluded:
+                name = MEDIA_TYPES[media_type]
+                break
+            if media_type in ("audio/*", "*/*"):
+                candidates = [cfg["default"]] + [n for n in CODECS if n != cfg["default"]]
+                name = next((n for n in candidates if n not in excluded), cfg["default"])
+                break
+
+    if bitrate:
+        bitrate = bitrate.lower()
+        if not CODECS[name].lossy:
+            raise ValueError(f"{name} 는 무손실 포맷이라 bitrate 를 지정할 수 없습니다.")
+        if bitrate not in cfg["allowed_bitrates"]:
+            raise ValueError(f"지원하지 않는 bitrate 입니다: {bitrate} (가능: {', '.join(cfg['allowed_bitrates'])})")
+    return AudioFormat(name, bitrate or None)
+
+
+# ============================
+# 트랜스코딩 (프로세스 풀)
+# ============================
+
+def transcode_pcm(src: str, dst: str, name: str, bitrate: Optional[str]) -> int:
+    """
+    OpenAI pcm 파일을 name/bitrate 로 인코딩해서 dst 에 쓰고 크기를 돌려준다.
+    프로세스 풀 워커에서 실행된다 (모듈 최상위 함수여야 pickle 가능).
+    """
+    from pydub import AudioSegment
+
+    codec = CODECS[name]
+    with open(src, "rb") as f:
+        segment = AudioSegment(
+            data=f.read(),
+            sample_width=PCM_SAMPLE_WIDTH,
+            frame_rate=PCM_FRAME_RATE,
+            channels=PCM_CHANNELS,
+        )
+    segment.export(dst, format=codec.container, codec=codec.codec, bitrate=bitrate)
+    return os.path.getsize(dst)
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_transcode_pool() -> ProcessPoolExecutor:
+    """
+    트랜스코딩 전용 프로세스 풀 (처음 쓸 때 만든다).
+    uvicorn 스레드가 떠 있는 프로세스를 fork 하지 않도록 spawn 으로 띄운다.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                workers = int(get_audio_format_config()["transcode_workers"])
+                _pool = ProcessPoolExecutor(
+                    max_workers=max(1, workers),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pool
+
+
+def shutdown_transcode_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+async def transcode_pcm_async(src: Path, dst: Path, fmt: AudioFormat) -> int:
+    """
+    transcode_pcm 을 프로세스 풀에서 실행. 중간 파일에 쓴 뒤 dst 로 옮긴다.
+    """
+    part = dst.with_name(dst.name + ".part")
+    loop = asyncio.get_running_loop()
+    try:
+        with stage("transcode"):
+            size = await loop.run_in_executor(
+                get_transcode_pool(), transcode_pcm, str(src), str(part), fmt.name, fmt.bitrate
+            )
+        os.replace(part, dst)
+    finally:
+        part.unlink(missing_ok=True)
+    return size
+
@@ -0,0 +1,415 @@
+# apps/morning_boost/boost_pool.py
+"""
+일기 없는 사용자용 하루치 응원 음성 풀.
+
+전날 일기가 없으면 프롬프트가 날짜에만 의존하는데도 예전에는 사용자마다 LLM + TTS 를 따로 돌렸다.
+(텍스트 캐시가 있어도 아침에 한꺼번에 몰리면 첫 멘트가 캐시에 들어가기 전까지 전부 LLM 을 부르고, 모두 같은 멘트를 듣는다)
+여기서는 하루에 variants 개의 멘트(주제를 조금씩 바꿔서)와 음성을 미리 만들어 두고,
+사용자는 hash(날짜, user_id) 로 그중 하나를 받는다 → 파일 조회만 하므로 지연 / 비용이 거의 없다.
+
+- 저장: data/morning_boost/pool/YYYYMMDD/ (manifest.json + 변형별 음성 파일, /static/morning_boost/pool/... 로도 접근 가능)
+- 같은 사용자는 하루 동안 같은 변형을 받고, 날짜가 바뀌면 다른 변형이 될 수 있다
+- 다음 날 풀은 자정 prefetch_minutes 전에 미리 만든다 (lifespan 의 refresher, check_interval_seconds 마다 확인)
+- 여러 프로세스(uvicorn 워커 / 작업 큐 워커)가 같은 디렉토리를 보고, 생성은 lock 파일을 잡은 한 곳만 한다
+- 풀이 아직 없으면(기동 직후 / 자정 직후) 요청들은 풀 생성 하나를 같이 기다린다 (최대 wait_seconds).
+  그래도 없거나 생성이 실패했으면 평소 경로(LLM + TTS)로 처리
+- formats 에 없는 포맷(예: opus-24k)은 처음 요청 때 풀 멘트로 TTS 해서 풀에 추가한다
+
+설정: configs/morning_boost.yaml 의 boost_pool 섹션.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from apps.morning_boost.audio_format import AudioFormat
+from apps.morning_boost.call_policy import request_deadline
+from apps.morning_boost.metrics import BOOST_POOL_TOTAL, set_endpoint
+from apps.morning_boost.prompt_engine import build_no_diary_prompt, generate_message_async
+from apps.morning_boost.singleflight import SingleFlight
+from apps.morning_boost.text_cache import next_midnight
+from apps.morning_boost.tts_engine import generate_tts_to_file_async
+from apps.morning_boost.utils import get_data_dir, load_section
+
+DEFAULT_BOOST_POOL_CONFIG: Dict[str, Any] = {
+    "enabled": True,
+    "variants": 8,                  # 하루에 만들 멘트 수
+    "formats": ["mp3"],             # 미리 만들어 둘 포맷 (mp3, opus-24k 처럼 포맷-비트레이트)
+    "model": "gpt-4o-mini",
+    "concurrency": 8,               # 풀 만들 때 동시에 돌릴 변형 수
+    "wait_seconds": 20,             # 풀이 없을 때 요청이 생성을 기다릴 최대 시간 (0 이면 바로 평소 경로)
+    "retry_seconds": 60,            # 생성이 실패하면 이 시간 동안은 다시 시도하지 않고 평소 경로
+    "prefetch_minutes": 30,         # 자정 몇 분 전에 다음 날 풀을 만들지
+    "check_interval_seconds": 60,   # refresher 확인 간격
+    "lock_stale_minutes": 10,       # 이보다 오래된 lock 은 생성하던 프로세스가 죽은 것으로 보고 가져간다
+}
+
+# 변형마다 멘트에 녹일 주제. 날짜마다 시작 위치를 돌려서 매일 조금씩 다른 조합이 되게 한다
+THEMES = (
+    "물 한 잔으로 시작하기",
+    "가벼운 스트레칭",
+    "햇빛 보며 걷기",
+    "책상 위 5분 정리",
+    "좋아하는 노래 한 곡",
+    "깊게 숨 쉬기",
+    "작은 목표 하나",
+    "고마운 사람 떠올리기",
+    "따뜻한 아침 식사",
+    "휴대폰 잠시 내려놓기",
+    "창문 열고 환기하기",
+    "나에게 건네는 칭찬",
+    "점심시간 짧은 산책",
+    "오늘의 작은 즐거움",
+    "천천히 마시는 커피나 차",
+    "미뤄 둔 일 하나 끝내기",
+)
+
+_MANIFEST = "manifest.json"
+_LOCK = ".lock"
+
+_pool: Optional["BoostPool"] = None
+_pool_loaded = False
+
+
+def load_boost_pool_config() -> Dict[str, Any]:
+    return load_section("boost_pool", DEFAULT_BOOST_POOL_CONFIG)
+
+
+def parse_pool_format(value: str) -> AudioFormat:
+    # "opus-24k" → AudioFormat("opus", "24k")
+    name, _, bitrate = value.partition("-")
+    return AudioFormat(name, bitrate or None)
+
+
+class BoostPool:
+    def __init__(
+        self,
+        root: Path,
+        variants: int = 8,
+        formats: Optional[List[str]] = None,
+        model: str = "gpt-4o-mini",
+        concurrency: int = 8,
+        lock_stale_minutes: float = 10,
+        wait_seconds: float = 20,
+        retry_seconds: float = 60,
+    ):
+        self.root = root
+        self.variants = max(1, int(variants))
+        self.formats = [parse_pool_format(f) for f in (formats or ["mp3"])]
+        self.model = model
+        self.concurrency = max(1, int(concurrency))
+        self.lock_stale_seconds = float(lock_stale_minutes) * 60
+        self.wait_seconds = float(wait_seconds)
+        self.retry_seconds = float(retry_seconds)
+        self._failed_at: Dict[date, float] = {}
+        self._manifests: Dict[date, Dict[str, Any]] = {}
+        self._building: Dict[date, asyncio.Task] = {}
+        self._flight = SingleFlight("boost_pool")
+        self.hits = 0
+        self.tts = 0
+        self.not_ready = 0
+        self.generated = 0
+
+    @classmethod
+    def from_config(cls, cfg: Optional[Dict[str, Any]] = None) -> "BoostPool":
+        cfg = cfg or load_boost_pool_config()
+        return cls(
+            get_data_dir() / "pool",
+            cfg["variants"],
+            cfg["formats"],
+            cfg["model"],
+            cfg["concurrency"],
+            cfg["lock_stale_minutes"],
+            cfg["wait_seconds"],
+            cfg["retry_seconds"],
+        )
+
+    # ---------- 경로 / 배정 ----------
+
+    def day_dir(self, day: date) -> Path:
+        return self.root / day.strftime("%Y%m%d")
+
+    def clip_path(self, day: date, index: int, fmt: AudioFormat) -> Path:
+        # S3 키(morning_boost/{user_id}/파일명)가 날짜마다 달라지도록 파일명에도 날짜를 넣는다
+        return self.day_dir(day) / f"{day.strftime('%Y%m%d')}-v{index}-{fmt.variant}.{fmt.ext}"
+
+    @staticmethod
+    def assign(user_id: str, day: date, count: int) -> int:
+        """
+        hash(날짜, user_id) → 0..count-1. 같은 날 같은 사용자는 항상 같은 자리.
+        """
+        digest = hashlib.blake2b(f"{day.isoformat()}|{user_id}".encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "big") % count
+
+    def themes_for(self, day: date) -> List[str]:
+        start = day.toordinal() * self.variants
+        return [THEMES[(start + i) % len(THEMES)] for i in range(self.variants)]
+
+    # ---------- manifest ----------
+
+    def manifest(self, day: date) -> Optional[Dict[str, Any]]:
+        """
+        그날 풀 manifest (없으면 None). 한 번 읽으면 프로세스 안에 기억해 둔다.
+        """
+        cached = self._manifests.get(day)
+        if cached is not None:
+            return cached
+        path = self.day_dir(day) / _MANIFEST
+        try:
+            manifest = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        self._manifests[day] = manifest
+        return manifest
+
+    # ---------- 요청 경로 ----------
+
+    async def clip_for(self, user_id: str, fmt: AudioFormat, day: Optional[date] = None) -> Optional[Path]:
+        """
+        user_id 에게 배정된 오늘 풀 음성 파일. 풀이 wait_seconds 안에 준비되지 않으면 None.
+        """
+        day = day or date.today()
+        manifest = self.manifest(day) or await self._wait_ready(day)
+        if manifest is None:
+            self.not_ready += 1
+            BOOST_POOL_TOTAL.inc("not_ready")
+            return None
+
+        variant = manifest["variants"][self.assign(user_id, day, len(manifest["variants"]))]
+        path = self.clip_path(day, variant["index"], fmt)
+        if path.exists():
+            self.hits += 1
+            BOOST_POOL_TOTAL.inc("hit")
+            return path
+
+        # 미리 안 만든 포맷(또는 retention 이 지운 파일) → 풀 멘트로 한 번만 TTS (같은 변형/포맷 동시 요청은 합침)
+        self.tts += 1
+        BOOST_POOL_TOTAL.inc("tts")
+        return await self._flight.do(str(path), lambda: self._synthesize(variant["text"], path, fmt))
+
+    async def _synthesize(self, text: str, path: Path, fmt: AudioFormat) -> Path:
+        if path.exists():
+            return path
+        part = path.with_name(f"{path.name}.{os.getpid()}.part")
+        try:
+            await generate_tts_to_file_async(text, part, format=fmt.name, bitrate=fmt.bitrate)
+            os.replace(part, path)
+        finally:
+            part.unlink(missing_ok=True)
+        return path
+
+    # ---------- 생성 ----------
+
+    async def _wait_ready(self, day: date) -> Optional[Dict[str, Any]]:
+        """
+        풀 생성이 끝나길 기다린다. 이 프로세스가 만들면 그 작업을 같이 기다리고,
+        다른 프로세스가 lock 을 잡고 만드는 중이면 manifest 가 생길 때까지 확인한다.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.wait_seconds
+        while True:
+            failed_at = self._failed_at.get(day)
+            if failed_at is not None and time.monotonic() - failed_at < self.retry_seconds:
+                return None
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return None
+            try:
+                # 기다리던 요청이 끊겨도 생성은 계속되도록 shield
+                manifest = await asyncio.wait_for(asyncio.shield(self.ensure_in_background(day)), remaining)
+            except asyncio.TimeoutError:
+                return None
+            manifest = manifest or self.manifest(day)
+            if manifest is not None:
+                return manifest
+            await asyncio.sleep(min(0.5, max(0.0, deadline - loop.time())))
+
+    def ensure_in_background(self, day: date) -> asyncio.Task:
+        """
+        이 프로세스 안에서 같은 날짜 풀 생성은 하나만 (refresher / 요청이 같은 작업을 공유).
+        """
+        task = self._building.get(day)
+        if task is None or task.done():
+            task = self._building[day] = asyncio.create_task(self.ensure(day))
+        return task
+
+    async def ensure(self, day: date) -> Optional[Dict[str, Any]]:
+        """
+        그날 풀이 없으면 만든다. 다른 프로세스가 만들고 있으면 기다리지 않고 None.
+        """
+        manifest = self.manifest(day)
+        if manifest is not None:
+            return manifest
+        day_dir = self.day_dir(day)
+        day_dir.mkdir(parents=True, exist_ok=True)
+        if not self._acquire_lock(day_dir / _LOCK):
+            return None
+        try:
+            # 요청 안에서 시작됐어도 그 요청의 예산을 물려받지 않는다 (단계 상한만)
+            with request_deadline(None):
+                manifest = await self._build(day)
+        except Exception as e:
+            print(f"[boost_pool ERROR] {day}: {e!r}")
+            manifest = None
+        finally:
+            (day_dir / _LOCK).unlink(missing_ok=True)
+        if manifest is None:
+            self._failed_at[day] = time.monotonic()
+        else:
+            self._failed_at.pop(day, None)
+        return manifest
+
+    def _acquire_lock(self, lock: Path) -> bool:
+        for _ in range(2):
+            try:
+                fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    age = time.time() - lock.stat().st_mtime
+                except FileNotFoundError:
+                    continue
+                if age < self.lock_stale_seconds:
+                    return False
+                print(f"[boost_pool] stale lock ({age:.0f}s), taking over: {lock}")
+                lock.unlink(missing_ok=True)
+                continue
+            os.write(fd, str(os.getpid()).encode())
+            os.close(fd)
+            return True
+        return False
+
+    async def _build(self, day: date) -> Optional[Dict[str, Any]]:
+        started = time.perf_counter()
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def one(index: int, theme: str) -> Dict[str, Any]:
+            async with slots:
+                text = await generate_message_async(build_no_diary_prompt(day, theme), self.model)
+                for fmt in self.formats:
+                    await self._synthesize(text, self.clip_path(day, index, fmt), fmt)
+                return {"index": index, "theme": theme, "text": text}
+
+        results = await asyncio.gather(
+            *(one(i, theme) for i, theme in enumerate(self.themes_for(day))),
+            return_exceptions=True,
+        )
+        variants = [r for r in results if isinstance(r, dict)]
+        for r in results:
+            if isinstance(r, BaseException):
+                print(f"[boost_pool ERROR] {day} variant failed: {r!r}")
+        if not variants:
+            return None
+
+        manifest = {
+            "day": day.isoformat(),
+            "model": self.model,
+            "formats": [fmt.variant for fmt in self.formats],
+            "created_at": time.time(),
+            "variants": variants,
+        }
+        # 다른 프로세스가 반쯤 쓴 파일을 읽지 않도록 임시 파일 → os.replace (음성 파일이 다 만들어진 뒤)
+        path = self.day_dir(day) / _MANIFEST
+        tmp = path.with_name(f"{_MANIFEST}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+        self._manifests[day] = manifest
+        self.generated += len(variants)
+        print(f"[boost_pool] {day} ready: {len(variants)}/{self.variants} variants in {time.perf_counter() - started:.1f}s")
+        return manifest
+
+    def prune(self, keep_from: date) -> int:
+        """
+        keep_from 보다 이전 날짜 풀 디렉토리 삭제.
+        """
+        removed = 0
+        cutoff = keep_from.strftime("%Y%m%d")
+        if not self.root.exists():
+            return 0
+        for child in self.root.iterdir():
+            if child.is_dir() and child.name < cutoff:
+                shutil.rmtree(child, ignore_errors=True)
+                removed += 1
+        for day in [d for d in self._manifests if d < keep_from]:
+            del self._manifests[day]
+        for day in [d for d in self._failed_at if d < keep_from]:
+            del self._failed_at[day]
+        for day in [d for d, task in self._building.items() if d < keep_from and task.done()]:
+            del self._building[day]
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        ready: Set[str] = {d.isoformat() for d in self._manifests}
+        return {
+            "variants": self.variants,
+            "formats": [fmt.variant for fmt in self.formats],
+            "ready_days": sorted(ready),
+            "today_ready": self.manifest(date.today()) is not None,
+            "hits": self.hits,
+            "tts": self.tts,
+            "not_ready": self.not_ready,
+            "generated": self.generated,
+        }
+
+
+def get_boost_pool() -> Optional[BoostPool]:
+    """
+    boost_pool.enabled 가 false 면 None.
+    """
+    global _pool, _pool_loaded
+    if not _pool_loaded:
+        cfg = load_boost_pool_config()
+        _pool = BoostPool.from_config(cfg) if cfg["enabled"] else None
+        _pool_loaded = True
+    return _pool
+
+
+def set_boost_pool(pool: Optional[BoostPool]) -> None:
+    """
+    테스트/벤치에서 풀을 바꿔 끼우거나 끌 때 (None).
+    """
+    global _pool, _pool_loaded
+    _pool = pool
+    _pool_loaded = True
+
+
+async def get_pool_clip(user_id: str, fmt: AudioFormat) -> Optional[Path]:
+    """
+    일기 없는 사용자에게 줄 오늘 풀 음성. 풀이 꺼져 있거나 아직 없으면 None → 평소 경로.
+    """
+    pool = get_boost_pool()
+    if pool is None:
+        return None
+    return await pool.clip_for(user_id, fmt)
+
+
+async def run_pool_refresher(pool: BoostPool, prefetch_minutes: float, interval_seconds: float) -> None:
+    """
+    오늘 풀이 있는지 확인하고, 자정 prefetch_minutes 전부터는 다음 날 풀도 만든다. 지난 날짜 풀은 지운다.
+    """
+    set_endpoint("boost_pool")
+    while True:
+        try:
+            now = datetime.now()
+            await pool.ensure_in_background(now.date())
+            if next_midnight(now) - now.timestamp() <= prefetch_minutes * 60:
+                await pool.ensure_in_background(now.date() + timedelta(days=1))
+            await asyncio.to_thread(pool.prune, now.date() - timedelta(days=1))
+        except Exception as e:
+            print("[boost_pool refresher ERROR]", repr(e))
+        await asyncio.sleep(interval_seconds)
+
+
+def start_pool_refresher() -> Optional[asyncio.Task]:
+    cfg = load_boost_pool_config()
+    pool = get_boost_pool()
+    if pool is None:
+        return None
+    return asyncio.create_task(
+        run_pool_refresher(pool, float(cfg["prefetch_minutes"]), float(cfg["check_interval_seconds"]))
+    )
@@ -0,0 +1,444 @@
+# apps/morning_boost/call_policy.py
+"""
+OpenAI 호출(LLM / TTS) 꼬리 지연 관리: 요청 예산에서 나온 단계별 deadline + 제한된 재시도 + hedging.
+
+업스트림 응답 하나가 느리면 그대로 /boost p99 가 됐다 (SDK 기본 타임아웃 10분, 재시도는 deadline 을 모름).
+- 요청 예산  : DeadlineMiddleware 가 /boost 요청마다 request_budget_seconds 를 잡는다 (작업 모드 / batch 항목은 따로).
+              단계 deadline = min(단계 timeout_seconds, 남은 예산 - 뒤 단계 몫 reserve_seconds).
+              남은 시간이 없으면 호출하지 않고 DeadlineExceeded → 504
+- 재시도    : 429 / 5xx / 연결 오류 / 시도 시간 초과(attempt_timeout_seconds)만, 최대 max_attempts 번,
+              지수 백오프 + full jitter (429 면 Retry-After 이상), deadline 안에 끝날 수 있을 때만
+- 재시도 예산: 프로세스 전체에서 재시도 + hedge 는 최근 window_seconds 동안 "호출 수 × ratio + min_per_second × window" 까지
+              (업스트림이 아플 때 재시도가 부하를 몇 배로 키우지 않게)
+- hedging   : 켜면 단계별 최근 지연의 percentile 이 지나도 응답이 없을 때 같은 호출을 하나 더 보내고,
+              먼저 끝난 쪽을 쓰고 나머지는 취소한다 (예산에서 차감, 표본이 min_samples 보다 적으면 안 함)
+
+스트리밍 호출(stream=true, 문장 단위)은 이미 보낸 조각을 되돌릴 수 없어서 재시도 / hedging 없이 단계 timeout 만 쓴다.
+off(enabled: false)면 예전처럼 SDK 재시도(openai_limits.max_retries)에 맡긴다.
+
+사용법:
+    async def attempt(timeout):
+        async with openai_slot_async(model):
+            return await attempt_client(timeout).responses.create(...)
+
+    response = await call_with_policy("llm", attempt)
+
+설정: configs/morning_boost.yaml 의 call_policy 섹션. 효과 확인: python -m scripts.bench.tail_latency
+"""
+
+import asyncio
+import contextvars
+import math
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterator, Optional, TypeVar
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from apps.morning_boost.clients import get_async_openai_client
+from apps.morning_boost.metrics import CALL_POLICY_TOTAL
+from apps.morning_boost.openai_limiter import OpenAIOverloaded, parse_retry_after
+from apps.morning_boost.utils import load_config
+
+T = TypeVar("T")
+
+DEFAULT_CALL_POLICY_CONFIG: Dict[str, Any] = {
+    "enabled": True,
+    "request_budget_seconds": 30.0,   # /boost 요청 하나 (DeadlineMiddleware)
+    "job_budget_seconds": 120.0,      # 작업 모드 작업 하나 / batch 항목 하나
+    "stages": {
+        # timeout_seconds: 단계 상한, reserve_seconds: 뒤 단계를 위해 남겨 둘 시간,
+        # attempt_timeout_seconds: 시도 하나 상한 (넘으면 끊고 재시도, null 이면 단계 deadline 까지)
+        "llm": {"timeout_seconds": 15.0, "reserve_seconds": 5.0, "attempt_timeout_seconds": None},
+        "tts": {"timeout_seconds": 20.0, "reserve_seconds": 0.0, "attempt_timeout_seconds": None},
+    },
+    "retry": {
+        "max_attempts": 3,
+        "base_delay_seconds": 0.2,
+        "max_delay_seconds": 2.0,
+    },
+    "retry_budget": {
+        "ratio": 0.1,              # 호출 10 번에 재시도 / hedge 1 번
+        "min_per_second": 1.0,     # 호출이 적을 때도 이만큼은 허용
+        "window_seconds": 10.0,
+    },
+    "hedge": {
+        "enabled": False,
+        "stages": ["llm", "tts"],
+        "percentile": 0.95,        # 최근 성공 지연의 이 분위수가 지나면 두 번째 호출
+        "min_samples": 20,
+        "window": 200,             # 분위수 계산에 쓸 최근 표본 수
+        "min_delay_seconds": 0.2,
+    },
+}
+
+# 요청 예산이 끝나는 시각 (time.monotonic 기준), 없으면 None (단계 상한만)
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("request_deadline", default=None)
+
+_config: Optional[Dict[str, Any]] = None
+
+
+class DeadlineExceeded(Exception):
+    """
+    요청 예산 / 단계 deadline 안에 OpenAI 호출을 끝낼 수 없을 때. deadline_handler 가 504 로 바꾼다.
+    """
+
+    def __init__(self, stage: str, timeout: float):
+        super().__init__(f"{stage} deadline exceeded ({timeout:.1f}s)")
+        self.stage = stage
+        self.timeout = timeout
+
+
+def load_call_policy_config() -> Dict[str, Any]:
+    """
+    configs/morning_boost.yaml 의 call_policy 섹션을 기본값 위에 덮어써서 반환 (하위 섹션은 키 단위로 합침).
+    """
+    cfg = {k: (dict(v) if isinstance(v, dict) else v) for k, v in DEFAULT_CALL_POLICY_CONFIG.items()}
+    cfg["stages"] = {name: dict(stage) for name, stage in DEFAULT_CALL_POLICY_CONFIG["stages"].items()}
+    for key, value in (load_config().get("call_policy") or {}).items():
+        if key == "stages":
+            for name, stage in (value or {}).items():
+                cfg["stages"].setdefault(name, {}).update(stage or {})
+        elif isinstance(cfg.get(key), dict):
+            cfg[key].update(value or {})
+        else:
+            cfg[key] = value
+    return cfg
+
+
+def get_call_policy_config() -> Dict[str, Any]:
+    """
+    호출마다 YAML 을 다시 읽지 않도록 캐시 (벤치에서는 이 dict 를 직접 고쳐 쓴다).
+    """
+    global _config
+    if _config is None:
+        _config = load_call_policy_config()
+    return _config
+
+
+# ---------- 요청 예산 / deadline ----------
+
+@contextmanager
+def request_deadline(seconds: Optional[float]) -> Iterator[None]:
+    """
+    with 블록 안의 OpenAI 호출들이 나눠 쓸 예산. None 이면 예산 없음 (단계 상한만).
+    """
+    token = _deadline.set(time.monotonic() + seconds if seconds is not None else None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_budget() -> Optional[float]:
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def stage_timeout(stage: str) -> float:
+    """
+    이 단계에 쓸 수 있는 시간 = min(단계 상한, 남은 예산 - 뒤 단계 몫). 없으면 DeadlineExceeded.
+    """
+    stage_cfg = get_call_policy_config()["stages"].get(stage) or {}
+    timeout = float(stage_cfg.get("timeout_seconds") or 60.0)
+    left = remaining_budget()
+    if left is not None:
+        timeout = min(timeout, left - float(stage_cfg.get("reserve_seconds") or 0.0))
+    if timeout <= 0:
+        CALL_POLICY_TOTAL.inc(stage, "deadline_exceeded")
+        raise DeadlineExceeded(stage, 0.0)
+    return timeout
+
+
+def attempt_client(timeout: Optional[float]):
+    """
+    정책 아래에서 쓸 AsyncOpenAI. SDK 재시도는 끄고(재시도는 call_with_policy 가) 시도 시간 상한을 건다.
+    timeout 이 None 이면(정책 off) 평소 클라이언트.
+    """
+    client = get_async_openai_client()
+    if timeout is None:
+        return client
+    return client.with_options(max_retries=0, timeout=timeout)
+
+
+def timeout_client(client, stage: str):
+    """
+    동기 호출 / 스트리밍 호출용: 정책이 켜져 있으면 단계 deadline 을 SDK timeout 으로 걸고 SDK 재시도는 끈다.
+    (SDK 재시도를 두면 시도마다 timeout 을 새로 받아서 단계 deadline 의 max_retries + 1 배까지 늘어난다)
+    """
+    if not get_call_policy_config()["enabled"]:
+        return client
+    return client.with_options(max_retries=0, timeout=stage_timeout(stage))
+
+
+# ---------- 재시도 예산 ----------
+
+class RetryBudget:
+    """
+    최근 window_seconds 동안의 재시도(+ hedge) 수를 "호출 수 × ratio + min_per_second × window" 로 제한.
+    1초 단위 칸에 (호출, 재시도) 수를 모은다.
+    """
+
+    def __init__(self, ratio: float = 0.1, min_per_second: float = 1.0, window_seconds: float = 10.0):
+        self.ratio = float(ratio)
+        self.min_per_second = float(min_per_second)
+        self.window = max(1, int(math.ceil(window_seconds)))
+        self._buckets: Deque[list] = deque()   # [second, calls, retries]
+        self._lock = threading.Lock()
+        self.denied = 0
+
+    def _bucket(self, now: float) -> list:
+        second = int(now)
+        while self._buckets and self._buckets[0][0] <= second - self.window:
+            self._buckets.popleft()
+        if not self._buckets or self._buckets[-1][0] != second:
+            self._buckets.append([second, 0, 0])
+        return self._buckets[-1]
+
+    def record_call(self) -> None:
+        with self._lock:
+            self._bucket(time.monotonic())[1] += 1
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            bucket = self._bucket(time.monotonic())
+            calls = sum(b[1] for b in self._buckets)
+            retries = sum(b[2] for b in self._buckets)
+            if retries + 1 > calls * self.ratio + self.min_per_second * self.window:
+                self.denied += 1
+                return False
+            bucket[2] += 1
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._bucket(time.monotonic())
+            return {
+                "window_calls": sum(b[1] for b in self._buckets),
+                "window_retries": sum(b[2] for b in self._buckets),
+                "denied": self.denied,
+            }
+
+
+# ---------- hedging 용 지연 표본 ----------
+
+class LatencyWindow:
+    """
+    단계별 최근 성공 시도 지연 (초). percentile 이 hedge 지연이 된다.
+    """
+
+    def __init__(self, size: int = 200):
+        self.samples: Deque[float] = deque(maxlen=max(1, int(size)))
+
+    def observe(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+_budget: Optional[RetryBudget] = None
+_latencies: Dict[str, LatencyWindow] = {}
+
+
+def get_retry_budget() -> RetryBudget:
+    global _budget
+    if _budget is None:
+        cfg = get_call_policy_config()["retry_budget"]
+        _budget = RetryBudget(cfg["ratio"], cfg["min_per_second"], cfg["window_seconds"])
+    return _budget
+
+
+def _latency_window(stage: str) -> LatencyWindow:
+    window = _latencies.get(stage)
+    if window is None:
+        window = _latencies[stage] = LatencyWindow(get_call_policy_config()["hedge"]["window"])
+    return window
+
+
+def reset_call_policy() -> None:
+    """
+    벤치에서 설정을 바꾼 뒤 예산 / 지연 표본을 새로 시작할 때.
+    """
+    global _budget
+    _budget = None
+    _latencies.clear()
+
+
+def _hedge_delay(stage: str) -> Optional[float]:
+    cfg = get_call_policy_config()["hedge"]
+    if not cfg["enabled"] or stage not in cfg["stages"]:
+        return None
+    window = _latency_window(stage)
+    if len(window.samples) < int(cfg["min_samples"]):
+        return None
+    return max(float(cfg["min_delay_seconds"]), window.percentile(float(cfg["percentile"])))
+
+
+# ---------- 재시도 판단 ----------
+
+def _is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, OpenAIOverloaded):
+        # 우리 limiter 가 거절한 것 → 다시 보내도 같은 대기열
+        return False
+    if isinstance(exc, asyncio.TimeoutError):
+        return True
+    import openai
+
+    if isinstance(exc, openai.APIConnectionError):   # APITimeoutError 포함
+        return True
+    if isinstance(exc, openai.APIStatusError):
+        return exc.status_code in (408, 409, 429) or exc.status_code >= 500
+    return False
+
+
+def _retry_delay(attempt: int, exc: BaseException) -> float:
+    cfg = get_call_policy_config()["retry"]
+    cap = min(float(cfg["max_delay_seconds"]), float(cfg["base_delay_seconds"]) * 2 ** (attempt - 1))
+    delay = random.uniform(0, cap)   # full jitter
+    response = getattr(exc, "response", None)
+    retry_after = parse_retry_after(response.headers) if response is not None else None
+    return max(delay, retry_after) if retry_after is not None else delay
+
+
+# ---------- 호출 ----------
+
+async def _cancel_all(tasks) -> None:
+    for task in tasks:
+        task.cancel()
+    for task in tasks:
+        try:
+            await task
+        except BaseException:
+            pass
+
+
+async def _attempt_hedged(stage: str, attempt: Callable[[float], Awaitable[T]], timeout: float) -> T:
+    """
+    시도 하나 (필요하면 hedge 하나 더). 먼저 성공한 결과를 쓰고 나머지는 취소한다.
+    """
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    window = _latency_window(stage)
+    hedge_after = _hedge_delay(stage)
+
+    async def timed(timeout_: float) -> T:
+        t0 = loop.time()
+        result = await attempt(timeout_)
+        window.observe(loop.time() - t0)
+        return result
+
+    primary = asyncio.create_task(timed(timeout))
+    tasks = {primary}
+    hedge: Optional[asyncio.Task] = None
+    try:
+        if hedge_after is not None and hedge_after < timeout:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+            if not done and get_retry_budget().try_spend():
+                CALL_POLICY_TOTAL.inc(stage, "hedge")
+                hedge = asyncio.create_task(timed(timeout - (loop.time() - started)))
+                tasks.add(hedge)
+            elif not done:
+                CALL_POLICY_TOTAL.inc(stage, "budget_exhausted")
+
+        error: Optional[BaseException] = None
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is hedge:
+                        CALL_POLICY_TOTAL.inc(stage, "hedge_win")
+                    return task.result()
+                # 한쪽이 실패해도 다른 쪽이 아직 돌고 있으면 기다린다 (첫 번째 시도의 에러를 우선)
+                if error is None or task is primary:
+                    error = task.exception()
+        raise error
+    finally:
+        await _cancel_all([t for t in tasks if not t.done()])
+
+
+async def call_with_policy(stage: str, attempt: Callable[[Optional[float]], Awaitable[T]]) -> T:
+    """
+    attempt(timeout) 을 deadline / 재시도 / hedging 아래에서 실행한다.
+    attempt 는 시도마다 새로 불리므로 자기 자원(limiter 자리, 임시 파일)을 스스로 정리해야 한다 (취소될 수 있음).
+    정책이 꺼져 있으면 attempt(None) 한 번 (SDK 재시도).
+    """
+    cfg = get_call_policy_config()
+    if not cfg["enabled"]:
+        return await attempt(None)
+
+    loop = asyncio.get_running_loop()
+    total = stage_timeout(stage)
+    deadline = loop.time() + total
+    attempt_cap = (cfg["stages"].get(stage) or {}).get("attempt_timeout_seconds")
+    budget = get_retry_budget()
+    budget.record_call()
+
+    for number in range(1, int(cfg["retry"]["max_attempts"]) + 1):
+        left = deadline - loop.time()
+        timeout = min(left, float(attempt_cap)) if attempt_cap else left
+        try:
+            return await asyncio.wait_for(_attempt_hedged(stage, attempt, timeout), timeout)
+        except Exception as e:
+            if isinstance(e, asyncio.TimeoutError) and deadline - loop.time() <= 0:
+                CALL_POLICY_TOTAL.inc(stage, "deadline_exceeded")
+                raise DeadlineExceeded(stage, total) from None
+            if not _is_retryable(e) or number >= int(cfg["retry"]["max_attempts"]):
+                raise
+            delay = _retry_delay(number, e)
+            if loop.time() + delay >= deadline:
+                CALL_POLICY_TOTAL.inc(stage, "deadline_exceeded")
+                raise DeadlineExceeded(stage, total) from e
+            if not budget.try_spend():
+                CALL_POLICY_TOTAL.inc(stage, "budget_exhausted")
+                raise
+            CALL_POLICY_TOTAL.inc(stage, "retry")
+            print(f"[call_policy] {stage} retry {number} in {delay:.2f}s: {e!r}")
+            await asyncio.sleep(delay)
+    raise AssertionError("unreachable")
+
+
+def call_policy_stats() -> Dict[str, Any]:
+    return {
+        "retry_budget": get_retry_budget().stats(),
+        "hedge_delay_seconds": {stage: _hedge_delay(stage) for stage in _latencies},
+    }
+
+
+# ---------- 앱 연결 ----------
+
+class DeadlineMiddleware:
+    """
+    paths 로 시작하는 요청마다 call_policy.request_budget_seconds 예산을 잡는 ASGI 미들웨어.
+    """
+
+    def __init__(self, app: ASGIApp, paths=("/boost",)):
+        self.app = app
+        self.paths = tuple(paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        cfg = get_call_policy_config()
+        if scope["type"] != "http" or not cfg["enabled"] or not scope["path"].startswith(self.paths):
+            await self.app(scope, receive, send)
+            return
+        with request_deadline(float(cfg["request_budget_seconds"])):
+            await self.app(scope, receive, send)
+
+
+async def deadline_handler(request: Request, exc: DeadlineExceeded) -> JSONResponse:
+    """
+    DeadlineExceeded → 504. 앱에서 add_exception_handler 로 등록한다.
+    """
+    return JSONResponse(
+        status_code=504,
+        content={"detail": "응답 생성이 제한 시간 안에 끝나지 않았습니다. 잠시 후 다시 시도해주세요.", "stage": exc.stage},
+    )
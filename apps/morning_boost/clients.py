@@ -0,0 +1,103 @@
+# apps/morning_boost/clients.py
+"""
+외부 SDK 클라이언트 공유 레지스트리.
+
+워커가 빨리 뜨도록 import 시점에는 아무것도 만들지 않는다.
+- openai SDK 는 import 만 0.5초 가량 걸려서, 처음 쓸 때 import + 생성
+- .env 도 처음 필요할 때 한 번만 읽는다
+- AsyncOpenAI 는 만들어진 이벤트 루프에 묶이므로 루프마다 따로 둔다
+  (스크립트에서 asyncio.run 을 여러 번 불러도 "Event loop is closed" 가 나지 않게)
+- 429 응답은 httpx hook 으로 openai_limiter 에 알리고, SDK 재시도 횟수는 openai_limits.max_retries
+
+morning_boost / stt_diary 모두 여기서 클라이언트를 받아 쓴다.
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import TYPE_CHECKING, Optional
+
+from apps.morning_boost.openai_limiter import async_rate_limit_hook, load_limits_config, rate_limit_hook
+from apps.morning_boost.utils import PROJECT_ROOT
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
+
+_lock = threading.RLock()
+_env_loaded = False
+_openai: Optional["OpenAI"] = None
+# 이벤트 루프 → AsyncOpenAI. 루프가 사라지면 항목도 같이 사라진다
+_async_openai: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+
+
+def load_env() -> None:
+    """
+    프로젝트 루트의 .env 를 한 번만 읽는다. (이미 있는 환경 변수는 덮어쓰지 않음)
+    """
+    global _env_loaded
+    if _env_loaded:
+        return
+    with _lock:
+        if not _env_loaded:
+            from dotenv import load_dotenv
+
+            load_dotenv(PROJECT_ROOT / ".env")
+            _env_loaded = True
+
+
+def _max_retries() -> int:
+    # Retry-After 를 지키며 429/5xx 를 재시도하는 건 SDK 에 맡긴다
+    return int(load_limits_config()["max_retries"])
+
+
+def get_openai_client() -> "OpenAI":
+    """
+    동기 OpenAI 클라이언트 (프로세스 전역, 스레드 간 공유).
+    """
+    global _openai
+    if _openai is None:
+        with _lock:
+            if _openai is None:
+                load_env()
+                from openai import DefaultHttpxClient, OpenAI
+
+                _openai = OpenAI(
+                    max_retries=_max_retries(),
+                    http_client=DefaultHttpxClient(event_hooks={"response": [rate_limit_hook]}),
+                )
+    return _openai
+
+
+def get_async_openai_client() -> "AsyncOpenAI":
+    """
+    현재 이벤트 루프용 AsyncOpenAI 클라이언트.
+    같은 루프 안에서는 하나를 재사용해서 커넥션 풀을 공유한다.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_openai.get(loop)
+    if client is None:
+        with _lock:
+            client = _async_openai.get(loop)
+            if client is None:
+                load_env()
+                from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+                client = AsyncOpenAI(
+                    max_retries=_max_retries(),
+                    http_client=DefaultAsyncHttpxClient(event_hooks={"response": [async_rate_limit_hook]}),
+                )
+                _async_openai[loop] = client
+    return client
+
+
+def preload_clients() -> None:
+    """
+    무거운 SDK import 와 클라이언트 생성을 미리 해 둔다.
+    lifespan 에서 백그라운드 스레드로 불러서, /health 는 바로 응답하고
+    첫 실제 요청은 import 비용을 내지 않게 한다.
+    """
+    try:
+        get_openai_client()
+    except Exception as e:
+        # 키가 없는 등 실패해도 서버 기동은 막지 않는다 (실제 호출 때 다시 에러가 남)
+        print("[clients] preload failed:", repr(e))
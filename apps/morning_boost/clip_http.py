@@ -0,0 +1,191 @@
+# apps/morning_boost/clip_http.py
+"""
+생성된 음성 파일 HTTP 캐시 / 부분 전송.
+
+- ETag        : 파일 내용 해시 (같은 음성이면 경로/mtime 이 달라도 같은 ETag)
+- Cache-Control: 정적 URL(/static/morning_boost/...) 중 파일명에 uuid / 내용 해시가 들어간 것만 immutable.
+                같은 이름으로 다시 써지는 파일(prerender 의 {user}_{YYYYMMDD}.mp3, 풀의 {date}-v{i}-...)과
+                /boost 응답은 저장은 하되 매번 ETag 로 재검증(no-cache)
+- If-None-Match / If-Modified-Since → 304 (GET / HEAD)
+- Range(단일 → 206, 여러 개 → 206 multipart/byteranges), If-Range 는 Starlette FileResponse 가 처리한다.
+  ETag 만 내용 해시로 바꿔 끼우므로 If-Range 비교도 내용 해시 기준이 된다.
+
+설정: configs/morning_boost.yaml 의 clip_http 섹션.
+"""
+
+import hashlib
+import os
+import re
+import stat
+import threading
+from collections import OrderedDict
+from email.utils import parsedate
+from typing import Any, Dict, Optional, Tuple, Union
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Receive, Scope, Send
+
+from apps.morning_boost.utils import load_section
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+DEFAULT_CLIP_HTTP_CONFIG: Dict[str, Any] = {
+    "static_cache_control": "public, max-age=31536000, immutable",   # 이름이 내용마다 다른 파일
+    "static_mutable_cache_control": "public, no-cache",               # 같은 이름으로 다시 써지는 파일
+    "response_cache_control": "private, no-cache",
+    "etag_cache_size": 4096,   # 파일 해시를 기억해 둘 개수 (매 요청마다 파일 전체를 읽지 않도록)
+}
+
+_HASH_CHUNK = 1024 * 1024
+
+# 파일 이름(확장자 뺀)이 uuid4 hex 로 끝나거나(new_clip_path: {user}_{uuid}) 통째로 해시(32자 이상 hex)면 내용 불변
+_IMMUTABLE_STEM = re.compile(r"(?:^|_)[0-9a-f]{32}$|^[0-9a-f]{32,}$")
+
+_etag_lock = threading.Lock()
+_etags: "OrderedDict[Tuple[str, int, int, int], str]" = OrderedDict()
+
+_config: Optional[Dict[str, Any]] = None
+
+
+def load_clip_http_config() -> Dict[str, Any]:
+    return load_section("clip_http", DEFAULT_CLIP_HTTP_CONFIG)
+
+
+def get_clip_http_config() -> Dict[str, Any]:
+    """
+    요청마다 yaml 을 읽지 않도록 처음 한 번만 읽어 둔다.
+    """
+    global _config
+    if _config is None:
+        _config = load_clip_http_config()
+    return _config
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_etag(path: PathLike, stat_result: Optional[os.stat_result] = None) -> str:
+    """
+    파일 내용 해시로 만든 강한 ETag (따옴표 포함).
+    (경로, inode, 크기, mtime) 이 같으면 다시 읽지 않는다. 파일이 바뀌면(os.replace 포함) 키가 달라진다.
+    """
+    path = os.fspath(path)
+    st = stat_result or os.stat(path)
+    key = (path, st.st_ino, st.st_size, st.st_mtime_ns)
+    with _etag_lock:
+        etag = _etags.get(key)
+        if etag is not None:
+            _etags.move_to_end(key)
+            return etag
+
+    etag = f'"{_hash_file(path)}"'
+    with _etag_lock:
+        _etags[key] = etag
+        limit = int(get_clip_http_config()["etag_cache_size"])
+        while len(_etags) > limit:
+            _etags.popitem(last=False)
+    return etag
+
+
+def is_immutable_name(path: PathLike) -> bool:
+    """
+    이 이름의 파일 내용이 절대 안 바뀌는지 (uuid / 내용 해시가 들어간 이름).
+    """
+    stem = os.path.basename(os.fspath(path)).split(".", 1)[0]
+    return _IMMUTABLE_STEM.search(stem) is not None
+
+
+def is_not_modified(request_headers: Headers, response_headers: Headers) -> bool:
+    """
+    If-None-Match 가 있으면 그것만 본다 (약한 비교, * 허용). 없으면 If-Modified-Since.
+    """
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match:
+        if if_none_match.strip() == "*":
+            return True
+        etag = response_headers["etag"]
+        return etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+
+    if_modified_since = parsedate(request_headers.get("if-modified-since", ""))
+    last_modified = parsedate(response_headers.get("last-modified", ""))
+    return bool(if_modified_since and last_modified and if_modified_since >= last_modified)
+
+
+class ClipFileResponse(FileResponse):
+    """
+    FileResponse + 내용 해시 ETag / Cache-Control / 304.
+    Range 는 GET(HEAD) 에서만 따른다 (POST /boost/from-json 에 Range 가 붙어 와도 전체 응답).
+    """
+
+    def __init__(self, path: PathLike, cache_control: str, **kwargs: Any) -> None:
+        super().__init__(path, **kwargs)
+        self.headers["cache-control"] = cache_control
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        stat_result = self.stat_result
+        if stat_result is None:
+            try:
+                stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+            except FileNotFoundError:
+                raise RuntimeError(f"File at path {self.path} does not exist.")
+            if not stat.S_ISREG(stat_result.st_mode):
+                raise RuntimeError(f"File at path {self.path} is not a file.")
+
+        # 해시 계산(첫 요청)은 파일을 다 읽으므로 스레드에서
+        self.headers["etag"] = await anyio.to_thread.run_sync(content_etag, self.path, stat_result)
+        self.stat_result = stat_result
+        self.set_stat_headers(stat_result)
+
+        method = scope["method"].upper() if scope["type"] == "http" else ""
+        if method in ("GET", "HEAD"):
+            if self.status_code == 200 and is_not_modified(Headers(scope=scope), self.headers):
+                not_modified: Response = NotModifiedResponse(self.headers)
+                await not_modified(scope, receive, send)
+                if self.background is not None:
+                    await self.background()
+                return
+        elif scope["type"] == "http":
+            scope = dict(scope, headers=[(k, v) for k, v in scope["headers"] if k != b"range"])
+
+        await super().__call__(scope, receive, send)
+
+
+class ClipStaticFiles(StaticFiles):
+    """
+    /static/morning_boost 마운트용 StaticFiles. 304 판단을 ClipFileResponse 에 맡긴다.
+    Cache-Control 은 파일 이름으로 고른다: uuid / 해시 이름이면 immutable, 아니면 no-cache + ETag 재검증.
+    """
+
+    def __init__(
+        self,
+        *,
+        cache_control: Optional[str] = None,
+        mutable_cache_control: Optional[str] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        cfg = get_clip_http_config()
+        self.cache_control = cache_control or cfg["static_cache_control"]
+        self.mutable_cache_control = mutable_cache_control or cfg["static_mutable_cache_control"]
+
+    def file_response(
+        self,
+        full_path: PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        return ClipFileResponse(
+            full_path,
+            cache_control=self.cache_control if is_immutable_name(full_path) else self.mutable_cache_control,
+            status_code=status_code,
+            stat_result=stat_result,
+        )
@@ -0,0 +1,237 @@
+# apps/morning_boost/diary_cache.py
+"""
+백엔드 최신 일기 조회 캐시 (사용자별, 프로세스 내).
+
+"최신 일기"는 하루에 몇 번 안 바뀌는데 /boost 마다 백엔드를 불렀다.
+- TTL: ttl_seconds 동안은 백엔드를 부르지 않는다
+- 만료 후: 백엔드가 ETag 를 주면 If-None-Match 로 다시 확인 → 304 면 본문 없이 TTL 만 연장
+- 일기 없음(not_found)도 negative_ttl_seconds 동안 기억 (아침마다 일기 없는 사용자를 반복 조회하지 않게)
+- 백엔드 장애(error)는 "일기 없음"으로 캐시하지 않고, 만료된 지 stale_if_error_seconds 안 된 값이 있으면 그걸 쓴다.
+  그런 값도 없으면 DiaryUnavailable 을 올린다 (None = 일기 없음 과 섞이지 않게)
+- 같은 사용자 동시 조회는 한 번만 (single-flight)
+- prefetch: 아침 작업이 사용자 목록을 미리 채워 둘 때. 캐시는 프로세스마다 따로라서 prefetch 를 실행한
+  프로세스만 따뜻해진다 (uvicorn 워커 여러 개 / 작업 큐 워커 프로세스는 각자 다시 조회).
+  prerender 는 같은 프로세스에서 prefetch 후 렌더하므로 그대로 효과가 있다.
+
+설정: configs/morning_boost.yaml 의 diary_cache 섹션. 상태: /boost/cache-stats 의 diary, /metrics 의 maumon_diary_cache_total
+"""
+
+import asyncio
+import copy
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from apps.morning_boost.metrics import DIARY_CACHE_TOTAL
+from apps.morning_boost.singleflight import SingleFlight
+from apps.morning_boost.utils import load_section
+
+DEFAULT_DIARY_CACHE_CONFIG: Dict[str, Any] = {
+    "enabled": True,
+    "ttl_seconds": 300,             # 일기가 있는 사용자
+    "negative_ttl_seconds": 60,     # 일기 없는 사용자
+    "stale_if_error_seconds": 3600, # 백엔드 장애 때 만료된 값을 이만큼까지는 대신 씀
+    "max_entries": 50000,           # 넘으면 가장 오래 안 쓴 사용자부터 버림
+    "prefetch_concurrency": 16,     # prefetch 때 동시에 보낼 백엔드 요청 수
+    "prefetch_max_users": 10000,    # POST /boost/diaries/prefetch 한 번에 받을 최대 사용자 수
+}
+
+# 백엔드 조회 결과 분류
+OK = "ok"                       # 일기 있음 (data)
+NOT_MODIFIED = "not_modified"   # 304, 가지고 있던 값 그대로
+NOT_FOUND = "not_found"         # 일기 없음
+ERROR = "error"                 # 네트워크 오류 / 5xx / 알 수 없는 응답
+
+
+class DiaryUnavailable(Exception):
+    """
+    백엔드 장애로 최신 일기를 확인하지 못했고, 대신 쓸 직전 값도 없음.
+    "일기 없음"(None)과 달리 풀 음성 / 일기 없는 멘트로 대신하면 안 된다.
+    """
+
+    def __init__(self, user_id: str):
+        super().__init__(f"latest diary unavailable for {user_id!r}")
+        self.user_id = user_id
+
+
+@dataclass
+class DiaryLookup:
+    status: str
+    data: Optional[Dict[str, Any]] = None
+    etag: Optional[str] = None
+
+
+# fetch(user_id, etag) → DiaryLookup. etag 를 주면 If-None-Match 로 보낸다
+DiaryFetcher = Callable[[str, Optional[str]], Awaitable[DiaryLookup]]
+
+
+@dataclass
+class _Entry:
+    data: Optional[Dict[str, Any]]
+    etag: Optional[str]
+    expires_at: float
+
+
+def load_diary_cache_config() -> Dict[str, Any]:
+    return load_section("diary_cache", DEFAULT_DIARY_CACHE_CONFIG)
+
+
+def get_diary_cache_config() -> Dict[str, Any]:
+    """
+    요청마다 yaml 을 읽지 않도록 처음 한 번만 읽어 둔다.
+    """
+    global _config
+    if _config is None:
+        _config = load_diary_cache_config()
+    return _config
+
+
+class DiaryCache:
+    def __init__(
+        self,
+        ttl_seconds: float = 300,
+        negative_ttl_seconds: float = 60,
+        stale_if_error_seconds: float = 3600,
+        max_entries: int = 50000,
+    ):
+        self.ttl = float(ttl_seconds)
+        self.negative_ttl = float(negative_ttl_seconds)
+        self.stale_if_error = float(stale_if_error_seconds)
+        self.max_entries = max(1, int(max_entries))
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._flight = SingleFlight("diary")
+        # outcome 별 횟수 (hit / negative_hit / coalesced / miss / revalidated / stale / error)
+        self.outcomes: Dict[str, int] = {}
+
+    def _count(self, outcome: str) -> str:
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        DIARY_CACHE_TOTAL.inc(outcome)
+        return outcome
+
+    async def get(self, user_id: str, fetch: DiaryFetcher) -> Optional[Dict[str, Any]]:
+        """
+        캐시에 살아 있으면 바로, 아니면 백엔드 조회(만료된 값에 ETag 가 있으면 재검증).
+        호출한 쪽이 고쳐도 캐시가 안 바뀌도록 복사본을 돌려준다. 일기 없음이면 None.
+        백엔드 장애인데 대신 쓸 값이 없으면 DiaryUnavailable.
+        """
+        entry = self._entries.get(user_id)
+        if entry is not None and time.monotonic() < entry.expires_at:
+            self._entries.move_to_end(user_id)
+            self._count("hit" if entry.data is not None else "negative_hit")
+            return copy.deepcopy(entry.data)
+        if self._flight.in_flight(user_id):
+            # 같은 사용자 조회가 이미 진행 중 → 그 결과를 같이 받는다 (백엔드 호출 없음)
+            self._count("coalesced")
+        outcome, data = await self._flight.do(user_id, lambda: self._refresh(user_id, fetch))
+        if outcome == "error":
+            raise DiaryUnavailable(user_id)
+        return copy.deepcopy(data)
+
+    async def _refresh(self, user_id: str, fetch: DiaryFetcher) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        백엔드 조회 후 캐시 갱신. (outcome, data) 반환.
+        """
+        entry = self._entries.get(user_id)
+        etag = entry.etag if entry is not None and entry.data is not None else None
+        result = await fetch(user_id, etag)
+        now = time.monotonic()
+
+        if result.status == NOT_MODIFIED and entry is not None:
+            entry.expires_at = now + self.ttl
+            self._entries.move_to_end(user_id)
+            return self._count("revalidated"), entry.data
+        if result.status == OK:
+            self._store(user_id, _Entry(result.data, result.etag, now + self.ttl))
+            return self._count("miss"), result.data
+        if result.status == NOT_FOUND:
+            self._store(user_id, _Entry(None, None, now + self.negative_ttl))
+            return self._count("miss"), None
+
+        # 장애: "일기 없음"으로 기억하지 않는다. 조금 전까지 맞던 값이 있으면 그걸로
+        if entry is not None and entry.data is not None and now < entry.expires_at + self.stale_if_error:
+            return self._count("stale"), entry.data
+        return self._count("error"), None
+
+    def _store(self, user_id: str, entry: _Entry) -> None:
+        self._entries[user_id] = entry
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def fresh(self, user_id: str) -> bool:
+        entry = self._entries.get(user_id)
+        return entry is not None and time.monotonic() < entry.expires_at
+
+    async def prefetch(self, user_ids: Iterable[str], fetch: DiaryFetcher, concurrency: int = 16) -> Dict[str, int]:
+        """
+        user_ids 를 미리 조회해서 채운다 (아직 살아 있는 사용자는 건너뜀).
+        반환: {"fetched": n, "skipped": n, "with_diary": n, "without_diary": n, "errors": n}
+        """
+        report = {"fetched": 0, "skipped": 0, "with_diary": 0, "without_diary": 0, "errors": 0}
+        slots = asyncio.Semaphore(max(1, int(concurrency)))
+
+        async def one(user_id: str) -> None:
+            if self.fresh(user_id):
+                report["skipped"] += 1
+                return
+            async with slots:
+                outcome, data = await self._flight.do(user_id, lambda: self._refresh(user_id, fetch))
+            report["fetched"] += 1
+            if outcome in ("error", "stale"):
+                report["errors"] += 1
+            elif data is not None:
+                report["with_diary"] += 1
+            else:
+                report["without_diary"] += 1
+
+        await asyncio.gather(*(one(u) for u in dict.fromkeys(user_ids)))
+        return report
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = sum(self.outcomes.values())
+        served = sum(self.outcomes.get(k, 0) for k in ("hit", "negative_hit", "coalesced"))
+        return {
+            "entries": len(self._entries),
+            "ttl_seconds": self.ttl,
+            "negative_ttl_seconds": self.negative_ttl,
+            **{
+                k: self.outcomes.get(k, 0)
+                for k in ("hit", "negative_hit", "coalesced", "miss", "revalidated", "stale", "error")
+            },
+            # 백엔드를 부르지 않고 끝난 조회 비율 (304 재검증은 호출이 있었으니 제외)
+            "hit_rate": round(served / lookups, 4) if lookups else 0.0,
+        }
+
+
+_config: Optional[Dict[str, Any]] = None
+_cache: Optional[DiaryCache] = None
+_cache_initialized = False
+
+
+def get_diary_cache() -> Optional[DiaryCache]:
+    """
+    configs/morning_boost.yaml 의 diary_cache 섹션으로 만든 전역 캐시.
+    enabled: false 면 None.
+    """
+    global _cache, _cache_initialized
+    if not _cache_initialized:
+        cfg = get_diary_cache_config()
+        if cfg["enabled"]:
+            _cache = DiaryCache(
+                cfg["ttl_seconds"],
+                cfg["negative_ttl_seconds"],
+                cfg["stale_if_error_seconds"],
+                cfg["max_entries"],
+            )
+        _cache_initialized = True
+    return _cache
+
+
+def set_diary_cache(cache: Optional[DiaryCache]) -> None:
+    """
+    테스트/벤치에서 캐시를 바꿔 끼우거나 끌 때 (None).
+    """
+    global _cache, _cache_initialized
+    _cache = cache
+    _cache_initialized = True
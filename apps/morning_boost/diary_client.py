@@ -0,0 +1,176 @@
+# apps/morning_boost/diary_client.py
+"""
+백엔드(Spring Boot) 일기 조회.
+
+라우터/배치 작업이 앱 엔트리 포인트(main.py) 전체를 import 하지 않고도
+일기를 가져올 수 있도록 main.py 에서 분리했다.
+
+비동기 조회는 사용자별 캐시(diary_cache.py: TTL / ETag 재검증 / 일기 없음 기억)를 거친다.
+응답은 ok / not_found(일기 없음) / error(장애) 로 나눠서 기록하고, 장애는 "일기 없음"으로 캐시하지 않는다.
+fetch_latest_diary(_async) 는 일기 없음이면 None, 장애면 DiaryUnavailable 을 올린다.
+앱은 diary_unavailable_handler 로 502 를 돌려주고, 작업 큐 / prerender 는 실패로 기록해서 다시 시도한다.
+"""
+
+import os
+from typing import Any, Dict, Iterable, Optional
+
+import httpx
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from apps.morning_boost.diary_cache import (
+    ERROR,
+    NOT_FOUND,
+    NOT_MODIFIED,
+    OK,
+    DiaryLookup,
+    DiaryUnavailable,
+    get_diary_cache,
+    get_diary_cache_config,
+)
+from apps.morning_boost.http_client import get_backend_client
+from apps.morning_boost.metrics import stage
+
+BACKEND_URL = os.getenv("BACKEND_URL", "http://13.209.35.235:8080")
+
+
+def fetch_latest_diary(user_id: str) -> Optional[Dict[str, Any]]:
+    """
+    백엔드(Spring Boot)의 최신 일기 조회 API 호출.
+
+    기대 응답 형식 (예시):
+    {
+        "code": 200,
+        "message": "9월 16일 정보 조회 성공",
+        "data": {
+            "emotion": "happy",
+            "draw": "그림 url",
+            "write_diary": "오늘의 일기를 작성했습니다. 오늘은 이런 저런 일을 했습니다.",
+            "file_summation": [
+                "느좋 카페 방문",
+                "페스티벌 관람",
+                "성적 A+"
+            ],
+            "ai_reply": "대충 ai 답장",
+            "ai_draw_reply": "그림 일기 ai 답장"
+        }
+    }
+
+    :return:
+        - 성공 시: data 블록(dict)을 그대로 반환
+        - 일기 없음: None
+    :raises DiaryUnavailable: 네트워크 오류 / 5xx / 알 수 없는 응답 (일기 없음으로 치면 안 됨)
+    """
+    with stage("backend_fetch") as s:
+        try:
+            resp = httpx.get(
+                f"{BACKEND_URL}/api/diary/latest",
+                params={"user_id": user_id},
+                timeout=5,
+            )
+            result = _classify_diary_response(resp)
+
+        except Exception as e:
+            print("[fetch_latest_diary ERROR]", repr(e))
+            result = DiaryLookup(ERROR)
+
+        s.outcome = result.status
+    if result.status == ERROR:
+        raise DiaryUnavailable(user_id)
+    return result.data
+
+
+async def fetch_latest_diary_async(user_id: str) -> Optional[Dict[str, Any]]:
+    """
+    fetch_latest_diary 의 비동기 버전.
+    공유 httpx.AsyncClient(http_client 모듈)를 사용해서 이벤트 루프를 막지 않고,
+    요청마다 TCP 핸드셰이크를 새로 하지 않는다.
+    diary_cache 가 켜져 있으면 캐시에 살아 있는 값은 백엔드를 부르지 않는다.
+    응답 형식/반환값/예외는 fetch_latest_diary 와 동일. (장애여도 캐시에 직전 값이 있으면 그 값)
+    """
+    cache = get_diary_cache()
+    if cache is None:
+        result = await lookup_latest_diary_async(user_id)
+        if result.status == ERROR:
+            raise DiaryUnavailable(user_id)
+        return result.data
+    return await cache.get(user_id, lookup_latest_diary_async)
+
+
+async def prefetch_latest_diaries(user_ids: Iterable[str], concurrency: Optional[int] = None) -> Dict[str, int]:
+    """
+    아침 작업 등에서 사용자 목록의 최신 일기를 미리 캐시에 채운다.
+    캐시는 프로세스마다 따로라서 이 함수를 부른 프로세스만 채워진다 (다른 앱 워커 / 작업 큐 워커는 그대로).
+    반환: {"fetched", "skipped", "with_diary", "without_diary", "errors"} 개수
+    """
+    user_ids = list(user_ids)
+    cache = get_diary_cache()
+    if cache is None:
+        return {"fetched": 0, "skipped": len(user_ids), "with_diary": 0, "without_diary": 0, "errors": 0}
+    concurrency = concurrency or int(get_diary_cache_config()["prefetch_concurrency"])
+    return await cache.prefetch(user_ids, lookup_latest_diary_async, concurrency)
+
+
+async def lookup_latest_diary_async(user_id: str, etag: Optional[str] = None) -> DiaryLookup:
+    """
+    캐시 없이 백엔드를 한 번 부른다. etag 를 주면 If-None-Match 로 보내서 바뀌지 않았으면 304.
+    """
+    with stage("backend_fetch") as s:
+        try:
+            # 앱 수명 동안 공유하는 커넥션 풀 사용 (keep-alive)
+            resp = await get_backend_client().get(
+                f"{BACKEND_URL}/api/diary/latest",
+                params={"user_id": user_id},
+                headers={"If-None-Match": etag} if etag else None,
+            )
+            result = _classify_diary_response(resp)
+
+        except Exception as e:
+            print("[fetch_latest_diary_async ERROR]", repr(e))
+            result = DiaryLookup(ERROR)
+
+        s.outcome = result.status
+        return result
+
+
+def _classify_diary_response(resp: httpx.Response) -> DiaryLookup:
+    """
+    백엔드 응답을 ok / not_modified / not_found / error 로 나누고 data 블록을 꺼낸다. (동기/비동기 공용)
+    - HTTP 404, 또는 body code 4xx → 일기 없음
+    - 그 외 200 이 아닌 응답 / 읽을 수 없는 본문 / body code 5xx → 장애
+    """
+    if resp.status_code == 304:
+        return DiaryLookup(NOT_MODIFIED, etag=resp.headers.get("etag"))
+    if resp.status_code == 404:
+        return DiaryLookup(NOT_FOUND)
+    if resp.status_code != 200:
+        print("[fetch_latest_diary] status_code:", resp.status_code)
+        return DiaryLookup(ERROR)
+
+    try:
+        body = resp.json()
+    except ValueError as e:
+        print("[fetch_latest_diary] invalid body:", repr(e))
+        return DiaryLookup(ERROR)
+
+    code = body.get("code")
+    if code != 200:
+        print("[fetch_latest_diary] response code:", code)
+        return DiaryLookup(NOT_FOUND if isinstance(code, int) and 400 <= code < 500 else ERROR)
+
+    data = body.get("data") or {}
+    # file_summation이 null/undefined일 수도 있으니 안전하게 처리
+    if data.get("file_summation") is None:
+        data["file_summation"] = []
+
+    return DiaryLookup(OK, data, resp.headers.get("etag"))
+
+
+async def diary_unavailable_handler(request: Request, exc: DiaryUnavailable) -> JSONResponse:
+    """
+    DiaryUnavailable → 502. 앱에서 add_exception_handler 로 등록한다.
+    """
+    return JSONResponse(
+        status_code=502,
+        content={"detail": "일기 서버에서 최신 일기를 가져오지 못했습니다. 잠시 후 다시 시도해주세요."},
+    )
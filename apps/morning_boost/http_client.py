@@ -0,0 +1,118 @@
+# apps/morning_boost/http_client.py
+"""
+백엔드(Spring Boot) 호출용 공유 HTTP 클라이언트.
+
+요청마다 새 커넥션을 여는 대신 앱 수명 동안 하나의 httpx.AsyncClient 를 재사용한다.
+- keep-alive + 커넥션 풀 상한 (configs/morning_boost.yaml 의 backend_http 섹션)
+- 선택적 HTTP/2 (h2 패키지가 있을 때만)
+- 앱 lifespan(lifespan.py) 에서 시작/종료
+- 풀 상태(open/idle/waiting) 조회
+"""
+
+from typing import Any, Dict, Optional
+
+import httpx
+
+from apps.morning_boost.utils import load_section
+
+DEFAULT_HTTP_CONFIG: Dict[str, Any] = {
+    "max_connections": 50,
+    "max_keepalive_connections": 20,
+    "keepalive_expiry": 30.0,
+    "timeout": 5.0,
+    "pool_timeout": 10.0,
+    "http2": False,
+}
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def load_http_config() -> Dict[str, Any]:
+    return load_section("backend_http", DEFAULT_HTTP_CONFIG)
+
+
+def _build_client(cfg: Dict[str, Any]) -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=cfg["max_connections"],
+        max_keepalive_connections=cfg["max_keepalive_connections"],
+        keepalive_expiry=cfg["keepalive_expiry"],
+    )
+    timeout = httpx.Timeout(cfg["timeout"], pool=cfg["pool_timeout"])
+
+    http2 = bool(cfg["http2"])
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            print("[http_client] h2 패키지가 없어 HTTP/1.1 로 동작합니다. (pip install httpx[http2])")
+            http2 = False
+
+    return httpx.AsyncClient(limits=limits, timeout=timeout, http2=http2)
+
+
+def get_backend_client() -> httpx.AsyncClient:
+    """
+    앱 전역 공유 클라이언트 반환.
+    lifespan 밖(스크립트 등)에서 불려도 쓸 수 있도록 없으면 만든다.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client(load_http_config())
+    return _client
+
+
+async def startup_backend_client() -> None:
+    get_backend_client()
+
+
+async def shutdown_backend_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def backend_pool_stats() -> Dict[str, Any]:
+    """
+    커넥션 풀 상태.
+    - open    : 열려 있는 커넥션 수
+    - idle    : keep-alive 로 쉬고 있는 커넥션 수
+    - active  : 요청을 처리 중인 커넥션 수
+    - waiting : 커넥션이 나기를 기다리는 요청 수
+    - introspected : 위 숫자를 실제로 읽었는지. httpx / httpcore 내부 구조가 바뀌어 못 읽으면 False 이고 숫자는 0
+    """
+    cfg = load_http_config()
+    stats: Dict[str, Any] = {
+        "max_connections": cfg["max_connections"],
+        "max_keepalive_connections": cfg["max_keepalive_connections"],
+        "open": 0,
+        "idle": 0,
+        "active": 0,
+        "waiting": 0,
+        "introspected": False,
+    }
+    if _client is None or _client.is_closed:
+        return stats
+
+    # httpx 공개 API 에는 풀 상태가 없어서 httpcore 풀을 직접 들여다본다.
+    # 내부 속성이라 버전이 바뀌면 없어질 수 있으므로 하나라도 없으면 조용히 0 으로 둔다.
+    pool = getattr(getattr(_client, "_transport", None), "_pool", None)
+    connections = getattr(pool, "connections", None)
+    if connections is None:
+        return stats
+    try:
+        connections = list(connections)
+        open_ = sum(1 for c in connections if not _call(c, "is_closed", True))
+        idle = sum(1 for c in connections if _call(c, "is_idle", False))
+        waiting = sum(1 for r in list(getattr(pool, "_requests", None) or ()) if _call(r, "is_queued", False))
+    except Exception as e:
+        print("[http_client] pool stats unavailable:", repr(e))
+        return stats
+
+    stats.update(open=open_, idle=idle, active=max(0, open_ - idle), waiting=waiting, introspected=True)
+    return stats
+
+
+def _call(obj: Any, name: str, default: bool) -> bool:
+    method = getattr(obj, name, None)
+    return bool(method()) if callable(method) else default
@@ -0,0 +1,391 @@
+# apps/morning_boost/job_queue.py
+"""
+응원 음성 생성 작업 큐 (SQLite, 로컬 디스크).
+
+/boost?job=true, /boost/from-json?job=true 는 음성을 기다리지 않고 작업만 넣은 뒤 job_id 를 바로 돌려준다.
+실제 생성(LLM → TTS → 파일)은 별도 프로세스 워커(job_worker.py)가 이 큐에서 꺼내 처리한다.
+
+- 저장: data/jobs/boost_jobs.sqlite3 (WAL). API 프로세스와 워커 프로세스가 같은 파일을 연다
+- 꺼내기: UPDATE ... RETURNING 한 문장으로 "queued → running" 을 바꾸므로 여러 프로세스가 동시에 꺼내도 겹치지 않는다
+- 리스(lease): 워커는 작업을 잡는 동안 lease_until 을 주기적으로 늘린다.
+  워커가 죽으면(재시작/OOM/kill) 리스가 끝난 작업을 다른 워커가 다시 가져간다 → 작업이 사라지지 않음
+- 재시도: 실패하면 max_attempts 까지 retry_delay_seconds 뒤에 다시. 넘으면 failed
+- 끝난 작업은 retention_hours 가 지나면 지운다 (음성 파일 자체는 retention.py 가 정리)
+
+설정: configs/morning_boost.yaml 의 job_queue 섹션.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from apps.morning_boost.metrics import (
+    JOB_QUEUE_COMPLETED_PER_MINUTE,
+    JOB_QUEUE_JOBS,
+    JOB_QUEUE_LATENCY_SECONDS,
+    JOB_QUEUE_OLDEST_AGE_SECONDS,
+)
+from apps.morning_boost.utils import PROJECT_ROOT, load_section
+
+DEFAULT_JOB_QUEUE_CONFIG: Dict[str, Any] = {
+    "enabled": True,
+    "path": "data/jobs/boost_jobs.sqlite3",   # 프로젝트 루트 기준 (절대 경로도 가능)
+    "workers": 0,                  # 앱 프로세스마다 같이 띄울 워커 프로세스 수 (0: python -m apps.morning_boost.job_worker 로 따로)
+    "concurrency": 4,              # 워커 프로세스 하나가 동시에 처리할 작업 수
+    "lease_seconds": 30.0,         # 이 시간 동안 소식이 없는 작업은 워커가 죽은 것으로 보고 다시 큐로
+    "max_attempts": 3,
+    "retry_delay_seconds": 5.0,
+    "poll_interval": 0.25,         # 큐가 비었을 때 워커가 다시 볼 간격
+    "long_poll_max_seconds": 30.0, # GET /boost/jobs/{id}?wait= 상한
+    "retention_hours": 24,         # 끝난(done / failed) 작업 기록 보관 시간
+    "stats_window_seconds": 60,    # 처리량 / 지연 통계 구간
+    "metrics_refresh_seconds": 15, # /metrics 게이지를 다시 채우는 간격 (lifespan 의 refresher)
+}
+
+TERMINAL_STATUSES = ("done", "failed")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id           TEXT PRIMARY KEY,
+    kind         TEXT NOT NULL,
+    payload      TEXT NOT NULL,
+    status       TEXT NOT NULL,           -- queued | running | done | failed
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    created_at   REAL NOT NULL,
+    available_at REAL NOT NULL,           -- queued 작업을 꺼낼 수 있는 시각 (재시도 지연)
+    started_at   REAL,
+    finished_at  REAL,
+    lease_until  REAL,
+    worker       TEXT,
+    result       TEXT,
+    error        TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, available_at);
+CREATE INDEX IF NOT EXISTS jobs_lease ON jobs (status, lease_until);
+CREATE INDEX IF NOT EXISTS jobs_finished ON jobs (status, finished_at);
+CREATE TABLE IF NOT EXISTS workers (
+    name       TEXT PRIMARY KEY,
+    pid        INTEGER,
+    started_at REAL NOT NULL,
+    seen_at    REAL NOT NULL              -- 워커 heartbeat 마다 갱신 (lease_seconds 안에 갱신된 워커만 살아 있는 것으로 봄)
+);
+"""
+
+_config: Optional[Dict[str, Any]] = None
+_queue: Optional["JobQueue"] = None
+_queue_lock = threading.Lock()
+
+
+def load_job_queue_config() -> Dict[str, Any]:
+    return load_section("job_queue", DEFAULT_JOB_QUEUE_CONFIG)
+
+
+def get_job_queue_config() -> Dict[str, Any]:
+    global _config
+    if _config is None:
+        _config = load_job_queue_config()
+    return _config
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    payload: Dict[str, Any]
+    attempts: int
+    created_at: float
+
+
+class JobQueue:
+    """
+    SQLite 작업 큐. 프로세스마다 하나씩 만들고, 스레드 간에는 lock 으로 연결 하나를 나눠 쓴다.
+    (asyncio 에서는 asyncio.to_thread 로 부른다)
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        lease_seconds: float = 30.0,
+        max_attempts: int = 3,
+        retry_delay_seconds: float = 5.0,
+    ):
+        self.path = Path(path)
+        self.lease_seconds = float(lease_seconds)
+        self.max_attempts = int(max_attempts)
+        self.retry_delay_seconds = float(retry_delay_seconds)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # autocommit: 문장 하나가 곧 트랜잭션 (꺼내기는 UPDATE ... RETURNING 한 문장)
+        self._db = sqlite3.connect(str(self.path), timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    @classmethod
+    def from_config(cls, cfg: Optional[Dict[str, Any]] = None) -> "JobQueue":
+        cfg = cfg or get_job_queue_config()
+        path = Path(cfg["path"])
+        if not path.is_absolute():
+            path = PROJECT_ROOT / path
+        return cls(path, cfg["lease_seconds"], cfg["max_attempts"], cfg["retry_delay_seconds"])
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._db.execute(sql, params)
+
+    def _fetchall(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    # ---------- 넣기 / 꺼내기 ----------
+
+    def enqueue(self, kind: str, payload: Dict[str, Any]) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._execute(
+            "INSERT INTO jobs (id, kind, payload, status, created_at, available_at) VALUES (?, ?, ?, 'queued', ?, ?)",
+            (job_id, kind, json.dumps(payload, ensure_ascii=False), now, now),
+        )
+        return job_id
+
+    def claim(self, worker: str) -> Optional[Job]:
+        """
+        꺼낼 수 있는 가장 오래된 작업 하나를 worker 이름으로 잡는다. 없으면 None.
+        """
+        now = time.time()
+        rows = self._fetchall(
+            """
+            UPDATE jobs
+               SET status = 'running', worker = ?, attempts = attempts + 1,
+                   started_at = ?, lease_until = ?
+             WHERE id = (SELECT id FROM jobs
+                          WHERE status = 'queued' AND available_at <= ?
+                          ORDER BY available_at LIMIT 1)
+            RETURNING id, kind, payload, attempts, created_at
+            """,
+            (worker, now, now + self.lease_seconds, now),
+        )
+        if not rows:
+            return None
+        row = rows[0]
+        return Job(row["id"], row["kind"], json.loads(row["payload"]), row["attempts"], row["created_at"])
+
+    def heartbeat(self, job_id: str, worker: str) -> bool:
+        """
+        리스 연장. False 면 이미 다른 워커에게 넘어간 작업 (리스가 끝나서 다시 큐로 갔음).
+        """
+        cur = self._execute(
+            "UPDATE jobs SET lease_until = ? WHERE id = ? AND worker = ? AND status = 'running'",
+            (time.time() + self.lease_seconds, job_id, worker),
+        )
+        return cur.rowcount == 1
+
+    def complete(self, job_id: str, worker: str, result: Dict[str, Any]) -> bool:
+        cur = self._execute(
+            """
+            UPDATE jobs SET status = 'done', result = ?, error = NULL, finished_at = ?, lease_until = NULL
+             WHERE id = ? AND worker = ? AND status = 'running'
+            """,
+            (json.dumps(result, ensure_ascii=False), time.time(), job_id, worker),
+        )
+        return cur.rowcount == 1
+
+    def fail(self, job_id: str, worker: str, error: str, retry: bool = True) -> Optional[str]:
+        """
+        실패 기록. 재시도 횟수가 남았으면 retry_delay_seconds 뒤에 다시 queued, 아니면 failed.
+        바뀐 상태를 돌려준다 (이미 다른 워커에게 넘어갔으면 None).
+        """
+        now = time.time()
+        rows = self._fetchall(
+            """
+            UPDATE jobs
+               SET status = CASE WHEN ? AND attempts < ? THEN 'queued' ELSE 'failed' END,
+                   available_at = ?, finished_at = CASE WHEN ? AND attempts < ? THEN NULL ELSE ? END,
+                   error = ?, lease_until = NULL
+             WHERE id = ? AND worker = ? AND status = 'running'
+            RETURNING status
+            """,
+            (retry, self.max_attempts, now + self.retry_delay_seconds, retry, self.max_attempts, now,
+             error, job_id, worker),
+        )
+        return rows[0]["status"] if rows else None
+
+    def release(self, job_id: str, worker: str, delay: float = 0.0) -> bool:
+        """
+        처리하지 않고 큐로 돌려놓는다 (시도 횟수도 되돌림). 워커 종료 / OpenAI 과부하 때 사용.
+        """
+        cur = self._execute(
+            """
+            UPDATE jobs SET status = 'queued', attempts = attempts - 1, available_at = ?,
+                            worker = NULL, lease_until = NULL
+             WHERE id = ? AND worker = ? AND status = 'running'
+            """,
+            (time.time() + delay, job_id, worker),
+        )
+        return cur.rowcount == 1
+
+    def requeue_expired(self) -> int:
+        """
+        리스가 끝난 running 작업(워커가 죽음)을 다시 queued 로. 시도 횟수를 다 쓴 작업은 failed.
+        """
+        now = time.time()
+        cur = self._execute(
+            """
+            UPDATE jobs
+               SET status = CASE WHEN attempts < ? THEN 'queued' ELSE 'failed' END,
+                   finished_at = CASE WHEN attempts < ? THEN NULL ELSE ? END,
+                   error = 'worker lease expired', available_at = ?, worker = NULL, lease_until = NULL
+             WHERE status = 'running' AND lease_until < ?
+            """,
+            (self.max_attempts, self.max_attempts, now, now, now),
+        )
+        return cur.rowcount
+
+    def prune(self, retention_seconds: float) -> int:
+        cutoff = time.time() - retention_seconds
+        self._execute("DELETE FROM workers WHERE seen_at < ?", (cutoff,))
+        cur = self._execute("DELETE FROM jobs WHERE status IN ('done', 'failed') AND finished_at < ?", (cutoff,))
+        return cur.rowcount
+
+    # ---------- 워커 생존 신호 (API 프로세스에서 워커 수를 볼 수 있게) ----------
+
+    def touch_worker(self, worker: str, pid: int) -> None:
+        now = time.time()
+        self._execute(
+            "INSERT INTO workers (name, pid, started_at, seen_at) VALUES (?, ?, ?, ?)"
+            " ON CONFLICT(name) DO UPDATE SET seen_at = excluded.seen_at",
+            (worker, pid, now, now),
+        )
+
+    def remove_worker(self, worker: str) -> None:
+        self._execute("DELETE FROM workers WHERE name = ?", (worker,))
+
+    # ---------- 조회 ----------
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._fetchall("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        if not rows:
+            return None
+        row = rows[0]
+        info: Dict[str, Any] = {
+            "job_id": row["id"],
+            "kind": row["kind"],
+            "status": row["status"],
+            "attempts": row["attempts"],
+            "created_at": row["created_at"],
+            "started_at": row["started_at"],
+            "finished_at": row["finished_at"],
+        }
+        if row["status"] == "queued":
+            # 내 앞에 기다리는 작업 수 (대략적인 대기 순서)
+            ahead = self._fetchall(
+                "SELECT COUNT(*) AS n FROM jobs WHERE status = 'queued' AND available_at < ?",
+                (row["available_at"],),
+            )
+            info["queue_position"] = ahead[0]["n"]
+        if row["result"]:
+            info["result"] = json.loads(row["result"])
+        if row["error"]:
+            info["error"] = row["error"]
+        return info
+
+    def stats(self, window_seconds: float = 60) -> Dict[str, Any]:
+        """
+        깊이(상태별 개수), 가장 오래 기다린 작업 나이, 최근 window 초 처리량 / 지연, 살아 있는 워커 수.
+        """
+        now = time.time()
+        counts = {status: 0 for status in ("queued", "running", "done", "failed")}
+        for row in self._fetchall("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"):
+            counts[row["status"]] = row["n"]
+        oldest = self._fetchall("SELECT MIN(created_at) AS t FROM jobs WHERE status IN ('queued', 'running')")
+        oldest_queued = self._fetchall("SELECT MIN(created_at) AS t FROM jobs WHERE status = 'queued'")
+        recent = self._fetchall(
+            "SELECT status, finished_at - created_at AS latency FROM jobs"
+            " WHERE status IN ('done', 'failed') AND finished_at >= ?",
+            (now - window_seconds,),
+        )
+        latencies = sorted(row["latency"] for row in recent if row["status"] == "done")
+        workers = self._fetchall("SELECT COUNT(*) AS n FROM workers WHERE seen_at >= ?", (now - self.lease_seconds,))
+
+        def pct(q: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))], 3)
+
+        return {
+            "depth": counts["queued"],
+            "running": counts["running"],
+            "done": counts["done"],
+            "failed": counts["failed"],
+            "oldest_age_s": round(now - oldest[0]["t"], 3) if oldest[0]["t"] else 0.0,
+            "oldest_queued_age_s": round(now - oldest_queued[0]["t"], 3) if oldest_queued[0]["t"] else 0.0,
+            "window_s": window_seconds,
+            "completed_in_window": len(latencies),
+            "failed_in_window": len(recent) - len(latencies),
+            "throughput_per_min": round(len(latencies) * 60 / window_seconds, 2),
+            "latency_p50_s": pct(0.5),
+            "latency_p95_s": pct(0.95),
+            "workers_alive": workers[0]["n"],
+        }
+
+
+def get_job_queue() -> JobQueue:
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = JobQueue.from_config()
+    return _queue
+
+
+def set_job_queue(queue: Optional[JobQueue]) -> None:
+    """
+    테스트/벤치에서 다른 경로의 큐로 바꿔 끼울 때.
+    """
+    global _queue
+    _queue = queue
+
+
+def collect_job_queue_metrics() -> None:
+    """
+    큐 상태를 게이지에 채운다. SQLite 쿼리 여러 개라 이벤트 루프에서 부르지 않고 refresher 가 스레드에서 부른다.
+    """
+    stats = get_job_queue().stats(float(get_job_queue_config()["stats_window_seconds"]))
+    JOB_QUEUE_JOBS.set(stats["depth"], "queued")
+    for status in ("running", "done", "failed"):
+        JOB_QUEUE_JOBS.set(stats[status], status)
+    JOB_QUEUE_OLDEST_AGE_SECONDS.set(stats["oldest_age_s"])
+    JOB_QUEUE_COMPLETED_PER_MINUTE.set(stats["throughput_per_min"])
+    for quantile, key in (("0.5", "latency_p50_s"), ("0.95", "latency_p95_s")):
+        JOB_QUEUE_LATENCY_SECONDS.set(stats[key] or 0.0, quantile)
+
+
+async def run_metrics_refresher(interval_seconds: float) -> None:
+    """
+    interval 마다 collect_job_queue_metrics 를 스레드에서 실행하는 백그라운드 루프.
+    (/metrics 요청은 채워 둔 게이지만 읽는다)
+    """
+    while True:
+        try:
+            await asyncio.to_thread(collect_job_queue_metrics)
+        except Exception as e:
+            print("[job_queue metrics ERROR]", repr(e))
+        await asyncio.sleep(interval_seconds)
+
+
+def start_metrics_refresher() -> Optional[asyncio.Task]:
+    cfg = get_job_queue_config()
+    if not cfg["enabled"]:
+        return None
+    return asyncio.create_task(run_metrics_refresher(float(cfg["metrics_refresh_seconds"])))
@@ -0,0 +1,315 @@
+# apps/morning_boost/job_worker.py
+"""
+응원 음성 작업 큐(job_queue.py) 워커 프로세스.
+
+프로세스마다 이벤트 루프 하나로 작업을 최대 concurrency 개씩 동시에 처리한다.
+- 처리: (user 작업이면 백엔드에서 최신 일기 조회) → LLM 멘트 → TTS 파일 → 결과(audio_url 등) 기록
+- 리스: 처리 중인 작업은 lease_seconds / 3 마다 리스를 늘린다. 리스를 잃으면(다른 워커가 가져감) 그 작업은 취소
+- 실패: OpenAI 과부하(limiter 503)는 시도 횟수를 쓰지 않고 retry_after 뒤로 미루고,
+        형식 오류는 바로 failed, 그 외 예외는 max_attempts 까지 재시도
+- 종료(SIGTERM): 새 작업은 안 꺼내고 처리 중인 작업을 SHUTDOWN_GRACE_SECONDS(10초)까지 기다린 뒤,
+  못 끝낸 작업은 큐로 돌려놓는다. (kill -9 로 죽으면 리스가 끝난 뒤 다른 워커가 가져간다)
+
+워커는 API 서버와 따로 한 번만 띄운다 (프로젝트 루트에서):
+    python -m apps.morning_boost.job_worker --workers 4
+job_queue.workers 를 1 이상으로 두면 앱(main.py / create_app)이 lifespan 에서 그만큼 띄우고, 죽으면 다시 띄운다.
+이건 앱 프로세스마다라서 uvicorn --workers N / gunicorn 으로 띄우면 워커도 N 배가 된다. 그래서 기본은 0
+(앱 프로세스가 하나뿐인 개발 환경용).
+
+워커 프로세스 안의 단계별 메트릭(stage)은 그 프로세스 메모리에만 남는다. 큐 상태는 GET /boost/jobs/stats, /metrics 로 본다.
+"""
+
+from apps.morning_boost.clients import load_env
+
+# diary_client / s3_client 가 import 시점에 환경 변수를 읽으므로 먼저 .env 로드 (spawn 된 프로세스도 이 모듈부터 import)
+load_env()
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import time
+from typing import Any, Dict, List, Optional
+
+from apps.morning_boost.audio_format import AudioFormat
+from apps.morning_boost.call_policy import get_call_policy_config, request_deadline
+from apps.morning_boost.diary_client import fetch_latest_diary_async
+from apps.morning_boost.http_client import shutdown_backend_client
+from apps.morning_boost.job_queue import Job, JobQueue, get_job_queue_config
+from apps.morning_boost.openai_limiter import OpenAIOverloaded
+from apps.morning_boost.router import (
+    _render_boost_file,
+    boost_flight,
+    diary_flight_key,
+    normalize_emotion_for_header,
+)
+from apps.morning_boost.s3_client import iter_file_chunks, make_audio_key, stream_to_s3
+from apps.morning_boost.utils import clip_url
+
+SHUTDOWN_GRACE_SECONDS = 10.0
+PRUNE_INTERVAL_SECONDS = 600.0
+
+
+async def run_boost_job(job: Job) -> Dict[str, Any]:
+    """
+    작업 하나 처리 → 결과 dict (GET /boost/jobs/{id} 의 result).
+    kind = user  : {"user_id", "format", "bitrate", "s3"}            → 백엔드에서 최신 일기 조회
+           diary : {"user_id", "diary", "format", "bitrate", "s3"}   → 받은 일기 그대로
+    """
+    started = time.perf_counter()
+    payload = job.payload
+    user_id = payload.get("user_id") or "anonymous"
+    fmt = AudioFormat(payload.get("format") or "mp3", payload.get("bitrate"))
+    if job.kind == "user":
+        diary = await fetch_latest_diary_async(user_id)
+    elif job.kind == "diary":
+        diary = payload["diary"]
+    else:
+        raise ValueError(f"알 수 없는 작업 종류: {job.kind}")
+
+    # 같은 일기로 동시에 들어온 작업은 프로세스 안에서 한 번만 생성 (라우터와 같은 키)
+    key = diary_flight_key(user_id, diary, fmt) if diary else f"user:{user_id}:{fmt.variant}"
+    out_path = await boost_flight.do(key, lambda: _render_boost_file(user_id, diary, fmt))
+
+    emotion = diary.get("emotion") if diary else None
+    result: Dict[str, Any] = {
+        "user_id": user_id,
+        "audio_url": clip_url(out_path),
+        "format": fmt.variant,
+        "media_type": fmt.media_type,
+        "bytes": out_path.stat().st_size,
+        "diary_used": diary is not None,
+        "emotion": emotion,
+        "emotion_code": normalize_emotion_for_header(emotion),
+    }
+    if payload.get("s3"):
+        # 작업 모드는 응답을 기다리는 사람이 없으니 업로드까지 끝낸 뒤 done
+        s3_key = make_audio_key(user_id, out_path.name)
+        result["s3_url"] = await stream_to_s3(iter_file_chunks(out_path), s3_key, content_type=fmt.media_type)
+    result["elapsed_ms"] = round((time.perf_counter() - started) * 1000)
+    return result
+
+
+async def run_worker(name: str, cfg: Dict[str, Any], stop: asyncio.Event) -> None:
+    """
+    stop 이 set 될 때까지 큐에서 작업을 꺼내 처리하는 루프.
+    """
+    queue = JobQueue.from_config(cfg)
+    slots = asyncio.Semaphore(max(1, int(cfg["concurrency"])))
+    poll_interval = float(cfg["poll_interval"])
+    running: Dict[str, asyncio.Task] = {}
+
+    async def process(job: Job) -> None:
+        try:
+            # 작업 하나의 OpenAI 호출 예산 (요청보다 넉넉하게, call_policy.job_budget_seconds)
+            with request_deadline(float(get_call_policy_config()["job_budget_seconds"])):
+                result = await run_boost_job(job)
+            if not await asyncio.to_thread(queue.complete, job.id, name, result):
+                print("[job_worker] lease lost before completion:", job.id)
+        except asyncio.CancelledError:
+            # 종료 중이거나 리스를 잃음 → 큐로 돌려놓기 (이미 넘어갔으면 아무 일도 안 함)
+            await asyncio.to_thread(queue.release, job.id, name)
+            raise
+        except OpenAIOverloaded as e:
+            await asyncio.to_thread(queue.release, job.id, name, e.retry_after)
+        except (KeyError, TypeError, ValueError) as e:
+            print("[job_worker] invalid job:", job.id, repr(e))
+            await asyncio.to_thread(queue.fail, job.id, name, repr(e), False)
+        except Exception as e:
+            status = await asyncio.to_thread(queue.fail, job.id, name, repr(e))
+            print("[job_worker] job failed:", job.id, f"attempt={job.attempts}", f"→ {status}", repr(e))
+        finally:
+            running.pop(job.id, None)
+            slots.release()
+
+    async def heartbeat() -> None:
+        interval = queue.lease_seconds / 3
+        last_prune = 0.0
+        while True:
+            await asyncio.sleep(interval)
+            await asyncio.to_thread(queue.touch_worker, name, os.getpid())
+            for job_id, task in list(running.items()):
+                if not await asyncio.to_thread(queue.heartbeat, job_id, name):
+                    task.cancel()
+            # 죽은 워커가 잡고 있던 작업 되살리기 / 오래된 기록 정리 (여러 워커가 해도 결과는 같음)
+            revived = await asyncio.to_thread(queue.requeue_expired)
+            if revived:
+                print(f"[job_worker] {name} requeued {revived} expired job(s)")
+            if time.monotonic() - last_prune > PRUNE_INTERVAL_SECONDS:
+                last_prune = time.monotonic()
+                await asyncio.to_thread(queue.prune, float(cfg["retention_hours"]) * 3600)
+
+    await asyncio.to_thread(queue.touch_worker, name, os.getpid())
+    beat = asyncio.create_task(heartbeat())
+    print(f"[job_worker] {name} started (concurrency={cfg['concurrency']}, db={queue.path})")
+    async def idle() -> None:
+        try:
+            await asyncio.wait_for(stop.wait(), poll_interval)
+        except asyncio.TimeoutError:
+            pass
+
+    try:
+        while not stop.is_set():
+            if slots.locked():
+                # 자리가 다 찼으면 자리가 나거나 종료 신호가 올 때까지
+                await idle()
+                continue
+            await slots.acquire()
+            job = await asyncio.to_thread(queue.claim, name)
+            if job is None:
+                slots.release()
+                await idle()
+                continue
+            running[job.id] = asyncio.create_task(process(job))
+
+        if running:
+            _, pending = await asyncio.wait(list(running.values()), timeout=SHUTDOWN_GRACE_SECONDS)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+    finally:
+        beat.cancel()
+        await shutdown_backend_client()
+        queue.remove_worker(name)
+        queue.close()
+        print(f"[job_worker] {name} stopped")
+
+
+def _process_main(cfg: Dict[str, Any], index: int) -> None:
+    """
+    워커 프로세스 진입점 (spawn). SIGTERM 을 받으면 하던 작업을 정리하고 끝낸다.
+    터미널 Ctrl+C(SIGINT)는 프로세스 그룹 전체에 가므로 무시하고, 부모(pool.stop)가 보내는 SIGTERM 만 따른다.
+    (안 그러면 부모가 종료 처리를 시작하기 전에 supervise() 가 "죽은" 워커를 다시 띄울 수 있다)
+    """
+    name = f"w{index}-{os.getpid()}"
+
+    async def main() -> None:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGTERM, stop.set)
+        loop.add_signal_handler(signal.SIGINT, lambda: None)
+        await run_worker(name, cfg, stop)
+
+    asyncio.run(main())
+
+
+class JobWorkerPool:
+    """
+    워커 프로세스 묶음. supervise() 가 돌고 있는 동안 죽은 프로세스는 다시 띄운다.
+    """
+
+    def __init__(self, cfg: Dict[str, Any], processes: int):
+        self.cfg = cfg
+        self.size = processes
+        self._ctx = multiprocessing.get_context("spawn")
+        self._procs: List[Optional[multiprocessing.process.BaseProcess]] = [None] * processes
+        self._supervisor: Optional[asyncio.Task] = None
+        self.restarts = 0
+
+    def _spawn(self, index: int) -> None:
+        proc = self._ctx.Process(target=_process_main, args=(self.cfg, index), name=f"boost-job-worker-{index}", daemon=True)
+        proc.start()
+        self._procs[index] = proc
+
+    def start(self) -> None:
+        for index in range(self.size):
+            self._spawn(index)
+
+    def alive(self) -> int:
+        return sum(1 for proc in self._procs if proc is not None and proc.is_alive())
+
+    def restart_dead(self) -> int:
+        restarted = 0
+        for index, proc in enumerate(self._procs):
+            if proc is not None and not proc.is_alive():
+                print(f"[job_worker] worker {index} (pid {proc.pid}) exited with {proc.exitcode}, restarting")
+                proc.close()
+                self._spawn(index)
+                restarted += 1
+        self.restarts += restarted
+        return restarted
+
+    async def supervise(self, interval: float = 1.0) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            self.restart_dead()
+
+    def start_supervisor(self) -> None:
+        self._supervisor = asyncio.create_task(self.supervise())
+
+    def stop(self, timeout: float = SHUTDOWN_GRACE_SECONDS + 5) -> None:
+        """
+        SIGTERM → timeout 까지 기다림 → 안 끝나면 kill. (블로킹이라 이벤트 루프에서는 스레드로)
+        """
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            self._supervisor = None
+        procs = [proc for proc in self._procs if proc is not None]
+        for proc in procs:
+            if proc.is_alive():
+                proc.terminate()
+        deadline = time.monotonic() + timeout
+        for proc in procs:
+            proc.join(max(0.0, deadline - time.monotonic()))
+            if proc.is_alive():
+                proc.kill()
+                proc.join()
+        self._procs = [None] * self.size
+
+
+_pool: Optional[JobWorkerPool] = None
+
+
+def start_job_workers() -> Optional[JobWorkerPool]:
+    """
+    lifespan 에서 호출. job_queue.enabled 이고 workers > 0 이면 워커 프로세스를 띄우고 감시를 시작한다.
+    """
+    global _pool
+    cfg = get_job_queue_config()
+    if not cfg["enabled"]:
+        return None
+    if int(cfg["workers"]) <= 0:
+        print("[job_worker] job_queue.workers=0: 워커는 python -m apps.morning_boost.job_worker 로 따로 띄워야 합니다")
+        return None
+    _pool = JobWorkerPool(dict(cfg), int(cfg["workers"]))
+    _pool.start()
+    _pool.start_supervisor()
+    return _pool
+
+
+async def stop_job_workers() -> None:
+    global _pool
+    if _pool is not None:
+        pool, _pool = _pool, None
+        await asyncio.to_thread(pool.stop)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="morning boost 작업 큐 워커")
+    parser.add_argument("--workers", type=int, default=None, help="워커 프로세스 수 (기본: job_queue.workers, 0 이면 1)")
+    parser.add_argument("--concurrency", type=int, default=None, help="프로세스당 동시 작업 수")
+    args = parser.parse_args()
+
+    cfg = dict(get_job_queue_config())
+    if args.concurrency is not None:
+        cfg["concurrency"] = args.concurrency
+    processes = args.workers if args.workers is not None else max(1, int(cfg["workers"]))
+
+    async def run() -> None:
+        pool = JobWorkerPool(cfg, processes)
+        pool.start()
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, stop.set)
+        supervisor = asyncio.create_task(pool.supervise())
+        await stop.wait()
+        supervisor.cancel()
+        await asyncio.to_thread(pool.stop)
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
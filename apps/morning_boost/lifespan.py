@@ -0,0 +1,65 @@
+# apps/morning_boost/lifespan.py
+"""
+morning_boost 앱 수명 주기 훅.
+
+FastAPI(lifespan=morning_boost_lifespan) 로 넘기면
+- 시작: 백엔드 공유 HTTP 클라이언트 생성, 음성 파일 보관 reaper 시작,
+        일기 없는 사용자용 하루치 풀 refresher 시작 (boost_pool),
+        작업 큐 /metrics 게이지 refresher 시작 (job_queue.enabled 일 때),
+        OpenAI SDK 백그라운드 preload (configs/morning_boost.yaml 의 startup.preload_clients),
+        프롬프트 토큰 인코더(tiktoken) 백그라운드 로드,
+        작업 큐 워커 프로세스 시작 (job_queue.workers > 0 일 때만, 기본 0 = 따로 띄움)
+- 종료: reaper / 풀 · 작업 큐 게이지 refresher 중지, 작업 큐 워커 종료, HTTP 클라이언트 종료, 음성 트랜스코딩 프로세스 풀 종료
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from apps.morning_boost.audio_format import shutdown_transcode_pool
+from apps.morning_boost.boost_pool import start_pool_refresher
+from apps.morning_boost.clients import preload_clients
+from apps.morning_boost.http_client import shutdown_backend_client, startup_backend_client
+from apps.morning_boost.job_queue import get_job_queue_config, start_metrics_refresher
+from apps.morning_boost.job_worker import start_job_workers, stop_job_workers
+from apps.morning_boost.prompt_budget import warm_prompt_encoder
+from apps.morning_boost.retention import start_reaper
+from apps.morning_boost.utils import load_config
+
+
+def _should_preload_clients() -> bool:
+    return bool((load_config().get("startup") or {}).get("preload_clients", True))
+
+
+@asynccontextmanager
+async def morning_boost_lifespan(app: Any = None) -> AsyncIterator[None]:
+    await startup_backend_client()
+    reaper = start_reaper()
+    refresher = start_pool_refresher()
+    queue_metrics = start_metrics_refresher()
+    preload = None
+    if _should_preload_clients():
+        # 기동(/health)은 기다리지 않고, 무거운 SDK import 는 스레드에서 미리
+        preload = asyncio.create_task(asyncio.to_thread(preload_clients))
+    # 첫 /boost 요청이 BPE 파일 다운로드를 기다리지 않도록 (그동안 count_tokens 는 어림값)
+    encoder = asyncio.create_task(asyncio.to_thread(warm_prompt_encoder))
+    if get_job_queue_config()["enabled"]:
+        start_job_workers()
+    try:
+        yield
+    finally:
+        for task in (reaper, refresher, queue_metrics):
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        # 스레드는 취소할 수 없으니 import / 다운로드가 끝날 때까지만 기다린다
+        pending = [t for t in (preload, encoder) if t is not None and not t.done()]
+        if pending:
+            await asyncio.wait(pending)
+        await stop_job_workers()
+        await shutdown_backend_client()
+        shutdown_transcode_pool()
@@ -3,93 +3,59 @@ morning_boost FastAPI 앱 엔트리 포인트.
 
 엔드포인트:
 - GET /health        : 서버 상태 체크
+- GET /pool-stats    : 백엔드 HTTP 커넥션 풀 상태
 - GET /ping-openai   : OpenAI TTS 호출 여부 체크
 - GET /boost         : 최신 일기 기반 응원 멘트 TTS 생성
 """
 
-import os
-from uuid import uuid4
-from typing import Optional, Dict, Any
+from apps.morning_boost.clients import load_env
+
+# diary_client / s3_client 가 import 시점에 환경 변수를 읽으므로 먼저 .env 로드
+load_env()
 
-import httpx
 from fastapi import FastAPI, Query
 from fastapi.responses import JSONResponse
-from fastapi.staticfiles import StaticFiles  # ★ 정적 파일 서빙용
 
+from apps.morning_boost.app_setup import install_common
+from apps.morning_boost.clip_http import ClipStaticFiles  # ★ 정적 파일 서빙용 (ETag / Range / 304)
+from apps.morning_boost.diary_client import (  # noqa: F401 (예전 import 경로 유지)
+    BACKEND_URL,
+    fetch_latest_diary,
+    fetch_latest_diary_async,
+)
+from apps.morning_boost.http_client import backend_pool_stats
+from apps.morning_boost.lifespan import morning_boost_lifespan
 from apps.morning_boost.prompt_engine import build_boost_prompt
-from apps.morning_boost.tts_engine import generate_tts_to_file, ping_openai
-from apps.morning_boost.utils import get_data_dir, load_config
-
-BACKEND_URL = os.getenv("BACKEND_URL", "http://13.209.35.235:8080")
-
-
-def fetch_latest_diary(user_id: str) -> Optional[Dict[str, Any]]:
-    """
-    백엔드(Spring Boot)의 최신 일기 조회 API 호출.
-
-    기대 응답 형식 (예시):
-    {
-        "code": 200,
-        "message": "9월 16일 정보 조회 성공",
-        "data": {
-            "emotion": "happy",
-            "draw": "그림 url",
-            "write_diary": "오늘의 일기를 작성했습니다. 오늘은 이런 저런 일을 했습니다.",
-            "file_summation": [
-                "느좋 카페 방문",
-                "페스티벌 관람",
-                "성적 A+"
-            ],
-            "ai_reply": "대충 ai 답장",
-            "ai_draw_reply": "그림 일기 ai 답장"
-        }
-    }
-
-    :return:
-        - 성공 시: data 블록(dict)을 그대로 반환
-        - 실패 시: None
-    """
-    try:
-        resp = httpx.get(
-            f"{BACKEND_URL}/api/diary/latest",
-            params={"user_id": user_id},
-            timeout=5,
-        )
-        if resp.status_code != 200:
-            print("[fetch_latest_diary] status_code:", resp.status_code)
-            return None
-
-        body = resp.json()
-        if body.get("code") != 200:
-            print("[fetch_latest_diary] response code:", body.get("code"))
-            return None
-
-        data = body.get("data") or {}
-        # file_summation이 null/undefined일 수도 있으니 안전하게 처리
-        if data.get("file_summation") is None:
-            data["file_summation"] = []
-
-        return data
-
-    except Exception as e:
-        print("[fetch_latest_diary ERROR]", repr(e))
-        return None
+from apps.morning_boost.tts_engine import generate_tts_to_file_async, ping_openai
+from apps.morning_boost.utils import (
+    STATIC_PREFIX,
+    clip_url,
+    get_data_dir,
+    load_config,
+    new_clip_path,
+)
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="morning_boost")
+    app = FastAPI(title="morning_boost", lifespan=morning_boost_lifespan)
 
     cfg = load_config()  # 지금은 안 쓰지만 나중에 시간/옵션 config 용
 
+    # /metrics, /boost 요청 예산(504), OpenAI 과부하(503), 일기 조회 장애(502). 업로드 경로는 없음
+    install_common(app, metrics_paths=["/boost"], upload_paths=[])
+
     # ==============================
     # 🔹 정적 파일 서빙 설정
     # /app/data/morning_boost 에 저장되는 mp3를
-    # /static/morning_boost/파일명.mp3 로 외부에서 접근 가능하게 만든다.
+    # /static/morning_boost/날짜/해시/파일명.mp3 로 외부에서 접근 가능하게 만든다.
+    # (예전 평평한 구조의 /static/morning_boost/파일명.mp3 도 그대로 동작)
+    # 파일명에 uuid 가 들어간 파일은 immutable 캐시, 다시 써지는 이름(prerender / 풀)은 no-cache
+    # + 내용 해시 ETag + Range(이어받기/탐색)
     # ==============================
     audio_dir = get_data_dir()  # 예: /app/data/morning_boost
     app.mount(
-        "/static/morning_boost",
-        StaticFiles(directory=str(audio_dir)),
+        STATIC_PREFIX,
+        ClipStaticFiles(directory=str(audio_dir)),
         name="morning_boost_static",
     )
 
@@ -97,8 +63,13 @@ def create_app() -> FastAPI:
     async def health():
         return {"status": "ok"}
 
+    @app.get("/pool-stats")
+    async def pool_stats():
+        return backend_pool_stats()
+
     @app.get("/ping-openai")
-    async def ping():
+    def ping():
+        # 동기 TTS 호출이라 async 로 두면 이벤트 루프를 막는다 → 스레드풀에서 실행
         ok = ping_openai()
         return {"ok": ok}
 
@@ -111,21 +82,19 @@ def create_app() -> FastAPI:
         2) 해당 정보를 기반으로 프롬프트 생성
         3) TTS 로 mp3 생성
         """
-        diary_data = fetch_latest_diary(user_id)
+        diary_data = await fetch_latest_diary_async(user_id)
 
         prompt = build_boost_prompt(
             user_id=user_id,
             diary=diary_data,  # None 일 수도 있음
         )
 
-        out_dir = get_data_dir()
-        file_name = f"{user_id}_{uuid4().hex}.mp3"
-        out_path = out_dir / file_name
+        out_path = new_clip_path(user_id)
 
-        generate_tts_to_file(prompt, out_path)
+        await generate_tts_to_file_async(prompt, out_path)
 
-        # 정적 파일 URL (/static/morning_boost/파일명.mp3)
-        audio_url = f"/static/morning_boost/{file_name}"
+        # 정적 파일 URL (/static/morning_boost/날짜/해시/파일명.mp3)
+        audio_url = clip_url(out_path)
 
         return JSONResponse(
             {
@@ -0,0 +1,416 @@
+# apps/morning_boost/metrics.py
+"""
+파이프라인 단계별 지연 메트릭 + Prometheus 텍스트 포맷 출력.
+
+외부 의존성 없이 카운터 / 게이지 / 히스토그램만 직접 구현했다. (프로세스 단위 집계)
+
+단계(stage) 이름:
+    backend_fetch, prompt_build, llm, tts, transcode, disk_write, s3_upload, stt, diary_generation
+    first_audio (스트리밍 응답: 요청 시작 → 첫 음성 청크)
+
+사용법:
+    with stage("llm") as s:
+        ...                     # 예외가 나면 outcome="error" 로 기록
+        s.outcome = "cache_hit" # 필요하면 결과를 직접 지정
+
+endpoint 라벨은 요청이 매칭된 라우트 템플릿(/boost/jobs/{job_id})이다. 경로 값이 라벨로 새지 않게
+MetricsMiddleware 는 요청 scope 만 심어 두고, 라벨은 라우터가 scope["route"] 를 채운 뒤에 읽는다.
+매칭되는 라우트가 없으면 "unmatched".
+요청 밖(배치 작업 등)에서는 set_endpoint() 로 지정하고, 없으면 "-".
+"""
+
+import asyncio
+import bisect
+import contextvars
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+# 단계 지연은 수 ms(캐시 hit) ~ 수십 초(긴 STT)까지 퍼져 있다
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+UNMATCHED_ENDPOINT = "unmatched"
+
+_endpoint: contextvars.ContextVar[str] = contextvars.ContextVar("metrics_endpoint", default="-")
+_request_scope: contextvars.ContextVar[Optional[Scope]] = contextvars.ContextVar("metrics_request_scope", default=None)
+
+
+def set_endpoint(endpoint: str) -> contextvars.Token:
+    # 요청 중에 띄운 백그라운드 작업이 자기 라벨을 쓰면 요청 라벨보다 우선
+    _request_scope.set(None)
+    return _endpoint.set(endpoint)
+
+
+def route_endpoint(scope: Scope) -> str:
+    """
+    라우터가 매칭한 라우트의 경로 템플릿. 아직 라우팅 전이거나 매칭이 없으면 UNMATCHED_ENDPOINT.
+    """
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or getattr(route, "path", None) or UNMATCHED_ENDPOINT
+
+
+def current_endpoint() -> str:
+    scope = _request_scope.get()
+    return route_endpoint(scope) if scope is not None else _endpoint.get()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        return self._values.get(labelvalues, 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labelvalues, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}")
+        return lines
+
+
+class Gauge:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, *labelvalues: str) -> None:
+        with self._lock:
+            self._values[labelvalues] = float(value)
+
+    def value(self, *labelvalues: str) -> float:
+        return self._values.get(labelvalues, 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labelvalues, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 값 → [버킷별 개수(누적 아님)..., +Inf 개수], 합계
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(labelvalues)
+            if counts is None:
+                counts = self._counts[labelvalues] = [0] * (len(self.buckets) + 1)
+                self._sums[labelvalues] = 0.0
+            counts[index] += 1
+            self._sums[labelvalues] += value
+
+    def count(self, *labelvalues: str) -> int:
+        return sum(self._counts.get(labelvalues, ()))
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, list(v), self._sums[k]) for k, v in self._counts.items())
+        for labelvalues, counts, total in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, labelvalues, le)} {cumulative}"
+                )
+            labels = _format_labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+STAGE_SECONDS = Histogram(
+    "maumon_stage_duration_seconds",
+    "Pipeline stage latency in seconds.",
+    ("stage", "endpoint", "outcome"),
+)
+STAGE_TOTAL = Counter(
+    "maumon_stage_total",
+    "Pipeline stage executions.",
+    ("stage", "endpoint", "outcome"),
+)
+REQUEST_SECONDS = Histogram(
+    "maumon_http_request_duration_seconds",
+    "HTTP request latency in seconds (until the last body byte is sent).",
+    ("endpoint", "status"),
+)
+REQUEST_TOTAL = Counter(
+    "maumon_http_requests_total",
+    "HTTP requests.",
+    ("endpoint", "status"),
+)
+
+# 응원 멘트 프롬프트 크기 (prompt_budget.py), kind = sent(실제 보낸 토큰) / saved(예산으로 줄인 토큰)
+PROMPT_TOKENS = Histogram(
+    "maumon_prompt_tokens",
+    "LLM prompt tokens per request.",
+    ("kind",),
+    buckets=(0, 50, 100, 200, 400, 800, 1200, 1600, 3200, 6400, 12800),
+)
+
+# OpenAI rate limiter (openai_limiter.py)
+OPENAI_QUEUE_DEPTH = Gauge(
+    "maumon_openai_queue_depth",
+    "Callers waiting for an OpenAI slot.",
+    ("model",),
+)
+OPENAI_IN_FLIGHT = Gauge(
+    "maumon_openai_in_flight",
+    "OpenAI calls currently holding a slot.",
+)
+OPENAI_CONCURRENCY_LIMIT = Gauge(
+    "maumon_openai_concurrency_limit",
+    "Current AIMD concurrency limit for OpenAI calls.",
+)
+OPENAI_QUEUE_WAIT_SECONDS = Histogram(
+    "maumon_openai_queue_wait_seconds",
+    "Time spent waiting for an OpenAI slot in seconds.",
+    ("model", "outcome"),
+)
+OPENAI_RATE_LIMITED_TOTAL = Counter(
+    "maumon_openai_rate_limited_total",
+    "429 responses received from OpenAI.",
+    ("model",),
+)
+OPENAI_SHED_TOTAL = Counter(
+    "maumon_openai_shed_total",
+    "OpenAI calls rejected by the limiter (503).",
+    ("model", "reason"),
+)
+
+# OpenAI 호출 꼬리 지연 관리 (call_policy.py)
+# event = retry / hedge(두 번째 호출) / hedge_win(두 번째가 먼저 끝남) / budget_exhausted(재시도 예산 소진) / deadline_exceeded
+CALL_POLICY_TOTAL = Counter(
+    "maumon_openai_call_policy_total",
+    "OpenAI call retries, hedges and deadline outcomes by stage.",
+    ("stage", "event"),
+)
+
+# 일기 없는 사용자용 하루치 응원 음성 풀 (boost_pool.py)
+# outcome = hit(미리 만든 파일) / tts(이 포맷은 처음이라 풀 멘트로 TTS) / not_ready(풀이 아직 없어 평소 경로)
+BOOST_POOL_TOTAL = Counter(
+    "maumon_boost_pool_requests_total",
+    "No-diary boost requests by pool outcome.",
+    ("outcome",),
+)
+
+# 백엔드 일기 조회 캐시 (diary_cache.py)
+# outcome = hit / negative_hit(일기 없음 기억) / coalesced(진행 중 조회에 합류) / miss(백엔드 본문 받음) / revalidated(304) / stale(장애, 이전 값) / error
+DIARY_CACHE_TOTAL = Counter(
+    "maumon_diary_cache_total",
+    "Latest-diary lookups by cache outcome.",
+    ("outcome",),
+)
+
+# /diary/stt 결과 캐시 (stt_diary/src/services/stt_cache.py), kind = transcript / diary, outcome = hit / miss / coalesced
+STT_CACHE_TOTAL = Counter(
+    "maumon_stt_cache_total",
+    "STT transcript / diary cache lookups by outcome.",
+    ("kind", "outcome"),
+)
+
+# 동시 요청 합치기 (singleflight.py), flight = boost(/boost 파이프라인) / diary(일기 조회) / boost_pool(풀 멘트 TTS)
+# outcome = executed(직접 실행) / coalesced(진행 중 실행의 결과를 같이 받음)
+SINGLEFLIGHT_TOTAL = Counter(
+    "maumon_singleflight_total",
+    "Single-flight calls by outcome.",
+    ("flight", "outcome"),
+)
+
+# 작업 큐 (job_queue.py). 워커는 다른 프로세스라 lifespan 의 refresher 가 metrics_refresh_seconds 마다 SQLite 에서 읽어 채운다
+JOB_QUEUE_JOBS = Gauge(
+    "maumon_job_queue_jobs",
+    "Boost jobs by status (done/failed are kept for job_queue.retention_hours).",
+    ("status",),
+)
+JOB_QUEUE_OLDEST_AGE_SECONDS = Gauge(
+    "maumon_job_queue_oldest_age_seconds",
+    "Age of the oldest queued or running boost job in seconds.",
+)
+JOB_QUEUE_COMPLETED_PER_MINUTE = Gauge(
+    "maumon_job_queue_completed_per_minute",
+    "Boost jobs completed per minute over the stats window.",
+)
+JOB_QUEUE_LATENCY_SECONDS = Gauge(
+    "maumon_job_queue_latency_seconds",
+    "Enqueue-to-done latency of boost jobs finished in the stats window.",
+    ("quantile",),
+)
+
+REGISTRY = (
+    STAGE_SECONDS,
+    STAGE_TOTAL,
+    REQUEST_SECONDS,
+    REQUEST_TOTAL,
+    PROMPT_TOKENS,
+    OPENAI_QUEUE_DEPTH,
+    OPENAI_IN_FLIGHT,
+    OPENAI_CONCURRENCY_LIMIT,
+    OPENAI_QUEUE_WAIT_SECONDS,
+    OPENAI_RATE_LIMITED_TOTAL,
+    OPENAI_SHED_TOTAL,
+    CALL_POLICY_TOTAL,
+    BOOST_POOL_TOTAL,
+    DIARY_CACHE_TOTAL,
+    STT_CACHE_TOTAL,
+    SINGLEFLIGHT_TOTAL,
+    JOB_QUEUE_JOBS,
+    JOB_QUEUE_OLDEST_AGE_SECONDS,
+    JOB_QUEUE_COMPLETED_PER_MINUTE,
+    JOB_QUEUE_LATENCY_SECONDS,
+)
+
+# render_metrics 직전에 부르는 함수들 (이벤트 루프에서 돌므로 가벼운 것만. 디스크 / DB 를 읽는 값은 refresher 로 채운다)
+_collectors: List[Callable[[], None]] = []
+
+
+def register_collector(collect: Callable[[], None]) -> None:
+    if collect not in _collectors:
+        _collectors.append(collect)
+
+
+def observe_stage(name: str, seconds: float, outcome: str = "ok", endpoint: Optional[str] = None) -> None:
+    endpoint = endpoint or current_endpoint()
+    STAGE_SECONDS.observe(seconds, name, endpoint, outcome)
+    STAGE_TOTAL.inc(name, endpoint, outcome)
+
+
+def observe_prompt_tokens(sent: int, saved: int) -> None:
+    PROMPT_TOKENS.observe(sent, "sent")
+    PROMPT_TOKENS.observe(saved, "saved")
+
+
+class _Stage:
+    # @contextmanager(제너레이터)보다 가벼워서 직접 __enter__/__exit__ 구현
+    __slots__ = ("name", "outcome", "_started")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.outcome = "ok"
+
+    def __enter__(self) -> "_Stage":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc_type is not None:
+            if issubclass(exc_type, (asyncio.CancelledError, GeneratorExit)):
+                self.outcome = "cancelled"
+            else:
+                self.outcome = "error"
+        observe_stage(self.name, time.perf_counter() - self._started, self.outcome)
+        return False
+
+
+def stage(name: str) -> _Stage:
+    """
+    with 블록 실행 시간을 name 단계로 기록한다.
+    예외 → "error", 취소/클라이언트 끊김 → "cancelled", 그 외에는 s.outcome (기본 "ok").
+    """
+    return _Stage(name)
+
+
+def render_metrics() -> str:
+    for collect in list(_collectors):
+        try:
+            collect()
+        except Exception as e:
+            print("[metrics] collector failed:", repr(e))
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
+class MetricsMiddleware:
+    """
+    요청마다 scope 를 컨텍스트에 심어 endpoint 라벨(라우트 템플릿)을 정하고, 요청 지연/상태 코드를 기록하는 ASGI 미들웨어.
+    paths 로 시작하는 경로만 기록한다. (정적 파일 등으로 라벨이 늘어나지 않게)
+    """
+
+    def __init__(self, app: ASGIApp, paths: Sequence[str] = ("/boost", "/diary")):
+        self.app = app
+        self.paths = tuple(paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.paths):
+            await self.app(scope, receive, send)
+            return
+
+        token = _request_scope.set(scope)
+        status = "500"
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            endpoint = route_endpoint(scope)
+            REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint, status)
+            REQUEST_TOTAL.inc(endpoint, status)
+            _request_scope.reset(token)
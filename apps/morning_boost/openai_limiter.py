@@ -0,0 +1,492 @@
+# apps/morning_boost/openai_limiter.py
+"""
+OpenAI 호출(LLM / TTS / STT) 앞에 두는 공유 rate limiter.
+
+아침 피크에 boost 엔드포인트와 STT 서비스가 한꺼번에 OpenAI 를 두드리면
+429 가 쏟아지고 그게 사용자에게 500 으로 보인다. 그래서 모든 호출이 여기서 자리를 받고 나간다.
+
+- 모델별 token bucket : 분당 요청 수(rpm) 예산, 순간 burst 허용
+- Retry-After 존중    : 429 응답을 받으면 그 모델 bucket 을 Retry-After 동안 멈춘다
+- AIMD 동시성 조절    : 성공하면 동시 호출 상한을 천천히(+1/limit) 올리고, 429 면 절반으로
+- 대기열 상한         : 모델별 대기 수가 max_queue 를 넘거나 max_wait_seconds 안에 자리가 안 나면
+                        기다리지 않고 OpenAIOverloaded → 503 + Retry-After 로 바로 돌려보낸다
+
+429 는 SDK 의 httpx event hook(clients.py)에서 관찰한다. SDK 가 Retry-After 를 보고 알아서 재시도하므로
+재시도 중에도 자리는 계속 잡고 있고, 그동안 같은 모델의 새 요청은 bucket 에서 기다린다.
+
+동기(스레드풀의 STT, ping) / 비동기(boost) 호출이 같은 상태를 공유해야 해서
+상태는 threading.Lock 으로 보호하고, 대기자는 스레드면 Event, 코루틴이면 Future 로 깨운다.
+
+사용법:
+    with openai_slot("gpt-4.1-mini"):
+        client.responses.create(...)
+
+    async with openai_slot_async("gpt-4o-mini"):
+        await client.responses.create(...)
+
+설정: configs/morning_boost.yaml 의 openai_limits 섹션.
+"""
+
+import asyncio
+import contextvars
+import math
+import threading
+import time
+from contextlib import nullcontext
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from apps.morning_boost.metrics import (
+    OPENAI_CONCURRENCY_LIMIT,
+    OPENAI_IN_FLIGHT,
+    OPENAI_QUEUE_DEPTH,
+    OPENAI_QUEUE_WAIT_SECONDS,
+    OPENAI_RATE_LIMITED_TOTAL,
+    OPENAI_SHED_TOTAL,
+)
+from apps.morning_boost.utils import load_section
+
+DEFAULT_LIMITS_CONFIG: Dict[str, Any] = {
+    "enabled": True,
+    "initial_concurrency": 16,
+    "min_concurrency": 2,
+    "max_concurrency": 64,
+    "max_queue": 64,
+    "max_wait_seconds": 10.0,
+    "max_retries": 3,
+    "default_rpm": 500,
+    "burst": 10,
+    "models": {},
+}
+
+# Retry-After 가 없는 429 면 이만큼 멈춘다
+DEFAULT_RETRY_AFTER = 1.0
+# 한 번의 429 폭풍(동시에 나간 요청들이 같이 429)에 상한이 여러 번 반으로 줄지 않게
+DECREASE_INTERVAL = 1.0
+
+
+class OpenAIOverloaded(Exception):
+    """
+    대기열이 가득 찼거나 max_wait_seconds 안에 자리가 나지 않을 때.
+    overloaded_handler 가 503 + Retry-After 로 바꾼다.
+    """
+
+    def __init__(self, model: str, reason: str, retry_after: float):
+        super().__init__(f"OpenAI {model} overloaded ({reason}), retry after {retry_after:.1f}s")
+        self.model = model
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def parse_retry_after(headers) -> Optional[float]:
+    """
+    응답 헤더에서 재시도까지 기다릴 초를 읽는다.
+    retry-after-ms(OpenAI) → retry-after(초 또는 HTTP 날짜) 순서. 없거나 못 읽으면 None.
+    """
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return max(0.0, float(value) / 1000)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class _Bucket:
+    """
+    모델 하나의 token bucket. rpm/60 개씩 초당 채워지고 burst 개까지 쌓인다.
+    """
+
+    __slots__ = ("rate", "burst", "tokens", "updated", "paused_until")
+
+    def __init__(self, rpm: float, burst: float, now: float):
+        self.rate = rpm / 60.0
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self.updated = now
+        self.paused_until = 0.0
+
+    def wait_time(self, now: float) -> float:
+        """
+        토큰 하나를 꺼낼 수 있을 때까지 남은 초 (0 이면 바로 가능).
+        """
+        if now < self.paused_until:
+            return self.paused_until - now
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1.0:
+            return 0.0
+        if self.rate <= 0:
+            return math.inf
+        return (1.0 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self.tokens -= 1.0
+
+    def pause(self, until: float) -> None:
+        # 멈춘 동안 쌓인 토큰으로 한꺼번에 몰려가지 않게 비운다
+        self.paused_until = max(self.paused_until, until)
+        self.tokens = 0.0
+        self.updated = until
+
+
+class _ThreadWaiter:
+    __slots__ = ("event",)
+
+    def __init__(self):
+        self.event = threading.Event()
+
+    def wake(self) -> None:
+        self.event.set()
+
+
+class _AsyncWaiter:
+    __slots__ = ("loop", "future")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.future = loop.create_future()
+
+    def _set(self) -> None:
+        if not self.future.done():
+            self.future.set_result(None)
+
+    def wake(self) -> None:
+        # release 는 다른 스레드/루프에서 불릴 수 있다
+        try:
+            self.loop.call_soon_threadsafe(self._set)
+        except RuntimeError:
+            pass  # 루프가 이미 닫힘
+
+
+class _Slot:
+    """
+    잡은 자리 하나. 429 를 받았는지 기록해 두었다가 반납할 때 AIMD 에 반영한다.
+    """
+
+    __slots__ = ("model", "rate_limited", "_previous")
+
+    def __init__(self, model: str):
+        self.model = model
+        self.rate_limited = False
+        self._previous: Optional["_Slot"] = None
+
+
+# 지금 실행 중인 OpenAI 호출의 자리. httpx hook 이 어느 모델의 429 인지 알아낼 때 쓴다
+_current_slot: contextvars.ContextVar[Optional[_Slot]] = contextvars.ContextVar("openai_slot", default=None)
+
+
+class OpenAILimiter:
+    def __init__(self, cfg: Dict[str, Any]):
+        self.cfg = cfg
+        self.min_concurrency = max(1, int(cfg["min_concurrency"]))
+        self.max_concurrency = max(self.min_concurrency, int(cfg["max_concurrency"]))
+        self.limit = float(min(max(int(cfg["initial_concurrency"]), self.min_concurrency), self.max_concurrency))
+        self.max_queue = int(cfg["max_queue"])
+        self.max_wait = float(cfg["max_wait_seconds"])
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, _Bucket] = {}
+        self._waiters: Dict[str, List[Any]] = {}
+        self._last_decrease = 0.0
+        OPENAI_CONCURRENCY_LIMIT.set(self.limit)
+
+    # ---------- 내부 상태 (self._lock 안에서만) ----------
+
+    def _bucket(self, model: str, now: float) -> _Bucket:
+        bucket = self._buckets.get(model)
+        if bucket is None:
+            rpm = (self.cfg.get("models") or {}).get(model, self.cfg["default_rpm"])
+            bucket = self._buckets[model] = _Bucket(float(rpm), float(self.cfg["burst"]), now)
+        return bucket
+
+    def _try_take(self, model: str, now: float) -> float:
+        """
+        자리를 잡으면 0, 아니면 다시 확인해 볼 때까지의 초 (inf 면 반납을 기다림).
+        """
+        bucket = self._bucket(model, now)
+        wait = bucket.wait_time(now)
+        if wait > 0:
+            return wait
+        if self.in_flight >= int(self.limit):
+            return math.inf
+        bucket.take()
+        self.in_flight += 1
+        OPENAI_IN_FLIGHT.set(self.in_flight)
+        return 0.0
+
+    def _enter(self, model: str, now: float, waiter_factory) -> Any:
+        """
+        바로 자리를 잡으면 None, 기다려야 하면 등록된 대기자를 돌려준다.
+        대기열이 가득 찼거나 기다려도 소용없으면 OpenAIOverloaded.
+        """
+        waiters = self._waiters.setdefault(model, [])
+        # 이미 기다리는 사람이 있으면 새치기하지 않고 줄을 선다 (다른 모델 대기자와는 무관)
+        wait = math.inf if waiters else self._try_take(model, now)
+        if wait == 0:
+            return None
+        if len(waiters) >= self.max_queue:
+            raise self._shed(model, "queue_full", now)
+        if wait != math.inf and wait > self.max_wait:
+            raise self._shed(model, "paused", now)
+        waiter = waiter_factory()
+        waiters.append(waiter)
+        OPENAI_QUEUE_DEPTH.set(len(waiters), model)
+        return waiter
+
+    def _leave(self, model: str, waiter: Any) -> None:
+        waiters = self._waiters[model]
+        waiters.remove(waiter)
+        OPENAI_QUEUE_DEPTH.set(len(waiters), model)
+        # 앞사람이 빠졌으니 다음 사람이 다시 시도해 볼 수 있게
+        if waiters:
+            waiters[0].wake()
+
+    def _retry(self, model: str, waiter: Any, now: float) -> float:
+        # 줄 맨 앞만 자리를 시도한다 (FIFO)
+        if self._waiters[model][0] is not waiter:
+            return math.inf
+        return self._try_take(model, now)
+
+    def _shed(self, model: str, reason: str, now: float) -> OpenAIOverloaded:
+        bucket = self._bucket(model, now)
+        retry_after = max(1.0, bucket.paused_until - now, len(self._waiters.get(model) or ()) / max(self.limit, 1.0))
+        OPENAI_SHED_TOTAL.inc(model, reason)
+        return OpenAIOverloaded(model, reason, retry_after)
+
+    def _wake_all(self) -> None:
+        for waiters in self._waiters.values():
+            if waiters:
+                waiters[0].wake()
+
+    def _give_up(self, model: str, started: float, now: float) -> OpenAIOverloaded:
+        with self._lock:
+            error = self._shed(model, "timeout", now)
+        OPENAI_QUEUE_WAIT_SECONDS.observe(now - started, model, "shed")
+        return error
+
+    # ---------- 자리 잡기 / 반납 ----------
+
+    def acquire(self, model: str) -> None:
+        """
+        스레드용. 자리가 날 때까지 막고 기다린다.
+        """
+        started = time.monotonic()
+        with self._lock:
+            waiter = self._enter(model, started, _ThreadWaiter)
+        if waiter is None:
+            OPENAI_QUEUE_WAIT_SECONDS.observe(0.0, model, "ok")
+            return
+
+        deadline = started + self.max_wait
+        try:
+            while True:
+                now = time.monotonic()
+                with self._lock:
+                    wait = self._retry(model, waiter, now)
+                if wait == 0:
+                    OPENAI_QUEUE_WAIT_SECONDS.observe(now - started, model, "ok")
+                    return
+                timeout = min(wait, deadline - now)
+                if timeout <= 0:
+                    raise self._give_up(model, started, now)
+                waiter.event.wait(timeout)
+                waiter.event.clear()
+        finally:
+            with self._lock:
+                self._leave(model, waiter)
+
+    async def acquire_async(self, model: str) -> None:
+        """
+        코루틴용. 이벤트 루프를 막지 않고 기다린다.
+        """
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        with self._lock:
+            waiter = self._enter(model, started, lambda: _AsyncWaiter(loop))
+        if waiter is None:
+            OPENAI_QUEUE_WAIT_SECONDS.observe(0.0, model, "ok")
+            return
+
+        deadline = started + self.max_wait
+        try:
+            while True:
+                now = time.monotonic()
+                with self._lock:
+                    wait = self._retry(model, waiter, now)
+                if wait == 0:
+                    OPENAI_QUEUE_WAIT_SECONDS.observe(now - started, model, "ok")
+                    return
+                timeout = min(wait, deadline - now)
+                if timeout <= 0:
+                    raise self._give_up(model, started, now)
+                await asyncio.wait((waiter.future,), timeout=timeout)
+                if waiter.future.done():
+                    waiter.future = loop.create_future()
+        finally:
+            with self._lock:
+                self._leave(model, waiter)
+
+    def release(self, slot: _Slot) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            OPENAI_IN_FLIGHT.set(self.in_flight)
+            if not slot.rate_limited:
+                # additive increase: 상한만큼 성공하면 +1
+                self.limit = min(float(self.max_concurrency), self.limit + 1.0 / self.limit)
+                OPENAI_CONCURRENCY_LIMIT.set(self.limit)
+            self._wake_all()
+
+    def on_rate_limited(self, model: Optional[str], retry_after: Optional[float]) -> None:
+        """
+        429 를 받았을 때 (httpx hook 에서 호출). 상한을 반으로 줄이고 모델 bucket 을 멈춘다.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_decrease >= DECREASE_INTERVAL:
+                self.limit = max(float(self.min_concurrency), self.limit / 2)
+                self._last_decrease = now
+                OPENAI_CONCURRENCY_LIMIT.set(self.limit)
+            if model is not None:
+                self._bucket(model, now).pause(now + (retry_after if retry_after is not None else DEFAULT_RETRY_AFTER))
+        OPENAI_RATE_LIMITED_TOTAL.inc(model or "-")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "limit": round(self.limit, 2),
+                "in_flight": self.in_flight,
+                "waiting": {m: len(w) for m, w in self._waiters.items() if w},
+            }
+
+
+class _SlotContext:
+    __slots__ = ("limiter", "slot")
+
+    def __init__(self, limiter: OpenAILimiter, model: str):
+        self.limiter = limiter
+        self.slot = _Slot(model)
+
+    def _enter(self) -> _Slot:
+        self.slot._previous = _current_slot.get()
+        _current_slot.set(self.slot)
+        return self.slot
+
+    def _exit(self) -> None:
+        # 스트리밍 제너레이터는 다른 태스크에서 끝날 수 있어서 reset(token) 대신 되돌려 놓기만 한다
+        _current_slot.set(self.slot._previous)
+        self.limiter.release(self.slot)
+
+    def __enter__(self) -> _Slot:
+        self.limiter.acquire(self.slot.model)
+        return self._enter()
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self._exit()
+        return False
+
+    async def __aenter__(self) -> _Slot:
+        await self.limiter.acquire_async(self.slot.model)
+        return self._enter()
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        self._exit()
+        return False
+
+
+_UNSET: Any = object()
+# 아직 설정을 안 읽었으면 _UNSET, 설정에서 꺼 두었으면 None
+_limiter: Any = _UNSET
+_limiter_lock = threading.Lock()
+
+
+def load_limits_config() -> Dict[str, Any]:
+    return load_section("openai_limits", DEFAULT_LIMITS_CONFIG)
+
+
+def get_openai_limiter() -> Optional[OpenAILimiter]:
+    """
+    프로세스 전역 limiter. 설정에서 꺼져 있으면 None.
+    """
+    global _limiter
+    if _limiter is _UNSET:
+        with _limiter_lock:
+            if _limiter is _UNSET:
+                cfg = load_limits_config()
+                _limiter = OpenAILimiter(cfg) if cfg["enabled"] else None
+    return _limiter
+
+
+def set_openai_limiter(limiter: Optional[OpenAILimiter]) -> None:
+    """
+    전역 limiter 교체 (벤치마크 / 스크립트에서 설정을 바꿔 가며 돌릴 때). None 이면 끈다.
+    """
+    global _limiter
+    with _limiter_lock:
+        _limiter = limiter
+
+
+def openai_slot(model: str):
+    """
+    동기 OpenAI 호출을 감싸는 with 블록. limiter 가 꺼져 있으면 아무것도 안 한다.
+    """
+    limiter = get_openai_limiter()
+    return _SlotContext(limiter, model) if limiter is not None else nullcontext()
+
+
+def openai_slot_async(model: str):
+    """
+    비동기 OpenAI 호출을 감싸는 async with 블록.
+    """
+    limiter = get_openai_limiter()
+    return _SlotContext(limiter, model) if limiter is not None else nullcontext()
+
+
+def _observe_response(response) -> None:
+    if response.status_code != 429:
+        return
+    limiter = get_openai_limiter()
+    if limiter is None:
+        return
+    slot = _current_slot.get()
+    if slot is not None:
+        slot.rate_limited = True
+    limiter.on_rate_limited(slot.model if slot is not None else None, parse_retry_after(response.headers))
+
+
+def rate_limit_hook(response) -> None:
+    """
+    OpenAI 동기 클라이언트 httpx response hook.
+    """
+    _observe_response(response)
+
+
+async def async_rate_limit_hook(response) -> None:
+    """
+    AsyncOpenAI 클라이언트 httpx response hook.
+    """
+    _observe_response(response)
+
+
+async def overloaded_handler(request: Request, exc: OpenAIOverloaded) -> JSONResponse:
+    """
+    OpenAIOverloaded → 503 + Retry-After. 앱에서 add_exception_handler 로 등록한다.
+    """
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "요청이 많아 잠시 후 다시 시도해주세요.", "retry_after": math.ceil(exc.retry_after)},
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
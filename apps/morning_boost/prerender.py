@@ -0,0 +1,296 @@
+# apps/morning_boost/prerender.py
+"""
+아침 응원 멘트 일괄 사전 생성(pre-render).
+
+전체 사용자 목록을 읽어서 (일기 조회 → 멘트 생성 → TTS) 파이프라인을
+워커 수 / 초당 처리량 상한을 두고 동시에 돌린다.
+
+- 진행 상황은 날짜별 manifest(jsonl)에 한 줄씩 기록 → 중간에 죽어도 이어서 실행 가능
+- 실행이 끝나면 처리 수 / 실패 수 / 소요 시간 / clips per second 리포트 출력
+- manifest 에는 클립을 만들 때 쓴 일기 digest 도 남긴다. /boost 는 prerendered_clip() 으로
+  지금 일기와 digest 가 같은 오늘 클립이 있으면 LLM / TTS 없이 그 파일을 보낸다 (기본 포맷 mp3 만)
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from apps.morning_boost.audio_format import AudioFormat
+from apps.morning_boost.boost_pool import get_boost_pool
+from apps.morning_boost.diary_client import BACKEND_URL, fetch_latest_diary_async, prefetch_latest_diaries
+from apps.morning_boost.http_client import get_backend_client
+from apps.morning_boost.metrics import set_endpoint
+from apps.morning_boost.prompt_engine import build_boost_message_async
+from apps.morning_boost.text_cache import diary_digest
+from apps.morning_boost.tts_cache import copy_clip
+from apps.morning_boost.tts_engine import generate_tts_to_file_async
+from apps.morning_boost.utils import PROJECT_ROOT, get_data_dir, get_shard_dir, load_config, load_section
+
+DEFAULT_PRERENDER_CONFIG: Dict[str, Any] = {
+    "users_file": "configs/users.txt",
+    "users_url": None,        # 예: /api/users (BACKEND_URL 기준), 응답 data 가 user_id 목록
+    "workers": 8,
+    "max_per_second": 5.0,    # OpenAI 호출 상한 (0 이면 제한 없음)
+    "lead_minutes": 30,       # schedule 시각보다 몇 분 먼저 시작할지
+}
+
+
+@dataclass
+class PrerenderReport:
+    run_date: str
+    total_users: int = 0
+    skipped: int = 0          # 이전 실행에서 이미 끝난 사용자
+    processed: int = 0
+    failures: int = 0
+    wall_time: float = 0.0
+    clips_per_second: float = 0.0
+    deadline: Optional[str] = None
+    finished_before_deadline: Optional[bool] = None
+    failed_users: List[str] = field(default_factory=list)
+
+    def summary(self) -> str:
+        lines = [
+            f"[prerender {self.run_date}]",
+            f"  users      : {self.total_users} (skipped {self.skipped} already done)",
+            f"  processed  : {self.processed}",
+            f"  failures   : {self.failures}",
+            f"  wall time  : {self.wall_time:.1f}s",
+            f"  clips/sec  : {self.clips_per_second:.2f}",
+        ]
+        if self.deadline:
+            status = "OK" if self.finished_before_deadline else "MISSED"
+            lines.append(f"  deadline   : {self.deadline} ({status})")
+        return "\n".join(lines)
+
+
+def load_prerender_config() -> Dict[str, Any]:
+    return load_section("prerender", DEFAULT_PRERENDER_CONFIG)
+
+
+class RateLimiter:
+    """
+    초당 시작 횟수 상한. 호출 간 최소 간격을 지키도록 대기시킨다.
+    """
+
+    def __init__(self, per_second: float):
+        self.interval = 1.0 / per_second if per_second and per_second > 0 else 0.0
+        self._lock = asyncio.Lock()
+        self._next_at = 0.0
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_at - now
+            self._next_at = max(now, self._next_at) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+async def load_user_ids(cfg: Dict[str, Any]) -> List[str]:
+    """
+    사용자 목록 로드.
+    users_url 이 있으면 백엔드에서, 아니면 users_file(한 줄에 user_id 하나, # 주석)에서 읽는다.
+    """
+    if cfg.get("users_url"):
+        resp = await get_backend_client().get(f"{BACKEND_URL}{cfg['users_url']}")
+        resp.raise_for_status()
+        body = resp.json()
+        return [str(u) for u in (body.get("data") or [])]
+
+    path = Path(cfg["users_file"])
+    if not path.is_absolute():
+        path = PROJECT_ROOT / path
+    if not path.exists():
+        raise FileNotFoundError(f"사용자 목록 파일이 없습니다: {path}")
+
+    user_ids = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            user_ids.append(line)
+    # 중복 제거 (순서 유지)
+    return list(dict.fromkeys(user_ids))
+
+
+def manifest_path(run_date: date) -> Path:
+    path = get_data_dir() / "prerender" / f"{run_date.isoformat()}.jsonl"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def load_done_users(path: Path) -> Set[str]:
+    """
+    manifest 에서 이미 성공한 user_id 목록. 마지막 줄이 깨져 있어도 무시한다.
+    """
+    done: Set[str] = set()
+    if not path.exists():
+        return done
+    for line in path.read_text(encoding="utf-8").splitlines():
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if row.get("status") == "ok":
+            done.add(row["user_id"])
+    return done
+
+
+def clip_path(user_id: str, run_date: date) -> Path:
+    return get_shard_dir(user_id, run_date) / f"{user_id}_{run_date.strftime('%Y%m%d')}.mp3"
+
+
+# /boost 용 manifest 색인: (날짜, (크기, mtime)) → {user_id: 일기 digest}. manifest 가 늘어나면 다시 읽는다
+_clip_index: Tuple[Optional[Tuple[date, int, int]], Dict[str, str]] = (None, {})
+
+
+def _prerendered_digests(run_date: date) -> Dict[str, str]:
+    global _clip_index
+    path = get_data_dir() / "prerender" / f"{run_date.isoformat()}.jsonl"
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return {}
+    stamp = (run_date, st.st_size, st.st_mtime_ns)
+    cached_stamp, digests = _clip_index
+    if cached_stamp == stamp:
+        return digests
+
+    digests = {}
+    for line in path.read_text(encoding="utf-8").splitlines():
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        # digest 가 없는 예전 줄은 어떤 일기로 만들었는지 몰라서 쓰지 않는다
+        if row.get("status") == "ok" and row.get("diary"):
+            digests[row["user_id"]] = row["diary"]
+    _clip_index = (stamp, digests)
+    return digests
+
+
+def prerendered_clip(user_id: str, diary: Optional[Dict[str, Any]], run_date: Optional[date] = None) -> Optional[Path]:
+    """
+    오늘(run_date) prerender 가 지금과 같은 일기(digest)로 만든 이 사용자 클립이 있으면 그 경로, 없으면 None.
+    manifest 를 읽으므로 이벤트 루프에서는 스레드로 부른다.
+    """
+    run_date = run_date or date.today()
+    if _prerendered_digests(run_date).get(user_id) != diary_digest(diary):
+        return None
+    path = clip_path(user_id, run_date)
+    return path if path.exists() else None
+
+
+def schedule_deadline(run_date: date) -> datetime:
+    schedule = load_config().get("schedule") or {}
+    return datetime.combine(run_date, datetime.min.time()).replace(
+        hour=int(schedule.get("hour", 9)),
+        minute=int(schedule.get("minute", 0)),
+    )
+
+
+async def render_one(user_id: str, run_date: date) -> Tuple[Path, str]:
+    """
+    한 사용자 클립을 만든다. (파일 경로, 쓴 일기 digest) 반환.
+    """
+    # 백엔드 장애면 DiaryUnavailable → 이 사용자는 error 로 기록되고 다음 실행 때 다시 만든다
+    # (일기 없는 사용자로 보고 풀 음성을 넣어 두면 그날 하루 동안 잘못된 클립이 남는다)
+    diary = await fetch_latest_diary_async(user_id)
+    pool = get_boost_pool()
+    if diary is None and pool is not None:
+        # 일기 없는 사용자는 그날 풀 음성을 복사만 (LLM / TTS 호출 없음)
+        pooled = await pool.clip_for(user_id, AudioFormat("mp3"), run_date)
+        if pooled is not None:
+            out_path = clip_path(user_id, run_date)
+            out_path.unlink(missing_ok=True)
+            copy_clip(pooled, out_path)
+            return out_path, diary_digest(diary)
+    boost_text = await build_boost_message_async(user_id=user_id, diary=diary)
+    return await generate_tts_to_file_async(boost_text, clip_path(user_id, run_date)), diary_digest(diary)
+
+
+async def run_prerender(
+    user_ids: Optional[List[str]] = None,
+    workers: Optional[int] = None,
+    max_per_second: Optional[float] = None,
+    run_date: Optional[date] = None,
+) -> PrerenderReport:
+    """
+    전체 사용자 클립을 미리 만든다. 같은 날짜로 다시 실행하면 끝난 사용자는 건너뛴다.
+    """
+    cfg = load_prerender_config()
+    # 단계 메트릭을 요청 경로 대신 "prerender" 로 묶는다
+    set_endpoint("prerender")
+    run_date = run_date or date.today()
+    workers = workers or int(cfg["workers"])
+    limiter = RateLimiter(cfg["max_per_second"] if max_per_second is None else max_per_second)
+
+    if user_ids is None:
+        user_ids = await load_user_ids(cfg)
+
+    mpath = manifest_path(run_date)
+    done = load_done_users(mpath)
+    pending = [u for u in user_ids if u not in done]
+
+    deadline = schedule_deadline(run_date)
+    report = PrerenderReport(
+        run_date=run_date.isoformat(),
+        total_users=len(user_ids),
+        skipped=len(user_ids) - len(pending),
+        deadline=deadline.strftime("%Y-%m-%d %H:%M"),
+    )
+
+    if pending:
+        # 일기 조회를 먼저 넓게 병렬로 끝내 두면 렌더 워커(OpenAI 속도 제한)가 백엔드를 기다리지 않는다
+        prefetched = await prefetch_latest_diaries(pending)
+        print(f"[prerender] diaries prefetched: {prefetched}")
+
+    pool = get_boost_pool()
+    if pool is not None and pending:
+        # 일기 없는 사용자용 풀을 먼저 만들어 두면 사용자마다 LLM / TTS 를 부르지 않는다
+        await pool.ensure(run_date)
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for user_id in pending:
+        queue.put_nowait(user_id)
+
+    started = time.perf_counter()
+
+    with open(mpath, "a", encoding="utf-8") as manifest:
+
+        def record(row: Dict[str, Any]) -> None:
+            manifest.write(json.dumps(row, ensure_ascii=False) + "\n")
+            manifest.flush()
+
+        async def worker() -> None:
+            while True:
+                try:
+                    user_id = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await limiter.wait()
+                try:
+                    out_path, digest = await render_one(user_id, run_date)
+                    report.processed += 1
+                    record({"user_id": user_id, "status": "ok", "file": out_path.name, "diary": digest, "ts": time.time()})
+                except Exception as e:
+                    report.failures += 1
+                    report.failed_users.append(user_id)
+                    record({"user_id": user_id, "status": "error", "error": repr(e), "ts": time.time()})
+                    print(f"[prerender ERROR] {user_id}: {e!r}")
+
+        await asyncio.gather(*(worker() for _ in range(max(1, workers))))
+
+    report.wall_time = time.perf_counter() - started
+    if report.wall_time > 0:
+        report.clips_per_second = report.processed / report.wall_time
+    report.finished_before_deadline = datetime.now() <= deadline
+
+    report_path = mpath.with_suffix(".report.json")
+    report_path.write_text(json.dumps(asdict(report), ensure_ascii=False, indent=2), encoding="utf-8")
+    return report
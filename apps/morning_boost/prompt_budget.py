@@ -0,0 +1,264 @@
+# apps/morning_boost/prompt_budget.py
+"""
+응원 멘트 프롬프트 토큰 예산.
+
+일기 본문 / 어제 AI 답장 / 키워드를 길이 제한 없이 넣으면 긴 일기일수록 LLM 입력 토큰과 지연이 늘어난다.
+여기서는 토큰 수를 세고, 설정한 입력 예산 안에 들어가도록 필드를 우선순위대로 채운다.
+
+우선순위:
+    0) 예산 안에 다 들어가면 아무것도 바꾸지 않는다 (키워드 중복 제거도 하지 않음)
+    1) 고정 지시문 + 감정 + 키워드(중복 제거, 최대 max_keywords 개, 넘치는 키워드는 자르거나 버림)
+    2) 일기 본문 (넘치면 문장 단위로 앞/뒤를 남기고 가운데를 줄임)
+    3) 어제 AI 답장 (남은 예산 안에서, 최대 ai_reply_max_tokens)
+
+토큰 수는 tiktoken 이 설치돼 있으면 그걸로 정확히 세고,
+없으면 보수적으로 어림한다 (ASCII 4글자당 1토큰, 한글 등은 글자당 1토큰 → 실제보다 크게 잡힘).
+
+설정: configs/morning_boost.yaml 의 prompt_budget 섹션.
+"""
+
+import math
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from apps.morning_boost.utils import load_section
+
+DEFAULT_PROMPT_BUDGET_CONFIG: Dict[str, Any] = {
+    "enabled": True,
+    "max_input_tokens": 1200,
+    "max_keywords": 10,
+    "ai_reply_max_tokens": 200,
+    "encoding": "o200k_base",   # gpt-4o / gpt-4.1 계열
+}
+
+# 줄였다는 걸 LLM 도 알 수 있게 가운데에 끼워 넣는다
+ELLIPSIS = " …(중략)… "
+
+# 문장 끝(. ! ? … 또는 줄바꿈) 뒤에서 나눈다
+_SENTENCE_END = re.compile(r"(?<=[.!?…。])\s+|\n+")
+
+_encoder_lock = threading.Lock()
+_encoders: Dict[str, Optional[Callable[[str], List[int]]]] = {}
+_loading: Set[str] = set()
+
+
+def _estimate_tokens(text: str) -> int:
+    # 글자마다 파이썬 루프를 돌지 않고 encode 로 ASCII 글자 수만 센다
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return math.ceil(ascii_chars / 4) + (len(text) - ascii_chars)
+
+
+def load_encoder(encoding: str) -> Optional[Callable[[str], List[int]]]:
+    """
+    tiktoken 인코더를 읽어 둔다 (처음이면 BPE 파일을 내려받을 수 있어 느림 → 이벤트 루프 밖에서 부를 것).
+    lifespan 이 기동 때 스레드에서 부른다.
+    """
+    with _encoder_lock:
+        if encoding not in _encoders:
+            try:
+                import tiktoken
+
+                _encoders[encoding] = tiktoken.get_encoding(encoding).encode
+            except Exception as e:
+                # 미설치 / 인코딩 파일 다운로드 실패 → 어림값 사용
+                print("[prompt_budget] tiktoken 을 쓸 수 없어 토큰 수를 어림합니다. (pip install tiktoken)", repr(e))
+                _encoders[encoding] = None
+            _loading.discard(encoding)
+    return _encoders[encoding]
+
+
+def _get_encoder(encoding: str) -> Optional[Callable[[str], List[int]]]:
+    """
+    읽어 둔 인코더. 아직 없으면 기다리지 않고 백그라운드 스레드로 읽기 시작하고,
+    그동안은 None(어림값) 을 돌려준다. 요청 처리 중에 다운로드를 기다리며 루프를 막지 않도록.
+    """
+    if encoding in _encoders:
+        return _encoders[encoding]
+    with _encoder_lock:
+        if encoding in _encoders or encoding in _loading:
+            return _encoders.get(encoding)
+        _loading.add(encoding)
+    threading.Thread(target=load_encoder, args=(encoding,), name="prompt-budget-encoder", daemon=True).start()
+    return None
+
+
+def warm_prompt_encoder() -> None:
+    """
+    전역 예산 설정의 인코더를 미리 읽는다 (블로킹).
+    """
+    budget = get_prompt_budget()
+    if budget.enabled:
+        load_encoder(budget.encoding)
+
+
+def count_tokens(text: str, encoding: str = DEFAULT_PROMPT_BUDGET_CONFIG["encoding"]) -> int:
+    if not text:
+        return 0
+    encode = _get_encoder(encoding)
+    if encode is None:
+        return _estimate_tokens(text)
+    return len(encode(text))
+
+
+def dedupe_keywords(keywords: Optional[Iterable[Any]]) -> List[str]:
+    """
+    앞뒤 공백 / 대소문자만 다른 키워드는 하나로 합친다. 처음 나온 순서와 표기를 유지.
+    """
+    seen = set()
+    result = []
+    for keyword in keywords or ():
+        text = str(keyword).strip()
+        norm = " ".join(text.split()).casefold()
+        if not norm or norm in seen:
+            continue
+        seen.add(norm)
+        result.append(text)
+    return result
+
+
+def _cut_tokens(text: str, max_tokens: int, count: Callable[[str], int], from_end: bool = False) -> str:
+    """
+    문장 하나가 통째로 예산보다 길 때 글자 단위로 자른다 (이진 탐색).
+    """
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        piece = text[-mid:] if from_end else text[:mid]
+        if count(piece) <= max_tokens:
+            lo = mid
+        else:
+            hi = mid - 1
+    if lo == 0:
+        return ""
+    return text[-lo:] if from_end else text[:lo]
+
+
+def trim_to_tokens(
+    text: str,
+    max_tokens: int,
+    count: Callable[[str], int] = count_tokens,
+    head_ratio: float = 0.7,
+) -> str:
+    """
+    text 를 max_tokens 안으로 줄인다.
+    문장 단위로 앞에서 head_ratio 만큼, 나머지는 뒤에서 채우고 가운데를 ELLIPSIS 로 바꾼다.
+    (일기는 첫 부분에 상황이, 끝부분에 그날의 감정 정리가 오는 경우가 많아서)
+    """
+    text = text.strip()
+    if max_tokens <= 0 or not text:
+        return ""
+    if count(text) <= max_tokens:
+        return text
+
+    available = max_tokens - count(ELLIPSIS)
+    if available <= 0:
+        return ""
+    sentences = [s for s in _SENTENCE_END.split(text) if s.strip()]
+
+    # 긴 일기라도 예산에 들어갈 만큼만 세도록 앞/뒤에서 한 문장씩 센다 (문장 사이 공백 몫 +1)
+    head: List[str] = []
+    head_budget = int(available * head_ratio)
+    used = 0
+    i = 0
+    while i < len(sentences):
+        cost = count(sentences[i]) + 1
+        if used + cost > head_budget:
+            break
+        head.append(sentences[i])
+        used += cost
+        i += 1
+    if not head:
+        # 첫 문장부터 너무 길면 글자 단위로 자른다
+        head.append(_cut_tokens(sentences[0], head_budget, count))
+        used += count(head[0])
+        i = 1
+
+    tail: List[str] = []
+    j = len(sentences) - 1
+    while j >= i:
+        cost = count(sentences[j]) + 1
+        if used + cost > available:
+            break
+        tail.insert(0, sentences[j])
+        used += cost
+        j -= 1
+    if not tail and j >= i and available - used > 0:
+        tail.append(_cut_tokens(sentences[j], available - used, count, from_end=True))
+
+    return (" ".join(head) + ELLIPSIS + " ".join(t for t in tail if t)).strip()
+
+
+def fit_keywords(keywords: List[str], render_tokens: Callable[[List[str]], int], max_tokens: int) -> List[str]:
+    """
+    키워드만 넣은 프롬프트가 max_tokens 를 넘지 않도록 앞에서부터 채운다.
+    다 들어가지 않는 키워드는 들어가는 만큼 글자 단위로 자르고, 그 뒤 키워드는 버린다.
+    """
+    if render_tokens(keywords) <= max_tokens:
+        return keywords
+    kept: List[str] = []
+    for keyword in keywords:
+        if render_tokens(kept + [keyword]) <= max_tokens:
+            kept.append(keyword)
+            continue
+        cut = _cut_tokens(keyword, max_tokens, lambda piece: render_tokens(kept + [piece])).strip()
+        if cut:
+            kept.append(cut)
+        break
+    return kept
+
+
+@dataclass
+class PromptStats:
+    """
+    프롬프트 하나의 토큰 수. raw 는 예산 없이(예전 방식) 만들었을 때의 크기.
+    keywords_dropped 는 중복 제거 / max_keywords / 예산 때문에 빠졌거나 잘린 키워드 수.
+    """
+
+    tokens: int
+    raw_tokens: int
+    keywords_dropped: int = 0
+    diary_trimmed: bool = False
+    ai_reply_trimmed: bool = False
+
+    @property
+    def saved_tokens(self) -> int:
+        return max(0, self.raw_tokens - self.tokens)
+
+
+@dataclass
+class PromptBudget:
+    enabled: bool = True
+    max_input_tokens: int = DEFAULT_PROMPT_BUDGET_CONFIG["max_input_tokens"]
+    max_keywords: int = DEFAULT_PROMPT_BUDGET_CONFIG["max_keywords"]
+    ai_reply_max_tokens: int = DEFAULT_PROMPT_BUDGET_CONFIG["ai_reply_max_tokens"]
+    encoding: str = DEFAULT_PROMPT_BUDGET_CONFIG["encoding"]
+
+    def count(self, text: str) -> int:
+        return count_tokens(text, self.encoding)
+
+
+_budget: Optional[PromptBudget] = None
+
+
+def load_prompt_budget_config() -> Dict[str, Any]:
+    return load_section("prompt_budget", DEFAULT_PROMPT_BUDGET_CONFIG)
+
+
+def get_prompt_budget() -> PromptBudget:
+    """
+    프로세스 전역 예산 설정 (처음 부를 때 설정 파일을 한 번 읽는다).
+    """
+    global _budget
+    if _budget is None:
+        _budget = PromptBudget(**load_prompt_budget_config())
+    return _budget
+
+
+def set_prompt_budget(budget: Optional[PromptBudget]) -> None:
+    """
+    전역 예산 교체 (벤치마크에서 예산을 바꿔 가며 돌릴 때). None 이면 다음 호출 때 설정을 다시 읽는다.
+    """
+    global _budget
+    _budget = budget
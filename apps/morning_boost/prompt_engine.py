@@ -4,65 +4,36 @@
 백엔드에서 받아온 diary 데이터 전체를 바탕으로 맞춤형 멘트를 생성한다.
 """
 
+import time
 from datetime import date
-from typing import Optional, Dict, Any
+from typing import AsyncIterator, Optional, Dict, Any, List, Tuple
 
-from openai import OpenAI
+from apps.morning_boost.call_policy import attempt_client, call_with_policy, timeout_client
+from apps.morning_boost.clients import get_async_openai_client, get_openai_client
+from apps.morning_boost.metrics import observe_prompt_tokens, observe_stage, stage
+from apps.morning_boost.openai_limiter import openai_slot, openai_slot_async
+from apps.morning_boost.prompt_budget import (
+    PromptBudget,
+    PromptStats,
+    dedupe_keywords,
+    fit_keywords,
+    get_prompt_budget,
+    trim_to_tokens,
+)
+from apps.morning_boost.text_cache import get_text_cache
 
-client = OpenAI()
 
-
-def build_boost_prompt(
-    user_id: str,  # 기존 인터페이스 유지를 위해 남겨두지만 프롬프트에서는 사용하지 않는다.
-    diary: Optional[Dict[str, Any]] = None
+def _diary_prompt_content(
+    today: str,
+    emotion: Any,
+    write_diary: str,
+    keywords: List[str],
+    ai_reply: Any,
 ) -> str:
-    """
-    아침에 들려줄 30초 분량의 응원멘트 생성을 위한 "프롬프트" 텍스트를 만든다.
-    이 텍스트는 LLM에 그대로 input으로 들어간다.
-
-    ⚠️ 규칙:
-    - 사용자 이름, 닉네임, ID를 부르지 않는다.
-    - 'OO님', '사용자님', '~님' 등의 호칭도 사용하지 않는다.
-    """
-
-    today = date.today().strftime("%Y년 %m월 %d일")
-
-    # 기본 톤 (고정)
-    base_instruction = (
-        "너는 따뜻하고 긍정적인 한국어 아침 응원 코치야. "
-        "듣는 사람이 기운을 낼 수 있도록 30초 정도 분량으로, "
-        "말투는 부드럽고 친근하게, 존댓말로 이야기해 줘. "
-        "절대 사용자 이름이나 닉네임, ID를 말하지 말고, "
-        "'OO님', '사용자님', '~님' 같은 호칭도 사용하지 마. "
-        "상대를 특정하지 않고 자연스럽게 말을 건네듯 이야기해."
-    )
-
-    # -------------------------------
-    # 1) 일기가 없을 때 (기본 멘트)
-    # -------------------------------
-    if diary is None:
-        content = (
-            f"오늘은 {today}이야.\n"
-            "전날 일기가 없지만, 어제 하루를 나름대로 열심히 보냈을 거라고 생각하고 "
-            "오늘도 차분히 시작할 수 있도록 아침 응원 멘트를 만들어줘.\n"
-            "- 가볍게 웃을 수 있는 문장 1개 포함\n"
-            "- 오늘 바로 실천해볼 수 있는 현실적인 행동 팁 1~2개 포함\n"
-            "- 특정 이름이나 호칭 없이 일반적인 형태로 말해줘\n"
-        )
-        return f"{base_instruction}\n\n{content}"
-
-    # -------------------------------
-    # 2) 일기가 있을 때 (맞춤형 멘트)
-    # -------------------------------
-    write_diary = diary.get("write_diary", "")
-    emotion = diary.get("emotion")
-    ai_reply = diary.get("ai_reply")
-    file_summation = diary.get("file_summation") or []
-
     # 키워드(파일 요약) 연결
-    keywords_str = ", ".join(file_summation) if file_summation else "키워드 없음"
+    keywords_str = ", ".join(keywords) if keywords else "키워드 없음"
 
-    content = (
+    return (
         f"오늘은 {today}이야.\n"
         "아래는 어제 사용자가 남긴 일기와 백엔드가 제공한 요약 정보야.\n\n"
 
@@ -88,7 +59,146 @@ def build_boost_prompt(
         "  특정 사람을 지칭하지 않는 자연스러운 응원 멘트로 작성해 줘.\n"
     )
 
-    return f"{base_instruction}\n\n{content}"
+
+# 기본 톤 (고정)
+_BASE_INSTRUCTION = (
+    "너는 따뜻하고 긍정적인 한국어 아침 응원 코치야. "
+    "듣는 사람이 기운을 낼 수 있도록 30초 정도 분량으로, "
+    "말투는 부드럽고 친근하게, 존댓말로 이야기해 줘. "
+    "절대 사용자 이름이나 닉네임, ID를 말하지 말고, "
+    "'OO님', '사용자님', '~님' 같은 호칭도 사용하지 마. "
+    "상대를 특정하지 않고 자연스럽게 말을 건네듯 이야기해."
+)
+
+
+def _format_day(day: Optional[date] = None) -> str:
+    return (day or date.today()).strftime("%Y년 %m월 %d일")
+
+
+def build_no_diary_prompt(day: Optional[date] = None, theme: Optional[str] = None) -> str:
+    """
+    전날 일기가 없을 때의 프롬프트. 날짜(와 theme)에만 의존한다.
+    theme 을 주면 그 주제를 녹인 멘트를 만든다 (boost_pool 이 하루치 여러 버전을 만들 때 사용).
+    """
+    content = (
+        f"오늘은 {_format_day(day)}이야.\n"
+        "전날 일기가 없지만, 어제 하루를 나름대로 열심히 보냈을 거라고 생각하고 "
+        "오늘도 차분히 시작할 수 있도록 아침 응원 멘트를 만들어줘.\n"
+        "- 가볍게 웃을 수 있는 문장 1개 포함\n"
+        "- 오늘 바로 실천해볼 수 있는 현실적인 행동 팁 1~2개 포함\n"
+        "- 특정 이름이나 호칭 없이 일반적인 형태로 말해줘\n"
+    )
+    if theme:
+        content += f"- 오늘의 주제는 '{theme}'이야. 행동 팁과 이야기를 이 주제에 맞춰 줘\n"
+    return f"{_BASE_INSTRUCTION}\n\n{content}"
+
+
+def build_boost_prompt_with_stats(
+    user_id: str,
+    diary: Optional[Dict[str, Any]] = None,
+    budget: Optional[PromptBudget] = None,
+) -> Tuple[str, PromptStats]:
+    """
+    build_boost_prompt 와 같은 프롬프트를 만들되, 토큰 예산(prompt_budget)을 적용하고
+    (프롬프트, 토큰 통계) 를 돌려준다.
+
+    예산 안에 다 들어가면 예전과 같은 프롬프트이고, 넘치면
+    감정 + 키워드(중복 제거) → 일기 본문(줄임) → 어제 AI 답장(줄임) 순서로 자리를 준다.
+    """
+    budget = budget or get_prompt_budget()
+    today = _format_day()
+
+    # -------------------------------
+    # 1) 일기가 없을 때 (기본 멘트)
+    # -------------------------------
+    if diary is None:
+        prompt = build_no_diary_prompt()
+        tokens = budget.count(prompt)
+        return prompt, PromptStats(tokens=tokens, raw_tokens=tokens)
+
+    # -------------------------------
+    # 2) 일기가 있을 때 (맞춤형 멘트)
+    # -------------------------------
+    write_diary = diary.get("write_diary", "") or ""
+    emotion = diary.get("emotion")
+    ai_reply = diary.get("ai_reply")
+    file_summation = list(diary.get("file_summation") or [])
+
+    def render(diary_text: str, keywords: List[str], reply: Any) -> str:
+        return f"{_BASE_INSTRUCTION}\n\n" + _diary_prompt_content(today, emotion, diary_text, keywords, reply)
+
+    raw_prompt = render(write_diary, file_summation, ai_reply)
+    raw_tokens = budget.count(raw_prompt)
+    if not budget.enabled or raw_tokens <= budget.max_input_tokens:
+        # 예산 안이면 키워드 중복 제거도 하지 않고 예전 프롬프트를 그대로 쓴다
+        return raw_prompt, PromptStats(tokens=raw_tokens, raw_tokens=raw_tokens)
+
+    # 예산을 넘으면 빈 필드는 "None" 대신 빈 칸으로, 센 그대로 렌더링한다
+    write_diary = write_diary.strip()
+    reply_text = "" if ai_reply is None else str(ai_reply).strip()
+
+    # 키워드가 아무리 길어도 일기 몫(남는 예산의 절반, 그보다 짧으면 일기 전체)은 남겨 둔다
+    diary_tokens = budget.count(write_diary)
+    base = budget.count(render("", [], ""))
+    diary_reserve = min(diary_tokens, max(0, budget.max_input_tokens - base) // 2)
+    candidates = dedupe_keywords(file_summation)[: max(0, budget.max_keywords)]
+    keywords = fit_keywords(
+        candidates,
+        lambda kept: budget.count(render("", kept, "")),
+        budget.max_input_tokens - diary_reserve,
+    )
+    intact = sum(1 for kept, original in zip(keywords, candidates) if kept == original)
+
+    # 고정 지시문 + 감정 + 키워드를 먼저 채우고, 남은 예산은 일기가 먼저 갖고 AI 답장은 그 나머지만
+    fixed = budget.count(render("", keywords, ""))
+    diary_budget = max(0, budget.max_input_tokens - fixed)
+    reply_budget = min(budget.ai_reply_max_tokens, diary_budget)
+    while True:
+        diary_text = trim_to_tokens(write_diary, diary_budget, budget.count)
+        reply_budget = min(reply_budget, max(0, budget.max_input_tokens - fixed - budget.count(diary_text)))
+        reply_trimmed = trim_to_tokens(reply_text, reply_budget, budget.count)
+        prompt = render(diary_text, keywords, reply_trimmed)
+        # 필드 경계에서 토큰이 합쳐지거나 갈라져 합이 조금 어긋날 수 있다 → 넘친 만큼 답장 → 일기 순으로 줄인다
+        over = budget.count(prompt) - budget.max_input_tokens
+        if over <= 0 or (diary_budget == 0 and reply_budget == 0):
+            break
+        if reply_trimmed:
+            reply_budget = max(0, min(reply_budget, budget.count(reply_trimmed)) - over)
+        else:
+            diary_budget = max(0, min(diary_budget, budget.count(diary_text)) - over)
+
+    stats = PromptStats(
+        tokens=0,
+        raw_tokens=raw_tokens,
+        keywords_dropped=len(file_summation) - intact,
+        diary_trimmed=diary_text != write_diary,
+        ai_reply_trimmed=reply_trimmed != reply_text,
+    )
+    stats.tokens = budget.count(prompt)
+    return prompt, stats
+
+
+def build_boost_prompt(
+    user_id: str,  # 기존 인터페이스 유지를 위해 남겨두지만 프롬프트에서는 사용하지 않는다.
+    diary: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    아침에 들려줄 30초 분량의 응원멘트 생성을 위한 "프롬프트" 텍스트를 만든다.
+    이 텍스트는 LLM에 그대로 input으로 들어간다.
+    입력 토큰 예산(configs 의 prompt_budget)을 넘으면 긴 필드를 줄인다.
+
+    ⚠️ 규칙:
+    - 사용자 이름, 닉네임, ID를 부르지 않는다.
+    - 'OO님', '사용자님', '~님' 등의 호칭도 사용하지 않는다.
+    """
+    return build_boost_prompt_with_stats(user_id=user_id, diary=diary)[0]
+
+
+def _build_prompt_observed(user_id: str, diary: Optional[Dict[str, Any]]) -> str:
+    with stage("prompt_build"):
+        prompt, stats = build_boost_prompt_with_stats(user_id=user_id, diary=diary)
+    observe_prompt_tokens(stats.tokens, stats.saved_tokens)
+    return prompt
 
 
 def build_boost_message(
@@ -100,15 +210,115 @@ def build_boost_message(
     위에서 만든 프롬프트를 실제 LLM에 던져서
     '최종으로 읽을 한 편의 응원 멘트 텍스트'를 생성한다.
     이 반환값을 그대로 TTS에 넣는다.
+
+    같은 날 같은 일기/모델로 이미 만든 멘트가 있으면 LLM 을 부르지 않고 재사용한다.
     """
-    prompt = build_boost_prompt(user_id=user_id, diary=diary)
+    cache = get_text_cache()
+    if cache is not None:
+        started = time.perf_counter()
+        cached = cache.get(diary, model)
+        if cached is not None:
+            observe_stage("llm", time.perf_counter() - started, "cache_hit")
+            return cached
 
-    # responses API 사용
-    response = client.responses.create(
-        model=model,
-        input=prompt,
-    )
+    prompt = _build_prompt_observed(user_id, diary)
+
+    # responses API 사용 (rate limiter 자리를 받은 뒤 호출, 대기 시간도 llm 단계에 포함)
+    with stage("llm"), openai_slot(model):
+        response = timeout_client(get_openai_client(), "llm").responses.create(
+            model=model,
+            input=prompt,
+        )
 
     # 최신 SDK에서 제공하는 편의 프로퍼티
-    text = response.output_text
-    return text.strip()
+    text = response.output_text.strip()
+    if cache is not None:
+        cache.set(diary, model, text)
+    return text
+
+
+async def build_boost_message_async(
+    user_id: str,
+    diary: Optional[Dict[str, Any]] = None,
+    model: str = "gpt-4o-mini",
+) -> str:
+    """
+    build_boost_message 의 비동기 버전.
+    AsyncOpenAI 클라이언트를 사용해서 LLM 응답을 기다리는 동안 이벤트 루프를 막지 않는다.
+    """
+    cache = get_text_cache()
+    if cache is not None:
+        started = time.perf_counter()
+        cached = cache.get(diary, model)
+        if cached is not None:
+            observe_stage("llm", time.perf_counter() - started, "cache_hit")
+            return cached
+
+    prompt = _build_prompt_observed(user_id, diary)
+    text = await generate_message_async(prompt, model)
+    if cache is not None:
+        cache.set(diary, model, text)
+    return text
+
+
+async def generate_message_async(prompt: str, model: str = "gpt-4o-mini") -> str:
+    """
+    프롬프트 → LLM 멘트 텍스트 (캐시 없이). rate limiter 대기 시간도 llm 단계에 포함.
+    deadline / 재시도 / hedging 은 call_policy 가 (시도마다 limiter 자리를 따로 받는다).
+    """
+
+    async def attempt(timeout: Optional[float]):
+        async with openai_slot_async(model):
+            return await attempt_client(timeout).responses.create(
+                model=model,
+                input=prompt,
+            )
+
+    with stage("llm"):
+        response = await call_with_policy("llm", attempt)
+    return response.output_text.strip()
+
+
+async def stream_boost_message_async(
+    user_id: str,
+    diary: Optional[Dict[str, Any]] = None,
+    model: str = "gpt-4o-mini",
+) -> AsyncIterator[str]:
+    """
+    build_boost_message_async 의 스트리밍 버전. 멘트를 생성되는 대로 텍스트 조각(delta)으로 내보낸다.
+    (sentence_stream 이 문장 단위로 잘라서 바로 TTS 에 넘긴다)
+
+    캐시에 있으면 캐시된 멘트를 한 번에 내보내고, 끝까지 받았을 때만 캐시에 넣는다.
+    """
+    cache = get_text_cache()
+    if cache is not None:
+        started = time.perf_counter()
+        cached = cache.get(diary, model)
+        if cached is not None:
+            observe_stage("llm", time.perf_counter() - started, "cache_hit")
+            yield cached
+            return
+
+    prompt = _build_prompt_observed(user_id, diary)
+
+    parts: List[str] = []
+    with stage("llm"):
+        # limiter 자리는 요청을 보내고 응답 헤더를 받을 때(429 가 보이는 지점)까지만 잡는다.
+        # 스트림을 읽는 동안에는 소비자(sentence_stream)가 TTS 자리 / lookahead 를 기다리며 멈출 수 있는데,
+        # 그동안 LLM 자리를 쥐고 있으면 TTS 쪽과 서로 기다리다 멈춘다(hold-and-wait).
+        async with openai_slot_async(model):
+            events = await timeout_client(get_async_openai_client(), "llm").responses.create(
+                model=model,
+                input=prompt,
+                stream=True,
+            )
+        async with events:
+            async for event in events:
+                if event.type == "response.output_text.delta":
+                    parts.append(event.delta)
+                    yield event.delta
+
+    text = "".join(parts).strip()
+    if cache is not None and text:
+        cache.set(diary, model, text)
+
@@ -0,0 +1,172 @@
+# apps/morning_boost/retention.py
+"""
+생성된 음성 파일(data/morning_boost) 보관 정책.
+
+- 오래된 파일 삭제 (max_age_days)
+- 전체 용량 상한 (max_total_bytes) 초과 시 오래된 파일부터 삭제
+- 만든 지 얼마 안 된 파일(min_age_minutes)은 응답 중일 수 있으니 건드리지 않음
+- 비어 버린 날짜/해시 디렉토리 정리
+- 용량은 파일 경로가 아니라 inode((st_dev, st_ino)) 단위로 센다. 하드링크 여러 개는 한 번만 세고,
+  트리 밖(예: 예전 TTS 캐시)에 링크가 남은 파일은 지워도 공간이 안 돌아오므로 reclaimed 에 넣지 않는다
+
+앱 안에서는 백그라운드 reaper 가 주기적으로 돌고,
+수동으로는 `python -m scripts.jobs.compact_audio` 로 바로 실행할 수 있다.
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from apps.morning_boost.utils import get_data_dir, load_section
+
+AUDIO_SUFFIXES = {".mp3", ".opus", ".aac", ".wav", ".flac", ".pcm"}
+
+DEFAULT_RETENTION_CONFIG: Dict[str, Any] = {
+    "enabled": True,
+    "max_age_days": 7,
+    "max_total_bytes": 2 * 1024 * 1024 * 1024,
+    "min_age_minutes": 10,
+    "interval_minutes": 30,
+}
+
+
+@dataclass
+class CompactionReport:
+    files_scanned: int = 0
+    files_deleted: int = 0
+    bytes_reclaimed: int = 0
+    bytes_remaining: int = 0
+    dirs_removed: int = 0
+    dry_run: bool = False
+
+    def summary(self) -> str:
+        prefix = "[compact_audio dry-run]" if self.dry_run else "[compact_audio]"
+        return (
+            f"{prefix} scanned={self.files_scanned} deleted={self.files_deleted} "
+            f"reclaimed={self.bytes_reclaimed / 1024 / 1024:.1f}MB "
+            f"remaining={self.bytes_remaining / 1024 / 1024:.1f}MB "
+            f"dirs_removed={self.dirs_removed}"
+        )
+
+
+def load_retention_config() -> Dict[str, Any]:
+    return load_section("retention", DEFAULT_RETENTION_CONFIG)
+
+
+def _scan(root: Path) -> List[Tuple[float, Path, os.stat_result]]:
+    files = []
+    for path in root.rglob("*"):
+        is_audio = path.suffix in AUDIO_SUFFIXES
+        is_part = path.name.endswith(".part")
+        if (is_audio or is_part) and path.is_file():
+            st = path.stat()
+            files.append((st.st_mtime, path, st))
+    files.sort(key=lambda item: item[0])
+    return files
+
+
+def _inode(st: os.stat_result) -> Tuple[int, int]:
+    return st.st_dev, st.st_ino
+
+
+def compact_audio_dir(
+    max_age_days: Optional[float] = None,
+    max_total_bytes: Optional[int] = None,
+    min_age_minutes: Optional[float] = None,
+    dry_run: bool = False,
+    root: Optional[Path] = None,
+) -> CompactionReport:
+    """
+    보관 정책에 따라 음성 파일을 지우고 결과를 리포트로 돌려준다.
+    인자를 안 주면 configs/morning_boost.yaml 의 retention 값을 쓴다.
+    """
+    cfg = load_retention_config()
+    max_age = float(cfg["max_age_days"] if max_age_days is None else max_age_days) * 86400
+    budget = int(cfg["max_total_bytes"] if max_total_bytes is None else max_total_bytes)
+    min_age = float(cfg["min_age_minutes"] if min_age_minutes is None else min_age_minutes) * 60
+    root = root or get_data_dir()
+
+    now = time.time()
+    report = CompactionReport(dry_run=dry_run)
+    files = _scan(root)
+    report.files_scanned = len(files)
+    # inode → 이 트리 안에 남은 경로 수. 같은 inode 의 하드링크는 용량을 한 번만 차지한다
+    links: Dict[Tuple[int, int], int] = {}
+    for _, _, st in files:
+        links[_inode(st)] = links.get(_inode(st), 0) + 1
+    sizes = {_inode(st): st.st_size for _, _, st in files}
+    total = sum(sizes.values())
+    # 트리 밖에 있는 링크 수 (스캔 시점 st_nlink - 트리 안 경로 수)
+    outside = {_inode(st): st.st_nlink - links[_inode(st)] for _, _, st in files}
+
+    def delete(path: Path, st: os.stat_result) -> None:
+        nonlocal total
+        if not dry_run:
+            path.unlink(missing_ok=True)
+        report.files_deleted += 1
+        key = _inode(st)
+        links[key] -= 1
+        if links[key] > 0:
+            # 트리 안에 같은 내용(하드링크)이 아직 남아 있음
+            return
+        total -= sizes[key]
+        if outside[key] <= 0:
+            # 마지막 링크(st_nlink == 1 이던 것)를 지웠을 때만 실제로 공간이 돌아온다
+            report.bytes_reclaimed += sizes[key]
+
+    survivors = []
+    for mtime, path, st in files:
+        age = now - mtime
+        if age > max_age:
+            delete(path, st)
+        elif path.name.endswith(".part") and age > 3600:
+            # 스트리밍 중 끊겨서 남은 중간 파일
+            delete(path, st)
+        else:
+            survivors.append((mtime, path, st))
+
+    # 용량 초과분은 오래된 것부터 (단, 방금 만든 파일은 제외)
+    for mtime, path, st in survivors:
+        if total <= budget:
+            break
+        if now - mtime < min_age:
+            break
+        delete(path, st)
+
+    report.bytes_remaining = total
+
+    if not dry_run:
+        # 깊은 디렉토리부터 비어 있으면 삭제 (방금 만든 샤드 디렉토리는 곧 파일이 들어올 수 있어 제외)
+        for path in sorted(root.rglob("*"), key=lambda p: len(p.parts), reverse=True):
+            if path.is_dir() and now - path.stat().st_mtime >= min_age:
+                try:
+                    path.rmdir()
+                    report.dirs_removed += 1
+                except OSError:
+                    pass
+
+    return report
+
+
+async def run_reaper(interval_seconds: float) -> None:
+    """
+    interval 마다 compact_audio_dir 를 스레드에서 실행하는 백그라운드 루프.
+    """
+    while True:
+        try:
+            report = await asyncio.to_thread(compact_audio_dir)
+            if report.files_deleted:
+                print(report.summary())
+        except Exception as e:
+            print("[retention reaper ERROR]", repr(e))
+        await asyncio.sleep(interval_seconds)
+
+
+def start_reaper() -> Optional[asyncio.Task]:
+    cfg = load_retention_config()
+    if not cfg["enabled"]:
+        return None
+    return asyncio.create_task(run_reaper(float(cfg["interval_minutes"]) * 60))
@@ -1,17 +1,41 @@
 # apps/morning_boost/router.py
 
-from uuid import uuid4
+from pathlib import Path
 from typing import List, Optional, Dict, Any
+import asyncio
 import json
-
-from fastapi import APIRouter, Query, UploadFile, File, HTTPException
-from fastapi.responses import FileResponse
-from pydantic import BaseModel
-
-from .prompt_engine import build_boost_message
-from .tts_engine import generate_tts_to_file, ping_openai
-from .utils import get_data_dir
-from .main import fetch_latest_diary  # user_id 방식에서 사용
+import time
+
+from fastapi import APIRouter, Body, Query, Request, UploadFile, File, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, ValidationError
+
+from .audio_format import AudioFormat, negotiate_audio_format
+from .boost_pool import get_boost_pool, get_pool_clip
+from .call_policy import DeadlineExceeded, call_policy_stats, get_call_policy_config, request_deadline
+from .clip_http import ClipFileResponse, get_clip_http_config
+from .http_client import backend_pool_stats
+from .job_queue import TERMINAL_STATUSES, get_job_queue, get_job_queue_config
+from .metrics import observe_stage
+from .openai_limiter import OpenAIOverloaded
+from .prerender import prerendered_clip
+from .prompt_engine import build_boost_message_async
+from .s3_client import (
+    check_s3_config,
+    iter_file_chunks,
+    make_audio_key,
+    public_url,
+    queue_chunks,
+    start_background_s3_upload,
+)
+from .sentence_stream import get_sentence_stream_config, stream_boost_audio_async
+from .singleflight import SingleFlight
+from .text_cache import diary_digest, get_text_cache
+from .tts_cache import get_tts_cache
+from .tts_engine import generate_tts_to_file_async, ping_openai, stream_tts_async
+from .utils import clip_url, load_config, load_section, new_clip_path
+from .diary_cache import get_diary_cache, get_diary_cache_config
+from .diary_client import fetch_latest_diary_async, prefetch_latest_diaries  # user_id 방식에서 사용
 
 
 router = APIRouter(
@@ -75,6 +99,201 @@ def normalize_user_id_for_header(user_id: Optional[str]) -> Optional[str]:
     return None
 
 
+# ============================
+# 동시 요청 합치기 (single-flight)
+# ============================
+
+# 같은 user_id(또는 같은 사용자의 같은 일기 digest)로 동시에 들어온 요청은 파이프라인을 한 번만 돈다.
+boost_flight = SingleFlight("boost")
+
+
+def diary_flight_key(user_id: str, diary: Dict[str, Any], fmt: AudioFormat) -> str:
+    """
+    일기 JSON 요청의 single-flight 키. 저장 파일 이름 / S3 키가 user_id 로 만들어지므로 사용자마다 따로 합친다.
+    (다른 사용자가 같은 일기를 보내도 LLM / TTS 는 멘트 캐시 / TTS 캐시가 재사용)
+    """
+    return f"diary:{user_id}:{diary_digest(diary)}:{fmt.variant}"
+
+
+async def _render_boost_file(user_id: str, diary: Optional[Dict[str, Any]], fmt: AudioFormat) -> Path:
+    """
+    LLM 멘트 생성 → TTS 음성(fmt 포맷) 저장. 저장된 파일 경로 반환.
+    일기가 없으면(diary=None) 오늘 풀(boost_pool.py)에 배정된 음성을 그대로 돌려준다 (풀이 아직 없을 때만 직접 생성).
+    아침 prerender 가 같은 일기로 만들어 둔 오늘 클립이 있으면 그 파일을 돌려준다.
+    None 은 "백엔드가 일기 없음이라고 답함"만 뜻한다. 조회 장애는 fetch_latest_diary_async 가 DiaryUnavailable 로 올린다.
+    """
+    if diary is None:
+        pooled = await get_pool_clip(user_id, fmt)
+        if pooled is not None:
+            return pooled
+    prerendered = await _prerendered_clip(user_id, diary, fmt)
+    if prerendered is not None:
+        return prerendered
+
+    boost_text = await build_boost_message_async(user_id=user_id, diary=diary)
+
+    out_path = new_clip_path(user_id, ext=fmt.ext)
+    # TTS는 최종 멘트 텍스트만 읽도록
+    await generate_tts_to_file_async(boost_text, out_path, format=fmt.name, bitrate=fmt.bitrate)
+    return out_path
+
+
+async def _prerendered_clip(user_id: str, diary: Optional[Dict[str, Any]], fmt: AudioFormat) -> Optional[Path]:
+    """
+    아침 prerender 가 지금 일기로 만들어 둔 오늘 클립 (prerender 는 기본 mp3 만 만든다).
+    """
+    if fmt.variant != "mp3":
+        return None
+    return await asyncio.to_thread(prerendered_clip, user_id, diary)
+
+
+# ============================
+# 출력 포맷 협상
+# ============================
+
+def _negotiate_format(request: Request, format: Optional[str], bitrate: Optional[str]) -> AudioFormat:
+    """
+    ?format= / ?bitrate= 쿼리 → Accept 헤더 → 기본값(mp3) 순서. 잘못된 값이면 400.
+    """
+    try:
+        return negotiate_audio_format(request.headers.get("accept"), format, bitrate)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _audio_file_response(out_path: Path, fmt: AudioFormat) -> ClipFileResponse:
+    """
+    내용 해시 ETag 를 붙여서, 같은 음성을 다시 받을 때 If-None-Match 로 304 를 받을 수 있게 한다.
+    GET 은 Range(206) 도 지원 (재생 중 탐색 / 이어받기).
+    """
+    return ClipFileResponse(
+        path=str(out_path),
+        cache_control=get_clip_http_config()["response_cache_control"],
+        media_type=fmt.media_type,
+        filename=out_path.name,
+    )
+
+
+def _set_format_headers(resp, fmt: AudioFormat) -> None:
+    # 같은 URL 이라도 Accept 에 따라 다른 본문이 나가므로 캐시(CDN/브라우저)가 구분하게
+    resp.headers["Vary"] = "Accept"
+    resp.headers["X-Audio-Format"] = fmt.variant
+
+
+# ============================
+# 스트리밍 응답
+# ============================
+
+_save_audio: Optional[bool] = None
+
+
+def _should_save_audio() -> bool:
+    # configs/morning_boost.yaml 의 log.save_audio (기본 true), 요청마다 yaml 을 읽지 않도록 한 번만 읽어 둔다
+    global _save_audio
+    if _save_audio is None:
+        _save_audio = bool((load_config().get("log") or {}).get("save_audio", True))
+    return _save_audio
+
+
+async def stream_audio_response(
+    text: str,
+    out_path: Path,
+    s3_key: Optional[str] = None,
+    fmt: AudioFormat = AudioFormat("mp3"),
+    started: Optional[float] = None,
+) -> StreamingResponse:
+    """
+    TTS 청크를 합성되는 대로 HTTP 응답으로 흘려보낸다.
+
+    첫 청크를 받은 뒤에 응답을 만들기 때문에, OpenAI 호출이 바로 실패하면
+    헤더가 나가기 전에 예외가 올라가서 일반 500 응답이 된다.
+    save_audio 설정이 켜져 있으면 out_path 에도 같이 저장(tee)한다.
+    s3_key 를 주면 같은 청크를 백그라운드 S3 multipart 업로드로도 흘려보낸다.
+    fmt 는 OpenAI 가 바로 만들어 주는 포맷만 가능하다 (비트레이트 지정 = 트랜스코딩은 스트리밍 불가).
+    started(요청 시작 perf_counter)를 주면 첫 음성 청크까지 시간을 first_audio 단계로 기록한다.
+    """
+    tee_path = out_path if _should_save_audio() else None
+    chunks = stream_tts_async(text, tee_path=tee_path, format=fmt.name)
+    return await _chunks_response(chunks, out_path, s3_key, fmt, started)
+
+
+async def stream_sentence_audio_response(
+    user_id: str,
+    diary: Optional[Dict[str, Any]],
+    out_path: Path,
+    s3_key: Optional[str] = None,
+    fmt: AudioFormat = AudioFormat("mp3"),
+    started: Optional[float] = None,
+) -> StreamingResponse:
+    """
+    stream_audio_response 의 문장 단위 버전: 멘트가 다 만들어지기를 기다리지 않고
+    LLM 스트림에서 첫 문장이 나오면 바로 TTS → 전송한다. (sentence_stream.py)
+    """
+    tee_path = out_path if _should_save_audio() else None
+    chunks = stream_boost_audio_async(user_id, diary, tee_path=tee_path, format=fmt.name)
+    return await _chunks_response(chunks, out_path, s3_key, fmt, started)
+
+
+async def _chunks_response(
+    chunks,
+    out_path: Path,
+    s3_key: Optional[str],
+    fmt: AudioFormat,
+    started: Optional[float],
+) -> StreamingResponse:
+    first = await chunks.__anext__()
+    if started is not None:
+        observe_stage("first_audio", time.perf_counter() - started)
+
+    async def body():
+        # 업로드는 본문을 실제로 보내기 시작할 때 띄운다. 본문이 한 번도 안 돌면(응답 전에 연결이 끊김)
+        # 큐에 끝 표시가 들어갈 일이 없어서 업로드 태스크가 영영 기다리게 된다.
+        s3_queue: Optional[asyncio.Queue] = None
+        if s3_key:
+            s3_queue = asyncio.Queue()
+            start_background_s3_upload(queue_chunks(s3_queue), s3_key, content_type=fmt.media_type)
+        completed = False
+        try:
+            if s3_queue is not None:
+                s3_queue.put_nowait(first)
+            yield first
+            async for chunk in chunks:
+                if s3_queue is not None:
+                    s3_queue.put_nowait(chunk)
+                yield chunk
+            completed = True
+        finally:
+            await chunks.aclose()
+            if s3_queue is not None:
+                # 중간에 끊겼으면 잘린 파일이 올라가지 않도록 업로드를 중단시킨다
+                s3_queue.put_nowait(None if completed else RuntimeError("stream aborted"))
+
+    return StreamingResponse(
+        body(),
+        media_type=fmt.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{out_path.name}"'},
+    )
+
+
+def _require_s3(s3: bool) -> None:
+    """
+    s3=true 인데 S3 설정이 없으면 생성 / 스트리밍을 시작하기 전에 503.
+    """
+    if not s3:
+        return
+    try:
+        check_s3_config()
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=f"S3 업로드를 사용할 수 없습니다: {e}")
+
+
+def upload_file_to_s3_in_background(out_path: Path, s3_key: str, content_type: str = "audio/mpeg") -> None:
+    """
+    이미 저장된 파일을 백그라운드에서 S3 로 올린다. (응답은 기다리지 않음)
+    """
+    start_background_s3_upload(iter_file_chunks(out_path), s3_key, content_type=content_type)
+
+
 # ============================
 # Pydantic 모델 (JSON 검증용)
 # ============================
@@ -108,8 +327,72 @@ async def health():
     return {"boost": "ok"}
 
 
+@router.get("/pool-stats")
+async def pool_stats():
+    """
+    백엔드 HTTP 커넥션 풀 상태 (open / idle / active / waiting).
+    풀 크기(configs/morning_boost.yaml 의 backend_http) 튜닝용.
+    """
+    return backend_pool_stats()
+
+
+@router.get("/cache-stats")
+async def cache_stats():
+    """
+    캐시 상태.
+    - tts        : TTS 음성 캐시 (entries / bytes / hits / misses / evictions)
+    - boost_text : 응원 멘트 텍스트 캐시 (entries / hits / misses / sets)
+    - boost_pool : 일기 없는 사용자용 하루치 풀 (hits / tts / not_ready / generated)
+    - diary      : 백엔드 일기 조회 캐시 (hit / negative_hit / coalesced / miss / revalidated / stale / error, hit_rate)
+    """
+    tts_cache = get_tts_cache()
+    text_cache = get_text_cache()
+    pool = get_boost_pool()
+    diary_cache = get_diary_cache()
+    return {
+        "tts": {"enabled": True, **tts_cache.stats()} if tts_cache else {"enabled": False},
+        "boost_text": {"enabled": True, **text_cache.stats()} if text_cache else {"enabled": False},
+        "boost_pool": {"enabled": True, **pool.stats()} if pool else {"enabled": False},
+        "diary": {"enabled": True, **diary_cache.stats()} if diary_cache else {"enabled": False},
+    }
+
+
+@router.get("/coalesce-stats")
+async def coalesce_stats():
+    """
+    동시 요청 합치기 상태. coalesced = 다른 요청의 결과를 같이 받아 간 요청 수.
+    누적 횟수는 /metrics 의 maumon_singleflight_total 에도 나간다.
+    """
+    return boost_flight.stats()
+
+
+@router.get("/call-policy-stats")
+async def call_policy_stats_endpoint():
+    """
+    OpenAI 호출 정책 상태. retry_budget = 최근 window 의 호출 / 재시도(+hedge) 수와 예산 부족으로 막힌 수,
+    hedge_delay_seconds = 단계별 지금 hedge 를 보내는 기준 지연 (표본이 모자라면 null).
+    재시도 / hedge / deadline 초과 누적은 /metrics 의 maumon_openai_call_policy_total.
+    """
+    return {"enabled": bool(get_call_policy_config()["enabled"]), **call_policy_stats()}
+
+
+@router.post("/diaries/prefetch")
+async def prefetch_diaries(user_ids: List[str] = Body(..., description="미리 조회할 user_id 목록")):
+    """
+    아침 작업이 사용자 목록을 보내서 일기 조회 캐시를 미리 채운다.
+    캐시는 프로세스마다 따로라서 이 요청을 받은 앱 프로세스만 채워진다 (uvicorn --workers N 이면 N 개 중 하나,
+    작업 큐 워커는 해당 없음). 여러 프로세스로 돌리면 prerender(같은 프로세스에서 prefetch → 렌더)를 쓴다.
+    반환: fetched / skipped(아직 살아 있음) / with_diary / without_diary / errors 개수
+    """
+    max_users = int(get_diary_cache_config()["prefetch_max_users"])
+    if len(user_ids) > max_users:
+        raise HTTPException(status_code=413, detail=f"한 번에 최대 {max_users}명까지 보낼 수 있습니다.")
+    return await prefetch_latest_diaries(user_ids)
+
+
 @router.get("/ping-openai")
-async def ping():
+def ping():
+    # 동기 TTS 호출이라 async 로 두면 이벤트 루프를 막는다 → 스레드풀에서 실행
     return {"ok": ping_openai()}
 
 
@@ -118,38 +401,141 @@ async def ping():
 #    ➜ LLM으로 멘트 생성 → mp3 바이너리 직접 응답
 # ============================
 
+FORMAT_QUERY = Query(None, description="음성 포맷 (mp3 | opus | aac | wav | flac), 없으면 Accept 헤더 → mp3")
+BITRATE_QUERY = Query(None, description="예: 24k. 주면 서버에서 인코딩 (opus 24k~32k 면 음성은 충분)")
+SENTENCES_QUERY = Query(
+    None,
+    description="stream=true 와 함께: LLM 출력을 문장 단위로 바로 TTS 해서 첫 소리까지 시간 단축 (mp3 / aac). "
+    "없으면 sentence_stream.enabled 설정",
+)
+
+
+JOB_QUERY = Query(False, description="true면 음성을 기다리지 않고 작업만 넣은 뒤 202 + job_id (GET /boost/jobs/{job_id} 로 결과 확인)")
+
+
+async def _enqueue_boost_job(kind: str, payload: Dict[str, Any]) -> JSONResponse:
+    """
+    작업 큐에 넣고 바로 202 응답. 생성은 워커 프로세스(job_worker.py)가 한다.
+    """
+    if not get_job_queue_config()["enabled"]:
+        raise HTTPException(status_code=503, detail="작업 큐가 꺼져 있습니다 (job_queue.enabled).")
+    queue = get_job_queue()
+    job_id = await asyncio.to_thread(queue.enqueue, kind, payload)
+    status_url = f"{router.prefix}/jobs/{job_id}"
+    return JSONResponse(
+        {"job_id": job_id, "status": "queued", "status_url": status_url},
+        status_code=202,
+        headers={"Location": status_url},
+    )
+
+
+def _pooled_file_response(user_id: str, pooled: Path, fmt: AudioFormat, s3: bool) -> tuple:
+    """
+    이미 만들어진 음성 파일(일기 없는 사용자의 풀 음성 / 아침 prerender 클립)을 그대로 응답.
+    스트리밍 요청이어도 다 만들어진 파일이라 바로 보낸다.
+    """
+    s3_key = make_audio_key(user_id, pooled.name) if s3 else None
+    if s3_key:
+        upload_file_to_s3_in_background(pooled, s3_key, fmt.media_type)
+    return _audio_file_response(pooled, fmt), s3_key
+
+
+def _use_sentence_stream(sentences: Optional[bool], fmt: AudioFormat) -> bool:
+    """
+    문장 단위 스트리밍 여부. 조각 음성을 이어 붙일 수 없는 포맷(opus / wav / flac)이면
+    설정 기본값일 때는 조용히 끄고, 요청에서 직접 켰으면 400.
+    """
+    if sentences is None:
+        return bool(get_sentence_stream_config()["enabled"]) and fmt.codec.concat
+    if sentences and not fmt.codec.concat:
+        raise HTTPException(status_code=400, detail=f"{fmt.name} 는 문장 단위 스트리밍을 지원하지 않습니다 (mp3 / aac 만 가능).")
+    return sentences
+
+
 @router.get("")
 async def boost(
+    request: Request,
     user_id: str = Query(..., description="사용자 ID"),
+    stream: bool = Query(False, description="true면 TTS 청크를 합성되는 대로 스트리밍"),
+    s3: bool = Query(False, description="true면 음성을 백그라운드로 S3에도 업로드"),
+    format: Optional[str] = FORMAT_QUERY,
+    bitrate: Optional[str] = BITRATE_QUERY,
+    sentences: Optional[bool] = SENTENCES_QUERY,
+    job: bool = JOB_QUERY,
 ):
     """
     1) 백엔드에서 최신 일기/요약 정보 가져오기
     2) LLM으로 아침 응원 멘트 텍스트 생성
-    3) TTS로 mp3 생성
-    4) mp3 바이너리 직접 응답 + 메타데이터는 헤더에
+    3) TTS로 음성 생성 (stream=true면 합성되는 대로 전송, bitrate 지정 시에는 인코딩 후 파일로)
+       stream=true&sentences=true 면 2) 와 3) 을 문장 단위로 겹쳐서 첫 문장부터 바로 전송
+    4) 음성 바이너리 직접 응답 + 메타데이터는 헤더에
+    job=true 면 1)~3) 을 워커에 맡기고 202 + job_id 만 바로 응답한다.
     """
-    diary_data: Optional[Dict[str, Any]] = fetch_latest_diary(user_id)
-
-    # 🔹 여기서 실제 응원 멘트를 생성
-    boost_text = build_boost_message(user_id=user_id, diary=diary_data)
-
-    out_dir = get_data_dir()
-    file_name = f"{user_id}_{uuid4().hex}.mp3"
-    out_path = out_dir / file_name
-
-    # TTS는 최종 멘트 텍스트만 읽도록
-    generate_tts_to_file(boost_text, out_path)
+    started = time.perf_counter()
+    fmt = _negotiate_format(request, format, bitrate)
+    _require_s3(s3)
+    if job:
+        return await _enqueue_boost_job(
+            "user", {"user_id": user_id, "format": fmt.name, "bitrate": fmt.bitrate, "s3": s3}
+        )
+
+    # 같은 user_id 로 동시에 들어온 요청은 아래 파이프라인을 한 번만 실행
+    if stream and not fmt.needs_transcode and _use_sentence_stream(sentences, fmt):
+        # 멘트 전체를 기다리지 않으므로 single-flight 로 합치지 않는다 (완성된 멘트는 텍스트 캐시에 들어감)
+        diary_data = await fetch_latest_diary_async(user_id)
+        # 일기가 없으면 풀 음성, 있으면 아침에 만들어 둔 클립이 있으니 스트리밍할 필요 없이 파일로
+        if diary_data is None:
+            pooled = await get_pool_clip(user_id, fmt)
+        else:
+            pooled = await _prerendered_clip(user_id, diary_data, fmt)
+        if pooled is not None:
+            resp, s3_key = _pooled_file_response(user_id, pooled, fmt, s3)
+        else:
+            out_path = new_clip_path(user_id, ext=fmt.ext)
+            s3_key = make_audio_key(user_id, out_path.name) if s3 else None
+            resp = await stream_sentence_audio_response(user_id, diary_data, out_path, s3_key, fmt, started)
+    elif stream and not fmt.needs_transcode:
+        async def make_text():
+            diary = await fetch_latest_diary_async(user_id)
+            if diary is None:
+                pooled = await get_pool_clip(user_id, fmt)
+            else:
+                pooled = await _prerendered_clip(user_id, diary, fmt)
+            if pooled is not None:
+                return diary, pooled
+            # 🔹 여기서 실제 응원 멘트를 생성
+            return diary, await build_boost_message_async(user_id=user_id, diary=diary)
+
+        diary_data, boost_text = await boost_flight.do(f"user-text:{user_id}", make_text)
+        if isinstance(boost_text, Path):
+            # 풀 음성 (일기 없음) / 아침 prerender 클립
+            resp, s3_key = _pooled_file_response(user_id, boost_text, fmt, s3)
+        else:
+            out_path = new_clip_path(user_id, ext=fmt.ext)
+            s3_key = make_audio_key(user_id, out_path.name) if s3 else None
+            resp = await stream_audio_response(boost_text, out_path, s3_key=s3_key, fmt=fmt, started=started)
+    else:
+        async def make_file():
+            diary = await fetch_latest_diary_async(user_id)
+            return diary, await _render_boost_file(user_id, diary, fmt)
+
+        diary_data, out_path = await boost_flight.do(f"user:{user_id}:{fmt.variant}", make_file)
+        s3_key = make_audio_key(user_id, out_path.name) if s3 else None
+        if s3_key:
+            upload_file_to_s3_in_background(out_path, s3_key, fmt.media_type)
+        resp = _audio_file_response(out_path, fmt)
+
+    _set_format_headers(resp, fmt)
+
+    # 업로드가 끝나면 이 URL 로 접근 가능 (응답 시점엔 아직 업로드 중일 수 있음)
+    # 버킷은 맨 앞의 _require_s3 에서 확인했으므로 여기서 실패하지 않는다
+    if s3_key:
+        resp.headers["X-Audio-S3-Url"] = public_url(s3_key)
 
     emotion = diary_data.get("emotion") if diary_data else None
     emotion_header = normalize_emotion_for_header(emotion)
     user_id_header = normalize_user_id_for_header(user_id)
 
-    resp = FileResponse(
-        path=str(out_path),
-        media_type="audio/mpeg",
-        filename=file_name,
-    )
-
     # ⚠️ 한글 user_id면 헤더에 넣지 않음 (UnicodeEncodeError 방지)
     if user_id_header:
         resp.headers["X-User-Id"] = user_id_header
@@ -167,32 +553,64 @@ async def boost(
 # ============================
 
 @router.post("/from-json")
-async def boost_from_json(req: BoostRequest):
+async def boost_from_json(
+    request: Request,
+    req: BoostRequest,
+    stream: bool = Query(False, description="true면 TTS 청크를 합성되는 대로 스트리밍"),
+    s3: bool = Query(False, description="true면 음성을 백그라운드로 S3에도 업로드"),
+    format: Optional[str] = FORMAT_QUERY,
+    bitrate: Optional[str] = BITRATE_QUERY,
+    sentences: Optional[bool] = SENTENCES_QUERY,
+    job: bool = JOB_QUERY,
+):
     """
     클라이언트/백엔드에서 만든 일기 요약 JSON을 Body로 직접 보내는 버전.
-    LLM으로 응원 멘트를 생성하고, 그 텍스트를 TTS로 읽어서 mp3를 반환한다.
+    LLM으로 응원 멘트를 생성하고, 그 텍스트를 TTS로 읽어서 음성(기본 mp3)을 반환한다.
+    job=true 면 생성은 워커에 맡기고 202 + job_id 만 바로 응답한다.
     """
+    started = time.perf_counter()
+    fmt = _negotiate_format(request, format, bitrate)
+    _require_s3(s3)
     user_id = req.user_id or "anonymous"
     diary = req.data.model_dump()
-
-    boost_text = build_boost_message(user_id=user_id, diary=diary)
-
-    out_dir = get_data_dir()
-    file_name = f"{user_id}_{uuid4().hex}.mp3"
-    out_path = out_dir / file_name
-
-    generate_tts_to_file(boost_text, out_path)
+    if job:
+        return await _enqueue_boost_job(
+            "diary", {"user_id": user_id, "diary": diary, "format": fmt.name, "bitrate": fmt.bitrate, "s3": s3}
+        )
+    digest = diary_digest(diary)
+
+    # 같은 일기 내용으로 동시에 들어온 요청은 한 번만 생성
+    if stream and not fmt.needs_transcode and _use_sentence_stream(sentences, fmt):
+        out_path = new_clip_path(user_id, ext=fmt.ext)
+        s3_key = make_audio_key(user_id, out_path.name) if s3 else None
+        resp = await stream_sentence_audio_response(user_id, diary, out_path, s3_key, fmt, started)
+    elif stream and not fmt.needs_transcode:
+        boost_text = await boost_flight.do(
+            f"diary-text:{digest}",
+            lambda: build_boost_message_async(user_id=user_id, diary=diary),
+        )
+        out_path = new_clip_path(user_id, ext=fmt.ext)
+        s3_key = make_audio_key(user_id, out_path.name) if s3 else None
+        resp = await stream_audio_response(boost_text, out_path, s3_key=s3_key, fmt=fmt, started=started)
+    else:
+        out_path = await boost_flight.do(
+            diary_flight_key(user_id, diary, fmt),
+            lambda: _render_boost_file(user_id, diary, fmt),
+        )
+        s3_key = make_audio_key(user_id, out_path.name) if s3 else None
+        if s3_key:
+            upload_file_to_s3_in_background(out_path, s3_key, fmt.media_type)
+        resp = _audio_file_response(out_path, fmt)
+
+    _set_format_headers(resp, fmt)
+
+    if s3_key:
+        resp.headers["X-Audio-S3-Url"] = public_url(s3_key)
 
     emotion = diary.get("emotion")
     emotion_header = normalize_emotion_for_header(emotion)
     user_id_header = normalize_user_id_for_header(user_id)
 
-    resp = FileResponse(
-        path=str(out_path),
-        media_type="audio/mpeg",
-        filename=file_name,
-    )
-
     # ⚠️ 한글 user_id면 헤더에 넣지 않음
     if user_id_header:
         resp.headers["X-User-Id"] = user_id_header
@@ -210,11 +628,17 @@ async def boost_from_json(req: BoostRequest):
 # ============================
 
 @router.post("/from-json-file")
-async def boost_from_json_file(file: UploadFile = File(..., description="일기 요약 JSON 파일")):
+async def boost_from_json_file(
+    request: Request,
+    file: UploadFile = File(..., description="일기 요약 JSON 파일"),
+    format: Optional[str] = FORMAT_QUERY,
+    bitrate: Optional[str] = BITRATE_QUERY,
+):
     """
     JSON 파일(.json)을 업로드해서 처리하는 버전.
-    LLM으로 응원 멘트를 생성하고, 그 텍스트를 TTS로 읽어서 mp3를 반환한다.
+    LLM으로 응원 멘트를 생성하고, 그 텍스트를 TTS로 읽어서 음성(기본 mp3)을 반환한다.
     """
+    fmt = _negotiate_format(request, format, bitrate)
     if file.content_type not in ("application/json", "text/json", "application/octet-stream"):
         raise HTTPException(status_code=400, detail="JSON 파일을 업로드해주세요.")
 
@@ -232,22 +656,16 @@ async def boost_from_json_file(file: UploadFile = File(..., description="일기
     user_id = req.user_id or "anonymous"
     diary = req.data.model_dump()
 
-    boost_text = build_boost_message(user_id=user_id, diary=diary)
-
-    out_dir = get_data_dir()
-    file_name = f"{user_id}_{uuid4().hex}.mp3"
-    out_path = out_dir / file_name
-
-    generate_tts_to_file(boost_text, out_path)
+    out_path = await boost_flight.do(
+        diary_flight_key(user_id, diary, fmt),
+        lambda: _render_boost_file(user_id, diary, fmt),
+    )
 
     emotion = diary.get("emotion")
     emotion_header = normalize_emotion_for_header(emotion)
 
-    resp = FileResponse(
-        path=str(out_path),
-        media_type="audio/mpeg",
-        filename=file_name,
-    )
+    resp = _audio_file_response(out_path, fmt)
+    _set_format_headers(resp, fmt)
 
     resp.headers["X-Diary-Used"] = "true"
     resp.headers["X-Uploaded-Filename"] = file.filename or ""
@@ -255,3 +673,205 @@ async def boost_from_json_file(file: UploadFile = File(..., description="일기
         resp.headers["X-Emotion"] = emotion_header
 
     return resp
+
+
+# ============================
+# 4) 여러 일기를 한 번에 (batch)
+#    ➜ 항목마다 LLM → TTS 를 동시에 돌리고, 끝나는 대로 NDJSON 한 줄씩 응답
+# ============================
+
+DEFAULT_BATCH_CONFIG: Dict[str, Any] = {
+    "max_items": 200,     # 한 번에 받을 수 있는 일기 수
+    "concurrency": 8,     # 요청 하나 안에서 동시에 처리할 항목 수 (OpenAI 호출은 limiter 가 따로 조절)
+}
+
+
+_batch_cfg: Optional[Dict[str, Any]] = None
+
+
+def _batch_config() -> Dict[str, Any]:
+    # configs/morning_boost.yaml 의 batch 섹션, 요청마다 yaml 을 읽지 않도록 한 번만 읽어 둔다
+    global _batch_cfg
+    if _batch_cfg is None:
+        _batch_cfg = load_section("batch", DEFAULT_BATCH_CONFIG)
+    return _batch_cfg
+
+
+async def _boost_batch_item(index: int, payload: Any, fmt: AudioFormat, s3: bool) -> Dict[str, Any]:
+    """
+    batch 항목 하나 처리. 예외는 전부 여기서 결과(status)로 바꿔서 다른 항목 / 응답 스트림에 번지지 않게 한다.
+    """
+    started = time.perf_counter()
+    result: Dict[str, Any] = {
+        "index": index,
+        "user_id": payload.get("user_id") if isinstance(payload, dict) else None,
+    }
+    try:
+        req = BoostRequest.model_validate(payload)
+    except ValidationError as e:
+        # NDJSON 한 줄에 들어가도록 "필드: 이유" 만 모은다
+        reasons = "; ".join(f"{'.'.join(map(str, err['loc'])) or 'item'}: {err['msg']}" for err in e.errors())
+        return {**result, "status": "invalid", "error": f"요청 JSON 형식이 올바르지 않습니다: {reasons}"}
+
+    user_id = req.user_id or "anonymous"
+    diary = req.data.model_dump()
+    emotion = diary.get("emotion")
+    result.update(user_id=user_id, emotion=emotion, emotion_code=normalize_emotion_for_header(emotion))
+    try:
+        # 항목마다 따로 예산 (batch 응답 전체가 /boost 요청 예산에 묶이지 않게)
+        with request_deadline(float(get_call_policy_config()["job_budget_seconds"])):
+            out_path = await boost_flight.do(
+                diary_flight_key(user_id, diary, fmt),
+                lambda: _render_boost_file(user_id, diary, fmt),
+            )
+        done = {
+            "status": "ok",
+            "audio_url": clip_url(out_path),
+            "format": fmt.variant,
+            "bytes": out_path.stat().st_size,
+        }
+        if s3:
+            s3_key = make_audio_key(user_id, out_path.name)
+            done["s3_url"] = public_url(s3_key)
+            upload_file_to_s3_in_background(out_path, s3_key, fmt.media_type)
+    except OpenAIOverloaded as e:
+        return {**result, "status": "overloaded", "error": str(e), "retry_after": e.retry_after}
+    except DeadlineExceeded as e:
+        return {**result, "status": "timeout", "error": str(e), "stage": e.stage}
+    except Exception as e:
+        print("[boost_batch] item failed:", index, repr(e))
+        return {**result, "status": "error", "error": repr(e)}
+
+    return {**result, **done, "elapsed_ms": round((time.perf_counter() - started) * 1000)}
+
+
+async def run_boost_batch(items: List[Any], fmt: AudioFormat, s3: bool = False, concurrency: int = 8):
+    """
+    items 를 워커 concurrency 개로 나눠 처리하고, 끝나는 순서대로 결과 dict 를 내보낸다.
+    마지막에 요약 한 줄({"done": true, ...})을 붙인다.
+    중간에 끊기면(클라이언트 연결 종료) 남은 워커를 취소한다. (이미 시작된 생성은 single-flight 가 마저 끝낸다)
+    """
+    started = time.perf_counter()
+    results: asyncio.Queue = asyncio.Queue()
+    pending = iter(enumerate(items))
+
+    async def worker() -> None:
+        # 워커들이 같은 iterator 에서 하나씩 꺼내 가므로 동시에 처리되는 항목은 최대 concurrency 개
+        for index, payload in pending:
+            try:
+                result = await _boost_batch_item(index, payload, fmt, s3)
+            except Exception as e:
+                print("[boost_batch] item crashed:", index, repr(e))
+                result = {"index": index, "status": "error", "error": repr(e)}
+            results.put_nowait(result)
+
+    workers = {asyncio.create_task(worker()) for _ in range(max(1, min(concurrency, len(items))))}
+    alive = set(workers)
+    reported: set = set()
+    counts: Dict[str, int] = {}
+    getter: Optional[asyncio.Task] = None
+    try:
+        # 결과 개수를 세며 기다리지 않고 워커 태스크도 같이 본다: 워커가 죽어도 응답이 멈추지 않게
+        while alive or not results.empty():
+            if getter is None:
+                getter = asyncio.ensure_future(results.get())
+            done, _ = await asyncio.wait({getter, *alive}, return_when=asyncio.FIRST_COMPLETED)
+            alive -= done
+            for task in done & workers:
+                if not task.cancelled() and task.exception() is not None:
+                    print("[boost_batch] worker died:", repr(task.exception()))
+            if getter in done:
+                result, getter = getter.result(), None
+                reported.add(result["index"])
+                counts[result["status"]] = counts.get(result["status"], 0) + 1
+                yield result
+        # 죽은 워커가 들고 있던 항목은 error 로 채운다
+        for index in range(len(items)):
+            if index not in reported:
+                counts["error"] = counts.get("error", 0) + 1
+                yield {"index": index, "status": "error", "error": "항목을 처리하던 작업이 중단되었습니다."}
+    finally:
+        if getter is not None:
+            getter.cancel()
+        for task in workers:
+            task.cancel()
+
+    yield {
+        "done": True,
+        "total": len(items),
+        **counts,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000),
+    }
+
+
+@router.post("/batch")
+async def boost_batch(
+    items: List[Any] = Body(..., description="BoostRequest(/boost/from-json 본문) 목록"),
+    s3: bool = Query(False, description="true면 음성을 백그라운드로 S3에도 업로드"),
+    format: Optional[str] = FORMAT_QUERY,
+    bitrate: Optional[str] = BITRATE_QUERY,
+):
+    """
+    여러 사용자의 일기 JSON 을 한 번에 받아 동시에 처리한다 (워커 batch.concurrency 개).
+    응답은 NDJSON: 항목이 끝나는 순서대로 한 줄씩
+        {"index", "user_id", "status": ok | invalid | overloaded | timeout | error, "audio_url", "emotion", ...}
+    마지막 줄은 {"done": true, "total", "ok", ...} 요약.
+    항목 하나가 실패해도 나머지는 계속 처리된다. 음성은 audio_url(/static/morning_boost/...)로 받는다.
+    s3=true 인데 S3 설정(AWS_S3_BUCKET)이 없으면 처리를 시작하지 않고 503.
+    """
+    cfg = _batch_config()
+    if len(items) > int(cfg["max_items"]):
+        raise HTTPException(status_code=413, detail=f"한 번에 최대 {cfg['max_items']}개까지 보낼 수 있습니다.")
+    try:
+        # 응답이 NDJSON 이라 Accept 헤더는 보지 않는다 (쿼리 → 기본값)
+        fmt = negotiate_audio_format(None, format, bitrate)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    _require_s3(s3)
+
+    async def body():
+        async for result in run_boost_batch(items, fmt, s3=s3, concurrency=int(cfg["concurrency"])):
+            yield json.dumps(result, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+
+# ============================
+# 5) 작업 모드 (?job=true) 상태 조회
+# ============================
+
+@router.get("/jobs/stats")
+async def job_stats():
+    """
+    작업 큐 상태: 깊이(queued / running), 가장 오래된 작업 나이, 최근 처리량 / 지연, 살아 있는 워커 수.
+    """
+    window = float(get_job_queue_config()["stats_window_seconds"])
+    return await asyncio.to_thread(get_job_queue().stats, window)
+
+
+@router.get("/jobs/{job_id}")
+async def job_status(
+    job_id: str,
+    wait: float = Query(0, ge=0, description="끝날 때까지 최대 몇 초 기다릴지 (long-poll, 상한 job_queue.long_poll_max_seconds)"),
+):
+    """
+    작업 상태. status = queued | running | done | failed
+    done 이면 result.audio_url(/static/morning_boost/...)로 음성을 받는다.
+    wait 를 주면 끝나거나 wait 초가 지날 때까지 응답을 미룬다. 아직 안 끝났으면 Retry-After 헤더.
+    """
+    queue = get_job_queue()
+    deadline = time.monotonic() + min(wait, float(get_job_queue_config()["long_poll_max_seconds"]))
+    delay = 0.05
+    while True:
+        info = await asyncio.to_thread(queue.get, job_id)
+        if info is None:
+            raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+        remaining = deadline - time.monotonic()
+        if info["status"] in TERMINAL_STATUSES or remaining <= 0:
+            break
+        # 워커는 다른 프로세스라 알림 대신 짧게 시작해서 점점 길게 다시 본다
+        await asyncio.sleep(min(delay, remaining))
+        delay = min(delay * 2, 0.5)
+
+    headers = {} if info["status"] in TERMINAL_STATUSES else {"Retry-After": "1"}
+    return JSONResponse(info, headers=headers)
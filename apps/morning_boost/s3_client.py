@@ -1,12 +1,14 @@
 
 # apps/morning_boost/s3_client.py
 
+import asyncio
 import os
+import threading
 from pathlib import Path
-from typing import Optional
+from urllib.parse import quote
+from typing import AsyncIterator, List, Optional, Set, Tuple
 
-import boto3
-from botocore.exceptions import BotoCoreError, ClientError
+from apps.morning_boost.metrics import stage
 
 
 AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
@@ -14,19 +16,73 @@ AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
 AWS_REGION = os.getenv("AWS_REGION", "ap-northeast-2")
 AWS_S3_BUCKET = os.getenv("AWS_S3_BUCKET")
 AWS_S3_PUBLIC_BASE = os.getenv("AWS_S3_PUBLIC_BASE")  # 선택
+AWS_S3_ENDPOINT_URL = os.getenv("AWS_S3_ENDPOINT_URL")  # 선택 (MinIO / 로컬 테스트용)
+AWS_S3_MAX_POOL = int(os.getenv("AWS_S3_MAX_POOL", "20"))
+AWS_S3_UPLOAD_CONCURRENCY = int(os.getenv("AWS_S3_UPLOAD_CONCURRENCY", "4"))
 
+# S3 multipart 는 마지막 파트를 빼고 최소 5MB
+MIN_PART_SIZE = 5 * 1024 * 1024
 
-if not AWS_S3_BUCKET:
-    raise RuntimeError("AWS_S3_BUCKET 환경변수가 설정되어 있지 않습니다.")
+# tee 업로드가 다음 청크를 기다리는 최대 시간 (응답 스트림이 끝 표시 없이 사라졌을 때 업로드를 정리)
+QUEUE_IDLE_TIMEOUT = float(os.getenv("AWS_S3_QUEUE_IDLE_TIMEOUT", "120"))
 
+_s3 = None
+_s3_lock = threading.Lock()
 
-# 세션 & 클라이언트 생성
-_session = boto3.session.Session(
-    aws_access_key_id=AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-    region_name=AWS_REGION,
-)
-_s3 = _session.client("s3")
+# 백그라운드 업로드 태스크가 GC 되지 않도록 잡아 둔다
+_background_tasks: Set[asyncio.Task] = set()
+
+
+def _require_bucket() -> str:
+    if not AWS_S3_BUCKET:
+        raise RuntimeError("AWS_S3_BUCKET 환경변수가 설정되어 있지 않습니다.")
+    return AWS_S3_BUCKET
+
+
+def check_s3_config() -> None:
+    """
+    s3=true 요청을 시작하기 전에 부른다. 버킷이 없으면(공개 URL 도 못 만듦) RuntimeError.
+    """
+    _require_bucket()
+
+
+def get_s3_client():
+    """
+    S3 클라이언트를 처음 쓸 때 만들어서 재사용한다. (boto3 import 도 이때)
+    boto3 클라이언트는 스레드 간 공유가 가능하고, 내부 커넥션 풀 크기는 AWS_S3_MAX_POOL.
+    """
+    global _s3
+    if _s3 is None:
+        with _s3_lock:
+            if _s3 is None:
+                import boto3
+                from botocore.config import Config
+
+                session = boto3.session.Session(
+                    aws_access_key_id=AWS_ACCESS_KEY_ID,
+                    aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+                    region_name=AWS_REGION,
+                )
+                _s3 = session.client(
+                    "s3",
+                    endpoint_url=AWS_S3_ENDPOINT_URL,
+                    config=Config(max_pool_connections=AWS_S3_MAX_POOL),
+                )
+    return _s3
+
+
+def make_audio_key(user_id: str, file_name: str) -> str:
+    return f"morning_boost/{user_id}/{file_name}"
+
+
+def public_url(key: str) -> str:
+    # 1) CloudFront나 자체 도메인이 있으면 그걸 우선 사용
+    if AWS_S3_PUBLIC_BASE:
+        base = AWS_S3_PUBLIC_BASE.rstrip("/")
+        return f"{base}/{quote(key)}"
+
+    # 2) 없으면 기본 S3 퍼블릭 URL 사용 (버킷이 public-read여야 함)
+    return f"https://{_require_bucket()}.s3.{AWS_REGION}.amazonaws.com/{quote(key)}"
 
 
 def upload_audio_to_s3(local_path: Path, user_id: str) -> str:
@@ -38,22 +94,206 @@ def upload_audio_to_s3(local_path: Path, user_id: str) -> str:
     if not local_path.exists():
         raise FileNotFoundError(local_path)
 
-    key = f"morning_boost/{user_id}/{local_path.name}"
+    key = make_audio_key(user_id, local_path.name)
+
+    from boto3.exceptions import S3UploadFailedError
+    from botocore.exceptions import BotoCoreError, ClientError
 
     try:
-        _s3.upload_file(
-            str(local_path),
-            AWS_S3_BUCKET,
-            key,
-            ExtraArgs={"ContentType": "audio/mpeg"},
-        )
-    except (BotoCoreError, ClientError) as e:
+        with stage("s3_upload"):
+            get_s3_client().upload_file(
+                str(local_path),
+                _require_bucket(),
+                key,
+                ExtraArgs={"ContentType": "audio/mpeg"},
+            )
+    except (BotoCoreError, ClientError, S3UploadFailedError) as e:
+        # upload_file 은 ClientError 를 S3UploadFailedError 로 감싸서 올린다
         raise RuntimeError(f"S3 업로드 실패: {e}") from e
 
-    # 1) CloudFront나 자체 도메인이 있으면 그걸 우선 사용
-    if AWS_S3_PUBLIC_BASE:
-        base = AWS_S3_PUBLIC_BASE.rstrip("/")
-        return f"{base}/{key}"
+    return public_url(key)
 
-    # 2) 없으면 기본 S3 퍼블릭 URL 사용 (버킷이 public-read여야 함)
-    return f"https://{AWS_S3_BUCKET}.s3.{AWS_REGION}.amazonaws.com/{key}"
+
+class S3MultipartUpload:
+    """
+    청크를 받는 대로 S3 multipart 업로드로 밀어 넣는 writer.
+    MIN_PART_SIZE 만큼 모이면 파트 하나를 올리고, complete() 에서 나머지를 마지막 파트로 올린다.
+    전체가 한 파트도 안 되는 작은 파일(보통의 아침 응원 mp3)은 multipart 를 만들지 않고 put_object 한 번으로 끝낸다.
+    """
+
+    def __init__(self, key: str, content_type: str = "audio/mpeg"):
+        self.key = key
+        self.content_type = content_type
+        self.bucket = _require_bucket()
+        self._s3 = get_s3_client()
+        self._buffer = bytearray()
+        self._parts: List[dict] = []
+        self._next_part = 1
+        self.upload_id: Optional[str] = None
+        self.bytes_uploaded = 0
+
+    @property
+    def pending_bytes(self) -> int:
+        return len(self._buffer)
+
+    def append(self, chunk: bytes) -> None:
+        self._buffer.extend(chunk)
+
+    def start(self) -> None:
+        if self.upload_id is None:
+            resp = self._s3.create_multipart_upload(
+                Bucket=self.bucket, Key=self.key, ContentType=self.content_type
+            )
+            self.upload_id = resp["UploadId"]
+
+    def take_part(self) -> Tuple[int, bytes]:
+        part_number = self._next_part
+        self._next_part += 1
+        body = bytes(self._buffer)
+        self._buffer.clear()
+        return part_number, body
+
+    def upload_part(self, part_number: int, body: bytes) -> None:
+        resp = self._s3.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            PartNumber=part_number,
+            Body=body,
+        )
+        self._parts.append({"PartNumber": part_number, "ETag": resp["ETag"]})
+        self.bytes_uploaded += len(body)
+
+    def write(self, chunk: bytes) -> None:
+        self.append(chunk)
+        if self.pending_bytes >= MIN_PART_SIZE:
+            self.start()
+            self.upload_part(*self.take_part())
+
+    def complete(self) -> str:
+        if self.upload_id is None:
+            body = bytes(self._buffer)
+            self._s3.put_object(
+                Bucket=self.bucket, Key=self.key, Body=body, ContentType=self.content_type
+            )
+            self.bytes_uploaded += len(body)
+            self._buffer.clear()
+            return public_url(self.key)
+
+        if self._buffer:
+            self.upload_part(*self.take_part())
+        self._s3.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            MultipartUpload={"Parts": sorted(self._parts, key=lambda p: p["PartNumber"])},
+        )
+        return public_url(self.key)
+
+    def abort(self) -> None:
+        if self.upload_id is None:
+            return
+        from botocore.exceptions import BotoCoreError, ClientError
+
+        try:
+            self._s3.abort_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self.upload_id
+            )
+        except (BotoCoreError, ClientError) as e:
+            print("[S3 abort ERROR]", repr(e))
+
+
+async def stream_to_s3(
+    chunks: AsyncIterator[bytes],
+    key: str,
+    concurrency: int = AWS_S3_UPLOAD_CONCURRENCY,
+    content_type: str = "audio/mpeg",
+) -> str:
+    """
+    비동기 청크 스트림을 로컬 파일 없이 바로 S3 로 보낸다.
+
+    boto3 호출은 스레드에서 실행해서 이벤트 루프를 막지 않고,
+    파트는 최대 concurrency 개까지 동시에 올린다. (메모리는 대략 concurrency x 5MB 까지)
+    """
+    with stage("s3_upload"):
+        return await _stream_to_s3(chunks, key, concurrency, content_type)
+
+
+async def _stream_to_s3(chunks: AsyncIterator[bytes], key: str, concurrency: int, content_type: str) -> str:
+    upload = await asyncio.to_thread(S3MultipartUpload, key, content_type)
+    slots = asyncio.Semaphore(max(1, concurrency))
+    pending: Set[asyncio.Task] = set()
+
+    async def send_part(part_number: int, body: bytes) -> None:
+        try:
+            await asyncio.to_thread(upload.upload_part, part_number, body)
+        finally:
+            slots.release()
+
+    try:
+        async for chunk in chunks:
+            upload.append(chunk)
+            if upload.pending_bytes < MIN_PART_SIZE:
+                continue
+            if upload.upload_id is None:
+                await asyncio.to_thread(upload.start)
+            await slots.acquire()
+            pending.add(asyncio.create_task(send_part(*upload.take_part())))
+        if pending:
+            await asyncio.gather(*pending)
+        return await asyncio.to_thread(upload.complete)
+    except BaseException:
+        # 이미 스레드에서 돌고 있는 파트 업로드가 끝난 뒤에 abort 해야 파트가 남지 않는다
+        await asyncio.gather(*pending, return_exceptions=True)
+        await asyncio.to_thread(upload.abort)
+        raise
+
+
+def start_background_s3_upload(
+    chunks: AsyncIterator[bytes],
+    key: str,
+    content_type: str = "audio/mpeg",
+) -> asyncio.Task:
+    """
+    stream_to_s3 를 백그라운드 태스크로 실행. HTTP 응답은 업로드를 기다리지 않는다.
+    """
+    async def run() -> Optional[str]:
+        try:
+            url = await stream_to_s3(chunks, key, content_type=content_type)
+            print("[S3 upload done]", url)
+            return url
+        except Exception as e:
+            print("[S3 upload ERROR]", key, repr(e))
+            return None
+
+    task = asyncio.create_task(run())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+async def iter_file_chunks(path: Path, chunk_size: int = 1024 * 1024) -> AsyncIterator[bytes]:
+    """
+    이미 저장된 파일을 청크 스트림으로 (파일 읽기는 스레드에서).
+    """
+    f = await asyncio.to_thread(open, path, "rb")
+    try:
+        while chunk := await asyncio.to_thread(f.read, chunk_size):
+            yield chunk
+    finally:
+        f.close()
+
+
+async def queue_chunks(queue: "asyncio.Queue", idle_timeout: float = QUEUE_IDLE_TIMEOUT) -> AsyncIterator[bytes]:
+    """
+    tee 용 큐를 청크 스트림으로 바꾼다.
+    None 이 오면 정상 종료, 예외 객체가 오면 그 예외를 던져서 업로드를 중단(abort)한다.
+    idle_timeout 초 동안 아무것도 안 오면(보내는 쪽이 사라짐) TimeoutError 로 중단한다.
+    """
+    while True:
+        item = await asyncio.wait_for(queue.get(), idle_timeout)
+        if item is None:
+            return
+        if isinstance(item, BaseException):
+            raise item
+        yield item
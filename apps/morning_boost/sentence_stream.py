@@ -0,0 +1,192 @@
+# apps/morning_boost/sentence_stream.py
+"""
+LLM 스트리밍 → 문장 단위 TTS 파이프라인.
+
+예전 스트리밍(/boost?stream=true)은 LLM 멘트가 다 만들어진 뒤에야 TTS 를 시작해서
+첫 소리까지 "LLM 전체 생성 시간 + TTS 첫 청크" 가 걸린다.
+여기서는 LLM 출력을 조각(delta)으로 받으면서 문장이 끝날 때마다 바로 TTS 를 시작하고,
+문장별 음성을 순서대로 이어서 흘려보낸다 → 첫 소리까지 "첫 문장 생성 + TTS 첫 청크".
+
+- 첫 조각은 짧게(first_min_chars), 그 뒤는 몇 문장씩 묶어서(min_chars) 보낸다
+  (TTS 호출 수를 줄이고, 문장 사이 억양이 너무 끊기지 않게)
+- 다음 조각 TTS 는 앞 조각을 재생(전송)하는 동안 미리 시작한다 (최대 tts_lookahead 개 동시)
+- 조각 음성을 바이트 그대로 이어 붙이므로 이어 붙여도 재생되는 포맷(mp3 / aac / pcm)만 가능
+- 조각별 음성은 TTS 캐시에 따로 들어간다 (같은 멘트를 다시 만들면 같은 조각 → 캐시 hit)
+
+설정: configs/morning_boost.yaml 의 sentence_stream 섹션.
+"""
+
+import asyncio
+import os
+import re
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from apps.morning_boost.prompt_engine import stream_boost_message_async
+from apps.morning_boost.tts_engine import ensure_output_dir, stream_tts_async
+from apps.morning_boost.utils import load_section
+
+DEFAULT_SENTENCE_STREAM_CONFIG: Dict[str, Any] = {
+    "enabled": False,        # true 면 stream=true 요청은 기본으로 문장 단위 파이프라인 (?sentences= 로 요청마다 바꿀 수 있음)
+    "first_min_chars": 8,    # 첫 조각 최소 글자 수 (짧을수록 첫 소리가 빠름)
+    "min_chars": 60,         # 이후 조각 최소 글자 수 (문장 몇 개씩 묶음)
+    "max_chars": 300,        # 문장 끝이 안 나와도 이 길이를 넘으면 공백에서 자른다
+    "tts_lookahead": 2,      # 동시에 합성해 둘 조각 수
+}
+
+# 문장 끝(. ! ? … ~ 。) 뒤 공백, 또는 줄바꿈. 뒤에 공백이 와야 끝으로 본다 ("3.5" 같은 숫자는 안 자름)
+_SENTENCE_END = re.compile(r"(?<=[.!?…~。])\s+|\n+")
+
+_config: Optional[Dict[str, Any]] = None
+
+
+def load_sentence_stream_config() -> Dict[str, Any]:
+    return load_section("sentence_stream", DEFAULT_SENTENCE_STREAM_CONFIG)
+
+
+def get_sentence_stream_config() -> Dict[str, Any]:
+    global _config
+    if _config is None:
+        _config = load_sentence_stream_config()
+    return _config
+
+
+class SentenceSplitter:
+    """
+    텍스트 조각을 받아서 완성된 문장(묶음)을 돌려주는 증분 분리기.
+
+        splitter = SentenceSplitter()
+        for delta in deltas:
+            for segment in splitter.feed(delta): ...
+        for segment in splitter.flush(): ...
+    """
+
+    def __init__(self, first_min_chars: int = 8, min_chars: int = 60, max_chars: int = 300):
+        self.min_chars = first_min_chars
+        self.next_min_chars = min_chars
+        self.max_chars = max_chars
+        self._buffer = ""
+
+    @classmethod
+    def from_config(cls, cfg: Dict[str, Any]) -> "SentenceSplitter":
+        return cls(int(cfg["first_min_chars"]), int(cfg["min_chars"]), int(cfg["max_chars"]))
+
+    def _emit(self, end: int, resume: int) -> str:
+        segment = self._buffer[:end].strip()
+        self._buffer = self._buffer[resume:]
+        self.min_chars = self.next_min_chars
+        return segment
+
+    def feed(self, delta: str) -> List[str]:
+        self._buffer += delta
+        segments = []
+        while True:
+            cut = None
+            for match in _SENTENCE_END.finditer(self._buffer):
+                if len(self._buffer[:match.start()].strip()) >= self.min_chars:
+                    cut = match
+                    break
+            if cut is not None:
+                segments.append(self._emit(cut.start(), cut.end()))
+                continue
+            if len(self._buffer) > self.max_chars:
+                # 문장 끝 없이 너무 길면 max_chars 안쪽 마지막 공백에서 자른다
+                space = self._buffer.rfind(" ", 0, self.max_chars)
+                end = space if space > 0 else self.max_chars
+                segments.append(self._emit(end, end))
+                continue
+            return [s for s in segments if s]
+
+    def flush(self) -> List[str]:
+        segment = self._buffer.strip()
+        self._buffer = ""
+        return [segment] if segment else []
+
+
+async def stream_boost_segments_async(
+    user_id: str,
+    diary: Optional[Dict[str, Any]],
+    cfg: Optional[Dict[str, Any]] = None,
+) -> AsyncIterator[str]:
+    """
+    응원 멘트를 LLM 스트리밍으로 받으면서 문장(묶음)이 완성될 때마다 내보낸다.
+    """
+    splitter = SentenceSplitter.from_config(cfg or get_sentence_stream_config())
+    async for delta in stream_boost_message_async(user_id=user_id, diary=diary):
+        for segment in splitter.feed(delta):
+            yield segment
+    for segment in splitter.flush():
+        yield segment
+
+
+async def stream_boost_audio_async(
+    user_id: str,
+    diary: Optional[Dict[str, Any]],
+    tee_path: Optional[Path] = None,
+    format: str = "mp3",
+    cfg: Optional[Dict[str, Any]] = None,
+) -> AsyncIterator[bytes]:
+    """
+    LLM 스트리밍 → 문장 단위 TTS → 음성 청크를 순서대로 내보내는 비동기 제너레이터.
+
+    조각마다 TTS 작업을 바로 띄우고(최대 tts_lookahead 개 동시), 출력은 조각 순서를 지킨다.
+    tee_path 를 주면 이어 붙인 음성을 .part 에 쓰다가 끝까지 성공했을 때만 tee_path 로 옮긴다.
+    중간에 끊기거나(클라이언트 종료) 에러가 나면 남은 LLM / TTS 작업을 취소한다.
+    """
+    cfg = cfg or get_sentence_stream_config()
+    lookahead = asyncio.Semaphore(max(1, int(cfg["tts_lookahead"])))
+    # 조각 순서대로 "그 조각의 청크 큐" 를 넣는다. 끝나면 None, 실패하면 예외 객체
+    segments: asyncio.Queue = asyncio.Queue()
+    tasks: List[asyncio.Task] = []
+
+    async def synthesize(text: str, out: asyncio.Queue) -> None:
+        try:
+            async for chunk in stream_tts_async(text, format=format):
+                out.put_nowait(chunk)
+            out.put_nowait(None)
+        except Exception as e:
+            out.put_nowait(e)
+        finally:
+            lookahead.release()
+
+    async def produce() -> None:
+        try:
+            async for segment in stream_boost_segments_async(user_id, diary, cfg):
+                await lookahead.acquire()
+                out: asyncio.Queue = asyncio.Queue()
+                tasks.append(asyncio.create_task(synthesize(segment, out)))
+                segments.put_nowait(out)
+            segments.put_nowait(None)
+        except Exception as e:
+            segments.put_nowait(e)
+
+    part_path: Optional[Path] = None
+    out_file = None
+    if tee_path is not None:
+        ensure_output_dir(tee_path)
+        part_path = tee_path.with_name(tee_path.name + ".part")
+        out_file = open(part_path, "wb")
+
+    producer = asyncio.create_task(produce())
+    completed = False
+    try:
+        while (chunks := await segments.get()) is not None:
+            if isinstance(chunks, Exception):
+                raise chunks
+            while (chunk := await chunks.get()) is not None:
+                if isinstance(chunk, Exception):
+                    raise chunk
+                if out_file is not None:
+                    out_file.write(chunk)
+                yield chunk
+        completed = True
+    finally:
+        producer.cancel()
+        for task in tasks:
+            task.cancel()
+        if out_file is not None:
+            out_file.close()
+            if completed:
+                os.replace(part_path, tee_path)
+            else:
+                part_path.unlink(missing_ok=True)
@@ -0,0 +1,60 @@
+# apps/morning_boost/singleflight.py
+"""
+동시 요청 합치기 (single-flight).
+
+같은 키로 동시에 들어온 요청은 파이프라인을 한 번만 실행하고 결과를 같이 받는다.
+(예: 앱이 /boost?user_id=X 를 두 번 연달아 쏘는 경우)
+이미 끝난 결과를 보관하지는 않는다 — 그건 캐시(tts_cache / text_cache)의 몫.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+from apps.morning_boost.metrics import SINGLEFLIGHT_TOTAL
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name      # /metrics 의 flight 라벨
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.calls = 0        # do() 호출 수
+        self.executions = 0   # 실제로 fn 을 실행한 수
+        self.coalesced = 0    # 다른 요청의 실행 결과를 같이 받은 수
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        key 로 진행 중인 실행이 있으면 그 결과를 기다리고, 없으면 fn() 을 실행한다.
+        fn 에서 난 예외는 기다리던 요청 모두에게 그대로 전달된다.
+        """
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._forget(k, t))
+            SINGLEFLIGHT_TOTAL.inc(self.name, "executed")
+        else:
+            self.coalesced += 1
+            SINGLEFLIGHT_TOTAL.inc(self.name, "coalesced")
+
+        # 한 요청이 끊겨도(cancel) 공유 실행은 계속되도록 shield
+        return await asyncio.shield(task)
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._inflight
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 기다리던 요청이 모두 취소된 경우에도 "exception was never retrieved" 경고가 안 나게
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._inflight),
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+        }
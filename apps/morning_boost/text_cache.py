@@ -0,0 +1,193 @@
+# apps/morning_boost/text_cache.py
+"""
+최종 응원 멘트 텍스트 캐시.
+
+같은 날, 같은 일기 내용, 같은 모델이면 LLM 을 다시 부르지 않고 이전 멘트를 돌려준다.
+(예: 앱이 /boost 후 /boost/from-json 을 또 부르거나, 클라이언트가 재시도할 때)
+
+- 키: build_boost_prompt 가 실제로 쓰는 일기 필드의 digest + 날짜 + 모델
+- TTL: 날짜가 바뀌는 순간(자정) 만료
+- 저장소: memory(프로세스 내) / disk(data/cache/boost_text, 워커 간 공유)
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from apps.morning_boost.utils import get_cache_dir, load_section
+
+# build_boost_prompt 가 프롬프트에 넣는 필드 (draw / ai_draw_reply 는 안 씀)
+PROMPT_FIELDS = ("emotion", "write_diary", "file_summation", "ai_reply")
+
+DEFAULT_TEXT_CACHE_CONFIG: Dict[str, Any] = {
+    "enabled": True,
+    "backend": "memory",   # memory | disk
+}
+
+
+def diary_digest(diary: Optional[Dict[str, Any]]) -> str:
+    """
+    프롬프트에 영향을 주는 일기 필드만 뽑아서 안정적인 해시를 만든다.
+    diary 가 None 이면 '일기 없음' 프롬프트라 고정 digest.
+    """
+    if diary is None:
+        fields: Any = None
+    else:
+        fields = {name: diary.get(name) for name in PROMPT_FIELDS}
+        fields["write_diary"] = fields["write_diary"] or ""
+        fields["file_summation"] = list(fields["file_summation"] or [])
+    raw = json.dumps(fields, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def make_text_key(diary: Optional[Dict[str, Any]], model: str, day: Optional[date] = None) -> str:
+    day = day or date.today()
+    raw = f"{day.isoformat()}|{model}|{diary_digest(diary)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def next_midnight(now: Optional[datetime] = None) -> float:
+    now = now or datetime.now()
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return midnight.timestamp()
+
+
+class MemoryTextCacheBackend:
+    """
+    프로세스 내 dict 저장소. 워커마다 따로 가진다.
+    """
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at <= time.time():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key: str, value: str, expires_at: float) -> None:
+        with self._lock:
+            now = time.time()
+            # 하루에 한 번꼴로 만료된 항목 정리
+            if self._data and next(iter(self._data.values()))[1] <= now:
+                self._data = {k: v for k, v in self._data.items() if v[1] > now}
+            self._data[key] = (value, expires_at)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class DiskTextCacheBackend:
+    """
+    data/cache/boost_text/{YYYY-MM-DD}/{key}.json 저장소.
+    여러 uvicorn 워커가 같이 쓸 수 있고, 지난 날짜 디렉토리는 쓰기 시점에 지운다.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def _path(self, key: str, expires_at: float) -> Path:
+        # 만료 시각(다음 자정)의 전날 = 캐시가 유효한 날짜
+        day = (datetime.fromtimestamp(expires_at) - timedelta(seconds=1)).date()
+        return self.root / day.isoformat() / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key, next_midnight())
+        try:
+            item = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if item["expires_at"] <= time.time():
+            return None
+        return item["value"]
+
+    def set(self, key: str, value: str, expires_at: float) -> None:
+        path = self._path(key, expires_at)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=".tmp-", dir=path.parent)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"value": value, "expires_at": expires_at}, f, ensure_ascii=False)
+        os.replace(tmp_name, path)
+        self._purge_old_days(path.parent.name)
+
+    def _purge_old_days(self, today: str) -> None:
+        for child in self.root.iterdir():
+            if child.is_dir() and child.name < today:
+                shutil.rmtree(child, ignore_errors=True)
+
+    def __len__(self) -> int:
+        today_dir = self.root / date.today().isoformat()
+        return len(list(today_dir.glob("*.json"))) if today_dir.exists() else 0
+
+
+class BoostTextCache:
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+
+    def get(self, diary: Optional[Dict[str, Any]], model: str) -> Optional[str]:
+        value = self.backend.get(make_text_key(diary, model))
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, diary: Optional[Dict[str, Any]], model: str, text: str) -> None:
+        self.backend.set(make_text_key(diary, model), text, next_midnight())
+        with self._lock:
+            self.sets += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "backend": type(self.backend).__name__,
+                "entries": len(self.backend),
+                "hits": self.hits,
+                "misses": self.misses,
+                "sets": self.sets,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+_cache: Optional[BoostTextCache] = None
+_cache_initialized = False
+
+
+def get_text_cache() -> Optional[BoostTextCache]:
+    """
+    configs/morning_boost.yaml 의 boost_text_cache 섹션으로 만든 전역 캐시.
+    enabled: false 면 None.
+    """
+    global _cache, _cache_initialized
+    if not _cache_initialized:
+        cfg = load_section("boost_text_cache", DEFAULT_TEXT_CACHE_CONFIG)
+        if cfg["enabled"]:
+            if cfg["backend"] == "disk":
+                backend = DiskTextCacheBackend(get_cache_dir("boost_text"))
+            elif cfg["backend"] == "memory":
+                backend = MemoryTextCacheBackend()
+            else:
+                raise ValueError(f"알 수 없는 boost_text_cache.backend: {cfg['backend']}")
+            _cache = BoostTextCache(backend)
+        _cache_initialized = True
+    return _cache
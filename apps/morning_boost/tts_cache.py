@@ -0,0 +1,168 @@
+# apps/morning_boost/tts_cache.py
+"""
+TTS 음성 파일 캐시 (content-addressed).
+
+(text, model, voice, format) 의 해시를 키로 합성 결과를 디스크에 보관해서,
+같은 멘트를 다시 요청하면 OpenAI TTS 를 부르지 않고 바로 돌려준다.
+
+- 용량 상한(max_bytes) 초과 시 가장 오래 안 쓴 파일부터 삭제 (LRU)
+- 임시 파일에 쓴 뒤 os.replace 로 옮기므로 동시에 써도 깨진 파일이 보이지 않음
+- hit / miss / eviction 카운터
+- 캐시 파일을 응답용 파일로 내줄 때는 복사한다. 하드링크로 공유하면 캐시에서 지워도 공간이 안 돌아오고,
+  한쪽 mtime 을 건드리면 다른 쪽(보관 기간 정리) 나이도 바뀐다.
+- 최근 사용 순서는 프로세스 메모리(인덱스)에만 있다. 파일 mtime 은 건드리지 않으므로 재시작하면 쓴 순서부터 다시 시작.
+- 인덱스 / max_bytes 는 프로세스마다 따로다. 앱 워커 N 개 + 작업 큐 워커가 같은 디렉토리를 쓰면
+  각자 자기가 본 파일만 세고 지우므로, 디스크 사용량은 최대 대략 프로세스 수 × max_bytes 까지 갈 수 있다.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from apps.morning_boost.utils import get_cache_dir, load_section
+
+DEFAULT_CACHE_CONFIG: Dict[str, Any] = {
+    "enabled": True,
+    "max_bytes": 512 * 1024 * 1024,
+}
+
+
+def copy_clip(src: Path, dst: Path) -> None:
+    # 하드링크 대신 실제 복사: 캐시 / 보관 정리가 서로의 파일(inode)을 건드리지 않게
+    shutil.copyfile(src, dst)
+
+
+class TTSCache:
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # 파일명 → 크기, 앞쪽일수록 오래 안 쓴 항목
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._load_index()
+
+    @staticmethod
+    def make_key(text: str, model: str, voice: str, format: str) -> str:
+        raw = json.dumps([text, model, voice, format], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str, format: str) -> Path:
+        # 한 디렉토리에 파일이 몰리지 않도록 앞 두 글자로 샤딩
+        return self.root / key[:2] / f"{key}.{format}"
+
+    def _load_index(self) -> None:
+        entries = []
+        for path in self.root.glob("*/*"):
+            if path.is_file() and not path.name.startswith("."):
+                st = path.stat()
+                entries.append((st.st_mtime, path.name, st.st_size))
+        for _, name, size in sorted(entries):
+            self._index[name] = size
+            self._bytes += size
+
+    def get(self, key: str, format: str) -> Optional[Path]:
+        """
+        캐시된 파일 경로 반환. 없으면 None.
+        다른 워커 프로세스가 써 둔 파일도 디스크에 있으면 hit 으로 본다.
+        """
+        path = self.path_for(key, format)
+        with self._lock:
+            if path.exists():
+                self.hits += 1
+                if path.name not in self._index:
+                    size = path.stat().st_size
+                    self._index[path.name] = size
+                    self._bytes += size
+                self._index.move_to_end(path.name)
+                return path
+
+            self.misses += 1
+            self._index.pop(path.name, None)
+            return None
+
+    def mark_missing(self, key: str, format: str) -> None:
+        """
+        get 이 돌려준 파일을 읽기 전에 다른 요청이 evict 해서 없어졌을 때. hit 을 miss 로 고쳐 센다.
+        """
+        name = self.path_for(key, format).name
+        with self._lock:
+            self.hits -= 1
+            self.misses += 1
+            self._bytes -= self._index.pop(name, 0)
+
+    def put_file(self, key: str, format: str, src: Path, move: bool = False) -> Path:
+        """
+        src 파일을 캐시에 넣는다. move=True 면 src 를 옮기고, 아니면 복사한다.
+        """
+        path = self.path_for(key, format)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_name = tempfile.mkstemp(prefix=".tmp-", dir=path.parent)
+        os.close(fd)
+        tmp_path = Path(tmp_name)
+        try:
+            if move:
+                os.replace(src, tmp_path)
+            else:
+                tmp_path.unlink()
+                copy_clip(src, tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        size = path.stat().st_size
+        with self._lock:
+            self._bytes -= self._index.pop(path.name, 0)
+            self._index[path.name] = size
+            self._bytes += size
+            self._evict_locked()
+        return path
+
+    def _evict_locked(self) -> None:
+        while self._bytes > self.max_bytes and len(self._index) > 1:
+            name, size = self._index.popitem(last=False)
+            self._bytes -= size
+            (self.root / name[:2] / name).unlink(missing_ok=True)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._index),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+_cache: Optional[TTSCache] = None
+_cache_initialized = False
+
+
+def get_tts_cache() -> Optional[TTSCache]:
+    """
+    configs/morning_boost.yaml 의 tts_cache 섹션으로 만든 전역 캐시.
+    enabled: false 면 None.
+    """
+    global _cache, _cache_initialized
+    if not _cache_initialized:
+        cfg = load_section("tts_cache", DEFAULT_CACHE_CONFIG)
+        if cfg["enabled"]:
+            _cache = TTSCache(get_cache_dir("tts"), int(cfg["max_bytes"]))
+        _cache_initialized = True
+    return _cache
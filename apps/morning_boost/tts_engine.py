@@ -1,49 +1,301 @@
+import asyncio
 import os
+import tempfile
+import time
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, BinaryIO, Optional, Tuple
+from uuid import uuid4
 import traceback
 
-from dotenv import load_dotenv
-from openai import OpenAI
+from apps.morning_boost.audio_format import AudioFormat, transcode_pcm_async
+from apps.morning_boost.call_policy import attempt_client, call_with_policy, timeout_client
+from apps.morning_boost.clients import get_async_openai_client, get_openai_client, load_env
+from apps.morning_boost.metrics import observe_stage, stage
+from apps.morning_boost.openai_limiter import openai_slot, openai_slot_async
+from apps.morning_boost.tts_cache import TTSCache, copy_clip, get_tts_cache
 
-# .env 파일 로드
-BASE_DIR = Path(__file__).resolve().parents[2]
-load_dotenv(BASE_DIR / ".env")
 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini-tts")
-OPENAI_VOICE = os.getenv("TTS_VOICE", "alloy")
+CACHE_READ_CHUNK = 64 * 1024
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+
+def voice_settings() -> Tuple[str, str]:
+    """
+    (TTS 모델, 보이스). .env 는 import 때가 아니라 처음 부를 때 읽는다.
+    """
+    load_env()
+    return os.getenv("OPENAI_MODEL", "gpt-4o-mini-tts"), os.getenv("TTS_VOICE", "alloy")
 
 
 def ensure_output_dir(path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
 
 
+def _lookup_cache(
+    text: str,
+    format: str,
+    use_cache: bool,
+    variant: Optional[str] = None,
+) -> Tuple[Optional[TTSCache], Optional[str], Optional[Path]]:
+    """
+    (캐시, 키, 캐시된 파일 경로) 반환. 캐시를 안 쓰면 (None, None, None).
+    variant 는 같은 포맷의 다른 비트레이트를 구분하는 이름 (예: opus-24k), 없으면 format.
+    """
+    cache = get_tts_cache() if use_cache else None
+    if cache is None:
+        return None, None, None
+    model, voice = voice_settings()
+    key = TTSCache.make_key(text, model, voice, variant or format)
+    return cache, key, cache.get(key, format)
+
+
+def _copy_cached(cache: TTSCache, key: str, format: str, cached: Path, dst: Path) -> bool:
+    """
+    캐시 파일을 dst 로 복사. get 과 복사 사이에 다른 요청이 evict 해서 없어졌으면 False (miss 로 처리).
+    """
+    try:
+        with stage("disk_write"):
+            copy_clip(cached, dst)
+    except FileNotFoundError:
+        cache.mark_missing(key, format)
+        return False
+    return True
+
+
+def _open_cached(
+    cache: TTSCache,
+    key: str,
+    format: str,
+    cached: Path,
+    tee_path: Optional[Path],
+) -> Optional[BinaryIO]:
+    """
+    캐시 파일을 (tee_path 가 있으면 거기로 복사한 뒤 그 복사본을) 연다. 없어졌으면 None.
+    연 뒤에는 캐시에서 지워져도 끝까지 읽을 수 있다.
+    """
+    if tee_path is None:
+        try:
+            return open(cached, "rb")
+        except FileNotFoundError:
+            cache.mark_missing(key, format)
+            return None
+    ensure_output_dir(tee_path)
+    if not _copy_cached(cache, key, format, cached, tee_path):
+        return None
+    return open(tee_path, "rb")
+
+
+class _TimedFile:
+    """
+    파일 쓰기에 걸린 시간만 따로 모은다. (TTS 스트림 수신과 섞여 있어서 disk_write 단계를 분리하려고)
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.seconds = 0.0
+
+    def write(self, chunk: bytes) -> None:
+        started = time.perf_counter()
+        self.f.write(chunk)
+        self.seconds += time.perf_counter() - started
+
+
 def generate_tts_to_file(
     text: str,
     output_path: Path,
     format: str = "mp3",
+    use_cache: bool = True,
 ) -> Path:
 
     ensure_output_dir(output_path)
 
-    with client.audio.speech.with_streaming_response.create(
-        model=OPENAI_MODEL,
-        voice=OPENAI_VOICE,
-        input=text,
-        response_format=format,   # ← 최신 SDK에서 필수
-    ) as resp:
-        resp.stream_to_file(output_path)
+    with stage("tts") as s:
+        # 같은 (text, model, voice, format) 은 캐시에서 바로 꺼낸다
+        cache, key, cached = _lookup_cache(text, format, use_cache)
+        if cached is not None and _copy_cached(cache, key, format, cached, output_path):
+            s.outcome = "cache_hit"
+            return output_path
+
+        model, voice = voice_settings()
+        with openai_slot(model), timeout_client(get_openai_client(), "tts").audio.speech.with_streaming_response.create(
+            model=model,
+            voice=voice,
+            input=text,
+            response_format=format,   # ← 최신 SDK에서 필수
+        ) as resp, open(output_path, "wb") as f:
+            out = _TimedFile(f)
+            for chunk in resp.iter_bytes():
+                out.write(chunk)
+
+    started = time.perf_counter()
+    if cache is not None:
+        cache.put_file(key, format, output_path)
+    observe_stage("disk_write", out.seconds + time.perf_counter() - started)
 
     return output_path
 
 
+async def generate_tts_to_file_async(
+    text: str,
+    output_path: Path,
+    format: str = "mp3",
+    use_cache: bool = True,
+    bitrate: Optional[str] = None,
+) -> Path:
+    """
+    generate_tts_to_file 의 비동기 버전.
+    음성 스트림을 받는 동안 이벤트 루프를 막지 않는다.
+
+    bitrate 를 주면 OpenAI 에서 pcm 원본을 받아 로컬에서 format/bitrate 로 인코딩한다 (audio_format).
+    """
+    if bitrate is not None:
+        return await _generate_transcoded_async(text, output_path, AudioFormat(format, bitrate), use_cache)
+
+    ensure_output_dir(output_path)
+
+    with stage("tts") as s:
+        cache, key, cached = _lookup_cache(text, format, use_cache)
+        if cached is not None and await asyncio.to_thread(_copy_cached, cache, key, format, cached, output_path):
+            s.outcome = "cache_hit"
+            return output_path
+
+        model, voice = voice_settings()
+
+        async def attempt(timeout: Optional[float]) -> _TimedFile:
+            # 재시도 / hedge 시도마다 자기 임시 파일에 받고, 끝까지 받은 쪽만 output_path 로 옮긴다
+            part = output_path.with_name(f"{output_path.name}.{uuid4().hex[:8]}.part")
+            try:
+                async with openai_slot_async(model), attempt_client(timeout).audio.speech.with_streaming_response.create(
+                    model=model,
+                    voice=voice,
+                    input=text,
+                    response_format=format,
+                ) as resp:
+                    with open(part, "wb") as f:
+                        out = _TimedFile(f)
+                        async for chunk in resp.iter_bytes():
+                            out.write(chunk)
+                os.replace(part, output_path)
+                return out
+            finally:
+                part.unlink(missing_ok=True)
+
+        out = await call_with_policy("tts", attempt)
+
+    started = time.perf_counter()
+    if cache is not None:
+        cache.put_file(key, format, output_path)
+    observe_stage("disk_write", out.seconds + time.perf_counter() - started)
+
+    return output_path
+
+
+async def _generate_transcoded_async(
+    text: str,
+    output_path: Path,
+    fmt: AudioFormat,
+    use_cache: bool,
+) -> Path:
+    ensure_output_dir(output_path)
+
+    cache, key, cached = _lookup_cache(text, fmt.ext, use_cache, variant=fmt.variant)
+    if cached is not None and await asyncio.to_thread(_copy_cached, cache, key, fmt.ext, cached, output_path):
+        return output_path
+
+    # pcm 원본도 캐시에 남겨서 다른 비트레이트 요청은 OpenAI 를 다시 부르지 않는다
+    source = output_path.with_name(output_path.name + ".pcm")
+    try:
+        await generate_tts_to_file_async(text, source, format="pcm", use_cache=use_cache)
+        await transcode_pcm_async(source, output_path, fmt)
+    finally:
+        source.unlink(missing_ok=True)
+
+    if cache is not None:
+        with stage("disk_write"):
+            cache.put_file(key, fmt.ext, output_path)
+    return output_path
+
+
+async def stream_tts_async(
+    text: str,
+    tee_path: Optional[Path] = None,
+    format: str = "mp3",
+    use_cache: bool = True,
+) -> AsyncIterator[bytes]:
+    """
+    OpenAI 음성 스트림을 받는 즉시 청크 단위로 흘려보내는 비동기 제너레이터.
+    전체 합성이 끝날 때까지 기다리지 않으므로 첫 바이트가 훨씬 빨리 나간다.
+
+    tee_path 를 주면 같은 청크를 디스크에도 저장한다.
+    중간 파일(.part)에 쓰다가 스트림이 끝까지 성공했을 때만 tee_path 로 옮기고,
+    클라이언트가 끊기거나 에러가 나면 중간 파일은 지운다.
+
+    TTS 캐시에 있으면 캐시 파일을 그대로 흘려보내고,
+    없으면 스트림이 끝까지 성공했을 때 결과를 캐시에 넣는다.
+    """
+    with stage("tts") as s:
+        cache, key, cached = _lookup_cache(text, format, use_cache)
+        # 파일 복사 / 읽기는 스레드에서 (이벤트 루프를 막지 않게)
+        cf = None
+        if cached is not None:
+            cf = await asyncio.to_thread(_open_cached, cache, key, format, cached, tee_path)
+        if cf is not None:
+            s.outcome = "cache_hit"
+            try:
+                while chunk := await asyncio.to_thread(cf.read, CACHE_READ_CHUNK):
+                    yield chunk
+            finally:
+                cf.close()
+            return
+
+        part_path: Optional[Path] = None
+        out: Optional[_TimedFile] = None
+        if tee_path is not None:
+            ensure_output_dir(tee_path)
+            part_path = tee_path.with_name(tee_path.name + ".part")
+            out = _TimedFile(open(part_path, "wb"))
+        elif cache is not None:
+            # 디스크 저장은 안 해도 캐시에는 넣어야 하므로 캐시 디렉토리에 임시로 받는다
+            fd, tmp_name = tempfile.mkstemp(prefix=".tmp-", dir=cache.root)
+            part_path = Path(tmp_name)
+            out = _TimedFile(os.fdopen(fd, "wb"))
+
+        model, voice = voice_settings()
+        completed = False
+        try:
+            # 스트림이 끝날 때까지 자리를 잡고 있는다
+            tts_client = timeout_client(get_async_openai_client(), "tts")
+            async with openai_slot_async(model), tts_client.audio.speech.with_streaming_response.create(
+                model=model,
+                voice=voice,
+                input=text,
+                response_format=format,
+            ) as resp:
+                async for chunk in resp.iter_bytes():
+                    if out is not None:
+                        out.write(chunk)
+                    yield chunk
+            completed = True
+        finally:
+            if out is not None:
+                out.f.close()
+                if not completed:
+                    part_path.unlink(missing_ok=True)
+                else:
+                    started = time.perf_counter()
+                    if tee_path is not None:
+                        os.replace(part_path, tee_path)
+                        if cache is not None:
+                            cache.put_file(key, format, tee_path)
+                    else:
+                        cache.put_file(key, format, part_path, move=True)
+                    observe_stage("disk_write", out.seconds + time.perf_counter() - started)
+
+
 def ping_openai() -> bool:
     tmp_path = Path("tmp_ping_tts.mp3")
     try:
-        generate_tts_to_file("테스트입니다.", tmp_path)
+        # 연결 확인이 목적이므로 캐시를 거치지 않는다
+        generate_tts_to_file("테스트입니다.", tmp_path, use_cache=False)
         tmp_path.unlink(missing_ok=True)
         return True
     except Exception as e:
@@ -2,13 +2,22 @@
 공용 유틸 함수들.
 """
 
+import hashlib
+from datetime import date
 from pathlib import Path
+from typing import Any, Dict, Optional
+from uuid import uuid4
+
 import yaml
 
 # maum/ 기준
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 CONFIG_DIR = PROJECT_ROOT / "configs"
 DATA_DIR = PROJECT_ROOT / "data" / "morning_boost"
+CACHE_DIR = PROJECT_ROOT / "data" / "cache"
+
+# create_app 의 StaticFiles 마운트 경로 (DATA_DIR 이 여기에 그대로 매핑됨)
+STATIC_PREFIX = "/static/morning_boost"
 
 
 def load_config(name: str = "morning_boost.yaml") -> dict:
@@ -23,9 +32,56 @@ def load_config(name: str = "morning_boost.yaml") -> dict:
         return yaml.safe_load(f) or {}
 
 
+def load_section(name: str, defaults: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    configs/morning_boost.yaml 의 name 섹션을 defaults 위에 덮어써서 반환 (defaults 는 고치지 않는다).
+    하위 dict 까지 합쳐야 하는 섹션(call_policy)은 각 모듈에서 따로 합친다.
+    """
+    cfg = dict(defaults)
+    cfg.update(load_config().get(name) or {})
+    return cfg
+
+
 def get_data_dir() -> Path:
     """
     mp3 파일 저장 디렉토리 반환 (없으면 생성)
     """
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     return DATA_DIR
+
+
+def get_shard_dir(user_id: str, day: Optional[date] = None) -> Path:
+    """
+    생성된 음성 파일을 날짜 / user 해시 기준으로 나눠 담는 디렉토리 (없으면 생성)
+    예: data/morning_boost/20251101/3f/
+    한 디렉토리에 파일이 계속 쌓이지 않도록 하고, 날짜 단위로 지우기 쉽게 한다.
+    """
+    day = day or date.today()
+    user_hash = hashlib.sha1(str(user_id).encode("utf-8")).hexdigest()[:2]
+    path = get_data_dir() / day.strftime("%Y%m%d") / user_hash
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def new_clip_path(user_id: str, ext: str = "mp3", day: Optional[date] = None) -> Path:
+    """
+    새 음성 파일 경로: {shard}/{user_id}_{uuid}.{ext}
+    """
+    return get_shard_dir(user_id, day) / f"{user_id}_{uuid4().hex}.{ext}"
+
+
+def clip_url(path: Path) -> str:
+    """
+    DATA_DIR 아래 파일의 정적 URL. (예: /static/morning_boost/20251101/3f/xxx.mp3)
+    예전 평평한 구조의 파일도 그대로 /static/morning_boost/xxx.mp3 로 나온다.
+    """
+    return f"{STATIC_PREFIX}/{path.relative_to(DATA_DIR).as_posix()}"
+
+
+def get_cache_dir(name: str) -> Path:
+    """
+    캐시 저장 디렉토리 반환 (data/cache/{name}, 없으면 생성)
+    """
+    path = CACHE_DIR / name
+    path.mkdir(parents=True, exist_ok=True)
+    return path
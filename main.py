@@ -1,11 +1,25 @@
+from apps.morning_boost.clients import load_env
+
+# 아래 모듈들이 import 시점에 환경 변수(BACKEND_URL, AWS_*, STT_*)를 읽으므로 제일 먼저
+load_env()
+
 from fastapi import FastAPI
 
+from apps.morning_boost.app_setup import install_common
+from apps.morning_boost.clip_http import ClipStaticFiles
+from apps.morning_boost.lifespan import morning_boost_lifespan
 from apps.morning_boost.router import router as boost_router
+from apps.morning_boost.utils import STATIC_PREFIX, get_data_dir
 from stt_diary.src.api.stt_diary_router import router as stt_router
 
-app = FastAPI(title="Maum-on Unified API")
+app = FastAPI(title="Maum-on Unified API", lifespan=morning_boost_lifespan)
+
+# /diary/stt 업로드 상한, /metrics, /boost 요청 예산(504), OpenAI 과부하(503), 일기 조회 장애(502)
+install_common(app)
 
 app.include_router(boost_router)
+# /boost/batch 결과의 audio_url (/static/morning_boost/...) 을 여기서 바로 받을 수 있게
+app.mount(STATIC_PREFIX, ClipStaticFiles(directory=str(get_data_dir())), name="morning_boost_static")
 app.include_router(stt_router)
 
 @app.get("/health")
@@ -0,0 +1,131 @@
+# scripts/bench/audio_formats.py
+"""
+/boost 음성 포맷별 크기 / 서버 처리 시간 / 다운로드 시간 비교.
+
+가짜 OpenAI 가 음성 비슷한 pcm(24kHz 16bit mono, 기본 30초)을 돌려주게 하고
+통합 앱(main.app)의 POST /boost/from-json 을 포맷/비트레이트마다 불러서
+- bytes       : 응답 본문 크기 (클립 하나)
+- cold_ms     : 처음 요청 (pcm 원본은 캐시돼 있고 인코딩만 새로, 프로세스 풀에서)
+- warm_ms     : 같은 요청 다시 (포맷별 TTS 캐시 hit)
+- 다운로드 시간 : 네트워크 프로필별 어림값 (RTT x 2 + bytes / 대역폭)
+을 출력한다.
+
+가짜 서버는 포맷과 무관하게 pcm 을 돌려주므로 OpenAI 가 직접 만드는 포맷(비트레이트 없음)은 재지 않고,
+서버 인코딩 경로(?format=...&bitrate=...)만 잰다. mp3 128k 가 지금 기본 mp3 와 비슷한 기준선이다.
+ffmpeg 가 PATH 에 있어야 한다 (pydub 인코딩).
+
+실행 (프로젝트 루트에서):
+    python -m scripts.bench.audio_formats
+    python -m scripts.bench.audio_formats --seconds 45 --variants opus-24k,aac-48k,mp3-64k
+"""
+
+import argparse
+import math
+import os
+import random
+import time
+from array import array
+from typing import Dict, List, Tuple
+from uuid import uuid4
+
+from scripts.bench.fake_servers import create_fake_openai_app, serve_in_thread
+
+DEFAULT_VARIANTS = "mp3-128k,mp3-64k,aac-64k,aac-32k,opus-32k,opus-24k,opus-16k"
+
+# (이름, 대역폭 Mbps, RTT 초)
+NETWORKS: Tuple[Tuple[str, float, float], ...] = (
+    ("3g", 1.5, 0.15),
+    ("lte", 10.0, 0.05),
+    ("wifi", 50.0, 0.02),
+)
+
+
+def make_speech_like_pcm(seconds: float, rate: int = 24000, seed: int = 0) -> bytes:
+    """
+    음성 비슷한 신호: 음절(약 4Hz) 단위로 켜졌다 꺼지는 배음 + 잡음, 문장 사이 쉼.
+    무음이나 순수 사인파는 인코더가 너무 잘 압축해서 실제 크기와 동떨어진다.
+    """
+    rng = random.Random(seed)
+    samples = array("h")
+    n = int(seconds * rate)
+    phase = 0.0
+    f0 = 160.0
+    for i in range(n):
+        t = i / rate
+        if i % (rate // 4) == 0:
+            # 음절마다 음높이를 조금씩 바꾸고, 가끔 쉰다
+            f0 = rng.uniform(110, 240)
+            voiced = rng.random() > 0.15
+        syllable = math.sin(math.pi * ((t * 4) % 1.0)) if voiced else 0.0
+        phase += 2 * math.pi * f0 / rate
+        tone = math.sin(phase) + 0.5 * math.sin(2 * phase) + 0.25 * math.sin(3 * phase) + 0.12 * math.sin(5 * phase)
+        noise = rng.uniform(-1, 1) * (0.15 if voiced else 0.01)
+        samples.append(int(max(-1.0, min(1.0, 0.35 * syllable * tone + noise * 0.3)) * 32767))
+    return samples.tobytes()
+
+
+def _diary(tag: str) -> Dict[str, object]:
+    return {
+        "user_id": "bench",
+        "code": 200,
+        "message": "ok",
+        "data": {"emotion": "행복", "write_diary": f"{tag} 산책을 했다.", "file_summation": [], "ai_reply": None},
+    }
+
+
+def _download_ms(size: int, mbps: float, rtt: float) -> float:
+    return (2 * rtt + size * 8 / (mbps * 1_000_000)) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="음성 포맷별 크기 / 다운로드 시간 비교")
+    parser.add_argument("--seconds", type=float, default=30.0, help="클립 길이")
+    parser.add_argument("--variants", default=DEFAULT_VARIANTS, help="format-bitrate 목록 (쉼표 구분)")
+    parser.add_argument("--tts-latency", type=float, default=0.5)
+    parser.add_argument("--openai-port", type=int, default=18592)
+    parser.add_argument("--app-port", type=int, default=18593)
+    args = parser.parse_args()
+
+    import httpx
+
+    pcm = make_speech_like_pcm(args.seconds)
+    fake = create_fake_openai_app(llm_latency=0.05, tts_latency=args.tts_latency, tts_audio=pcm)
+
+    with serve_in_thread(fake, args.openai_port) as openai_url:
+        os.environ["OPENAI_BASE_URL"] = f"{openai_url}/v1"
+        os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+        from main import app
+
+        with serve_in_thread(app, args.app_port) as app_url, httpx.Client(base_url=app_url, timeout=120) as http:
+            payload = _diary(uuid4().hex[:8])
+            # pcm 원본 캐시 + 프로세스 풀 기동을 먼저 해 둔다 (포맷 간 비교를 공정하게)
+            http.post("/boost/from-json", params={"format": "mp3", "bitrate": "32k"}, json=payload).raise_for_status()
+
+            rows: List[Tuple[str, int, float, float]] = [("pcm (원본)", len(pcm), 0.0, 0.0)]
+            for variant in args.variants.split(","):
+                name, bitrate = variant.split("-")
+                params = {"format": name, "bitrate": bitrate}
+                timings = []
+                for _ in range(2):
+                    started = time.perf_counter()
+                    resp = http.post("/boost/from-json", params=params, json=payload)
+                    resp.raise_for_status()
+                    timings.append((time.perf_counter() - started) * 1000)
+                rows.append((variant, len(resp.content), timings[0], timings[1]))
+
+            accept = http.post("/boost/from-json", headers={"Accept": "audio/ogg"}, json=payload)
+            print(f"Accept: audio/ogg → {accept.headers['content-type']} ({accept.headers['x-audio-format']})")
+
+    header = f"{'variant':>12} {'bytes':>9} {'kbps':>6} {'cold_ms':>8} {'warm_ms':>8}"
+    header += "".join(f" {name + '_ms':>8}" for name, _, _ in NETWORKS)
+    print(f"clip {args.seconds:.0f}s")
+    print(header)
+    for variant, size, cold, warm in rows:
+        kbps = size * 8 / args.seconds / 1000
+        line = f"{variant:>12} {size:>9} {kbps:>6.0f} {cold:>8.0f} {warm:>8.0f}"
+        line += "".join(f" {_download_ms(size, mbps, rtt):>8.0f}" for _, mbps, rtt in NETWORKS)
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
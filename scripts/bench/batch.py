@@ -0,0 +1,156 @@
+# scripts/bench/batch.py
+"""
+POST /boost/batch vs /boost/from-json 단건 호출 N 번.
+
+가짜 OpenAI(LLM / TTS 지연 고정)를 띄우고 통합 앱(main.app)에 같은 개수의 서로 다른 일기를
+- serial   : 백엔드가 지금처럼 사용자마다 /boost/from-json 을 차례로 호출
+- parallel : 단건 호출을 클라이언트에서 batch.concurrency 개씩 동시에 (batch 와 같은 동시성)
+- batch    : /boost/batch 한 번 (NDJSON 으로 끝나는 대로 받음) + 그 뒤 audio_url 로 음성 내려받기
+로 보내고 전체 시간 / 첫 결과까지 시간 / HTTP 요청 수 / 받은 바이트를 비교한다.
+batch 에는 형식이 틀린 항목을 --invalid 개 섞어서 나머지가 영향 없이 처리되는지도 본다.
+
+모드마다 일기 내용을 다르게 해서 캐시 hit 이 섞이지 않게 하고,
+가짜 서버 지연만 보려고 OpenAI rate limiter 는 끈다.
+
+실행 (프로젝트 루트에서):
+    python -m scripts.bench.batch
+    python -m scripts.bench.batch --items 100 --llm-latency 0.8 --tts-latency 1.5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, List
+
+from scripts.bench.fake_servers import create_fake_openai_app, serve_in_thread
+
+
+def _payload(tag: str, i: int) -> Dict[str, Any]:
+    return {
+        "user_id": f"batch{i}",
+        "code": 200,
+        "message": "ok",
+        "data": {
+            "emotion": ("행복", "슬픔", "분노")[i % 3],
+            "write_diary": f"[{tag}-{i}] 오늘은 공원을 산책했다.",
+            "file_summation": ["산책"],
+        },
+    }
+
+
+async def _singles(http, items: List[Dict[str, Any]], concurrency: int) -> Dict[str, Any]:
+    semaphore = asyncio.Semaphore(concurrency)
+    first: List[float] = []
+    received = 0
+    started = time.perf_counter()
+
+    async def one(payload: Dict[str, Any]) -> None:
+        nonlocal received
+        async with semaphore:
+            resp = await http.post("/boost/from-json", json=payload)
+            resp.raise_for_status()
+            received += resp.num_bytes_downloaded
+            first.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one(p) for p in items))
+    return {
+        "total_s": round(time.perf_counter() - started, 2),
+        "first_ms": round(min(first) * 1000),
+        "requests": len(items),
+        "bytes": received,
+    }
+
+
+async def _batch(http, items: List[Any], concurrency: int) -> Dict[str, Any]:
+    started = time.perf_counter()
+    first_ms = None
+    results: List[Dict[str, Any]] = []
+    summary: Dict[str, Any] = {}
+    received = 0
+    async with http.stream("POST", "/boost/batch", json=items) as resp:
+        resp.raise_for_status()
+        async for line in resp.aiter_lines():
+            if not line:
+                continue
+            row = json.loads(line)
+            if row.get("done"):
+                summary = row
+                continue
+            if first_ms is None:
+                first_ms = round((time.perf_counter() - started) * 1000)
+            results.append(row)
+        received += resp.num_bytes_downloaded
+    batch_s = time.perf_counter() - started
+
+    # 결과의 audio_url 로 음성 받기 (단건 호출은 응답 본문에 음성이 같이 오므로 공정하게 포함)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def download(url: str) -> int:
+        async with semaphore:
+            r = await http.get(url)
+            r.raise_for_status()
+            return r.num_bytes_downloaded
+
+    urls = [r["audio_url"] for r in results if r["status"] == "ok"]
+    received += sum(await asyncio.gather(*(download(u) for u in urls)))
+    return {
+        "total_s": round(time.perf_counter() - started, 2),
+        "batch_s": round(batch_s, 2),
+        "first_ms": first_ms,
+        "requests": 1 + len(urls),
+        "bytes": received,
+        "summary": {k: v for k, v in summary.items() if k not in ("done", "elapsed_ms")},
+    }
+
+
+async def _run(url: str, args: argparse.Namespace) -> None:
+    import httpx
+
+    limits = httpx.Limits(max_connections=args.concurrency + 4)
+    async with httpx.AsyncClient(base_url=url, timeout=300, limits=limits) as http:
+        run = time.time_ns()
+        modes = {
+            "serial": lambda: _singles(http, [_payload(f"s{run}", i) for i in range(args.items)], 1),
+            "parallel": lambda: _singles(http, [_payload(f"p{run}", i) for i in range(args.items)], args.concurrency),
+            "batch": lambda: _batch(
+                http,
+                [_payload(f"b{run}", i) for i in range(args.items)] + [{"user_id": "broken"}] * args.invalid,
+                args.concurrency,
+            ),
+        }
+        for name in args.modes.split(","):
+            print(f"[{name:>8}] {await modes[name]()}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="/boost/batch vs 단건 호출 N 번")
+    parser.add_argument("--items", type=int, default=40)
+    parser.add_argument("--invalid", type=int, default=2, help="batch 에 섞을 형식 오류 항목 수")
+    parser.add_argument("--llm-latency", type=float, default=0.4)
+    parser.add_argument("--tts-latency", type=float, default=0.6)
+    parser.add_argument("--modes", default="serial,parallel,batch")
+    parser.add_argument("--openai-port", type=int, default=18595)
+    parser.add_argument("--app-port", type=int, default=18596)
+    args = parser.parse_args()
+
+    fake = create_fake_openai_app(llm_latency=args.llm_latency, tts_latency=args.tts_latency)
+    with serve_in_thread(fake, args.openai_port) as openai_url:
+        os.environ["OPENAI_BASE_URL"] = f"{openai_url}/v1"
+        os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+        from apps.morning_boost import router
+        from apps.morning_boost.openai_limiter import set_openai_limiter
+        from main import app
+
+        set_openai_limiter(None)
+        # parallel 모드도 서버의 batch 동시성과 같게
+        args.concurrency = int(router._batch_config()["concurrency"])
+
+        print(f"items={args.items} concurrency={args.concurrency} llm={args.llm_latency}s tts={args.tts_latency}s")
+        with serve_in_thread(app, args.app_port) as app_url:
+            asyncio.run(_run(app_url, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# scripts/bench/boost_concurrency.py
+"""
+/boost 동시성 벤치마크.
+
+로컬 가짜 OpenAI / 백엔드 서버를 띄운 뒤, 통합 앱(main.py)을 uvicorn 워커 1개로 실행하고
+동시에 보내는 요청 수(in-flight)를 늘려 가며 처리량(req/s)을 잰다.
+파이프라인이 이벤트 루프를 막지 않는다면 처리량이 in-flight 수에 비례해서 늘어난다.
+
+실행 (프로젝트 루트에서):
+    python -m scripts.bench.boost_concurrency --levels 1,2,4,8,16
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from uuid import uuid4
+
+from scripts.bench.fake_servers import (
+    create_fake_backend_app,
+    create_fake_openai_app,
+    serve_in_thread,
+)
+
+
+async def _drive(base_url: str, concurrency: int, rounds: int) -> float:
+    import httpx
+
+    total = concurrency * rounds
+    # 실행마다 다른 user_id 를 써서 TTS 캐시 hit 이 섞이지 않게 한다
+    run_tag = uuid4().hex[:8]
+    sem = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as http:
+
+        async def one(i: int) -> None:
+            async with sem:
+                resp = await http.get("/boost", params={"user_id": f"bench_{run_tag}_{i}"})
+                resp.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total)))
+        elapsed = time.perf_counter() - started
+
+    return total / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="/boost 동시성 벤치마크")
+    parser.add_argument("--levels", default="1,2,4,8,16", help="in-flight 요청 수 목록")
+    parser.add_argument("--rounds", type=int, default=2, help="레벨마다 in-flight 수 × rounds 만큼 요청")
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--tts-latency", type=float, default=0.5)
+    parser.add_argument("--backend-latency", type=float, default=0.05)
+    parser.add_argument("--port", type=int, default=18080)
+    args = parser.parse_args()
+
+    levels = [int(x) for x in args.levels.split(",") if x]
+
+    openai_app = create_fake_openai_app(llm_latency=args.llm_latency, tts_latency=args.tts_latency)
+    backend_app = create_fake_backend_app(latency=args.backend_latency)
+
+    with serve_in_thread(openai_app, args.port + 1) as openai_url, \
+            serve_in_thread(backend_app, args.port + 2) as backend_url:
+        # 앱 모듈이 import 시점에 환경변수를 읽으므로 import 전에 세팅
+        os.environ["OPENAI_API_KEY"] = "sk-bench"
+        os.environ["OPENAI_BASE_URL"] = f"{openai_url}/v1"
+        os.environ["BACKEND_URL"] = backend_url
+
+        from main import app
+
+        with serve_in_thread(app, args.port) as app_url:
+            ideal = 1 / (args.backend_latency + args.llm_latency + args.tts_latency)
+            print(f"single request ideal: {ideal:.2f} req/s")
+            print(f"{'in-flight':>10} {'req/s':>10} {'scaling':>10}")
+            base = None
+            for level in levels:
+                rps = asyncio.run(_drive(app_url, level, args.rounds))
+                base = base or rps
+                print(f"{level:>10} {rps:>10.2f} {rps / base:>9.1f}x")
+
+            import httpx
+
+            print("backend pool:", httpx.get(f"{app_url}/boost/pool-stats").json())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# scripts/bench/boost_pool.py
+"""
+일기 없는 사용자 아침 몰림: 사용자별 생성(pool off) vs 하루치 풀(pool on).
+
+가짜 백엔드는 user_id 가 nd 로 시작하면 "일기 없음"으로 응답하고, 가짜 OpenAI 는 LLM / TTS 지연을 흉내 낸다.
+모드마다 새 프로세스에서(텍스트 캐시 / 풀이 빈 상태) --clients 명이 동시에 GET /boost 를 부르고
+- 지연 p50 / p95, 끝날 때까지 시간
+- LLM(responses) / TTS(speech) 호출 수
+- 받은 음성 파일 종류 수 (풀이면 변형 수, 사용자별 생성이면 사용자 수)
+를 비교한다. on 은 기동 직후 refresher 가 풀을 만드는 중에 몰린 요청(생성을 같이 기다림)이고,
+--warm 이면 풀이 다 만들어진 뒤에 요청을 보낸다.
+
+실행 (프로젝트 루트에서):
+    python -m scripts.bench.boost_pool
+    python -m scripts.bench.boost_pool --clients 300 --warm
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+from uuid import uuid4
+
+from scripts.bench.fake_servers import create_fake_backend_app, create_fake_openai_app, serve_in_thread
+
+
+from scripts.bench.stats import percentile
+async def _wave(url: str, n: int, run: str, warm: bool) -> Dict[str, Any]:
+    import httpx
+
+    latencies: List[float] = []
+    files = set()
+    errors = 0
+
+    async with httpx.AsyncClient(base_url=url, timeout=120, limits=httpx.Limits(max_connections=n + 4)) as http:
+        if warm and (await http.get("/boost/cache-stats")).json()["boost_pool"]["enabled"]:
+            while not (await http.get("/boost/cache-stats")).json()["boost_pool"].get("today_ready"):
+                await asyncio.sleep(0.1)
+
+        async def one(i: int) -> None:
+            nonlocal errors
+            t0 = time.perf_counter()
+            resp = await http.get("/boost", params={"user_id": f"nd_{run}_{i}"})
+            latencies.append(time.perf_counter() - t0)
+            if resp.status_code != 200:
+                errors += 1
+                return
+            files.add(resp.headers.get("content-disposition"))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(n)))
+        total = time.perf_counter() - started
+        pool = (await http.get("/boost/cache-stats")).json()["boost_pool"]
+
+    return {
+        "total_s": round(total, 2),
+        "p50_s": round(percentile(latencies, 0.5), 2),
+        "p95_s": round(percentile(latencies, 0.95), 2),
+        "errors": errors,
+        "distinct_clips": len(files),
+        "pool_hits": pool.get("hits", 0),
+        "pool_not_ready": pool.get("not_ready", 0),
+    }
+
+
+def _run_mode(args: argparse.Namespace) -> None:
+    """
+    한 모드만 이 프로세스에서 실행하고 결과를 JSON 한 줄로 출력.
+    """
+    run = uuid4().hex[:8]
+    # 실행마다 멘트가 달라지게 해서 디스크 TTS 캐시가 이전 실행 결과로 hit 하지 않게 한다
+    openai_app = create_fake_openai_app(
+        llm_latency=args.llm_latency,
+        llm_text=f"좋은 아침이에요. 오늘도 천천히 시작해 봐요. [{run}]",
+        tts_latency=args.tts_latency,
+    )
+    backend_app = create_fake_backend_app(latency=0.02, no_diary_prefix="nd")
+
+    with serve_in_thread(openai_app, args.port + 1) as openai_url, \
+            serve_in_thread(backend_app, args.port + 2) as backend_url:
+        os.environ["OPENAI_API_KEY"] = "sk-bench"
+        os.environ["OPENAI_BASE_URL"] = f"{openai_url}/v1"
+        os.environ["BACKEND_URL"] = backend_url
+
+        from apps.morning_boost.boost_pool import BoostPool, set_boost_pool
+        from apps.morning_boost.utils import get_data_dir
+        from main import app
+
+        if args.mode == "on":
+            pool = BoostPool(get_data_dir() / f"pool-bench-{run}", variants=args.variants)
+            set_boost_pool(pool)
+        else:
+            set_boost_pool(None)
+
+        with serve_in_thread(app, args.port) as app_url:
+            result = asyncio.run(_wave(app_url, args.clients, run, args.warm))
+        result["llm_calls"] = openai_app.state.calls["responses"]
+        result["tts_calls"] = openai_app.state.calls["speech"]
+
+        if args.mode == "on":
+            import shutil
+
+            shutil.rmtree(pool.root, ignore_errors=True)
+    print(json.dumps(result))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="일기 없는 사용자 풀 on/off 비교")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--variants", type=int, default=8)
+    parser.add_argument("--llm-latency", type=float, default=1.5)
+    parser.add_argument("--tts-latency", type=float, default=1.0)
+    parser.add_argument("--warm", action="store_true", help="on: 풀이 다 만들어진 뒤에 요청")
+    parser.add_argument("--mode", choices=("off", "on"), help="한 모드만 (내부용, 없으면 둘 다 새 프로세스로)")
+    parser.add_argument("--port", type=int, default=18640)
+    args = parser.parse_args()
+
+    if args.mode:
+        _run_mode(args)
+        return
+
+    print(
+        f"clients={args.clients} variants={args.variants} llm={args.llm_latency}s tts={args.tts_latency}s "
+        f"warm={args.warm}"
+    )
+    forwarded = list(sys.argv[1:])
+    for mode in ("off", "on"):
+        out = subprocess.run(
+            [sys.executable, "-m", "scripts.bench.boost_pool", *forwarded, "--mode", mode],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        print(f"[{mode:>3}] {out.stdout.strip().splitlines()[-1]}")
+
+
+if __name__ == "__main__":
+    main()
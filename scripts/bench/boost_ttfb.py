@@ -0,0 +1,114 @@
+# scripts/bench/boost_ttfb.py
+"""
+/boost 첫 바이트(= 첫 소리)까지 걸리는 시간(TTFB) 비교.
+
+- file      : 멘트 생성 → TTS 파일 저장 → 응답
+- stream    : 멘트 생성(전체) → TTS 청크를 합성되는 대로 스트리밍
+- sentences : LLM 스트리밍 → 문장 단위로 바로 TTS → 순서대로 스트리밍 (sentence_stream.py)
+
+가짜 OpenAI 는 약 30초 분량 멘트를 --llm-ttft 뒤부터 --llm-latency 가 다 될 때까지 조각으로 보내고,
+TTS 는 "호출당 --tts-latency + 글자당 --tts-latency-per-char" 로 합성 시간을 흉내 낸다
+(문장 단위로 나눠 불러도 총 합성량은 같게).
+
+실행 (프로젝트 루트에서):
+    python -m scripts.bench.boost_ttfb
+    python -m scripts.bench.boost_ttfb --llm-latency 6 --tts-latency-per-char 0.02
+"""
+
+import argparse
+import os
+import statistics
+import time
+from uuid import uuid4
+
+from scripts.bench.fake_servers import (
+    create_fake_backend_app,
+    create_fake_openai_app,
+    serve_in_thread,
+)
+
+# 말했을 때 약 30초 분량
+BOOST_SENTENCES = (
+    "좋은 아침이에요.",
+    "어제는 회의가 길어져서 많이 지치셨을 것 같아요.",
+    "그래도 퇴근길에 친구와 통화하면서 마음이 조금 풀렸다니 정말 다행이에요.",
+    "힘든 하루 속에서도 스스로를 달랠 방법을 찾았다는 건 큰 힘이에요.",
+    "오늘은 출근 전에 물 한 잔을 천천히 마시면서 하루를 시작해 보면 어떨까요?",
+    "그리고 점심시간에 십 분만이라도 햇빛을 보며 걸어 보세요.",
+    "작은 쉼이 오후의 기분을 꽤 많이 바꿔 줄 거예요.",
+    "오늘 하루도 너무 완벽하려고 애쓰지 않아도 괜찮아요.",
+    "지금 이 순간을 시작한 것만으로도 충분히 잘하고 있어요.",
+    "가벼운 마음으로, 천천히 출발해 봐요.",
+)
+# 문장마다 요청별 해시를 넣어서 반복 측정 때 문장 단위 TTS 캐시 hit 이 섞이지 않게 한다
+BOOST_SCRIPT = " ".join(f"{{digest}} {sentence}" for sentence in BOOST_SENTENCES)
+
+MODES = {
+    "file": {"stream": "false"},
+    "stream": {"stream": "true", "sentences": "false"},
+    "sentences": {"stream": "true", "sentences": "true"},
+}
+
+
+def _measure(app_url: str, mode: str, repeat: int, calls) -> tuple:
+    import httpx
+
+    # 실행/모드마다 다른 user_id 를 써서 TTS / 멘트 캐시 hit 이 섞이지 않게 한다
+    run_tag = uuid4().hex[:8]
+
+    ttfb, total, speech = [], [], []
+    with httpx.Client(base_url=app_url, timeout=120) as http:
+        for i in range(repeat):
+            before = calls["speech"]
+            started = time.perf_counter()
+            params = {"user_id": f"ttfb_{run_tag}_{i}", **MODES[mode]}
+            with http.stream("GET", "/boost", params=params) as resp:
+                resp.raise_for_status()
+                first = None
+                for _ in resp.iter_bytes():
+                    if first is None:
+                        first = time.perf_counter() - started
+            ttfb.append(first)
+            total.append(time.perf_counter() - started)
+            speech.append(calls["speech"] - before)
+    return statistics.median(ttfb), statistics.median(total), statistics.median(speech)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="/boost TTFB 비교")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--llm-latency", type=float, default=4.0, help="멘트 전체 생성 시간")
+    parser.add_argument("--llm-ttft", type=float, default=0.4, help="첫 토큰까지 시간")
+    parser.add_argument("--tts-latency", type=float, default=0.4, help="TTS 호출당 고정 시간")
+    parser.add_argument("--tts-latency-per-char", type=float, default=0.01)
+    parser.add_argument("--modes", default="file,stream,sentences")
+    parser.add_argument("--port", type=int, default=18180)
+    args = parser.parse_args()
+
+    openai_app = create_fake_openai_app(
+        llm_latency=args.llm_latency,
+        llm_text=BOOST_SCRIPT,
+        llm_ttft=args.llm_ttft,
+        tts_latency=args.tts_latency,
+        tts_latency_per_char=args.tts_latency_per_char,
+    )
+    backend_app = create_fake_backend_app(latency=0.05)
+
+    with serve_in_thread(openai_app, args.port + 1) as openai_url, \
+            serve_in_thread(backend_app, args.port + 2) as backend_url:
+        os.environ["OPENAI_API_KEY"] = "sk-bench"
+        os.environ["OPENAI_BASE_URL"] = f"{openai_url}/v1"
+        os.environ["BACKEND_URL"] = backend_url
+
+        from main import app
+
+        with serve_in_thread(app, args.port) as app_url:
+            print(f"script={len(BOOST_SCRIPT)} chars, llm={args.llm_latency}s (ttft {args.llm_ttft}s)")
+            print(f"{'mode':>10} {'ttfb(s)':>10} {'total(s)':>10} {'tts_calls':>10}")
+            for mode in args.modes.split(","):
+                ttfb, total, speech = _measure(app_url, mode, args.repeat, openai_app.state.calls)
+                print(f"{mode:>10} {ttfb:>10.3f} {total:>10.3f} {speech:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# scripts/bench/clip_http.py
+"""
+음성 파일 HTTP 캐시 / Range 전송량 비교 (apps/morning_boost/clip_http.py).
+ETag / 304 / Range 동작 자체는 tests/test_clip_http.py 에서 확인한다.
+
+재생 시나리오(앞 30% 듣다 멈춤 → 이어 듣기 → 50~70% 다시 듣기 → 다음 날 두 번 더 재생)에서
+검증자/Range 없이 매번 전체를 받는 클라이언트와, ETag + Range 를 쓰는 클라이언트가 실제로 받은 바이트를 비교한다.
+
+실행 (프로젝트 루트에서):
+    python -m scripts.bench.clip_http
+    python -m scripts.bench.clip_http --size 960000
+"""
+
+import argparse
+import random
+
+from scripts.bench.fake_servers import serve_in_thread
+
+
+def _replay_scenario(http, url: str, size: int) -> None:
+    """
+    같은 클립을 여러 번 듣는 동안 실제로 받은 바이트 (본문 기준).
+    """
+    cut = lambda fraction: int(size * fraction)  # noqa: E731
+    steps = [
+        ("앞 30% 듣고 멈춤", (0, cut(0.3))),
+        ("이어 듣기", (cut(0.3), size)),
+        ("50~70% 다시 듣기", (cut(0.5), cut(0.7))),
+        ("다음 날 재생", None),
+        ("한 번 더 재생", None),
+    ]
+    naive = smart = 0
+    etag = None
+    print("replay scenario")
+    for name, span in steps:
+        # 검증자 / Range 없는 클라이언트: 매번 처음부터 전체
+        naive_bytes = http.get(url).num_bytes_downloaded
+        if span is not None:
+            start, end = span
+            resp = http.get(url, headers={"Range": f"bytes={start}-{end - 1}"})
+            etag = resp.headers["etag"]
+        else:
+            resp = http.get(url, headers={"If-None-Match": etag})
+        smart_bytes = resp.num_bytes_downloaded
+        naive += naive_bytes
+        smart += smart_bytes
+        print(f"  {name:<14} full={naive_bytes:>9} etag+range={smart_bytes:>9} ({resp.status_code})")
+    print(f"  total          full={naive:>9} etag+range={smart:>9}  saved={100 * (1 - smart / naive):.0f}%")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="음성 파일 ETag / Range 재생 전송량 비교")
+    parser.add_argument("--size", type=int, default=480_000, help="가짜 클립 크기 (기본 ≈ mp3 128k 30초)")
+    parser.add_argument("--port", type=int, default=18594)
+    args = parser.parse_args()
+
+    import httpx
+
+    from apps.morning_boost.main import create_app
+    from apps.morning_boost.utils import clip_url, new_clip_path
+
+    path = new_clip_path("bench-http")
+    path.write_bytes(random.Random(0).randbytes(args.size))
+    try:
+        with serve_in_thread(create_app(), args.port) as url, httpx.Client(base_url=url, timeout=30) as http:
+            _replay_scenario(http, clip_url(path), args.size)
+    finally:
+        path.unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    main()
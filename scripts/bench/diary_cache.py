@@ -0,0 +1,195 @@
+# scripts/bench/diary_cache.py
+"""
+일기 조회 캐시(diary_cache.py) 동작 확인 + 아침 몰림 때 백엔드 호출 수 비교.
+
+가짜 백엔드(ETag 지원, nd 로 시작하는 user_id 는 일기 없음)를 띄우고
+- check : TTL hit / 동시 조회 합치기 / 만료 후 304 재검증 / 일기 바뀜 반영 / 일기 없음 기억 /
+          장애 때 이전 값 사용 + 장애를 "일기 없음"으로 기억하지 않음 / 복사본 반환 / prefetch
+          를 차례로 확인한다 (하나라도 틀리면 종료 코드 1)
+- load  : --users 명이 각자 --repeat 번 조회(섞어서 동시 --concurrency)할 때
+          캐시 off / on / prefetch 후 on 의 백엔드 호출 수, 전체 시간, 조회 지연 p50 / p95 비교
+캐시 규칙 하나하나는 tests/test_diary_cache.py 에서 확인한다.
+
+실행 (프로젝트 루트에서):
+    python -m scripts.bench.diary_cache
+    python -m scripts.bench.diary_cache --modes load --users 2000 --backend-latency 0.05
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+from scripts.bench.fake_servers import FaultInjector, create_fake_backend_app, serve_in_thread
+
+
+from scripts.bench.stats import percentile
+class _Checker:
+    def __init__(self):
+        self.failed = 0
+
+    def __call__(self, name: str, ok: bool, detail: Any = "") -> None:
+        if not ok:
+            self.failed += 1
+        print(f"  [{'ok' if ok else 'FAIL'}] {name}{f'  ({detail})' if detail != '' else ''}")
+
+
+async def _check(backend, faults: FaultInjector) -> bool:
+    from apps.morning_boost.diary_cache import DiaryCache, DiaryUnavailable, set_diary_cache
+    from apps.morning_boost.diary_client import fetch_latest_diary_async, prefetch_latest_diaries
+
+    check = _Checker()
+    calls = backend.state.calls
+    cache = DiaryCache(ttl_seconds=0.3, negative_ttl_seconds=0.3, stale_if_error_seconds=60)
+    set_diary_cache(cache)
+
+    first = await fetch_latest_diary_async("alice")
+    second = await fetch_latest_diary_async("alice")
+    check("miss → hit", first == second and calls["ok"] == 1 and cache.outcomes.get("hit") == 1, dict(calls))
+
+    results = await asyncio.gather(*(fetch_latest_diary_async("bob") for _ in range(20)))
+    check("20 concurrent cold lookups → 1 backend call", calls["ok"] == 2 and all(r == results[0] for r in results))
+
+    await asyncio.sleep(0.35)
+    again = await fetch_latest_diary_async("alice")
+    check("expired → If-None-Match → 304", again == first and calls["not_modified"] == 1, dict(calls))
+
+    backend.state.revisions["alice"] += 1
+    await asyncio.sleep(0.35)
+    changed = await fetch_latest_diary_async("alice")
+    check("diary changed → new body", "#1" in changed["write_diary"] and calls["ok"] == 3, changed["write_diary"])
+
+    await fetch_latest_diary_async("nd_carol")
+    none = await fetch_latest_diary_async("nd_carol")
+    check("no diary is remembered", none is None and calls["not_found"] == 1 and cache.outcomes.get("negative_hit") == 1)
+
+    changed["write_diary"] = "mutated by caller"
+    check("caller mutation does not leak into cache", "#1" in (await fetch_latest_diary_async("alice"))["write_diary"])
+
+    await asyncio.sleep(0.35)
+    faults.error_rate = 1.0
+    stale = await fetch_latest_diary_async("alice")
+    try:
+        missing = await fetch_latest_diary_async("dave")
+    except DiaryUnavailable as e:
+        missing = e
+    faults.error_rate = 0.0
+    check("backend down → previous diary (stale)", stale is not None and "#1" in stale["write_diary"])
+    check(
+        "backend down, nothing cached → DiaryUnavailable (not 'no diary')",
+        isinstance(missing, DiaryUnavailable) and cache.outcomes.get("error") == 1,
+        repr(missing),
+    )
+    recovered = await fetch_latest_diary_async("dave")
+    check("error was not cached as 'no diary'", recovered is not None and calls["ok"] == 4, dict(calls))
+
+    users = [f"u{i}" for i in range(100)] + [f"nd_{i}" for i in range(20)]
+    cache.ttl = cache.negative_ttl = 60
+    report = await prefetch_latest_diaries(users, concurrency=16)
+    check(
+        "prefetch fills the cache",
+        report["fetched"] == 120 and report["with_diary"] == 100 and report["without_diary"] == 20,
+        report,
+    )
+    before = sum(calls.values())
+    await asyncio.gather(*(fetch_latest_diary_async(u) for u in users))
+    check("lookups after prefetch hit the cache", sum(calls.values()) == before)
+    report = await prefetch_latest_diaries(users)
+    check("second prefetch skips fresh users", report["skipped"] == 120, report)
+
+    print(f"  stats: {cache.stats()}")
+    return check.failed == 0
+
+
+async def _load_once(backend, users: List[str], repeat: int, concurrency: int, prefetch: bool) -> Dict[str, Any]:
+    from apps.morning_boost.diary_client import fetch_latest_diary_async, prefetch_latest_diaries
+
+    calls_before = sum(backend.state.calls.values())
+    started = time.perf_counter()
+    if prefetch:
+        await prefetch_latest_diaries(users)
+    prefetch_s = time.perf_counter() - started
+
+    order = [u for u in users for _ in range(repeat)]
+    random.Random(7).shuffle(order)
+    slots = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one(user_id: str) -> None:
+        async with slots:
+            t0 = time.perf_counter()
+            await fetch_latest_diary_async(user_id)
+            latencies.append(time.perf_counter() - t0)
+
+    lookups_started = time.perf_counter()
+    await asyncio.gather(*(one(u) for u in order))
+    return {
+        "backend_calls": sum(backend.state.calls.values()) - calls_before,
+        "prefetch_s": round(prefetch_s, 2),
+        "lookups_s": round(time.perf_counter() - lookups_started, 2),
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+    }
+
+
+async def _load(backend, args: argparse.Namespace) -> None:
+    from apps.morning_boost.diary_cache import DiaryCache, DiaryUnavailable, set_diary_cache
+
+    users = [f"{'nd_' if i % 5 == 0 else 'u'}{i}" for i in range(args.users)]
+    for name, cache, prefetch in (
+        ("off", None, False),
+        ("on", DiaryCache(), False),
+        ("prefetch", DiaryCache(), True),
+    ):
+        set_diary_cache(cache)
+        result = await _load_once(backend, users, args.repeat, args.concurrency, prefetch)
+        if cache is not None:
+            result["hit_rate"] = cache.stats()["hit_rate"]
+        print(f"[{name:>8}] {result}")
+
+
+async def _in_loop(coro):
+    # 공유 백엔드 클라이언트는 만든 이벤트 루프에 묶여 있어서 asyncio.run 마다 닫아 준다
+    from apps.morning_boost.http_client import shutdown_backend_client
+
+    try:
+        return await coro
+    finally:
+        await shutdown_backend_client()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="일기 조회 캐시 동작 확인 / 백엔드 호출 수 비교")
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3, help="사용자당 조회 수 (/boost, 재시도, from-json 등)")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--backend-latency", type=float, default=0.03)
+    parser.add_argument("--modes", default="check,load")
+    parser.add_argument("--port", type=int, default=18660)
+    args = parser.parse_args()
+
+    faults = FaultInjector()
+    backend = create_fake_backend_app(latency=args.backend_latency, faults=faults, no_diary_prefix="nd", etag=True)
+    with serve_in_thread(backend, args.port) as backend_url:
+        # diary_client 는 import 할 때 BACKEND_URL 을 읽는다
+        os.environ["BACKEND_URL"] = backend_url
+        ok = True
+        for mode in args.modes.split(","):
+            if mode == "check":
+                print("[check]")
+                ok = asyncio.run(_in_loop(_check(backend, faults))) and ok
+            elif mode == "load":
+                print(f"users={args.users} repeat={args.repeat} concurrency={args.concurrency} "
+                      f"backend={args.backend_latency}s")
+                asyncio.run(_in_loop(_load(backend, args)))
+
+    if not ok:
+        print("FAILED")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+# scripts/bench/fake_servers.py
+"""
+벤치마크용 로컬 가짜 서버들.
+
+- OpenAI 흉내: POST /v1/responses (stream=true 면 SSE 로 글자 조각), POST /v1/audio/speech, POST /v1/audio/transcriptions
+- 백엔드(Spring Boot) 흉내: GET /api/diary/latest (선택: ETag / If-None-Match → 304)
+- FaultInjector: 지연 흔들기(jitter) + 일정 비율 에러 응답 주입 + 동시 처리 상한(넘으면 429)
+
+실제 OpenAI / BACKEND_URL 을 부르지 않고 지연 시간만 흉내 내서
+이벤트 루프가 막히는지, 동시성이 잘 나오는지 측정할 때 쓴다.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from collections import Counter
+from typing import Any, Dict, Iterator, Optional
+
+import uvicorn
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+FAKE_BOOST_TEXT = "좋은 아침이에요. 오늘도 천천히, 한 걸음씩 시작해 봐요."
+
+
+class FaultInjector:
+    """
+    가짜 서버 응답에 지연 흔들기와 에러를 섞는다.
+
+    :param error_rate: 요청 중 에러로 응답할 비율 (0~1)
+    :param error_status: 에러 응답 상태 코드 (429 면 OpenAI SDK 가 재시도)
+    :param jitter: 지연 시간을 ±jitter 비율만큼 무작위로 흔든다 (0.5 → 0.5배~1.5배)
+    :param seed: 주면 실행마다 같은 순서로 실패/지연
+    :param retry_after: 429 응답에 실을 Retry-After(초), None 이면 헤더 없음
+    :param capacity: 동시에 처리하는 요청 수 상한. 넘게 들어오면 바로 429 (실제 rate limit 흉내)
+    :param sigma: 주면 지연에 평균 1 인 로그정규 배수를 곱한다 (오른쪽 꼬리가 긴 분포, 0.5 정도가 현실적)
+    :param tail_rate: 요청 중 이 비율만 tail_latency 초를 더 끈다 (가끔 한참 느린 업스트림 응답 흉내)
+    :param tail_latency: tail_rate 에 걸린 요청에 더할 지연(초)
+    """
+
+    def __init__(
+        self,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        jitter: float = 0.0,
+        seed: Optional[int] = None,
+        retry_after: Optional[float] = None,
+        capacity: Optional[int] = None,
+        sigma: float = 0.0,
+        tail_rate: float = 0.0,
+        tail_latency: float = 0.0,
+    ):
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.jitter = jitter
+        self.rng = random.Random(seed)
+        self.retry_after = retry_after
+        self.capacity = capacity
+        self.sigma = sigma
+        self.tail_rate = tail_rate
+        self.tail_latency = tail_latency
+        self.slow = 0
+        self.requests = 0
+        self.injected = 0
+        self.rate_limited = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def delay(self, base: float) -> float:
+        latency = base
+        if self.jitter:
+            latency *= 1 + self.rng.uniform(-self.jitter, self.jitter)
+        if self.sigma:
+            latency *= self.rng.lognormvariate(-self.sigma ** 2 / 2, self.sigma)
+        if self.tail_rate and self.rng.random() < self.tail_rate:
+            self.slow += 1
+            latency += self.tail_latency
+        return max(0.0, latency)
+
+    def _error(self, status: int) -> JSONResponse:
+        headers = {}
+        if status == 429 and self.retry_after is not None:
+            headers = {"retry-after": str(self.retry_after), "retry-after-ms": str(int(self.retry_after * 1000))}
+        return JSONResponse(
+            status_code=status,
+            content={"error": {"message": "injected failure", "type": "server_error", "code": None}},
+            headers=headers,
+        )
+
+    def error_response(self) -> Optional[JSONResponse]:
+        self.requests += 1
+        if not self.error_rate or self.rng.random() >= self.error_rate:
+            return None
+        self.injected += 1
+        if self.error_status == 429:
+            self.rate_limited += 1
+        return self._error(self.error_status)
+
+    def admit(self) -> Optional[JSONResponse]:
+        """
+        요청 시작 시 호출. capacity 를 넘으면 429 응답, 아니면 None (끝나면 release() 필요).
+        """
+        if self.capacity is not None and self.in_flight >= self.capacity:
+            self.requests += 1
+            self.rate_limited += 1
+            return self._error(429)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        return None
+
+    def release(self) -> None:
+        self.in_flight -= 1
+
+
+def _fake_response(text: str, status: str = "completed") -> Dict[str, Any]:
+    return {
+        "id": "resp_fake",
+        "object": "response",
+        "created_at": int(time.time()),
+        "model": "fake",
+        "status": status,
+        "output": [
+            {
+                "type": "message",
+                "id": "msg_fake",
+                "status": status,
+                "role": "assistant",
+                "content": [{"type": "output_text", "text": text, "annotations": []}],
+            }
+        ] if text else [],
+        "parallel_tool_calls": False,
+        "tool_choice": "auto",
+        "tools": [],
+    }
+
+
+def _sse(event: Dict[str, Any]) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+
+def create_fake_openai_app(
+    llm_latency: float = 1.0,
+    llm_latency_per_kb: float = 0.0,
+    llm_text: str = FAKE_BOOST_TEXT,
+    llm_ttft: Optional[float] = None,
+    llm_delta_chars: int = 4,
+    tts_latency: float = 1.0,
+    tts_latency_per_char: float = 0.0,
+    tts_chunks: int = 8,
+    tts_chunk_size: int = 4096,
+    tts_audio: Optional[bytes] = None,
+    stt_latency: float = 1.0,
+    stt_latency_per_mb: float = 0.0,
+    faults: Optional[FaultInjector] = None,
+) -> FastAPI:
+    """
+    OpenAI responses / speech / transcriptions API 를 흉내 내는 앱.
+
+    :param llm_latency: /v1/responses 응답까지 걸리는 시간(초)
+    :param llm_latency_per_kb: 요청 본문 1KB 당 추가 지연(초), 입력 토큰 수에 비례하는 prefill 흉내
+    :param llm_text: 멘트 텍스트. 요청마다 다른 해시가 뒤에 붙는다 ({digest} 가 있으면 그 자리에 들어간다)
+    :param llm_ttft: stream=true 일 때 첫 조각까지 시간(초). 없으면 llm_latency 의 10%.
+                     나머지 조각(llm_delta_chars 글자씩)은 llm_latency 가 다 될 때까지 나눠서 보낸다
+    :param tts_latency: /v1/audio/speech 전체 스트림에 걸리는 시간(초), 청크마다 나눠서 지연
+    :param tts_latency_per_char: 읽을 텍스트 한 글자당 추가 합성 시간(초) (문장 단위로 나눠 부를 때 공정하게)
+    :param tts_audio: 주면 /v1/audio/speech 가 이 바이트를 tts_chunks 조각으로 나눠 보낸다 (요청 포맷과 무관)
+    :param stt_latency: /v1/audio/transcriptions 응답까지 걸리는 시간(초)
+    :param stt_latency_per_mb: 업로드 1MB 당 추가 지연(초), 녹음 길이에 비례하는 STT 흉내
+    :param faults: 지연 흔들기 / 에러 주입 (없으면 항상 정상 응답)
+    """
+    app = FastAPI(title="fake_openai")
+    faults = faults or FaultInjector()
+    # 엔드포인트별 호출 수 (responses / speech / transcriptions)
+    app.state.calls = Counter()
+
+    @app.post("/v1/responses")
+    async def responses(request: Request):
+        app.state.calls["responses"] += 1
+        # 입력마다 다른 멘트가 나오도록 (TTS 캐시가 벤치마크를 왜곡하지 않게)
+        body = await request.body()
+        digest = hashlib.sha1(body).hexdigest()[:8]
+        text = llm_text.replace("{digest}", digest) if "{digest}" in llm_text else f"{llm_text} ({digest})"
+        latency = faults.delay(llm_latency + llm_latency_per_kb * len(body) / 1024)
+        if (error := faults.admit()) is not None:
+            return error
+
+        if json.loads(body or b"{}").get("stream"):
+            if (error := faults.error_response()) is not None:
+                faults.release()
+                return error
+
+            async def events():
+                try:
+                    ttft = llm_ttft if llm_ttft is not None else latency * 0.1
+                    deltas = [text[i:i + llm_delta_chars] for i in range(0, len(text), llm_delta_chars)]
+                    per_delta = max(latency - ttft, 0.0) / max(len(deltas), 1)
+                    yield _sse({"type": "response.created", "sequence_number": 0, "response": _fake_response("", "in_progress")})
+                    await asyncio.sleep(ttft)
+                    for n, delta in enumerate(deltas, start=1):
+                        if n > 1:
+                            await asyncio.sleep(per_delta)
+                        yield _sse({
+                            "type": "response.output_text.delta",
+                            "sequence_number": n,
+                            "item_id": "msg_fake",
+                            "output_index": 0,
+                            "content_index": 0,
+                            "delta": delta,
+                            "logprobs": [],
+                        })
+                    yield _sse({"type": "response.completed", "sequence_number": len(deltas) + 1, "response": _fake_response(text)})
+                finally:
+                    faults.release()
+
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        try:
+            await asyncio.sleep(latency)
+        finally:
+            faults.release()
+        if (error := faults.error_response()) is not None:
+            return error
+        return _fake_response(text)
+
+    @app.post("/v1/audio/speech")
+    async def speech(request: Request):
+        app.state.calls["speech"] += 1
+        chars = len((await request.json()).get("input", ""))
+        if (error := faults.admit()) is not None:
+            return error
+        if (error := faults.error_response()) is not None:
+            faults.release()
+            return error
+
+        async def body():
+            try:
+                per_chunk = faults.delay(tts_latency + tts_latency_per_char * chars) / max(tts_chunks, 1)
+                if tts_audio is not None:
+                    step = -(-len(tts_audio) // max(tts_chunks, 1))
+                    for start in range(0, len(tts_audio), step):
+                        await asyncio.sleep(per_chunk)
+                        yield tts_audio[start:start + step]
+                    return
+                for _ in range(tts_chunks):
+                    await asyncio.sleep(per_chunk)
+                    yield b"\xff\xf3" + b"\x00" * (tts_chunk_size - 2)
+            finally:
+                faults.release()
+
+        return StreamingResponse(body(), media_type="audio/mpeg")
+
+    @app.post("/v1/audio/transcriptions")
+    async def transcriptions(request: Request):
+        app.state.calls["transcriptions"] += 1
+        form = await request.form()
+        upload = form["file"]
+        size = 0
+        while chunk := await upload.read(64 * 1024):
+            size += len(chunk)
+        if (error := faults.admit()) is not None:
+            return error
+        try:
+            await asyncio.sleep(faults.delay(stt_latency + stt_latency_per_mb * size / (1024 * 1024)))
+        finally:
+            faults.release()
+        if (error := faults.error_response()) is not None:
+            return error
+        return {"text": f"오늘은 산책을 했다. ({size} bytes)"}
+
+    return app
+
+
+def create_fake_backend_app(
+    latency: float = 0.1,
+    faults: Optional[FaultInjector] = None,
+    no_diary_prefix: Optional[str] = None,
+    etag: bool = False,
+) -> FastAPI:
+    """
+    /api/diary/latest 를 흉내 내는 백엔드 앱.
+    no_diary_prefix 로 시작하는 user_id 는 전날 일기가 없는 사용자로 응답한다.
+    etag=True 면 본문 해시를 ETag 로 주고, If-None-Match 가 같으면 304.
+    app.state.revisions[user_id] 를 올리면 그 사용자의 일기 내용이 바뀐다 (새 일기 작성 흉내).
+    """
+    app = FastAPI(title="fake_backend")
+    faults = faults or FaultInjector()
+    # 응답 종류별 호출 수 (ok / not_found / not_modified)
+    app.state.calls = Counter()
+    app.state.revisions = Counter()
+
+    @app.get("/api/diary/latest")
+    async def latest(request: Request, user_id: str = Query(...)):
+        await asyncio.sleep(faults.delay(latency))
+        if (error := faults.error_response()) is not None:
+            return error
+        if no_diary_prefix and user_id.startswith(no_diary_prefix):
+            app.state.calls["not_found"] += 1
+            return {"code": 404, "message": "일기 없음", "data": None}
+        revision = app.state.revisions[user_id]
+        body = {
+            "code": 200,
+            "message": "조회 성공",
+            "data": {
+                "emotion": "행복",
+                "draw": None,
+                "write_diary": f"{user_id} 의 일기{f' #{revision}' if revision else ''}. 친구와 산책하며 기분을 전환했다.",
+                "file_summation": ["산책", "카페"],
+                "ai_reply": "멋진 하루였네요.",
+                "ai_draw_reply": None,
+            },
+        }
+        if not etag:
+            app.state.calls["ok"] += 1
+            return body
+        tag = '"' + hashlib.sha1(json.dumps(body, ensure_ascii=False).encode("utf-8")).hexdigest()[:16] + '"'
+        if request.headers.get("if-none-match") == tag:
+            app.state.calls["not_modified"] += 1
+            return Response(status_code=304, headers={"ETag": tag})
+        app.state.calls["ok"] += 1
+        return JSONResponse(body, headers={"ETag": tag})
+
+    return app
+
+
+@contextmanager
+def serve_in_thread(app: FastAPI, port: int, host: str = "127.0.0.1") -> Iterator[str]:
+    """
+    uvicorn 서버를 백그라운드 스레드에서 띄우고 base URL 을 돌려준다.
+    with 블록을 빠져나가면 서버를 종료한다.
+    """
+    config = uvicorn.Config(app, host=host, port=port, log_level="warning", lifespan="on")
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"fake server on port {port} did not start")
+        time.sleep(0.01)
+
+    try:
+        yield f"http://{host}:{port}"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
@@ -0,0 +1,243 @@
+# scripts/bench/job_queue.py
+"""
+작업 모드(/boost/from-json?job=true) vs 동기 호출 + 워커 강제 종료 복구 확인.
+
+가짜 OpenAI(LLM / TTS 지연 고정)를 띄우고 통합 앱(main.app, lifespan 이 워커 프로세스를 띄움)에
+- sync  : 클라이언트 --clients 개가 동시에 /boost/from-json 을 부르고 음성이 올 때까지 연결을 붙잡고 있음
+          (클라이언트 타임아웃 --client-timeout 초, OpenAI limiter 대기열이 차면 503)
+- job   : 같은 수의 작업을 ?job=true 로 넣고(바로 202) GET /boost/jobs/{id}?wait= 로 결과를 기다림
+을 보내서 성공 / 타임아웃 / 503 수, 요청당 연결 유지 시간, 끝날 때까지 시간, 큐 깊이 최대값을 비교한다.
+job 의 제출 지연은 같은 동시 접속 수의 GET /health 지연(health_p50_ms)과 같이 본다 (접속 폭주 자체 비용).
+
+- kill  : 작업을 넣고 처리 중에 워커 프로세스 하나를 SIGKILL → 리스가 끝난 작업을 다른 워커가 이어받아
+          전부 done 이 되는지, 몇 개가 다시 시도됐는지(attempts > 1) 확인한다. (하나라도 못 끝나면 종료 코드 1)
+
+큐는 임시 디렉토리의 SQLite 파일을 쓰고, kill 확인이 빨리 끝나도록 lease 를 짧게 둔다.
+
+실행 (프로젝트 루트에서):
+    python -m scripts.bench.job_queue
+    python -m scripts.bench.job_queue --clients 300 --client-timeout 5 --workers 4
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from scripts.bench.fake_servers import create_fake_openai_app, serve_in_thread
+
+
+from scripts.bench.stats import percentile
+def _payload(tag: str, i: int) -> Dict[str, Any]:
+    return {
+        "user_id": f"job{i}",
+        "code": 200,
+        "message": "ok",
+        "data": {
+            "emotion": ("행복", "슬픔", "분노")[i % 3],
+            "write_diary": f"[{tag}-{i}] 오늘은 공원을 산책했다.",
+            "file_summation": ["산책"],
+        },
+    }
+
+
+async def _sync(http, tag: str, n: int, timeout: float) -> Dict[str, Any]:
+    import httpx
+
+    outcomes: Dict[str, int] = {}
+    held: List[float] = []
+    started = time.perf_counter()
+
+    async def one(i: int) -> None:
+        t0 = time.perf_counter()
+        try:
+            resp = await http.post("/boost/from-json", json=_payload(tag, i), timeout=timeout)
+            key = "ok" if resp.status_code == 200 else str(resp.status_code)
+        except httpx.TimeoutException:
+            key = "timeout"
+        held.append(time.perf_counter() - t0)
+        outcomes[key] = outcomes.get(key, 0) + 1
+
+    await asyncio.gather(*(one(i) for i in range(n)))
+    return {
+        "total_s": round(time.perf_counter() - started, 2),
+        "outcomes": outcomes,
+        "requests": n,
+        "held_p50_s": round(percentile(held, 0.5), 2),
+        "held_p95_s": round(percentile(held, 0.95), 2),
+    }
+
+
+async def _submit(http, tag: str, n: int) -> tuple:
+    submit: List[float] = []
+
+    async def one(i: int) -> str:
+        t0 = time.perf_counter()
+        resp = await http.post("/boost/from-json", params={"job": "true"}, json=_payload(tag, i))
+        resp.raise_for_status()
+        submit.append(time.perf_counter() - t0)
+        return resp.json()["job_id"]
+
+    return await asyncio.gather(*(one(i) for i in range(n))), submit
+
+
+async def _wait_all(http, job_ids: List[str], started: float) -> tuple:
+    done_at: List[float] = []
+    infos: List[Dict[str, Any]] = []
+    polls = 0
+
+    async def one(job_id: str) -> None:
+        nonlocal polls
+        while True:
+            polls += 1
+            resp = await http.get(f"/boost/jobs/{job_id}", params={"wait": 20}, timeout=30)
+            resp.raise_for_status()
+            info = resp.json()
+            if info["status"] in ("done", "failed"):
+                done_at.append(time.perf_counter() - started)
+                infos.append(info)
+                return
+
+    await asyncio.gather(*(one(job_id) for job_id in job_ids))
+    return infos, done_at, polls
+
+
+async def _sample_depth(http, stop: asyncio.Event) -> int:
+    peak = 0
+    while not stop.is_set():
+        stats = (await http.get("/boost/jobs/stats")).json()
+        peak = max(peak, stats["depth"] + stats["running"])
+        await asyncio.sleep(0.2)
+    return peak
+
+
+async def _baseline(http, n: int) -> float:
+    """
+    같은 동시 접속 수로 GET /health 를 불렀을 때 p50 (접속 폭주 자체에 드는 시간, 제출 지연과 비교용)
+    """
+    latencies: List[float] = []
+
+    async def one() -> None:
+        t0 = time.perf_counter()
+        await http.get("/health")
+        latencies.append(time.perf_counter() - t0)
+
+    await asyncio.gather(*(one() for _ in range(n)))
+    return percentile(latencies, 0.5)
+
+
+async def _job(http, tag: str, n: int) -> Dict[str, Any]:
+    health_p50 = await _baseline(http, n)
+    started = time.perf_counter()
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(_sample_depth(http, stop))
+    job_ids, submit = await _submit(http, tag, n)
+    infos, done_at, polls = await _wait_all(http, job_ids, started)
+    stop.set()
+    statuses: Dict[str, int] = {}
+    for info in infos:
+        statuses[info["status"]] = statuses.get(info["status"], 0) + 1
+    return {
+        "total_s": round(time.perf_counter() - started, 2),
+        "outcomes": statuses,
+        "requests": n + polls,
+        "submit_p50_ms": round(percentile(submit, 0.5) * 1000, 1),
+        "submit_p95_ms": round(percentile(submit, 0.95) * 1000, 1),
+        "health_p50_ms": round(health_p50 * 1000, 1),
+        "done_p50_s": round(percentile(done_at, 0.5), 2),
+        "done_p95_s": round(percentile(done_at, 0.95), 2),
+        "peak_depth": await sampler,
+    }
+
+
+async def _kill(http, tag: str, n: int, pool) -> bool:
+    started = time.perf_counter()
+    job_ids, _ = await _submit(http, tag, n)
+    # 워커가 작업을 잡을 때까지 조금 기다렸다가 하나를 강제 종료
+    while (await http.get("/boost/jobs/stats")).json()["running"] == 0:
+        await asyncio.sleep(0.05)
+    await asyncio.sleep(0.3)
+    victim = pool._procs[0]
+    victim.kill()
+    print(f"  killed worker pid={victim.pid} at {time.perf_counter() - started:.2f}s")
+    infos, done_at, _ = await _wait_all(http, job_ids, started)
+    done = sum(1 for info in infos if info["status"] == "done")
+    retried = sum(1 for info in infos if info["attempts"] > 1)
+    stats = (await http.get("/boost/jobs/stats")).json()
+    print(
+        f"  done={done}/{n} retried={retried} total={max(done_at):.2f}s "
+        f"restarts={pool.restarts} workers_alive={stats['workers_alive']}"
+    )
+    return done == n
+
+
+async def _run(url: str, args: argparse.Namespace, pool) -> bool:
+    import httpx
+
+    limits = httpx.Limits(max_connections=args.clients + 8)
+    async with httpx.AsyncClient(base_url=url, timeout=60, limits=limits) as http:
+        # 워커 프로세스가 다 뜰 때까지 (spawn + import)
+        while (await http.get("/boost/jobs/stats")).json()["workers_alive"] < args.workers:
+            await asyncio.sleep(0.2)
+        run = time.time_ns()
+        ok = True
+        for name in args.modes.split(","):
+            if name == "sync":
+                print(f"[    sync] {await _sync(http, f's{run}', args.clients, args.client_timeout)}")
+            elif name == "job":
+                print(f"[     job] {await _job(http, f'j{run}', args.clients)}")
+            elif name == "kill":
+                print("[    kill]")
+                ok = await _kill(http, f'k{run}', args.kill_jobs, pool) and ok
+        return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="작업 모드 vs 동기 호출, 워커 강제 종료 복구")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--client-timeout", type=float, default=5.0)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=8, help="워커 프로세스당 동시 작업 수")
+    parser.add_argument("--kill-jobs", type=int, default=24)
+    parser.add_argument("--lease", type=float, default=5.0)
+    parser.add_argument("--llm-latency", type=float, default=0.4)
+    parser.add_argument("--tts-latency", type=float, default=0.6)
+    parser.add_argument("--modes", default="sync,job,kill")
+    parser.add_argument("--openai-port", type=int, default=18597)
+    parser.add_argument("--app-port", type=int, default=18598)
+    args = parser.parse_args()
+
+    fake = create_fake_openai_app(llm_latency=args.llm_latency, tts_latency=args.tts_latency)
+    with tempfile.TemporaryDirectory() as tmp, serve_in_thread(fake, args.openai_port) as openai_url:
+        os.environ["OPENAI_BASE_URL"] = f"{openai_url}/v1"
+        os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+        from apps.morning_boost import job_worker
+        from apps.morning_boost.job_queue import get_job_queue_config
+        from main import app
+
+        # lifespan 이 띄우는 워커도 이 설정을 받는다 (임시 큐 파일, 짧은 lease)
+        get_job_queue_config().update(
+            path=str(Path(tmp) / "jobs.sqlite3"),
+            workers=args.workers,
+            concurrency=args.concurrency,
+            lease_seconds=args.lease,
+            poll_interval=0.05,
+        )
+        print(
+            f"clients={args.clients} timeout={args.client_timeout}s workers={args.workers}x{args.concurrency} "
+            f"llm={args.llm_latency}s tts={args.tts_latency}s"
+        )
+        with serve_in_thread(app, args.app_port) as app_url:
+            ok = asyncio.run(_run(app_url, args, job_worker._pool))
+
+    if not ok:
+        print("FAILED: not every job survived the worker kill")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
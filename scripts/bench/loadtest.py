@@ -0,0 +1,366 @@
+# scripts/bench/loadtest.py
+"""
+통합 앱(main.py) 부하 테스트.
+
+가짜 OpenAI / 백엔드 서버(지연, 지연 흔들기, 에러 주입 설정 가능)를 띄우고
+앱을 별도 uvicorn 프로세스로 실행한 뒤, 시나리오마다 목표 동시성으로 요청을 보낸다.
+
+시나리오:
+- boost           : GET  /boost?user_id=...
+- boost-stream    : GET  /boost?user_id=...&stream=true
+- from-json       : POST /boost/from-json
+- from-json-file  : POST /boost/from-json-file (multipart JSON 파일)
+- stt             : POST /diary/stt (wav 업로드)
+
+결과 (시나리오별 p50/p95/p99/max 지연, req/s, 상태 코드 분포, 앱 프로세스 peak RSS,
+서버 쪽 /metrics 의 단계별 평균 지연)는 --out 으로 JSON 저장하고,
+--compare 로 이전 결과와 비교할 수 있다.
+
+실행 (프로젝트 루트에서):
+    python -m scripts.bench.loadtest --concurrency 16 --requests 200 --out /tmp/lt.json
+    python -m scripts.bench.loadtest --openai-error-rate 0.05 --jitter 0.5 --compare /tmp/lt.json
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+import wave
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+from uuid import uuid4
+
+from scripts.bench.fake_servers import (
+    FaultInjector,
+    create_fake_backend_app,
+    create_fake_openai_app,
+    serve_in_thread,
+)
+from scripts.bench.stats import percentile
+
+SCENARIOS = ("boost", "boost-stream", "from-json", "from-json-file", "stt")
+
+
+# ---------------------------------------------------------------------------
+# 요청 만들기
+# ---------------------------------------------------------------------------
+
+def _diary_payload(user_id: str, i: int) -> Dict[str, Any]:
+    # 요청마다 일기를 다르게 해서 멘트/TTS 캐시 hit 이 섞이지 않게 한다
+    return {
+        "user_id": user_id,
+        "code": 200,
+        "message": "조회 성공",
+        "data": {
+            "emotion": "행복",
+            "write_diary": f"부하 테스트 일기 {user_id} #{i}. 산책을 하고 카페에 갔다.",
+            "file_summation": ["산책", "카페"],
+            "ai_reply": "좋은 하루였네요.",
+        },
+    }
+
+
+def _make_wav(seconds: float, rate: int = 16000) -> bytes:
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(b"\x00\x00" * int(seconds * rate))
+    return buf.getvalue()
+
+
+def _request_factory(scenario: str, run_tag: str, wav: bytes) -> Callable:
+    async def send(http, i: int):
+        user_id = f"lt_{run_tag}_{i}"
+        if scenario == "boost":
+            return await http.get("/boost", params={"user_id": user_id})
+        if scenario == "boost-stream":
+            return await http.get("/boost", params={"user_id": user_id, "stream": "true"})
+        if scenario == "from-json":
+            return await http.post("/boost/from-json", json=_diary_payload(user_id, i))
+        if scenario == "from-json-file":
+            body = json.dumps(_diary_payload(user_id, i), ensure_ascii=False).encode("utf-8")
+            return await http.post(
+                "/boost/from-json-file", files={"file": (f"{user_id}.json", body, "application/json")}
+            )
+        if scenario == "stt":
+            return await http.post("/diary/stt", files={"audio": (f"{user_id}.wav", wav, "audio/wav")})
+        raise ValueError(scenario)
+
+    return send
+
+
+# ---------------------------------------------------------------------------
+# 측정
+# ---------------------------------------------------------------------------
+
+def _read_status_kb(pid: int, field: str) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak_rss(pid: int) -> bool:
+    # Linux: clear_refs 에 5 를 쓰면 VmHWM 이 현재 RSS 로 초기화된다
+    try:
+        with open(f"/proc/{pid}/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+_STAGE_LINE = re.compile(
+    r'^maumon_stage_duration_seconds_(sum|count)\{stage="([^"]+)",endpoint="([^"]*)",outcome="([^"]+)"\} (\S+)$'
+)
+
+
+def _stage_snapshot(metrics_text: str) -> Dict[str, Dict[str, float]]:
+    """
+    /metrics 에서 단계별 (sum, count) 를 모은다. (endpoint/outcome 은 합침)
+    """
+    totals: Dict[str, Dict[str, float]] = defaultdict(lambda: {"sum": 0.0, "count": 0.0})
+    for line in metrics_text.splitlines():
+        m = _STAGE_LINE.match(line)
+        if m:
+            kind, stage_name, _endpoint, _outcome, value = m.groups()
+            totals[stage_name][kind] += float(value)
+    return totals
+
+
+def _stage_means_ms(before: Dict, after: Dict) -> Dict[str, float]:
+    means = {}
+    for name, cur in after.items():
+        prev = before.get(name, {"sum": 0.0, "count": 0.0})
+        count = cur["count"] - prev["count"]
+        if count > 0:
+            means[name] = round((cur["sum"] - prev["sum"]) / count * 1000, 2)
+    return means
+
+
+async def _run_scenario(
+    base_url: str,
+    scenario: str,
+    concurrency: int,
+    total: int,
+    wav: bytes,
+) -> Dict[str, Any]:
+    import httpx
+
+    send = _request_factory(scenario, uuid4().hex[:8], wav)
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    queue: asyncio.Queue = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(i)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=300, limits=limits) as http:
+
+        async def worker() -> None:
+            while True:
+                try:
+                    i = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                started = time.perf_counter()
+                try:
+                    resp = await send(http, i)
+                    await resp.aread()
+                    statuses[str(resp.status_code)] += 1
+                except httpx.HTTPError as e:
+                    statuses[type(e).__name__] += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    ok = sum(n for code, n in statuses.items() if code.startswith("2"))
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "ok": ok,
+        "errors": total - ok,
+        "statuses": dict(statuses),
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(total / elapsed, 2),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.5) * 1000, 1),
+            "p95": round(percentile(latencies, 0.95) * 1000, 1),
+            "p99": round(percentile(latencies, 0.99) * 1000, 1),
+            "max": round(latencies[-1] * 1000, 1) if latencies else 0.0,
+            "mean": round(sum(latencies) / len(latencies) * 1000, 1) if latencies else 0.0,
+        },
+    }
+
+
+# ---------------------------------------------------------------------------
+# 앱 프로세스
+# ---------------------------------------------------------------------------
+
+def _start_app(port: int, env: Dict[str, str]) -> subprocess.Popen:
+    import httpx
+
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    deadline = time.monotonic() + 30
+    while True:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return proc
+        except httpx.HTTPError:
+            pass
+        if proc.poll() is not None or time.monotonic() > deadline:
+            proc.terminate()
+            raise RuntimeError("app did not start")
+        time.sleep(0.05)
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _print_results(results: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    header = f"{'scenario':>15} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'err':>5} {'peakMB':>8}"
+    print(header)
+    for name, r in results["scenarios"].items():
+        lat = r["latency_ms"]
+        peak = r.get("peak_rss_mb")
+        print(
+            f"{name:>15} {r['rps']:>8.2f} {lat['p50']:>8.1f} {lat['p95']:>8.1f} {lat['p99']:>8.1f} "
+            f"{r['errors']:>5} {peak if peak is not None else '-':>8}"
+        )
+        base = (baseline or {}).get("scenarios", {}).get(name)
+        if base:
+            def delta(cur: float, prev: float) -> str:
+                return f"{(cur - prev) / prev * 100:+.0f}%" if prev else "-"
+
+            blat = base["latency_ms"]
+            bpeak = base.get("peak_rss_mb")
+            print(
+                f"{'vs baseline':>15} {delta(r['rps'], base['rps']):>8} {delta(lat['p50'], blat['p50']):>8} "
+                f"{delta(lat['p95'], blat['p95']):>8} {delta(lat['p99'], blat['p99']):>8} "
+                f"{r['errors'] - base['errors']:>+5} "
+                f"{delta(peak, bpeak) if peak and bpeak else '-':>8}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="통합 앱 부하 테스트")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"쉼표 구분 ({', '.join(SCENARIOS)})")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=100, help="시나리오마다 보낼 요청 수")
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--tts-latency", type=float, default=0.8)
+    parser.add_argument("--stt-latency", type=float, default=0.5)
+    parser.add_argument("--backend-latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.0, help="가짜 서버 지연을 ±비율만큼 흔든다")
+    parser.add_argument("--openai-error-rate", type=float, default=0.0)
+    parser.add_argument("--backend-error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--stt-seconds", type=float, default=20.0, help="업로드할 wav 길이")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--port", type=int, default=18780)
+    args = parser.parse_args()
+
+    scenarios = [s for s in args.scenarios.split(",") if s]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    openai_faults = FaultInjector(args.openai_error_rate, args.error_status, args.jitter, args.seed)
+    backend_faults = FaultInjector(args.backend_error_rate, args.error_status, args.jitter, args.seed + 1)
+    openai_app = create_fake_openai_app(
+        llm_latency=args.llm_latency,
+        tts_latency=args.tts_latency,
+        stt_latency=args.stt_latency,
+        faults=openai_faults,
+    )
+    backend_app = create_fake_backend_app(latency=args.backend_latency, faults=backend_faults)
+    wav = _make_wav(args.stt_seconds)
+
+    results: Dict[str, Any] = {
+        "meta": {
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "git": _git_revision(),
+            "args": vars(args),
+        },
+        "scenarios": {},
+    }
+
+    with serve_in_thread(openai_app, args.port + 1) as openai_url, \
+            serve_in_thread(backend_app, args.port + 2) as backend_url:
+        env = dict(
+            os.environ,
+            OPENAI_API_KEY="sk-bench",
+            OPENAI_BASE_URL=f"{openai_url}/v1",
+            BACKEND_URL=backend_url,
+        )
+        proc = _start_app(args.port, env)
+        base_url = f"http://127.0.0.1:{args.port}"
+        try:
+            import httpx
+
+            results["meta"]["idle_rss_mb"] = round((_read_status_kb(proc.pid, "VmRSS") or 0) / 1024, 1)
+            for scenario in scenarios:
+                peak_reset = _reset_peak_rss(proc.pid)
+                before = _stage_snapshot(httpx.get(f"{base_url}/metrics").text)
+                r = asyncio.run(_run_scenario(base_url, scenario, args.concurrency, args.requests, wav))
+                after = _stage_snapshot(httpx.get(f"{base_url}/metrics").text)
+
+                peak_kb = _read_status_kb(proc.pid, "VmHWM")
+                r["peak_rss_mb"] = round(peak_kb / 1024, 1) if peak_kb else None
+                # reset 이 안 되는 환경이면 peak 는 프로세스 시작 이후 누적값
+                r["peak_rss_scope"] = "scenario" if peak_reset else "process"
+                r["stage_mean_ms"] = _stage_means_ms(before, after)
+                results["scenarios"][scenario] = r
+        finally:
+            proc.terminate()
+            proc.wait()
+
+    results["meta"]["injected_errors"] = {
+        "openai": openai_faults.injected,
+        "backend": backend_faults.injected,
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    _print_results(results, baseline)
+    injected = results["meta"]["injected_errors"]
+    if any(injected.values()):
+        # OpenAI SDK 는 5xx/429 를 재시도하므로 주입한 에러가 꼭 실패 응답으로 이어지지는 않는다
+        print(f"\ninjected errors: openai={injected['openai']} backend={injected['backend']}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\nsaved: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
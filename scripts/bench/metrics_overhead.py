@@ -0,0 +1,107 @@
+# scripts/bench/metrics_overhead.py
+"""
+단계 메트릭(apps/morning_boost/metrics.py) 자체 비용 측정.
+
+- stage()        : with stage(...) 한 번 (시간 측정 + 히스토그램/카운터 기록)
+- observe_stage  : 값만 기록
+- middleware     : 요청 하나당 MetricsMiddleware 가 더하는 시간 (빈 ASGI 앱 기준)
+- render         : /metrics 응답 만들기 (라벨 조합 수에 비례)
+
+boost 요청 하나는 단계 기록 6~8번 + 요청 기록 1번이므로,
+아래 결과 x 10 정도가 요청당 오버헤드다. (LLM/TTS 는 수백 ms ~ 수 초)
+
+실행 (프로젝트 루트에서):
+    python -m scripts.bench.metrics_overhead
+"""
+
+import argparse
+import asyncio
+import time
+
+from apps.morning_boost import metrics
+from apps.morning_boost.metrics import MetricsMiddleware, observe_stage, render_metrics, stage
+
+
+def _per_op_ns(fn, n: int) -> float:
+    started = time.perf_counter_ns()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter_ns() - started) / n
+
+
+def _bench_stage(n: int) -> float:
+    def op():
+        with stage("bench"):
+            pass
+
+    return _per_op_ns(op, n)
+
+
+def _bench_observe(n: int) -> float:
+    return _per_op_ns(lambda: observe_stage("bench", 0.01), n)
+
+
+def _bench_baseline(n: int) -> float:
+    def op():
+        started = time.perf_counter()
+        time.perf_counter() - started
+
+    return _per_op_ns(op, n)
+
+
+def _bench_middleware(n: int) -> tuple:
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    scope = {"type": "http", "path": "/boost", "method": "GET", "headers": []}
+    wrapped = MetricsMiddleware(app)
+
+    async def run(target) -> float:
+        started = time.perf_counter_ns()
+        for _ in range(n):
+            await target(scope, receive, send)
+        return (time.perf_counter_ns() - started) / n
+
+    bare = asyncio.run(run(app))
+    with_metrics = asyncio.run(run(wrapped))
+    return bare, with_metrics
+
+
+def _bench_render(series: int) -> tuple:
+    for i in range(series):
+        observe_stage(f"render_{i % 8}", 0.01, "ok", endpoint=f"/e{i // 8}")
+    started = time.perf_counter()
+    body = render_metrics()
+    return (time.perf_counter() - started) * 1000, len(body)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="메트릭 기록 오버헤드 측정")
+    parser.add_argument("--n", type=int, default=200_000)
+    parser.add_argument("--series", type=int, default=200, help="render 측정용 라벨 조합 수")
+    args = parser.parse_args()
+
+    baseline = _bench_baseline(args.n)
+    per_stage = _bench_stage(args.n)
+    per_observe = _bench_observe(args.n)
+    bare, with_metrics = _bench_middleware(args.n // 10)
+    render_ms, render_bytes = _bench_render(args.series)
+
+    print(f"{'perf_counter x2':>18} {baseline:8.0f} ns")
+    print(f"{'stage()':>18} {per_stage:8.0f} ns")
+    print(f"{'observe_stage':>18} {per_observe:8.0f} ns")
+    print(f"{'middleware':>18} {with_metrics - bare:8.0f} ns  (bare {bare:.0f} ns -> {with_metrics:.0f} ns)")
+    per_request_us = (8 * per_stage + (with_metrics - bare)) / 1000
+    print(f"{'per boost request':>18} {per_request_us:8.1f} us  (stage x8 + middleware)")
+    print(f"{'render':>18} {render_ms:8.2f} ms  ({len(metrics.STAGE_SECONDS._counts)} series, {render_bytes} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# scripts/bench/prompt_budget.py
+"""
+프롬프트 토큰 예산(apps/morning_boost/prompt_budget.py) 효과 측정.
+
+짧은 메모부터 아주 긴 일기까지 섞인 가짜 일기 묶음을 만들어서
+- 예산 없이(예전 방식) / 예산 적용 시 프롬프트 토큰 수 (평균, p95, 최대, 총 절약량)
+- 프롬프트 만드는 데 드는 시간 (토큰 세기 포함)
+- 가짜 OpenAI(요청 1KB 당 지연이 늘어나는 prefill 흉내)로 보낸 LLM 호출 지연 p50/p95
+를 비교한다.
+
+실행 (프로젝트 루트에서):
+    python -m scripts.bench.prompt_budget
+    python -m scripts.bench.prompt_budget --diaries 300 --budget 800 --llm-latency-per-kb 0.05
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import time
+from typing import Any, Dict, List
+
+from apps.morning_boost.prompt_budget import PromptBudget, load_encoder, load_prompt_budget_config, set_prompt_budget
+from scripts.bench.fake_servers import create_fake_openai_app, serve_in_thread
+from scripts.bench.stats import percentile
+
+_SENTENCES = (
+    "아침에 일어나서 커피를 마셨다.",
+    "회사에서 회의가 길어져서 점심을 늦게 먹었다.",
+    "팀장님이 보고서를 다시 써 오라고 해서 조금 속상했다.",
+    "퇴근길에 친구와 통화하면서 기분이 좀 풀렸다.",
+    "저녁에는 공원을 30분 정도 걸었다.",
+    "요즘 잠을 잘 못 자서 피곤하다.",
+    "그래도 오늘은 운동을 빼먹지 않아서 뿌듯하다!",
+    "내일은 조금 더 일찍 자야겠다.",
+    "I felt a bit anxious about the deadline.",
+    "동생이 맛있는 케이크를 사 와서 같이 먹었다.",
+)
+_KEYWORDS = ("회사", "회의", "산책", "커피", "친구", "운동", "피곤", "케이크", "보고서", "잠")
+_EMOTIONS = ("행복", "슬픔", "분노", "공허", "부끄러움")
+
+
+def make_corpus(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    문장 수가 로그 분포(2 ~ 400문장)인 일기 n 개. 키워드는 중복이 섞여 있다.
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(n):
+        sentences = int(2 * 200 ** rng.random())
+        keywords = [rng.choice(_KEYWORDS) for _ in range(rng.randint(0, 30))]
+        corpus.append(
+            {
+                "emotion": rng.choice(_EMOTIONS),
+                "write_diary": " ".join(rng.choice(_SENTENCES) for _ in range(sentences)),
+                "file_summation": keywords,
+                "ai_reply": " ".join(rng.choice(_SENTENCES) for _ in range(rng.randint(1, 30))),
+            }
+        )
+    return corpus
+
+
+def _summary(values: List[float]) -> Dict[str, float]:
+    values = sorted(values)
+    return {
+        "mean": round(sum(values) / len(values), 1),
+        "p95": round(percentile(values, 0.95), 1),
+        "max": round(values[-1], 1),
+    }
+
+
+def _measure_prompts(corpus: List[Dict[str, Any]], budget: PromptBudget) -> Dict[str, Any]:
+    from apps.morning_boost.prompt_engine import build_boost_prompt_with_stats
+
+    tokens, raw, build_us = [], [], []
+    for diary in corpus:
+        started = time.perf_counter()
+        _prompt, stats = build_boost_prompt_with_stats("bench", diary, budget=budget)
+        build_us.append((time.perf_counter() - started) * 1e6)
+        tokens.append(stats.tokens)
+        raw.append(stats.raw_tokens)
+    return {
+        "tokens": _summary(tokens),
+        "saved_total": sum(raw) - sum(tokens),
+        "build_us": _summary(build_us),
+    }
+
+
+async def _measure_llm(corpus: List[Dict[str, Any]], tag: str, concurrency: int) -> Dict[str, Any]:
+    from apps.morning_boost.prompt_engine import build_boost_message_async
+
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int, diary: Dict[str, Any]) -> None:
+        # 모드마다 일기 앞에 태그를 붙여서 멘트 캐시 hit 이 섞이지 않게 한다
+        diary = dict(diary, write_diary=f"[{tag}-{i}] " + diary["write_diary"])
+        async with semaphore:
+            started = time.perf_counter()
+            await build_boost_message_async(user_id="bench", diary=diary)
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one(i, d) for i, d in enumerate(corpus)))
+    latencies.sort()
+    return {
+        "p50_ms": round(percentile(latencies, 0.5) * 1000),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="프롬프트 토큰 예산 벤치마크")
+    parser.add_argument("--diaries", type=int, default=200)
+    parser.add_argument("--budget", type=int, default=0, help="max_input_tokens (0 이면 설정 파일 값)")
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--llm-latency-per-kb", type=float, default=0.02)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--port", type=int, default=18591)
+    args = parser.parse_args()
+
+    from apps.morning_boost.openai_limiter import set_openai_limiter
+
+    corpus = make_corpus(args.diaries, args.seed)
+    cfg = load_prompt_budget_config()
+    if args.budget:
+        cfg["max_input_tokens"] = args.budget
+    budgets = {
+        "raw": PromptBudget(**dict(cfg, enabled=False)),
+        "budget": PromptBudget(**dict(cfg, enabled=True)),
+    }
+    # 토큰 수는 tiktoken 이 있으면 정확, 없으면 어림값 (count 는 인코더를 기다리지 않으므로 미리 읽는다)
+    load_encoder(cfg["encoding"])
+
+    app = create_fake_openai_app(llm_latency=args.llm_latency, llm_latency_per_kb=args.llm_latency_per_kb)
+    with serve_in_thread(app, args.port) as url:
+        os.environ["OPENAI_BASE_URL"] = f"{url}/v1"
+        os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+        # 가짜 서버 지연만 보려고 rate limiter 는 끈다
+        set_openai_limiter(None)
+
+        print(f"diaries={args.diaries} max_input_tokens={cfg['max_input_tokens']}")
+        for name, budget in budgets.items():
+            result = _measure_prompts(corpus, budget)
+            set_prompt_budget(budget)
+            result["llm"] = asyncio.run(_measure_llm(corpus, f"{name}-{time.time_ns()}", args.concurrency))
+            print(f"[{name:>6}] {result}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+# scripts/bench/rate_limit.py
+"""
+OpenAI rate limiter(apps/morning_boost/openai_limiter.py) 벤치마크.
+
+가짜 OpenAI 가 동시에 --capacity 개까지만 처리하고 넘치면 429 + Retry-After 로 돌려보내게 한 뒤
+(원하면 --error-rate 로 무작위 429 도 섞는다), 같은 부하를 limiter 없이 / 있을 때 각각 보낸다.
+
+- off : 전부 OpenAI 로 바로 나감 → 429 가 쏟아지고 SDK 재시도가 다 떨어지면 실패(=사용자 500)
+- on  : limiter 가 AIMD 로 동시성을 줄이고 Retry-After 동안 bucket 을 멈춤,
+        대기열이 넘치면 기다리지 않고 바로 503(OpenAIOverloaded)
+
+출력: 모드별 성공/429 실패/503 shed 수, 지연 p50/p95/max, 가짜 서버가 받은 429 수, 최종 동시성 상한.
+AIMD / FIFO / shed 동작 자체는 tests/test_openai_limiter.py 에서 확인한다.
+
+실행 (프로젝트 루트에서):
+    python -m scripts.bench.rate_limit
+    python -m scripts.bench.rate_limit --rpm 6000          # bucket 대신 AIMD 동시성 조절만 보기
+    python -m scripts.bench.rate_limit --requests 300 --concurrency 128 --capacity 8 --max-queue 32
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from scripts.bench.fake_servers import FaultInjector, create_fake_openai_app, serve_in_thread
+from scripts.bench.stats import percentile
+
+
+async def _drive(requests: int, concurrency: int, run_tag: str) -> Dict[str, Any]:
+    import openai
+
+    from apps.morning_boost.openai_limiter import OpenAIOverloaded
+    from apps.morning_boost.prompt_engine import build_boost_message_async
+
+    outcomes: Counter = Counter()
+    latencies: Dict[str, List[float]] = {"ok": [], "shed": []}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        # 요청마다 일기를 다르게 해서 멘트 캐시 hit 이 섞이지 않게 한다
+        diary = {"emotion": "행복", "write_diary": f"{run_tag}-{i} 산책을 했다.", "file_summation": []}
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await build_boost_message_async(user_id=f"u{i}", diary=diary)
+                outcomes["ok"] += 1
+                latencies["ok"].append(time.perf_counter() - started)
+            except OpenAIOverloaded:
+                outcomes["shed_503"] += 1
+                latencies["shed"].append(time.perf_counter() - started)
+            except openai.RateLimitError:
+                outcomes["failed_429"] += 1
+            except Exception as e:
+                outcomes[type(e).__name__] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    result: Dict[str, Any] = {"outcomes": dict(outcomes), "elapsed_s": round(elapsed, 2)}
+    for name, values in latencies.items():
+        values.sort()
+        if values:
+            result[f"{name}_ms"] = {
+                "p50": round(percentile(values, 0.5) * 1000),
+                "p95": round(percentile(values, 0.95) * 1000),
+                "max": round(values[-1] * 1000),
+            }
+    return result
+
+
+def _run_mode(mode: str, args: argparse.Namespace, faults: FaultInjector) -> Dict[str, Any]:
+    from apps.morning_boost import openai_limiter
+
+    limiter: Optional[openai_limiter.OpenAILimiter] = None
+    if mode == "on":
+        cfg = openai_limiter.load_limits_config()
+        cfg.update(max_queue=args.max_queue, max_wait_seconds=args.max_wait)
+        if args.rpm:
+            cfg.update(default_rpm=args.rpm, models={})
+        limiter = openai_limiter.OpenAILimiter(cfg)
+    openai_limiter.set_openai_limiter(limiter)
+
+    faults.rate_limited = 0
+    faults.peak_in_flight = 0
+    result = asyncio.run(_drive(args.requests, args.concurrency, f"{mode}-{time.time_ns()}"))
+    result["server_429"] = faults.rate_limited
+    result["server_peak_in_flight"] = faults.peak_in_flight
+    if limiter is not None:
+        result["final_limit"] = limiter.stats()["limit"]
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="OpenAI rate limiter 벤치마크 (429 주입 가짜 API)")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=64, help="동시에 보내는 호출 수")
+    parser.add_argument("--capacity", type=int, default=8, help="가짜 OpenAI 동시 처리 상한 (넘으면 429)")
+    parser.add_argument("--retry-after", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="capacity 와 별개로 무작위 429 비율")
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--max-queue", type=int, default=64)
+    parser.add_argument("--max-wait", type=float, default=10.0)
+    parser.add_argument("--rpm", type=float, default=0, help="모든 모델 분당 요청 수 (0 이면 설정 파일 값)")
+    parser.add_argument("--modes", default="off,on")
+    parser.add_argument("--port", type=int, default=18590)
+    args = parser.parse_args()
+
+    faults = FaultInjector(
+        error_rate=args.error_rate,
+        error_status=429,
+        retry_after=args.retry_after,
+        capacity=args.capacity,
+        seed=0,
+    )
+    app = create_fake_openai_app(llm_latency=args.llm_latency, faults=faults)
+
+    with serve_in_thread(app, args.port) as url:
+        os.environ["OPENAI_BASE_URL"] = f"{url}/v1"
+        os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+
+        print(
+            f"requests={args.requests} concurrency={args.concurrency} capacity={args.capacity} "
+            f"retry_after={args.retry_after}s max_queue={args.max_queue} rpm={args.rpm or 'config'}"
+        )
+        for mode in args.modes.split(","):
+            result = _run_mode(mode, args, faults)
+            print(f"[{mode:>3}] {result}")
+
+
+if __name__ == "__main__":
+    main()
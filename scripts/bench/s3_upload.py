@@ -0,0 +1,183 @@
+# scripts/bench/s3_upload.py
+"""
+생성 음성 S3 업로드 벤치마크 (moto 로컬 S3 사용, pip install "moto[server]").
+
+- inline     : 예전 방식. mp3 를 파일로 다 쓴 뒤 upload_file 이 끝나야 응답
+- bg-file    : /boost?s3=true        파일 응답 후 백그라운드로 multipart 업로드
+- bg-stream  : /boost?stream=true&s3=true  TTS 청크를 클라이언트와 S3 로 동시에 흘림 (로컬 파일 없이)
+
+응답 시간(클라이언트가 본문을 다 받을 때까지)과 S3 에 객체가 보일 때까지의 시간을 비교하고,
+큰 페이로드로 upload_file 대비 multipart 스트리밍 처리량도 잰다.
+키 / ContentType / 실패 처리는 tests/test_s3_upload.py 에서 확인한다.
+
+실행 (프로젝트 루트에서):
+    python -m scripts.bench.s3_upload --repeat 5 --tts-latency 1
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from uuid import uuid4
+
+from scripts.bench.fake_servers import (
+    create_fake_backend_app,
+    create_fake_openai_app,
+    serve_in_thread,
+)
+
+BUCKET = "bench-morning-boost"
+
+
+def _wait_for_object(s3, key: str, timeout: float = 60.0) -> float:
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        try:
+            s3.head_object(Bucket=BUCKET, Key=key)
+            return time.perf_counter()
+        except s3.exceptions.ClientError:
+            time.sleep(0.01)
+    raise TimeoutError(key)
+
+
+def _find_key(s3, prefix: str) -> str:
+    resp = s3.list_objects_v2(Bucket=BUCKET, Prefix=prefix)
+    return resp["Contents"][0]["Key"]
+
+
+def _add_inline_route(app) -> None:
+    """
+    비교용: 예전처럼 파일을 다 쓰고 S3 업로드가 끝난 뒤에 응답하는 엔드포인트.
+    """
+    from fastapi.responses import FileResponse
+
+    from apps.morning_boost.diary_client import fetch_latest_diary_async
+    from apps.morning_boost.router import _render_boost_file
+    from apps.morning_boost.s3_client import upload_audio_to_s3
+
+    @app.get("/bench/boost-inline")
+    async def boost_inline(user_id: str):
+        diary = await fetch_latest_diary_async(user_id)
+        out_path = await _render_boost_file(user_id, diary)
+        await asyncio.to_thread(upload_audio_to_s3, out_path, user_id)
+        return FileResponse(path=str(out_path), media_type="audio/mpeg", filename=out_path.name)
+
+
+def _measure(app_url: str, s3, mode: str, repeat: int) -> tuple:
+    import httpx
+
+    run_tag = uuid4().hex[:8]
+    response, visible = [], []
+    with httpx.Client(base_url=app_url, timeout=120) as http:
+        for i in range(repeat):
+            user_id = f"s3_{run_tag}_{mode}_{i}"
+            started = time.perf_counter()
+            if mode == "inline":
+                resp = http.get("/bench/boost-inline", params={"user_id": user_id})
+            else:
+                stream = "true" if mode == "bg-stream" else "false"
+                resp = http.get("/boost", params={"user_id": user_id, "stream": stream, "s3": "true"})
+            resp.raise_for_status()
+            done = time.perf_counter()
+            response.append(done - started)
+
+            deadline = time.perf_counter() + 60
+            while True:
+                try:
+                    key = _find_key(s3, f"morning_boost/{user_id}/")
+                    break
+                except KeyError:
+                    if time.perf_counter() > deadline:
+                        raise
+                    time.sleep(0.01)
+            visible.append(_wait_for_object(s3, key) - started)
+    return statistics.median(response), statistics.median(visible)
+
+
+def _measure_throughput(size_mb: int) -> None:
+    from apps.morning_boost.s3_client import get_s3_client, stream_to_s3
+
+    payload = os.urandom(size_mb * 1024 * 1024)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "big.mp3"
+        path.write_bytes(payload)
+        started = time.perf_counter()
+        get_s3_client().upload_file(str(path), BUCKET, "throughput/upload_file.mp3")
+        upload_file_s = time.perf_counter() - started
+
+    async def chunks():
+        for i in range(0, len(payload), 4096):
+            yield payload[i:i + 4096]
+
+    started = time.perf_counter()
+    asyncio.run(stream_to_s3(chunks(), "throughput/multipart.mp3"))
+    multipart_s = time.perf_counter() - started
+
+    print(f"\n{size_mb}MB 처리량 (4KB 청크)")
+    print(f"{'upload_file':>12} {size_mb / upload_file_s:8.1f} MB/s  (로컬 파일 필요)")
+    print(f"{'multipart':>12} {size_mb / multipart_s:8.1f} MB/s  (파일 없이 스트림)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="생성 음성 S3 업로드 벤치마크")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--llm-latency", type=float, default=0.2)
+    parser.add_argument("--tts-latency", type=float, default=1.0)
+    parser.add_argument("--s3-latency", type=float, default=0.1, help="S3 API 호출마다 더할 지연(초)")
+    parser.add_argument("--size-mb", type=int, default=32)
+    parser.add_argument("--port", type=int, default=18480)
+    args = parser.parse_args()
+
+    from moto.server import ThreadedMotoServer
+
+    moto_server = ThreadedMotoServer(ip_address="127.0.0.1", port=args.port + 3)
+    moto_server.start()
+
+    openai_app = create_fake_openai_app(llm_latency=args.llm_latency, tts_latency=args.tts_latency)
+    backend_app = create_fake_backend_app(latency=0.05)
+
+    try:
+        with serve_in_thread(openai_app, args.port + 1) as openai_url, \
+                serve_in_thread(backend_app, args.port + 2) as backend_url:
+            os.environ.update(
+                OPENAI_API_KEY="sk-bench",
+                OPENAI_BASE_URL=f"{openai_url}/v1",
+                BACKEND_URL=backend_url,
+                AWS_ACCESS_KEY_ID="bench",
+                AWS_SECRET_ACCESS_KEY="bench",
+                AWS_REGION="us-east-1",
+                AWS_S3_BUCKET=BUCKET,
+                AWS_S3_ENDPOINT_URL=f"http://127.0.0.1:{args.port + 3}",
+            )
+
+            import boto3
+
+            from apps.morning_boost.s3_client import get_s3_client
+            from main import app
+
+            # 측정용 조회 클라이언트는 지연 없이 따로 둔다
+            s3 = boto3.client("s3", endpoint_url=os.environ["AWS_S3_ENDPOINT_URL"], region_name="us-east-1")
+            s3.create_bucket(Bucket=BUCKET)
+            # 로컬 moto 는 너무 빨라서 앱 쪽 클라이언트에 실제 S3 왕복 지연을 흉내 낸다
+            get_s3_client().meta.events.register(
+                "before-send.s3", lambda **kwargs: time.sleep(args.s3_latency)
+            )
+            _add_inline_route(app)
+
+            print(f"{'mode':>10} {'response(s)':>12} {'s3 visible(s)':>14}")
+            with serve_in_thread(app, args.port) as app_url:
+                for mode in ("inline", "bg-file", "bg-stream"):
+                    resp_s, visible_s = _measure(app_url, s3, mode, args.repeat)
+                    print(f"{mode:>10} {resp_s:>12.3f} {visible_s:>14.3f}")
+
+            _measure_throughput(args.size_mb)
+    finally:
+        moto_server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# scripts/bench/startup.py
+"""
+워커 기동 시간 벤치마크 + 회귀 체크.
+
+- import : 새 파이썬 프로세스에서 `import main` 에 걸리는 시간 (-X importtime)
+- ready  : uvicorn 프로세스를 띄운 뒤 첫 /health 200 까지 걸리는 시간
+
+기준(--max-import-ms / --max-ready-ms)을 넘으면 종료 코드 1 로 끝나서 CI 에서 회귀를 잡을 수 있다.
+느려졌을 때 원인을 찾기 쉽도록 누적 import 시간이 큰 모듈도 같이 출력한다.
+
+실행 (프로젝트 루트에서):
+    python -m scripts.bench.startup
+    python -m scripts.bench.startup --repeat 5 --max-import-ms 600 --max-ready-ms 1500
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+
+def _env() -> Dict[str, str]:
+    # 실제 키/백엔드 없이도 기동은 되어야 한다
+    return dict(os.environ, OPENAI_API_KEY=os.getenv("OPENAI_API_KEY", "sk-bench"))
+
+
+def _import_times(module: str) -> Tuple[float, List[Tuple[float, str]]]:
+    """
+    (module 누적 import 시간 ms, [(누적 ms, 모듈명), ...]) 반환.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    total = 0.0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, name = (p.strip() for p in line[len("import time:"):].split("|"))
+        ms = int(cumulative_us) / 1000
+        rows.append((ms, name))
+        if name == module:
+            total = ms
+    return total, rows
+
+
+def _ready_time(module: str, port: int, timeout: float = 30.0) -> float:
+    import httpx
+
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", f"{module}:app", "--port", str(port), "--log-level", "warning"],
+        env=_env(),
+    )
+    try:
+        while True:
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/health", timeout=0.5).status_code == 200:
+                    return (time.perf_counter() - started) * 1000
+            except httpx.HTTPError:
+                pass
+            if proc.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with {proc.returncode}")
+            if time.perf_counter() - started > timeout:
+                raise TimeoutError("no /health response")
+            time.sleep(0.01)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="워커 기동 시간 벤치마크")
+    parser.add_argument("--module", default="main", help="import / uvicorn 대상 모듈 (app 속성 필요)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10, help="누적 import 시간 상위 모듈 수")
+    parser.add_argument("--max-import-ms", type=float, default=800.0)
+    parser.add_argument("--max-ready-ms", type=float, default=2000.0)
+    parser.add_argument("--port", type=int, default=18580)
+    args = parser.parse_args()
+
+    imports, rows = [], []
+    for _ in range(args.repeat):
+        total, rows = _import_times(args.module)
+        imports.append(total)
+    ready = [_ready_time(args.module, args.port) for _ in range(args.repeat)]
+
+    import_ms = statistics.median(imports)
+    ready_ms = statistics.median(ready)
+
+    print(f"top {args.top} cumulative imports (last run):")
+    for ms, name in sorted(rows, reverse=True)[: args.top]:
+        print(f"  {ms:8.1f} ms  {name}")
+    print()
+    print(f"{'import':>8} {import_ms:8.1f} ms  (limit {args.max_import_ms:.0f} ms)")
+    print(f"{'ready':>8} {ready_ms:8.1f} ms  (limit {args.max_ready_ms:.0f} ms)")
+
+    failed = []
+    if import_ms > args.max_import_ms:
+        failed.append("import")
+    if ready_ms > args.max_ready_ms:
+        failed.append("ready")
+    if failed:
+        print("[startup] REGRESSION:", ", ".join(failed))
+        sys.exit(1)
+    print("[startup] OK")
+
+
+if __name__ == "__main__":
+    main()
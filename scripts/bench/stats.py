@@ -0,0 +1,18 @@
+# scripts/bench/stats.py
+"""
+벤치 스크립트 공용 통계 도우미.
+"""
+
+import math
+from typing import Iterable
+
+
+def percentile(values: Iterable[float], q: float) -> float:
+    """
+    nearest-rank 백분위수. q 는 0~1 (예: 0.95), values 는 정렬 안 돼 있어도 된다. 비어 있으면 0.0.
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(q * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
@@ -0,0 +1,208 @@
+# scripts/bench/stt_cache.py
+"""
+/diary/stt 결과 캐시(stt_cache.py) 동작 확인 + 재업로드 때 OpenAI 호출 수 비교.
+
+가짜 OpenAI(STT 는 업로드 크기에 비례해 느리고, 전사에 크기가 들어감)와 앱을 띄우고
+- check : 같은 녹음 재업로드 hit / 동시 재업로드 합치기 / 녹음이 달라도 전사가 같으면 일기 재사용 /
+          실패는 캐시하지 않음 / 용량 상한 eviction 을 차례로 확인한다 (하나라도 틀리면 종료 코드 1)
+- load  : --memos 개 녹음을 각각 --repeat 번(네트워크 끊김 재업로드 흉내) 올릴 때
+          캐시 off / on 의 STT / 일기 생성 호출 수, 업로드 지연 p50 / p95 비교
+
+실행 (프로젝트 루트에서):
+    python -m scripts.bench.stt_cache
+    python -m scripts.bench.stt_cache --modes load --memos 40 --repeat 3 --size-kb 2048
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+from scripts.bench.fake_servers import FaultInjector, create_fake_openai_app, serve_in_thread
+
+
+from scripts.bench.stats import percentile
+def _memo(i: int, size: int) -> bytes:
+    # 녹음마다 바이트 / 길이가 다르게 (가짜 STT 는 전사에 크기를 넣는다)
+    return random.Random(i).randbytes(size + i)
+
+
+class _Checker:
+    def __init__(self):
+        self.failed = 0
+
+    def __call__(self, name: str, ok: bool, detail: Any = "") -> None:
+        if not ok:
+            self.failed += 1
+        print(f"  [{'ok' if ok else 'FAIL'}] {name}{f'  ({detail})' if detail != '' else ''}")
+
+
+async def _upload(http, payload: bytes, name: str = "memo.m4a"):
+    t0 = time.perf_counter()
+    resp = await http.post("/diary/stt", files={"audio": (name, payload, "audio/mp4")})
+    return resp, time.perf_counter() - t0
+
+
+async def _check(url: str, openai_app, faults: FaultInjector, size: int) -> bool:
+    import httpx
+
+    from stt_diary.src.services.stt_cache import STTResultCache, set_stt_caches
+
+    check = _Checker()
+    calls = openai_app.state.calls
+    set_stt_caches(STTResultCache("transcript"), STTResultCache("diary"))
+
+    async with httpx.AsyncClient(base_url=url, timeout=60) as http:
+        a = _memo(1, size)
+        first, cold = await _upload(http, a)
+        again, warm = await _upload(http, a)
+        check(
+            "re-upload → no OpenAI calls",
+            first.json() == again.json() and calls["transcriptions"] == 1 and calls["responses"] == 1,
+            f"cold {cold * 1000:.0f}ms, warm {warm * 1000:.0f}ms",
+        )
+
+        b = _memo(2, size)
+        results = await asyncio.gather(*(_upload(http, b) for _ in range(5)))
+        check(
+            "5 concurrent uploads of one memo → 1 STT + 1 diary call",
+            calls["transcriptions"] == 2 and calls["responses"] == 2
+            and len({r.text for r, _ in results}) == 1,
+            dict(calls),
+        )
+
+        # 같은 길이, 다른 바이트 → 가짜 STT 전사가 같다 → 일기는 재사용
+        c = bytearray(a)
+        c[0] ^= 0xFF
+        third, _ = await _upload(http, bytes(c))
+        check(
+            "different audio, same transcript → diary reused",
+            third.json() == first.json() and calls["transcriptions"] == 3 and calls["responses"] == 2,
+            dict(calls),
+        )
+
+        faults.error_rate = 1.0
+        failed, _ = await _upload(http, _memo(3, size))
+        faults.error_rate = 0.0
+        ok, _ = await _upload(http, _memo(3, size))
+        check(
+            "failure is not cached",
+            failed.status_code != 200 and ok.status_code == 200,
+            (failed.status_code, ok.status_code),
+        )
+
+        stats = (await http.get("/diary/stt/cache-stats")).json()
+        check(
+            "cache-stats",
+            stats["transcript"]["hits"] == 1 and stats["transcript"]["coalesced"] == 4 and stats["diary"]["hits"] == 2,
+            stats,
+        )
+
+        small = STTResultCache("transcript", max_bytes=1024)
+        set_stt_caches(small, STTResultCache("diary", max_bytes=1024))
+        for i in range(20):
+            await _upload(http, _memo(100 + i, 1024))
+        small_stats = small.stats()
+        check(
+            "size bound evicts least recently used",
+            small_stats["bytes"] <= 1024 and small_stats["evictions"] > 0,
+            small_stats,
+        )
+    return check.failed == 0
+
+
+async def _load(url: str, openai_app, args: argparse.Namespace) -> None:
+    import httpx
+
+    from stt_diary.src.services.stt_cache import STTResultCache, set_stt_caches
+
+    memos = [_memo(1000 + i, args.size_kb * 1024) for i in range(args.memos)]
+    for name, enabled in (("off", False), ("on", True)):
+        set_stt_caches(
+            STTResultCache("transcript") if enabled else None,
+            STTResultCache("diary") if enabled else None,
+        )
+        before = dict(openai_app.state.calls)
+        latencies: List[float] = []
+        slots = asyncio.Semaphore(args.concurrency)
+        # 녹음마다 repeat 번: 첫 업로드 뒤 재업로드가 섞여서 들어온다
+        order = [i for i in range(args.memos) for _ in range(args.repeat)]
+        random.Random(7).shuffle(order)
+
+        async with httpx.AsyncClient(base_url=url, timeout=300) as http:
+            async def one(i: int) -> None:
+                async with slots:
+                    resp, elapsed = await _upload(http, memos[i])
+                    if resp.status_code == 200:
+                        latencies.append(elapsed)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(one(i) for i in order))
+            total = time.perf_counter() - started
+
+        calls = openai_app.state.calls
+        result: Dict[str, Any] = {
+            "uploads": len(order),
+            "ok": len(latencies),
+            "stt_calls": calls["transcriptions"] - before.get("transcriptions", 0),
+            "diary_calls": calls["responses"] - before.get("responses", 0),
+            "total_s": round(total, 2),
+            "p50_ms": round(percentile(latencies, 0.5) * 1000),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000),
+        }
+        print(f"[{name:>3}] {result}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="/diary/stt 결과 캐시 동작 확인 / OpenAI 호출 수 비교")
+    parser.add_argument("--memos", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=3, help="녹음당 업로드 수 (첫 업로드 + 재업로드)")
+    parser.add_argument("--size-kb", type=int, default=512)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--stt-latency", type=float, default=0.3)
+    parser.add_argument("--stt-latency-per-mb", type=float, default=0.5)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--modes", default="check,load")
+    parser.add_argument("--port", type=int, default=18700)
+    args = parser.parse_args()
+
+    faults = FaultInjector()
+    openai_app = create_fake_openai_app(
+        llm_latency=args.llm_latency,
+        stt_latency=args.stt_latency,
+        stt_latency_per_mb=args.stt_latency_per_mb,
+        faults=faults,
+    )
+    with serve_in_thread(openai_app, args.port + 1) as openai_url:
+        os.environ["OPENAI_API_KEY"] = "sk-bench"
+        os.environ["OPENAI_BASE_URL"] = f"{openai_url}/v1"
+
+        from apps.morning_boost.boost_pool import set_boost_pool
+        from main import app
+
+        # 기동 때 일기 없는 사용자 풀이 LLM 을 부르면 호출 수가 섞이므로 끈다
+        set_boost_pool(None)
+
+        ok = True
+        with serve_in_thread(app, args.port) as url:
+            for mode in args.modes.split(","):
+                if mode == "check":
+                    print("[check]")
+                    ok = asyncio.run(_check(url, openai_app, faults, args.size_kb * 1024)) and ok
+                elif mode == "load":
+                    print(
+                        f"memos={args.memos} repeat={args.repeat} size={args.size_kb}KB "
+                        f"concurrency={args.concurrency}"
+                    )
+                    asyncio.run(_load(url, openai_app, args))
+
+    if not ok:
+        print("FAILED")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
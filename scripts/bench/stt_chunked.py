@@ -0,0 +1,76 @@
+# scripts/bench/stt_chunked.py
+"""
+긴 음성 일기 STT: 한 번에 보내기 vs 무음 기준 분할 + 병렬 전사.
+
+합성한 N분짜리 wav(말소리 흉내 톤 + 중간중간 무음)를 만들고,
+업로드 크기에 비례해서 느려지는 가짜 STT 서버로 전사 시간을 잰다.
+
+실행 (프로젝트 루트에서):
+    python -m scripts.bench.stt_chunked --minutes 10 --parallel 4,8,16
+"""
+
+import argparse
+import io
+import os
+import time
+
+from scripts.bench.fake_servers import create_fake_openai_app, serve_in_thread
+
+
+def _synthetic_diary(minutes: float) -> bytes:
+    from pydub import AudioSegment
+    from pydub.generators import Sine
+
+    # 7초 말하기 + 0.8초 쉬기 반복
+    speech = Sine(220).to_audio_segment(duration=7000, volume=-12)
+    pause = AudioSegment.silent(duration=800)
+    unit = (speech + pause).set_channels(1).set_frame_rate(16000).set_sample_width(2)
+    audio = unit * int(minutes * 60 * 1000 / len(unit) + 1)
+    buf = io.BytesIO()
+    audio[: int(minutes * 60 * 1000)].export(buf, format="wav")
+    return buf.getvalue()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="긴 음성 STT 분할/병렬 벤치마크")
+    parser.add_argument("--minutes", type=float, default=10)
+    parser.add_argument("--parallel", default="4,8,16")
+    parser.add_argument("--chunk-seconds", type=float, default=60)
+    parser.add_argument("--latency-per-mb", type=float, default=0.5)
+    parser.add_argument("--port", type=int, default=18481)
+    args = parser.parse_args()
+
+    fake = create_fake_openai_app(stt_latency=0.3, stt_latency_per_mb=args.latency_per_mb)
+    with serve_in_thread(fake, args.port) as openai_url:
+        os.environ["OPENAI_API_KEY"] = "sk-bench"
+        os.environ["OPENAI_BASE_URL"] = f"{openai_url}/v1"
+
+        from stt_diary.src.services.stt_chunking import transcribe_long_audio
+        from stt_diary.src.services.stt_diary_service import _transcribe
+
+        payload = _synthetic_diary(args.minutes)
+        print(f"{args.minutes:g} min diary, {len(payload) / 1024 / 1024:.1f}MB wav")
+        print(f"{'mode':>14} {'seconds':>8}")
+
+        for parallel in [1] + [int(x) for x in args.parallel.split(",") if x]:
+            started = time.perf_counter()
+            transcribe_long_audio(
+                io.BytesIO(payload),
+                "diary.wav",
+                _transcribe,
+                max_parallel=parallel,
+                chunk_seconds=args.chunk_seconds,
+                min_bytes=0,
+            )
+            elapsed = time.perf_counter() - started
+            mode = "single" if parallel == 1 else f"chunked x{parallel}"
+            print(f"{mode:>14} {elapsed:>8.2f}")
+
+        one_chunk = _synthetic_diary(args.chunk_seconds / 60)
+        started = time.perf_counter()
+        _transcribe("chunk.wav", io.BytesIO(one_chunk))
+        print(f"{'one chunk':>14} {time.perf_counter() - started:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+# scripts/bench/stt_upload_memory.py
+"""
+/diary/stt 대용량 동시 업로드 메모리 벤치마크.
+
+앱 서버를 별도 프로세스로 띄우고 큰 음성 파일을 동시에 올린 뒤
+서버 프로세스의 peak RSS(VmHWM)를 비교한다. (Linux /proc 필요)
+
+- legacy    : 예전 방식 (await audio.read() → BytesIO)
+- streaming : 현재 방식 (spool 파일을 그대로 STT 호출에 전달)
+
+실행 (프로젝트 루트에서):
+    python -m scripts.bench.stt_upload_memory --size-mb 20 --parallel 8
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+from scripts.bench.fake_servers import create_fake_openai_app, serve_in_thread
+
+
+def _legacy_app():
+    import io
+
+    from fastapi import FastAPI, File, UploadFile
+
+    from stt_diary.src.core.openai_client import get_client
+
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    @app.post("/diary/stt")
+    async def legacy(audio: UploadFile = File(...)):
+        audio_bytes = await audio.read()
+        audio_file = io.BytesIO(audio_bytes)
+        audio_file.name = audio.filename or "audio.wav"
+        res = get_client().audio.transcriptions.create(model="gpt-4o-mini-transcribe", file=audio_file)
+        return {"transcript": res.text, "diary": ""}
+
+    return app
+
+
+def _serve(mode: str, port: int) -> None:
+    import uvicorn
+
+    if mode == "legacy":
+        app = _legacy_app()
+    else:
+        from main import app
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def _rss_kb(pid: int, field: str) -> int:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    return 0
+
+
+async def _upload_all(base_url: str, payload: bytes, parallel: int) -> list:
+    import httpx
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=300) as http:
+        async def one(i: int) -> int:
+            files = {"audio": (f"memo_{i}.wav", payload, "audio/wav")}
+            resp = await http.post("/diary/stt", files=files)
+            return resp.status_code
+
+        return await asyncio.gather(*(one(i) for i in range(parallel)))
+
+
+def _run_mode(mode: str, args, openai_url: str) -> None:
+    import httpx
+
+    env = dict(os.environ, OPENAI_API_KEY="sk-bench", OPENAI_BASE_URL=f"{openai_url}/v1")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "scripts.bench.stt_upload_memory", "--serve", mode, "--port", str(args.port)],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                httpx.get(f"{base_url}/health", timeout=1)
+                break
+            except httpx.HTTPError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.1)
+
+        idle_kb = _rss_kb(proc.pid, "VmRSS")
+        payload = os.urandom(args.size_mb * 1024 * 1024)
+        started = time.perf_counter()
+        statuses = asyncio.run(_upload_all(base_url, payload, args.parallel))
+        elapsed = time.perf_counter() - started
+        peak_kb = _rss_kb(proc.pid, "VmHWM")
+
+        print(
+            f"{mode:>10} idle={idle_kb / 1024:7.1f}MB peak={peak_kb / 1024:7.1f}MB "
+            f"delta={(peak_kb - idle_kb) / 1024:7.1f}MB time={elapsed:5.1f}s statuses={sorted(set(statuses))}"
+        )
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="/diary/stt 업로드 메모리 벤치마크")
+    parser.add_argument("--size-mb", type=int, default=20)
+    parser.add_argument("--parallel", type=int, default=8)
+    parser.add_argument("--port", type=int, default=18380)
+    parser.add_argument("--serve", choices=["legacy", "streaming"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        _serve(args.serve, args.port)
+        return
+
+    fake = create_fake_openai_app(llm_latency=0.1, stt_latency=0.5)
+    with serve_in_thread(fake, args.port + 1) as openai_url:
+        print(f"{args.parallel} x {args.size_mb}MB uploads")
+        for mode in ("legacy", "streaming"):
+            _run_mode(mode, args, openai_url)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+# scripts/bench/tail_latency.py
+"""
+OpenAI 호출 꼬리 지연: 호출 정책(call_policy.py) off / deadline+재시도 / 시도 상한+재시도 / hedging 비교.
+
+가짜 OpenAI 는 평소에는 llm / tts 지연(로그정규로 흔들림)으로 답하지만
+--tail-rate 비율의 요청은 --tail-latency 초를 더 끌고, --error-rate 비율은 5xx 로 실패한다.
+모드마다 새 프로세스에서(설정 / 재시도 예산 / 지연 표본이 빈 상태) --requests 개의 "요청"을
+동시 --concurrency 개씩 보낸다. 요청 하나 = request_deadline(--budget) 안에서 LLM 멘트 → TTS 파일.
+- off      : 정책 끔 (SDK 재시도, SDK timeout)
+- deadline : 정책 켬, 실패(5xx)만 재시도, 느린 시도는 단계 deadline 까지 기다림
+- attempt  : + 시도 하나 상한(--attempt-timeout), 넘으면 끊고 재시도
+- hedge    : + hedging (최근 p95 가 지나면 하나 더, 빠른 쪽 사용)
+각 모드의 요청 지연 p50 / p95 / p99 / max, 실패(deadline 초과 포함) 수, 업스트림 호출 수(증폭)를 출력한다.
+정책 모드 중 p99 가 off 보다 낮은 모드가 없으면 종료 코드 1.
+
+실행 (프로젝트 루트에서):
+    python -m scripts.bench.tail_latency
+    python -m scripts.bench.tail_latency --requests 600 --tail-rate 0.03 --tail-latency 8 --modes off,hedge
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, List
+from uuid import uuid4
+
+from scripts.bench.fake_servers import FaultInjector, create_fake_openai_app, serve_in_thread
+
+from scripts.bench.stats import percentile
+MODES = ("off", "deadline", "attempt", "hedge")
+
+
+def _configure(mode: str, args: argparse.Namespace) -> None:
+    from apps.morning_boost.call_policy import get_call_policy_config, reset_call_policy
+
+    cfg = get_call_policy_config()
+    cfg["enabled"] = mode != "off"
+    cfg["request_budget_seconds"] = args.budget
+    for stage in ("llm", "tts"):
+        cfg["stages"][stage]["attempt_timeout_seconds"] = args.attempt_timeout if mode == "attempt" else None
+    cfg["hedge"]["enabled"] = mode == "hedge"
+    reset_call_policy()
+
+
+async def _wave(args: argparse.Namespace, out_dir) -> Dict[str, Any]:
+    from apps.morning_boost.call_policy import DeadlineExceeded, request_deadline
+    from apps.morning_boost.prompt_engine import generate_message_async
+    from apps.morning_boost.tts_engine import generate_tts_to_file_async
+
+    slots = asyncio.Semaphore(args.concurrency)
+    latencies: List[float] = []
+    failures: Counter = Counter()
+
+    async def one(i: int) -> None:
+        async with slots:
+            t0 = time.perf_counter()
+            try:
+                with request_deadline(args.budget):
+                    text = await generate_message_async(f"tail-latency bench request {i}")
+                    await generate_tts_to_file_async(text, out_dir / f"{i}.mp3", use_cache=False)
+            except DeadlineExceeded as e:
+                failures[f"deadline_{e.stage}"] += 1
+            except Exception as e:
+                failures[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - t0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.requests)))
+    return {
+        "total_s": round(time.perf_counter() - started, 2),
+        "p50_s": round(percentile(latencies, 0.5), 2),
+        "p95_s": round(percentile(latencies, 0.95), 2),
+        "p99_s": round(percentile(latencies, 0.99), 2),
+        "max_s": round(max(latencies, default=0.0), 2),
+        "failed": sum(failures.values()),
+        "failures": dict(failures),
+    }
+
+
+def _run_mode(args: argparse.Namespace) -> None:
+    """
+    한 모드만 이 프로세스에서 실행하고 결과를 JSON 한 줄로 출력.
+    """
+    faults = FaultInjector(
+        error_rate=args.error_rate,
+        error_status=500,
+        seed=args.seed,
+        sigma=args.sigma,
+        tail_rate=args.tail_rate,
+        tail_latency=args.tail_latency,
+    )
+    openai_app = create_fake_openai_app(
+        llm_latency=args.llm_latency,
+        tts_latency=args.tts_latency,
+        tts_chunks=2,
+        faults=faults,
+    )
+    with serve_in_thread(openai_app, args.port) as openai_url:
+        os.environ["OPENAI_API_KEY"] = "sk-bench"
+        os.environ["OPENAI_BASE_URL"] = f"{openai_url}/v1"
+
+        from apps.morning_boost.call_policy import call_policy_stats
+        from apps.morning_boost.openai_limiter import set_openai_limiter
+        from apps.morning_boost.utils import get_data_dir
+
+        # rate limiter 대기는 빼고 업스트림 꼬리 지연만 본다 (limiter 는 scripts.bench.rate_limit)
+        set_openai_limiter(None)
+        _configure(args.mode, args)
+        out_dir = get_data_dir() / f"tail-bench-{uuid4().hex[:8]}"
+        out_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            result = asyncio.run(_wave(args, out_dir))
+        finally:
+            shutil.rmtree(out_dir, ignore_errors=True)
+        calls = openai_app.state.calls
+        result["upstream_calls"] = calls["responses"] + calls["speech"]
+        result["amplification"] = round(result["upstream_calls"] / (2 * args.requests), 2)
+        result["slow_injected"] = faults.slow
+        if args.mode != "off":
+            result["retry_budget"] = call_policy_stats()["retry_budget"]
+    print(json.dumps(result, ensure_ascii=False))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="OpenAI 호출 정책 꼬리 지연 비교")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--tts-latency", type=float, default=0.3)
+    parser.add_argument("--sigma", type=float, default=0.3, help="로그정규 지연 흔들기")
+    parser.add_argument("--tail-rate", type=float, default=0.03, help="한참 느린 응답 비율")
+    parser.add_argument("--tail-latency", type=float, default=6.0, help="느린 응답에 더할 지연(초)")
+    parser.add_argument("--error-rate", type=float, default=0.02, help="5xx 비율")
+    parser.add_argument("--budget", type=float, default=10.0, help="요청 예산(초)")
+    parser.add_argument("--attempt-timeout", type=float, default=1.5, help="attempt 모드의 시도 하나 상한(초)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--mode", choices=MODES, help="한 모드만 (내부용, 없으면 --modes 를 각각 새 프로세스로)")
+    parser.add_argument("--port", type=int, default=18680)
+    args = parser.parse_args()
+
+    if args.mode:
+        _run_mode(args)
+        return
+
+    print(
+        f"requests={args.requests} concurrency={args.concurrency} llm={args.llm_latency}s tts={args.tts_latency}s "
+        f"tail={args.tail_rate}×+{args.tail_latency}s errors={args.error_rate} budget={args.budget}s"
+    )
+    forwarded = list(sys.argv[1:])
+    p99: Dict[str, float] = {}
+    for mode in args.modes.split(","):
+        out = subprocess.run(
+            [sys.executable, "-m", "scripts.bench.tail_latency", *forwarded, "--mode", mode],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        line = out.stdout.strip().splitlines()[-1]
+        p99[mode] = json.loads(line)["p99_s"]
+        print(f"[{mode:>8}] {line}")
+
+    policy = [m for m in p99 if m != "off"]
+    if "off" in p99 and policy and min(p99[m] for m in policy) >= p99["off"]:
+        print("FAILED: no policy mode lowered p99")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
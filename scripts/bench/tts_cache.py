@@ -0,0 +1,51 @@
+# scripts/bench/tts_cache.py
+"""
+TTS 캐시 miss / hit 지연 비교.
+
+같은 멘트로 generate_tts_to_file_async 를 두 번 부르고
+첫 번째(합성) 와 두 번째(캐시) 에 걸린 시간을 출력한다.
+
+실행 (프로젝트 루트에서):
+    python -m scripts.bench.tts_cache --tts-latency 2
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from uuid import uuid4
+
+from scripts.bench.fake_servers import create_fake_openai_app, serve_in_thread
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="TTS 캐시 miss/hit 비교")
+    parser.add_argument("--tts-latency", type=float, default=2.0)
+    parser.add_argument("--port", type=int, default=18281)
+    args = parser.parse_args()
+
+    with serve_in_thread(create_fake_openai_app(tts_latency=args.tts_latency), args.port) as openai_url:
+        os.environ["OPENAI_API_KEY"] = "sk-bench"
+        os.environ["OPENAI_BASE_URL"] = f"{openai_url}/v1"
+
+        from apps.morning_boost.tts_cache import get_tts_cache
+        from apps.morning_boost.tts_engine import generate_tts_to_file_async
+        from apps.morning_boost.utils import get_data_dir
+
+        text = f"캐시 벤치마크 {uuid4().hex}"
+
+        async def run() -> None:
+            for label in ("miss", "hit"):
+                out_path = get_data_dir() / f"bench_cache_{uuid4().hex}.mp3"
+                started = time.perf_counter()
+                await generate_tts_to_file_async(text, out_path)
+                elapsed = time.perf_counter() - started
+                print(f"{label:>5}: {elapsed * 1000:9.1f} ms  ({out_path.stat().st_size} bytes)")
+                out_path.unlink(missing_ok=True)
+
+        asyncio.run(run())
+        print("stats:", get_tts_cache().stats())
+
+
+if __name__ == "__main__":
+    main()
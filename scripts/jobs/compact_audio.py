@@ -0,0 +1,32 @@
+# scripts/jobs/compact_audio.py
+"""
+생성된 음성 파일 디렉토리(data/morning_boost) 즉시 정리.
+
+configs/morning_boost.yaml 의 retention 정책(나이 / 전체 용량)을 적용하고
+지운 파일 수와 회수한 용량을 출력한다.
+
+실행 (프로젝트 루트에서):
+    python -m scripts.jobs.compact_audio
+    python -m scripts.jobs.compact_audio --dry-run --max-age-days 3
+"""
+
+import argparse
+
+from apps.morning_boost.retention import compact_audio_dir
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="morning boost 음성 파일 정리")
+    parser.add_argument("--dry-run", action="store_true", help="지우지 않고 결과만 출력")
+    parser.add_argument("--max-age-days", type=float, default=None)
+    parser.add_argument("--max-total-bytes", type=int, default=None)
+    parser.add_argument("--min-age-minutes", type=float, default=None)
+    args = parser.parse_args()
+
+    report = compact_audio_dir(
+        max_age_days=args.max_age_days,
+        max_total_bytes=args.max_total_bytes,
+        min_age_minutes=args.min_age_minutes,
+        dry_run=args.dry_run,
+    )
+    print(report.summary())
@@ -1,42 +1,80 @@
 # scripts/jobs/morning_cron.py
 """
-매일 정해진 시간마다 morning_boost API를 자동으로 호출하는 스케줄러
+매일 아침 전체 사용자의 응원 멘트 음성을 미리 만들어 두는 스케줄러.
+
+configs/morning_boost.yaml 의 schedule 시각보다 prerender.lead_minutes 만큼 먼저 시작해서
+schedule 시각 전에 모든 사용자 클립을 만들어 둔다.
+중간에 죽어도 같은 날 다시 실행하면 끝난 사용자는 건너뛰고 이어서 만든다.
+
+실행 (프로젝트 루트에서):
+    python -m scripts.jobs.morning_cron          # 스케줄러로 대기
+    python -m scripts.jobs.morning_cron --now    # 지금 바로 한 번 실행
 """
 
-import requests
-from datetime import datetime
-from apscheduler.schedulers.blocking import BlockingScheduler
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+from apps.morning_boost.clients import load_env
+
+load_env()
+
+from apps.morning_boost.http_client import shutdown_backend_client
+from apps.morning_boost.prerender import load_prerender_config, run_prerender
 from apps.morning_boost.utils import load_config
 
 cfg = load_config()
+prerender_cfg = load_prerender_config()
 
-scheduler = BlockingScheduler()
 
-def run_boost():
+async def run_boost(workers=None, max_per_second=None) -> None:
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    print(f"[{now}] Running scheduled morning boost")
-
-    # 나중에 user 목록 불러오게 바꿔도 됨
-    user_id = "test_user"
+    print(f"[{now}] Running scheduled morning boost pre-render")
 
     try:
-        res = requests.get(
-            "http://127.0.0.1:8010/boost",
-            params={"user_id": user_id, "dryrun": 1},
-            timeout=10,
-        )
-        print("[BOOST RESULT]", res.json())
+        report = await run_prerender(workers=workers, max_per_second=max_per_second)
+        print(report.summary())
+        if report.failed_users:
+            print("[BOOST FAILED USERS]", ", ".join(report.failed_users))
     except Exception as e:
-        print("[BOOST ERROR]", e)
+        print("[BOOST ERROR]", repr(e))
+
+
+def _start_time() -> datetime:
+    # schedule 시각 - lead_minutes (날짜는 의미 없음, 시/분만 사용)
+    target = datetime(2000, 1, 2, int(cfg["schedule"]["hour"]), int(cfg["schedule"]["minute"]))
+    return target - timedelta(minutes=int(prerender_cfg["lead_minutes"]))
+
 
+async def _main(args: argparse.Namespace) -> None:
+    # 공유 HTTP/OpenAI 클라이언트가 한 이벤트 루프에 묶여 있으므로
+    # 매일 실행도 같은 루프(AsyncIOScheduler) 위에서 돌린다.
+    try:
+        if args.now:
+            await run_boost(args.workers, args.max_per_second)
+            return
+
+        start = _start_time()
+        scheduler = AsyncIOScheduler()
+        scheduler.add_job(
+            run_boost,
+            "cron",
+            hour=start.hour,
+            minute=start.minute,
+            kwargs={"workers": args.workers, "max_per_second": args.max_per_second},
+        )
+        scheduler.start()
+        print(f"⏰ Morning boost pre-render scheduler is started... (daily {start:%H:%M})")
+        await asyncio.Event().wait()
+    finally:
+        await shutdown_backend_client()
 
-scheduler.add_job(
-    run_boost,
-    "cron",
-    hour=cfg["schedule"]["hour"],
-    minute=cfg["schedule"]["minute"],
-)
 
 if __name__ == "__main__":
-    print("⏰ Morning boost cron scheduler is started...")
-    scheduler.start()
+    parser = argparse.ArgumentParser(description="morning boost 일괄 사전 생성")
+    parser.add_argument("--now", action="store_true", help="스케줄을 기다리지 않고 바로 한 번 실행")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-per-second", type=float, default=None)
+    asyncio.run(_main(parser.parse_args()))
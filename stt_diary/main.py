@@ -1,17 +1,20 @@
 # main.py
 
-from dotenv import load_dotenv
-load_dotenv()
+from apps.morning_boost.clients import load_env
+load_env()
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 # 라우터 import
+from apps.morning_boost.app_setup import install_common
+from apps.morning_boost.lifespan import morning_boost_lifespan
 from apps.morning_boost.router import router as boost_router
 from stt_diary.src.api.stt_diary_router import router as stt_diary_router
 
 app = FastAPI(
     title="Maum-on Unified API",
+    lifespan=morning_boost_lifespan,  # 백엔드 HTTP 클라이언트 / 음성 파일 reaper 시작·종료
 )
 
 # ============================
@@ -34,6 +37,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ============================
+# 🔥 공용 미들웨어 / 예외 핸들러
+# ============================
+
+# /diary/stt 업로드 상한(413), /metrics, /boost 요청 예산(504), OpenAI 과부하(503), 일기 조회 장애(502)
+install_common(app)
+
 # ============================
 # 🔥 라우터 등록
 # ============================
@@ -1,7 +1,11 @@
 # src/api/stt_diary_router.py
 from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 
+from apps.morning_boost.openai_limiter import OpenAIOverloaded
+from stt_diary.src.core.upload import STT_UPLOAD_MAX_BYTES
+from stt_diary.src.services.stt_cache import stt_cache_stats
 from stt_diary.src.services.stt_diary_service import stt_and_write_diary
 
 router = APIRouter(
@@ -15,6 +19,14 @@ class STTDiaryResponse(BaseModel):
     diary: str
 
 
+@router.get("/cache-stats")
+async def cache_stats():
+    """
+    같은 녹음 재업로드용 캐시 상태 (transcript: 음성 해시 → 전사, diary: 전사 해시 → 일기).
+    """
+    return stt_cache_stats()
+
+
 @router.post("", response_model=STTDiaryResponse)
 async def create_diary_from_voice(
     audio: UploadFile = File(..., description="녹음한 음성 파일 (wav/mp3/m4a 등)")
@@ -23,10 +35,18 @@ async def create_diary_from_voice(
     if not audio.content_type.startswith("audio/"):
         raise HTTPException(status_code=400, detail="audio 파일을 업로드해주세요.")
 
-    audio_bytes = await audio.read()
+    # 본문 크기 상한은 UploadSizeLimitMiddleware 가 먼저 막고, 여기선 한 번 더 확인
+    if audio.size is not None and audio.size > STT_UPLOAD_MAX_BYTES:
+        raise HTTPException(status_code=413, detail="업로드 파일이 너무 큽니다.")
 
+    # audio.read() 로 통째로 메모리에 올리지 않고, spool 된 파일 객체를 그대로 넘긴다.
+    # STT/일기 생성은 동기 호출이라 스레드풀에서 실행 (이벤트 루프 블로킹 방지)
     try:
-        result = stt_and_write_diary(audio_bytes, filename=audio.filename or "audio.wav")
+        result = await run_in_threadpool(
+            stt_and_write_diary, audio.file, filename=audio.filename or "audio.wav"
+        )
+    except OpenAIOverloaded:
+        raise  # 앱의 exception handler 가 503 + Retry-After 로 응답
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"STT/일기 생성 중 오류: {e}")
 
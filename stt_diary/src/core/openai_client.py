@@ -1,7 +1,11 @@
 # src/core/openai_client.py
-import os
-from openai import OpenAI
+from apps.morning_boost.clients import get_openai_client
 
-# .env에 OPENAI_API_KEY 저장해두면 알아서 읽음
-# 필요하면 이렇게도 가능: OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-client = OpenAI()
+
+def get_client():
+    """
+    공유 OpenAI 클라이언트 (apps.morning_boost.clients 레지스트리).
+    .env 에 OPENAI_API_KEY 저장해두면 알아서 읽음.
+    처음 부를 때 SDK 를 import 하고 만들기 때문에 서버 기동이 빨라진다.
+    """
+    return get_openai_client()
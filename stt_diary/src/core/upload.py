@@ -0,0 +1,98 @@
+# src/core/upload.py
+"""
+음성 업로드를 메모리에 통째로 올리지 않기 위한 설정/미들웨어.
+
+- STT_UPLOAD_SPOOL_BYTES : 이 크기까지만 메모리에 두고, 넘으면 임시 파일로 내린다 (기본 1MB)
+- STT_UPLOAD_MAX_BYTES   : 업로드 상한. 넘으면 본문을 끝까지 받지 않고 바로 413 (기본 25MB)
+"""
+import os
+from typing import Iterable
+
+from starlette.formparsers import MultiPartParser
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+STT_UPLOAD_SPOOL_BYTES = int(os.getenv("STT_UPLOAD_SPOOL_BYTES", str(1024 * 1024)))
+STT_UPLOAD_MAX_BYTES = int(os.getenv("STT_UPLOAD_MAX_BYTES", str(25 * 1024 * 1024)))
+
+
+def configure_upload_spooling(spool_bytes: int = STT_UPLOAD_SPOOL_BYTES) -> None:
+    """
+    multipart 파일 파트를 받을 때 쓰는 SpooledTemporaryFile 의 메모리 임계값 설정.
+    (starlette 가 UploadFile 을 만들 때 쓰는 값이라 프로세스 전역 설정)
+    """
+    MultiPartParser.spool_max_size = spool_bytes
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class UploadSizeLimitMiddleware:
+    """
+    지정한 경로로 들어오는 요청 본문 크기를 제한하는 ASGI 미들웨어.
+
+    Content-Length 가 있으면 본문을 읽기 전에 바로 413,
+    chunked 전송이면 받은 바이트 수를 세다가 상한을 넘는 순간 413.
+    """
+
+    def __init__(self, app: ASGIApp, paths: Iterable[str], max_bytes: int = STT_UPLOAD_MAX_BYTES):
+        self.app = app
+        self.paths = tuple(paths)
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.paths):
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope.get("headers") or []:
+            if name == b"content-length":
+                try:
+                    too_large = int(value) > self.max_bytes
+                except ValueError:
+                    too_large = False
+                if too_large:
+                    await self._reject(scope, receive, send)
+                    return
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    exceeded = True
+                    raise UploadTooLarge()
+            return message
+
+        async def guarded_send(message: Message) -> None:
+            nonlocal response_started
+            if exceeded:
+                # 본문 파싱 중 끊었으면 프레임워크가 만든 400 대신 413 을 한 번만 보낸다
+                if not response_started:
+                    response_started = True
+                    await self._reject(scope, receive, send)
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except UploadTooLarge:
+            if response_started:
+                return
+            await self._reject(scope, receive, send)
+
+    async def _reject(self, scope: Scope, receive: Receive, send: Send) -> None:
+        response = JSONResponse(
+            status_code=413,
+            content={"detail": f"업로드 파일이 너무 큽니다. (최대 {self.max_bytes // (1024 * 1024)}MB)"},
+            headers={"Connection": "close"},
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,211 @@
+# src/services/stt_cache.py
+"""
+/diary/stt 결과 캐시 (프로세스 내, 내용 해시 기준).
+
+네트워크가 끊겨서 앱이 같은 녹음을 다시 올리면 STT + 일기 생성을 처음부터 다시 했다.
+- 전사: (STT 모델, 음성 바이트 sha256) → transcript
+- 일기: (일기 모델, 프롬프트, transcript sha256) → diary  (녹음이 달라도 전사가 같으면 재사용)
+- 캐시마다 저장한 글자 바이트 합이 STT_CACHE_MAX_BYTES 를 넘으면 가장 오래 안 쓴 것부터 버림, TTL 이 지나면 만료
+- 같은 키를 동시에 계산 중이면(재업로드가 원래 요청보다 먼저 도착) 그 결과를 같이 받는다
+
+환경 변수:
+- STT_CACHE_ENABLED     : 0 이면 끔 (기본 1)
+- STT_CACHE_MAX_BYTES   : 캐시 하나(전사 / 일기)의 상한 (기본 16MB)
+- STT_CACHE_TTL_SECONDS : 항목 수명 (기본 24시간)
+
+상태: GET /diary/stt/cache-stats, /metrics 의 maumon_stt_cache_total
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import BinaryIO, Callable, Dict, Optional, Tuple
+
+from apps.morning_boost.metrics import STT_CACHE_TOTAL
+
+STT_CACHE_ENABLED = os.getenv("STT_CACHE_ENABLED", "1") not in ("0", "false", "False")
+STT_CACHE_MAX_BYTES = int(os.getenv("STT_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+STT_CACHE_TTL_SECONDS = float(os.getenv("STT_CACHE_TTL_SECONDS", str(24 * 3600)))
+
+_HASH_CHUNK = 1024 * 1024
+
+# 메트릭 outcome → 카운터 속성
+_OUTCOME_ATTRS = {"hit": "hits", "miss": "misses", "coalesced": "coalesced"}
+
+
+def audio_digest(audio_file: BinaryIO) -> str:
+    """
+    업로드 파일 전체의 sha256. 메모리에 통째로 올리지 않고 1MB 씩 읽고, 끝나면 처음으로 되돌린다.
+    """
+    h = hashlib.sha256()
+    audio_file.seek(0)
+    for chunk in iter(lambda: audio_file.read(_HASH_CHUNK), b""):
+        h.update(chunk)
+    audio_file.seek(0)
+    return h.hexdigest()
+
+
+def text_digest(*parts: str) -> str:
+    return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Optional[str] = None
+        self.error: Optional[BaseException] = None
+
+
+class STTResultCache:
+    """
+    문자열 결과용 LRU + TTL 캐시. 스레드풀에서 불리므로 threading.Lock 으로 보호한다.
+    """
+
+    def __init__(self, kind: str, max_bytes: int = STT_CACHE_MAX_BYTES, ttl_seconds: float = STT_CACHE_TTL_SECONDS):
+        self.kind = kind
+        self.max_bytes = max_bytes
+        self.ttl = ttl_seconds
+        self._lock = threading.Lock()
+        # 키 → (값, 만료 시각, 크기), 앞쪽일수록 오래 안 쓴 항목
+        self._entries: "OrderedDict[str, Tuple[str, float, int]]" = OrderedDict()
+        self._flights: Dict[str, _Flight] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def _count(self, outcome: str) -> None:
+        attr = _OUTCOME_ATTRS[outcome]
+        setattr(self, attr, getattr(self, attr) + 1)
+        STT_CACHE_TOTAL.inc(self.kind, outcome)
+
+    def _get_locked(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at, size = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            self._bytes -= size
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _put_locked(self, key: str, value: str) -> None:
+        size = len(key) + len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[2]
+        self._entries[key] = (value, time.monotonic() + self.ttl, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+            self.evictions += 1
+
+    def get_or_compute(self, key: str, compute: Callable[[], str]) -> Tuple[str, str]:
+        """
+        캐시에 있으면 바로, 같은 키를 다른 스레드가 계산 중이면 그 결과를, 아니면 compute() 후 저장.
+        (outcome, 값) 반환, outcome = hit / coalesced / miss.
+        compute 가 실패하면 캐시하지 않고, 기다리던 쪽에도 같은 예외를 올린다.
+        """
+        with self._lock:
+            value = self._get_locked(key)
+            if value is not None:
+                self._count("hit")
+                return "hit", value
+            flight = self._flights.get(key)
+            owner = flight is None
+            if owner:
+                flight = self._flights[key] = _Flight()
+
+        if not owner:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            with self._lock:
+                self._count("coalesced")
+            return "coalesced", flight.value
+
+        with self._lock:
+            self._count("miss")
+        try:
+            value = compute()
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            flight.value = value
+            with self._lock:
+                self._put_locked(key, value)
+            return "miss", value
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_rate": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+_transcripts: Optional[STTResultCache] = None
+_diaries: Optional[STTResultCache] = None
+_initialized = False
+
+
+def _init() -> None:
+    global _transcripts, _diaries, _initialized
+    if not _initialized:
+        if STT_CACHE_ENABLED:
+            _transcripts = STTResultCache("transcript")
+            _diaries = STTResultCache("diary")
+        _initialized = True
+
+
+def get_transcript_cache() -> Optional[STTResultCache]:
+    """
+    (STT 모델, 음성 해시) → 전사. STT_CACHE_ENABLED=0 이면 None.
+    """
+    _init()
+    return _transcripts
+
+
+def get_diary_text_cache() -> Optional[STTResultCache]:
+    """
+    (일기 모델, 프롬프트, 전사 해시) → 일기. STT_CACHE_ENABLED=0 이면 None.
+    """
+    _init()
+    return _diaries
+
+
+def set_stt_caches(transcripts: Optional[STTResultCache], diaries: Optional[STTResultCache]) -> None:
+    """
+    테스트/벤치에서 캐시를 바꿔 끼우거나 끌 때 (None).
+    """
+    global _transcripts, _diaries, _initialized
+    _transcripts, _diaries = transcripts, diaries
+    _initialized = True
+
+
+def stt_cache_stats() -> Dict[str, object]:
+    transcripts, diaries = get_transcript_cache(), get_diary_text_cache()
+    return {
+        "transcript": {"enabled": True, **transcripts.stats()} if transcripts else {"enabled": False},
+        "diary": {"enabled": True, **diaries.stats()} if diaries else {"enabled": False},
+    }
@@ -0,0 +1,214 @@
+# src/services/stt_chunking.py
+"""
+긴 음성 일기를 무음 구간 기준으로 잘라서 병렬로 STT 하는 모듈.
+
+STT 지연은 녹음 길이에 비례하므로, 긴 녹음은
+1) 무음 구간에서 최대 STT_CHUNK_SECONDS 길이의 조각으로 나누고
+2) 조각들을 STT_MAX_PARALLEL 개씩 동시에 전사한 뒤
+3) 순서대로 이어 붙인다.
+짧은 녹음은 디코딩 없이 원본 파일 그대로 한 번에 보낸다.
+
+녹음 전체를 메모리에 디코딩하지 않는다 (1시간 녹음이면 16kHz PCM 만 100MB 가 넘음).
+업로드를 임시 디렉토리에 한 번 복사하고, ffmpeg 가 흘려 읽으면서 평균 음량 / 무음 구간만 로그로 알려주면
+자를 위치를 정한 뒤, 조각은 전사할 차례에 ffmpeg -ss / -t 로 임시 wav 파일에 잘라 쓰고 다 보내면 지운다.
+ffmpeg 가 PATH 에 있어야 하고, 없으면 자르지 않고 한 번에 보낸다.
+
+환경 변수:
+- STT_CHUNK_MIN_BYTES   : 이보다 작은 파일은 자르지 않음 (기본 4MB)
+- STT_CHUNK_SECONDS     : 조각 최대 길이 (기본 60초)
+- STT_MAX_PARALLEL      : 동시에 보낼 조각 수 (기본 4)
+- STT_MIN_SILENCE_MS    : 자를 수 있는 무음 최소 길이 (기본 400ms)
+- STT_SILENCE_OFFSET_DB : 평균 음량보다 이만큼 작으면 무음으로 봄 (기본 16dB)
+"""
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Callable, List, Optional, Tuple
+
+STT_CHUNK_MIN_BYTES = int(os.getenv("STT_CHUNK_MIN_BYTES", str(4 * 1024 * 1024)))
+STT_CHUNK_SECONDS = float(os.getenv("STT_CHUNK_SECONDS", "60"))
+STT_MAX_PARALLEL = int(os.getenv("STT_MAX_PARALLEL", "4"))
+STT_MIN_SILENCE_MS = int(os.getenv("STT_MIN_SILENCE_MS", "400"))
+STT_SILENCE_OFFSET_DB = float(os.getenv("STT_SILENCE_OFFSET_DB", "16"))
+
+# STT 에는 16kHz 모노면 충분하고, 조각 크기도 작아진다
+STT_FRAME_RATE = 16000
+
+_COPY_CHUNK = 1024 * 1024
+
+# ffmpeg 로그에서 읽을 값
+_N_SAMPLES = re.compile(r"n_samples:\s*(\d+)")
+_MEAN_VOLUME = re.compile(r"mean_volume:\s*(-?[\d.]+) dB")
+_SILENCE = re.compile(r"silence_(start|end):\s*(-?[\d.]+)")
+
+# (파일명, 파일 객체) → 전사 텍스트
+TranscribeFn = Callable[[str, BinaryIO], str]
+
+
+def _file_size(audio_file: BinaryIO) -> int:
+    pos = audio_file.tell()
+    audio_file.seek(0, os.SEEK_END)
+    size = audio_file.tell()
+    audio_file.seek(pos)
+    return size
+
+
+def plan_chunks(
+    duration_ms: int,
+    silences: List[Tuple[int, int]],
+    max_chunk_ms: int,
+) -> List[Tuple[int, int]]:
+    """
+    무음 구간 목록을 보고 자를 위치를 정한다.
+
+    각 조각은 max_chunk_ms 를 넘지 않으며, 가능한 한 조각 끝 쪽의 무음 구간 한가운데에서 자른다.
+    자를 무음이 없으면 max_chunk_ms 에서 그냥 자른다.
+    """
+    cut_points = [(start + end) // 2 for start, end in silences]
+    chunks: List[Tuple[int, int]] = []
+    start = 0
+    while duration_ms - start > max_chunk_ms:
+        limit = start + max_chunk_ms
+        # 너무 짧은 조각이 생기지 않도록 조각 절반 이후의 무음만 후보로
+        candidates = [p for p in cut_points if start + max_chunk_ms // 2 <= p <= limit]
+        end = candidates[-1] if candidates else limit
+        chunks.append((start, end))
+        start = end
+    chunks.append((start, duration_ms))
+    return chunks
+
+
+def _ffmpeg(*args: str) -> str:
+    """
+    ffmpeg 를 실행하고 로그(stderr)를 돌려준다. 실패하면 RuntimeError.
+    """
+    proc = subprocess.run(
+        ["ffmpeg", "-hide_banner", "-nostdin", *args],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors="replace",
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg exited {proc.returncode}: {proc.stderr.strip()[-300:]}")
+    return proc.stderr
+
+
+def _spool_to_disk(audio_file: BinaryIO, filename: str, workdir: str) -> str:
+    """
+    업로드 파일을 ffmpeg 가 읽을 수 있게 작업 디렉토리에 1MB 씩 복사한다. (메모리에 통째로 올리지 않음)
+    """
+    ext = os.path.splitext(filename)[1].lower()
+    path = os.path.join(workdir, f"source{ext}")
+    audio_file.seek(0)
+    with open(path, "wb") as out:
+        shutil.copyfileobj(audio_file, out, _COPY_CHUNK)
+    audio_file.seek(0)
+    return path
+
+
+def _probe_audio(path: str) -> Tuple[int, float]:
+    """
+    (길이 ms, 평균 음량 dB). ffmpeg 가 디코딩하면서 흘려보내므로 메모리에는 안 쌓인다.
+    """
+    log = _ffmpeg("-i", path, "-vn", "-ac", "1", "-ar", str(STT_FRAME_RATE), "-af", "volumedetect", "-f", "null", "-")
+    # 필터 그래프를 처음 구성할 때도 n_samples: 0 이 찍히므로 마지막 값을 쓴다
+    samples = _N_SAMPLES.findall(log)
+    means = _MEAN_VOLUME.findall(log)
+    if not samples or not means:
+        raise RuntimeError("ffmpeg volumedetect 결과를 읽지 못했습니다")
+    return int(samples[-1]) * 1000 // STT_FRAME_RATE, float(means[-1])
+
+
+def _detect_silences(path: str, duration_ms: int, thresh_db: float) -> List[Tuple[int, int]]:
+    """
+    ffmpeg silencedetect 로 무음 구간 [(시작 ms, 끝 ms)] 을 찾는다.
+    """
+    log = _ffmpeg(
+        "-i", path, "-vn", "-ac", "1", "-ar", str(STT_FRAME_RATE),
+        "-af", f"silencedetect=noise={thresh_db:.1f}dB:d={STT_MIN_SILENCE_MS / 1000:.3f}",
+        "-f", "null", "-",
+    )
+    silences: List[Tuple[int, int]] = []
+    start: Optional[int] = None
+    for kind, value in _SILENCE.findall(log):
+        ms = int(float(value) * 1000)
+        if kind == "start":
+            start = max(0, ms)
+        elif start is not None:
+            silences.append((start, min(ms, duration_ms)))
+            start = None
+    if start is not None:
+        # 끝까지 조용하면 silence_end 가 안 찍힌다
+        silences.append((start, duration_ms))
+    return silences
+
+
+def plan_audio_chunks(path: str, max_chunk_ms: int) -> List[Tuple[int, int]]:
+    """
+    음성 파일을 훑어서(디코딩 두 번: 평균 음량 → 무음 구간) 자를 구간 [(시작 ms, 끝 ms)] 을 정한다.
+    """
+    duration_ms, mean_db = _probe_audio(path)
+    silences = _detect_silences(path, duration_ms, mean_db - STT_SILENCE_OFFSET_DB)
+    return plan_chunks(duration_ms, silences, max_chunk_ms)
+
+
+def extract_chunk(path: str, start_ms: int, end_ms: int, out_path: str) -> None:
+    """
+    [start_ms, end_ms) 구간만 16kHz 모노 wav 로 out_path 에 쓴다.
+    """
+    _ffmpeg(
+        "-ss", f"{start_ms / 1000:.3f}", "-t", f"{(end_ms - start_ms) / 1000:.3f}", "-i", path,
+        "-vn", "-ac", "1", "-ar", str(STT_FRAME_RATE), "-sample_fmt", "s16", "-y", out_path,
+    )
+
+
+def transcribe_long_audio(
+    audio_file: BinaryIO,
+    filename: str,
+    transcribe: TranscribeFn,
+    max_parallel: int = STT_MAX_PARALLEL,
+    chunk_seconds: float = STT_CHUNK_SECONDS,
+    min_bytes: int = STT_CHUNK_MIN_BYTES,
+) -> str:
+    """
+    작은 파일은 그대로 한 번에, 큰 파일은 조각내서 병렬로 전사한 뒤 순서대로 이어 붙인다.
+    """
+    if max_parallel <= 1 or _file_size(audio_file) < min_bytes:
+        audio_file.seek(0)
+        return transcribe(filename, audio_file)
+
+    max_chunk_ms = int(chunk_seconds * 1000)
+    with tempfile.TemporaryDirectory(prefix="stt-chunks-") as workdir:
+        try:
+            source = _spool_to_disk(audio_file, filename, workdir)
+            chunks = plan_audio_chunks(source, max_chunk_ms)
+        except Exception as e:
+            # ffmpeg 가 없거나 디코딩할 수 없는 포맷이면 예전처럼 한 번에 보낸다
+            print("[stt_chunking] split failed, fallback to single request:", repr(e))
+            chunks = []
+        if len(chunks) <= 1:
+            # 잘라 보니 한 조각이면 재인코딩한 것 말고 원본을 보낸다
+            audio_file.seek(0)
+            return transcribe(filename, audio_file)
+
+        stem = os.path.splitext(filename)[0] or "audio"
+
+        def run(i: int, start_ms: int, end_ms: int) -> str:
+            # 조각은 전사 직전에 잘라서 쓰고 바로 지운다 (디스크에도 동시에 max_parallel 개 정도만)
+            piece = os.path.join(workdir, f"chunk_{i:03d}.wav")
+            extract_chunk(source, start_ms, end_ms, piece)
+            try:
+                with open(piece, "rb") as f:
+                    return transcribe(f"{stem}_{i:03d}.wav", f)
+            finally:
+                os.remove(piece)
+
+        with ThreadPoolExecutor(max_workers=max_parallel) as pool:
+            futures = [pool.submit(run, i, start, end) for i, (start, end) in enumerate(chunks)]
+            texts = [f.result() for f in futures]
+
+    return " ".join(t.strip() for t in texts if t and t.strip())
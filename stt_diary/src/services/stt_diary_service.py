@@ -1,49 +1,103 @@
 # src/services/stt_diary_service.py
 import io
-from typing import Dict
+from typing import BinaryIO, Dict, Union
 
-from stt_diary.src.core.openai_client import client
+from apps.morning_boost.metrics import stage
+from apps.morning_boost.openai_limiter import openai_slot
+from stt_diary.src.core.openai_client import get_client
+from stt_diary.src.services.stt_cache import (
+    audio_digest,
+    get_diary_text_cache,
+    get_transcript_cache,
+    text_digest,
+)
+from stt_diary.src.services.stt_chunking import transcribe_long_audio
 
 
-def stt_and_write_diary(audio_bytes: bytes, filename: str = "audio.wav") -> Dict[str, str]:
+STT_MODEL = "gpt-4o-mini-transcribe"  # 또는 "whisper-1"
+DIARY_MODEL = "gpt-4.1-mini"  # 너가 쓰는 기본 모델로 바꿔도 됨
+
+DIARY_SYSTEM_PROMPT = (
+    "너는 한국어 일기 작성 도우미야. "
+    "사용자가 말한 내용을 자연스럽고 정돈된 한 편의 일기로 정리해줘. "
+    "1인칭 시점, 오늘 하루를 돌아보는 느낌으로, 과한 꾸밈말은 피하고 일상적인 말투로 써줘."
+)
+DIARY_USER_PROMPT = (
+    "다음은 사용자가 음성으로 말한 내용을 문자로 옮긴 결과야.\n"
+    "이 내용을 바탕으로 자연스러운 한국어 일기를 한 편 써줘.\n\n"
+    "[음성 인식 결과]\n{transcript}"
+)
+
+
+def _transcribe(filename: str, audio_file: BinaryIO) -> str:
+    # 조각마다 병렬로 불리므로 조각 하나가 limiter 자리 하나를 쓴다
+    with openai_slot(STT_MODEL):
+        stt_res = get_client().audio.transcriptions.create(
+            model=STT_MODEL,
+            file=(filename, audio_file),  # openai 라이브러리에서 파일명이 필요함
+            # language="ko",  # 한국어 고정하고 싶으면 주석 해제
+        )
+    return stt_res.text
+
+
+def _write_diary(transcript: str) -> str:
+    user_prompt = DIARY_USER_PROMPT.format(transcript=transcript)
+
+    with openai_slot(DIARY_MODEL):
+        resp = get_client().responses.create(
+            model=DIARY_MODEL,
+            input=[
+                {"role": "system", "content": DIARY_SYSTEM_PROMPT},
+                {"role": "user", "content": user_prompt},
+            ],
+        )
+    return resp.output[0].content[0].text
+
+
+def stt_and_write_diary(
+    audio: Union[bytes, BinaryIO],
+    filename: str = "audio.wav",
+) -> Dict[str, str]:
     """
     1) 음성을 텍스트로 변환(STT)
     2) 그 텍스트를 바탕으로 GPT가 자연스러운 일기 작성
+
+    audio 는 bytes 또는 파일 객체(예: 업로드 spool 파일).
+    파일 객체를 주면 전체를 메모리로 복사하지 않고 그대로 스트리밍해서 보낸다.
+    긴 녹음은 무음 구간에서 잘라 병렬로 전사한다 (stt_chunking).
+    같은 녹음을 다시 올리면 전사 / 일기를 캐시에서 바로 돌려준다 (stt_cache).
     """
 
     # 1. STT (Whisper / gpt-4o-mini-transcribe)
-    audio_file = io.BytesIO(audio_bytes)
-    audio_file.name = filename  # openai 라이브러리에서 필요로 함
-
-    stt_res = client.audio.transcriptions.create(
-        model="gpt-4o-mini-transcribe",  # 또는 "whisper-1"
-        file=audio_file,
-        # language="ko",  # 한국어 고정하고 싶으면 주석 해제
-    )
-    transcript = stt_res.text  # 사용자가 말한 내용
-
-    # 2. 일기 생성
-    system_prompt = (
-        "너는 한국어 일기 작성 도우미야. "
-        "사용자가 말한 내용을 자연스럽고 정돈된 한 편의 일기로 정리해줘. "
-        "1인칭 시점, 오늘 하루를 돌아보는 느낌으로, 과한 꾸밈말은 피하고 일상적인 말투로 써줘."
-    )
-
-    user_prompt = (
-        "다음은 사용자가 음성으로 말한 내용을 문자로 옮긴 결과야.\n"
-        "이 내용을 바탕으로 자연스러운 한국어 일기를 한 편 써줘.\n\n"
-        f"[음성 인식 결과]\n{transcript}"
-    )
-
-    resp = client.responses.create(
-        model="gpt-4.1-mini",   # 너가 쓰는 기본 모델로 바꿔도 됨
-        input=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
-    )
-
-    diary_text = resp.output[0].content[0].text
+    if isinstance(audio, (bytes, bytearray)):
+        audio_file = io.BytesIO(audio)
+    else:
+        audio_file = audio
+        audio_file.seek(0)
+
+    transcripts = get_transcript_cache()
+    with stage("stt") as s:
+        if transcripts is None:
+            transcript = transcribe_long_audio(audio_file, filename, _transcribe)  # 사용자가 말한 내용
+        else:
+            key = text_digest(STT_MODEL, audio_digest(audio_file))
+            outcome, transcript = transcripts.get_or_compute(
+                key, lambda: transcribe_long_audio(audio_file, filename, _transcribe)
+            )
+            if outcome != "miss":
+                s.outcome = "cache_hit"
+
+    # 2. 일기 생성 (같은 전사면 녹음이 달라도 재사용)
+    diaries = get_diary_text_cache()
+    with stage("diary_generation") as s:
+        if diaries is None:
+            diary_text = _write_diary(transcript)
+        else:
+            # 프롬프트를 고치면 키가 바뀌어 예전 일기를 쓰지 않는다
+            key = text_digest(DIARY_MODEL, DIARY_SYSTEM_PROMPT, DIARY_USER_PROMPT, text_digest(transcript))
+            outcome, diary_text = diaries.get_or_compute(key, lambda: _write_diary(transcript))
+            if outcome != "miss":
+                s.outcome = "cache_hit"
 
     return {
         "transcript": transcript,
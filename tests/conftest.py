@@ -0,0 +1,40 @@
+# tests/conftest.py
+"""
+테스트 공용 fixture. 가짜 OpenAI / 백엔드는 scripts/bench/fake_servers.py 의 것을 그대로 띄운다.
+"""
+
+import socket
+from contextlib import ExitStack
+
+import pytest
+
+from scripts.bench.fake_servers import serve_in_thread
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _data_dirs(tmp_path_factory):
+    """
+    음성 / 캐시 파일은 저장소의 data/ 대신 임시 디렉토리에 쓴다.
+    """
+    from apps.morning_boost import utils
+
+    root = tmp_path_factory.mktemp("data")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(utils, "DATA_DIR", root / "morning_boost")
+        mp.setattr(utils, "CACHE_DIR", root / "cache")
+        yield root
+
+
+@pytest.fixture
+def serve():
+    """
+    serve(app) → base URL. 테스트가 끝나면 서버를 내린다.
+    """
+    with ExitStack() as stack:
+        yield lambda app: stack.enter_context(serve_in_thread(app, free_port()))
@@ -0,0 +1,40 @@
+# tests/test_app_setup.py
+"""
+세 엔트리 포인트가 install_common 으로 같은 미들웨어 / 예외 핸들러를 갖는지.
+"""
+
+import importlib
+
+import pytest
+
+from apps.morning_boost.call_policy import DeadlineExceeded, DeadlineMiddleware
+from apps.morning_boost.diary_cache import DiaryUnavailable
+from apps.morning_boost.metrics import MetricsMiddleware
+from apps.morning_boost.openai_limiter import OpenAIOverloaded
+from stt_diary.src.core.upload import UploadSizeLimitMiddleware
+
+
+def _load(name: str):
+    if name == "apps.morning_boost.main":
+        return importlib.import_module(name).create_app()
+    return importlib.import_module(name).app
+
+
+@pytest.mark.parametrize(
+    "name, has_upload",
+    [("main", True), ("stt_diary.main", True), ("apps.morning_boost.main", False)],
+)
+def test_entry_points_share_common_setup(name, has_upload):
+    app = _load(name)
+    for exc in (OpenAIOverloaded, DeadlineExceeded, DiaryUnavailable):
+        assert exc in app.exception_handlers
+
+    middleware = [m.cls for m in app.user_middleware]
+    assert DeadlineMiddleware in middleware
+    assert MetricsMiddleware in middleware
+    assert (UploadSizeLimitMiddleware in middleware) is has_upload
+    # 바깥쪽부터 Deadline → Metrics → UploadSizeLimit
+    assert middleware.index(DeadlineMiddleware) < middleware.index(MetricsMiddleware)
+    if has_upload:
+        assert middleware.index(MetricsMiddleware) < middleware.index(UploadSizeLimitMiddleware)
+    assert "/metrics" in {getattr(r, "path", None) for r in app.routes}
@@ -0,0 +1,46 @@
+# tests/test_call_policy.py
+"""
+call_policy 의 동기 / 스트리밍 경로(timeout_client)가 단계 deadline 을 넘기지 않는지, 가짜 OpenAI 서버로 확인.
+"""
+
+import time
+
+import openai
+import pytest
+from openai import OpenAI
+
+from apps.morning_boost import call_policy
+from apps.morning_boost.call_policy import request_deadline, timeout_client
+from scripts.bench.fake_servers import create_fake_openai_app
+
+
+@pytest.fixture
+def slow_openai(serve, monkeypatch):
+    cfg = call_policy.get_call_policy_config()
+    monkeypatch.setitem(cfg, "enabled", True)
+    monkeypatch.setitem(cfg["stages"]["llm"], "timeout_seconds", 0.3)
+    monkeypatch.setitem(cfg["stages"]["llm"], "reserve_seconds", 0.0)
+    base_url = serve(create_fake_openai_app(llm_latency=2.0))
+    # SDK 기본 재시도를 켠 채로 만든 클라이언트 (clients.py 와 같은 조건)
+    with OpenAI(base_url=f"{base_url}/v1", api_key="test", max_retries=3) as client:
+        yield client
+
+
+def test_timeout_client_disables_sdk_retries(slow_openai):
+    with request_deadline(5.0):
+        client = timeout_client(slow_openai, "llm")
+    assert client.max_retries == 0
+    assert client.timeout == pytest.approx(0.3, abs=0.05)
+
+
+def test_sync_call_stops_at_stage_deadline(slow_openai):
+    started = time.monotonic()
+    with pytest.raises(openai.APITimeoutError):
+        timeout_client(slow_openai, "llm").responses.create(model="gpt-4o-mini", input="hi")
+    # 재시도 3번이면 0.3 * 4 + 백오프 ≈ 2초
+    assert time.monotonic() - started < 1.0
+
+
+def test_policy_off_keeps_sdk_client(slow_openai, monkeypatch):
+    monkeypatch.setitem(call_policy.get_call_policy_config(), "enabled", False)
+    assert timeout_client(slow_openai, "llm") is slow_openai
@@ -0,0 +1,181 @@
+# tests/test_clip_http.py
+"""
+음성 파일 HTTP 캐시 / Range (apps/morning_boost/clip_http.py).
+
+morning_boost create_app() 의 /static/morning_boost 마운트와, 라우터가 쓰는 ClipFileResponse(/test-clip)에
+가짜 음성 파일을 올려 두고 ETag / 304 / Range 206 본문이 파일과 바이트 단위로 같은지 확인한다.
+"""
+
+import hashlib
+import random
+import shutil
+from pathlib import Path
+from typing import List, Tuple
+
+import pytest
+from fastapi.testclient import TestClient
+
+SIZE = 48_000
+
+
+def _parse_multipart(resp) -> List[Tuple[str, bytes]]:
+    """
+    multipart/byteranges 본문 → [(Content-Range, 본문)]
+    """
+    boundary = resp.headers["content-type"].split("boundary=")[1].encode()
+    parts = []
+    for raw in resp.content.split(b"--" + boundary):
+        if not raw.strip() or raw.startswith(b"--"):
+            continue
+        head, _, body = raw.partition(b"\r\n\r\n")
+        content_range = next(
+            line.split(b":", 1)[1].strip().decode()
+            for line in head.split(b"\r\n")
+            if line.lower().startswith(b"content-range")
+        )
+        parts.append((content_range, body.removesuffix(b"\r\n")))
+    return parts
+
+
+@pytest.fixture(scope="module")
+def clips():
+    from apps.morning_boost.audio_format import AudioFormat
+    from apps.morning_boost.main import create_app
+    from apps.morning_boost.router import _audio_file_response
+    from apps.morning_boost.utils import clip_url, new_clip_path
+
+    data = random.Random(0).randbytes(SIZE)
+    path = new_clip_path("test-http")
+    copy = new_clip_path("test-http")
+    # prerender 와 같은 {user}_{YYYYMMDD} 이름 (다음 실행 때 같은 이름으로 다시 써짐)
+    rewritable = path.with_name("test-http_20250101.mp3")
+    path.write_bytes(data)
+    shutil.copyfile(path, copy)
+    shutil.copyfile(path, rewritable)
+
+    app = create_app()
+
+    @app.api_route("/test-clip", methods=["GET", "HEAD", "POST"])
+    async def test_clip():
+        return _audio_file_response(Path(path), AudioFormat("mp3"))
+
+    try:
+        yield {
+            "http": TestClient(app),
+            "url": clip_url(path),
+            "copy_url": clip_url(copy),
+            "rewritable_url": clip_url(rewritable),
+            "data": data,
+        }
+    finally:
+        for p in (path, copy, rewritable):
+            p.unlink(missing_ok=True)
+
+
+def test_static_etag_and_cache_headers(clips):
+    http, url, data = clips["http"], clips["url"], clips["data"]
+    resp = http.get(url)
+
+    assert resp.status_code == 200 and resp.content == data
+    assert resp.headers["etag"] == f'"{hashlib.blake2b(data, digest_size=16).hexdigest()}"'
+    assert "immutable" in resp.headers["cache-control"]
+    assert resp.headers["accept-ranges"] == "bytes"
+    # 같은 내용의 다른 파일은 같은 ETag
+    assert http.get(clips["copy_url"]).headers["etag"] == resp.headers["etag"]
+
+
+def test_rewritable_name_is_revalidated(clips):
+    http = clips["http"]
+    resp = http.get(clips["rewritable_url"])
+
+    assert resp.headers["cache-control"] == "public, no-cache"
+    assert http.get(clips["rewritable_url"], headers={"If-None-Match": resp.headers["etag"]}).status_code == 304
+
+
+@pytest.mark.parametrize("if_none_match", ["{etag}", "W/{etag}", '"other", {etag}', "*"])
+def test_static_if_none_match_304(clips, if_none_match):
+    http, url = clips["http"], clips["url"]
+    etag = http.get(url).headers["etag"]
+    resp = http.get(url, headers={"If-None-Match": if_none_match.format(etag=etag)})
+
+    assert resp.status_code == 304 and resp.content == b""
+    assert "etag" in resp.headers and "cache-control" in resp.headers
+
+
+def test_static_conditional_misses_and_if_modified_since(clips):
+    http, url, data = clips["http"], clips["url"], clips["data"]
+    resp = http.get(url, headers={"If-None-Match": '"other"'})
+    assert resp.status_code == 200 and resp.content == data
+
+    resp = http.get(url, headers={"If-Modified-Since": resp.headers["last-modified"]})
+    assert resp.status_code == 304
+
+
+@pytest.mark.parametrize(
+    "header, start, end",
+    [
+        ("bytes=100-199", 100, 200),
+        (f"bytes={SIZE - 1000}-", SIZE - 1000, SIZE),
+        ("bytes=-1000", SIZE - 1000, SIZE),
+        (f"bytes={SIZE - 100}-{SIZE + 5000}", SIZE - 100, SIZE),   # 끝을 넘으면 파일 끝까지
+        ("bytes=0-99,50-149", 0, 150),                              # 겹치면 하나로 합쳐진다
+    ],
+)
+def test_static_single_range(clips, header, start, end):
+    resp = clips["http"].get(clips["url"], headers={"Range": header})
+
+    assert resp.status_code == 206
+    assert resp.content == clips["data"][start:end]
+    assert resp.headers["content-length"] == str(end - start)
+    assert resp.headers["content-range"] == f"bytes {start}-{end - 1}/{SIZE}"
+
+
+def test_static_multi_range(clips):
+    spans = [(0, 100), (1000, 1100), (SIZE // 2, SIZE // 2 + 4096)]
+    header = "bytes=" + ",".join(f"{s}-{e - 1}" for s, e in spans)
+    resp = clips["http"].get(clips["url"], headers={"Range": header})
+
+    assert resp.status_code == 206
+    assert resp.headers["content-type"].startswith("multipart/byteranges")
+    assert resp.headers["content-length"] == str(len(resp.content))
+    assert _parse_multipart(resp) == [(f"bytes {s}-{e - 1}/{SIZE}", clips["data"][s:e]) for s, e in spans]
+
+
+def test_static_range_errors_and_if_range(clips):
+    http, url, data = clips["http"], clips["url"], clips["data"]
+    etag = http.get(url).headers["etag"]
+
+    resp = http.get(url, headers={"Range": f"bytes={SIZE}-"})
+    assert resp.status_code == 416 and resp.headers["content-range"] == f"bytes */{SIZE}"
+
+    resp = http.get(url, headers={"Range": "bytes=10-19", "If-Range": etag})
+    assert resp.status_code == 206 and resp.content == data[10:20]
+
+    resp = http.get(url, headers={"Range": "bytes=10-19", "If-Range": '"stale"'})
+    assert resp.status_code == 200 and resp.content == data
+
+
+def test_static_head(clips):
+    resp = clips["http"].head(clips["url"])
+
+    assert resp.content == b"" and resp.headers["content-length"] == str(SIZE)
+
+
+def test_router_response(clips):
+    http, data = clips["http"], clips["data"]
+    resp = http.get("/test-clip")
+    etag = resp.headers["etag"]
+
+    assert resp.status_code == 200 and resp.headers["cache-control"] == "private, no-cache"
+    assert http.get("/test-clip", headers={"If-None-Match": etag}).status_code == 304
+
+    resp = http.get("/test-clip", headers={"Range": "bytes=5-9"})
+    assert resp.status_code == 206 and resp.content == data[5:10]
+
+
+def test_router_post_ignores_range_and_conditionals(clips):
+    http, data = clips["http"], clips["data"]
+    etag = http.get("/test-clip").headers["etag"]
+    resp = http.post("/test-clip", headers={"Range": "bytes=5-9", "If-None-Match": etag})
+
+    assert resp.status_code == 200 and resp.content == data
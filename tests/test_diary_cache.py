@@ -0,0 +1,163 @@
+# tests/test_diary_cache.py
+"""
+일기 조회 캐시 (apps/morning_boost/diary_cache.py) 를 가짜 백엔드(scripts/bench/fake_servers.py)에 붙여서 확인.
+가짜 백엔드는 ETag 를 주고, nd 로 시작하는 user_id 는 "일기 없음"으로 응답한다.
+"""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from apps.morning_boost import diary_client
+from apps.morning_boost.diary_cache import DiaryCache, DiaryUnavailable, set_diary_cache
+from apps.morning_boost.diary_client import diary_unavailable_handler, fetch_latest_diary_async
+from apps.morning_boost.http_client import shutdown_backend_client
+from scripts.bench.fake_servers import FaultInjector, create_fake_backend_app
+
+TTL = 0.2
+
+
+@pytest.fixture
+def backend(serve, monkeypatch):
+    faults = FaultInjector()
+    app = create_fake_backend_app(latency=0.02, faults=faults, no_diary_prefix="nd", etag=True)
+    app.state.faults = faults
+    monkeypatch.setattr(diary_client, "BACKEND_URL", serve(app))
+    yield app
+    set_diary_cache(None)
+
+
+def _cache(**kwargs) -> DiaryCache:
+    cache = DiaryCache(**{"ttl_seconds": TTL, "negative_ttl_seconds": TTL, "stale_if_error_seconds": 60, **kwargs})
+    set_diary_cache(cache)
+    return cache
+
+
+def _run(coro):
+    async def main():
+        try:
+            return await coro
+        finally:
+            # 공유 클라이언트는 만든 루프에 묶이므로 테스트마다 닫는다
+            await shutdown_backend_client()
+
+    return asyncio.run(main())
+
+
+def test_ttl_hit_then_etag_revalidation(backend):
+    cache = _cache()
+    calls = backend.state.calls
+
+    async def scenario():
+        first = await fetch_latest_diary_async("alice")
+        second = await fetch_latest_diary_async("alice")
+        await asyncio.sleep(TTL + 0.05)
+        third = await fetch_latest_diary_async("alice")
+        return first, second, third
+
+    first, second, third = _run(scenario())
+    assert first == second == third
+    assert calls["ok"] == 1 and calls["not_modified"] == 1
+    assert cache.outcomes == {"miss": 1, "hit": 1, "revalidated": 1}
+
+
+def test_changed_diary_replaces_cached_body(backend):
+    _cache()
+
+    async def scenario():
+        await fetch_latest_diary_async("alice")
+        backend.state.revisions["alice"] += 1
+        await asyncio.sleep(TTL + 0.05)
+        return await fetch_latest_diary_async("alice")
+
+    assert "#1" in _run(scenario())["write_diary"]
+    assert backend.state.calls["ok"] == 2
+
+
+def test_returns_copies(backend):
+    _cache()
+
+    async def scenario():
+        diary = await fetch_latest_diary_async("alice")
+        diary["write_diary"] = "mutated by caller"
+        return await fetch_latest_diary_async("alice")
+
+    assert _run(scenario())["write_diary"] != "mutated by caller"
+
+
+def test_negative_ttl_remembers_missing_diary(backend):
+    cache = _cache(ttl_seconds=60, negative_ttl_seconds=TTL)
+
+    async def scenario():
+        results = [await fetch_latest_diary_async("nd_carol") for _ in range(3)]
+        await asyncio.sleep(TTL + 0.05)
+        results.append(await fetch_latest_diary_async("nd_carol"))
+        return results
+
+    assert _run(scenario()) == [None] * 4
+    assert backend.state.calls["not_found"] == 2
+    assert cache.outcomes["negative_hit"] == 2
+
+
+def test_backend_outage_serves_stale_value(backend):
+    cache = _cache()
+
+    async def scenario():
+        fresh = await fetch_latest_diary_async("alice")
+        await asyncio.sleep(TTL + 0.05)
+        backend.state.faults.error_rate = 1.0
+        return fresh, await fetch_latest_diary_async("alice")
+
+    fresh, stale = _run(scenario())
+    assert stale == fresh
+    assert cache.outcomes["stale"] == 1
+
+
+def test_backend_outage_without_usable_value_raises(backend):
+    cache = _cache(stale_if_error_seconds=0.1)
+    backend.state.faults.error_rate = 1.0
+
+    async def scenario():
+        with pytest.raises(DiaryUnavailable) as info:
+            await fetch_latest_diary_async("dave")
+        assert info.value.user_id == "dave"
+
+        # 만료된 지 stale_if_error_seconds 가 지난 값은 대신 쓰지 않는다
+        backend.state.faults.error_rate = 0.0
+        await fetch_latest_diary_async("erin")
+        await asyncio.sleep(TTL + 0.15)
+        backend.state.faults.error_rate = 1.0
+        with pytest.raises(DiaryUnavailable):
+            await fetch_latest_diary_async("erin")
+
+        # 장애는 "일기 없음"으로 기억하지 않는다
+        backend.state.faults.error_rate = 0.0
+        return await fetch_latest_diary_async("dave")
+
+    assert _run(scenario()) is not None
+    assert cache.outcomes["error"] == 2
+
+
+def test_concurrent_lookups_share_one_backend_call(backend):
+    cache = _cache(ttl_seconds=60)
+
+    async def scenario():
+        return await asyncio.gather(*(fetch_latest_diary_async("bob") for _ in range(20)))
+
+    results = _run(scenario())
+    assert all(r == results[0] for r in results)
+    assert backend.state.calls["ok"] == 1
+    assert cache.outcomes == {"miss": 1, "coalesced": 19}
+
+
+def test_unavailable_maps_to_502():
+    app = FastAPI()
+    app.add_exception_handler(DiaryUnavailable, diary_unavailable_handler)
+
+    @app.get("/diary")
+    async def diary():
+        raise DiaryUnavailable("alice")
+
+    assert TestClient(app).get("/diary").status_code == 502
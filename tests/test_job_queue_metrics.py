@@ -0,0 +1,40 @@
+# tests/test_job_queue_metrics.py
+"""
+작업 큐 게이지는 /metrics 요청 안에서가 아니라 refresher 가 스레드에서 채운다.
+"""
+
+import asyncio
+import threading
+
+from apps.morning_boost import job_queue
+from apps.morning_boost.job_queue import JobQueue, run_metrics_refresher
+from apps.morning_boost.metrics import JOB_QUEUE_JOBS, render_metrics
+
+
+def test_refresher_fills_gauges_off_the_event_loop(tmp_path, monkeypatch):
+    queue = JobQueue(tmp_path / "jobs.sqlite3")
+    queue.enqueue("boost", {"user_id": "u1"})
+    queue.enqueue("boost", {"user_id": "u2"})
+    monkeypatch.setattr(job_queue, "_queue", queue)
+
+    threads = []
+    collect = job_queue.collect_job_queue_metrics
+
+    def spy():
+        threads.append(threading.current_thread())
+        collect()
+
+    monkeypatch.setattr(job_queue, "collect_job_queue_metrics", spy)
+
+    async def main():
+        task = asyncio.create_task(run_metrics_refresher(0.01))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        # /metrics 는 SQLite 를 읽지 않는다
+        before = len(threads)
+        render_metrics()
+        assert len(threads) == before
+
+    asyncio.run(main())
+    assert threads and all(t is not threading.main_thread() for t in threads)
+    assert JOB_QUEUE_JOBS.value("queued") == 2
@@ -0,0 +1,219 @@
+# tests/test_openai_limiter.py
+"""
+OpenAI rate limiter (apps/morning_boost/openai_limiter.py).
+
+429 는 scripts/bench/fake_servers.py 의 가짜 OpenAI 가 주입하고,
+실제 앱처럼 SDK 의 httpx response hook 으로 limiter 에 전달되게 한다.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from apps.morning_boost import openai_limiter
+from apps.morning_boost.openai_limiter import (
+    DEFAULT_LIMITS_CONFIG,
+    OpenAILimiter,
+    OpenAIOverloaded,
+    async_rate_limit_hook,
+    openai_slot,
+    openai_slot_async,
+    overloaded_handler,
+    set_openai_limiter,
+)
+from scripts.bench.fake_servers import FaultInjector, create_fake_openai_app
+
+MODEL = "gpt-4.1-mini"
+
+
+def _limiter(**overrides) -> OpenAILimiter:
+    cfg = dict(DEFAULT_LIMITS_CONFIG, default_rpm=60_000, burst=1000)
+    cfg.update(overrides)
+    limiter = OpenAILimiter(cfg)
+    set_openai_limiter(limiter)
+    return limiter
+
+
+@pytest.fixture(autouse=True)
+def _reset_limiter():
+    yield
+    set_openai_limiter(openai_limiter._UNSET)
+
+
+async def _call_sdk(base_url: str) -> None:
+    from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+    client = AsyncOpenAI(
+        api_key="sk-test",
+        base_url=f"{base_url}/v1",
+        max_retries=0,
+        http_client=DefaultAsyncHttpxClient(event_hooks={"response": [async_rate_limit_hook]}),
+    )
+    try:
+        async with openai_slot_async(MODEL):
+            await client.responses.create(model=MODEL, input="hi")
+    finally:
+        await client.close()
+
+
+def test_429_halves_limit_once_per_burst_and_pauses_model(serve):
+    import openai
+
+    limiter = _limiter(initial_concurrency=16, min_concurrency=2)
+    faults = FaultInjector(error_rate=1.0, error_status=429, retry_after=0.3)
+    url = serve(create_fake_openai_app(llm_latency=0.0, faults=faults))
+
+    async def burst():
+        return await asyncio.gather(*(_call_sdk(url) for _ in range(4)), return_exceptions=True)
+
+    results = asyncio.run(burst())
+    assert all(isinstance(r, openai.RateLimitError) for r in results)
+    assert faults.rate_limited == 4
+    # 같이 나간 요청들의 429 는 DECREASE_INTERVAL 안에 한 번만 반영된다
+    assert limiter.stats()["limit"] == 8
+    assert limiter.in_flight == 0
+
+    # Retry-After 동안 그 모델 bucket 이 멈춘다 (다른 모델은 영향 없음)
+    now = time.monotonic()
+    with limiter._lock:
+        assert 0 < limiter._bucket(MODEL, now).wait_time(now) <= 0.3
+        assert limiter._bucket("tts-1", now).wait_time(now) == 0
+
+
+def test_429_after_debounce_halves_again_down_to_min(monkeypatch):
+    monkeypatch.setattr(openai_limiter, "DECREASE_INTERVAL", 0.0)
+    limiter = _limiter(initial_concurrency=16, min_concurrency=3)
+
+    for expected in (8, 4, 3, 3):
+        limiter.on_rate_limited(None, None)
+        assert limiter.stats()["limit"] == expected
+
+
+def test_success_increases_limit_additively():
+    limiter = _limiter(initial_concurrency=4, max_concurrency=5)
+
+    for _ in range(4):
+        with openai_slot(MODEL):
+            pass
+    assert 4.9 < limiter.limit < 5.0
+    for _ in range(10):
+        with openai_slot(MODEL):
+            pass
+    assert limiter.limit == 5
+
+
+def _hold_slot(limiter: OpenAILimiter):
+    """
+    자리 하나를 잡고 있는 스레드. release.set() 하면 반납.
+    """
+    held, release = threading.Event(), threading.Event()
+
+    def run():
+        with openai_slot(MODEL):
+            held.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    assert held.wait(5)
+    return release, thread
+
+
+def _wait_queue(limiter: OpenAILimiter, depth: int) -> None:
+    deadline = time.monotonic() + 5
+    while limiter.stats()["waiting"].get(MODEL, 0) != depth:
+        assert time.monotonic() < deadline, limiter.stats()
+        time.sleep(0.005)
+
+
+def test_waiters_get_slots_in_fifo_order():
+    limiter = _limiter(initial_concurrency=1, min_concurrency=1, max_concurrency=1)
+    release, holder = _hold_slot(limiter)
+    order = []
+
+    def wait(i):
+        with openai_slot(MODEL):
+            order.append(i)
+
+    threads = []
+    for i in range(5):
+        thread = threading.Thread(target=wait, args=(i,))
+        thread.start()
+        threads.append(thread)
+        _wait_queue(limiter, i + 1)
+
+    release.set()
+    for thread in [holder, *threads]:
+        thread.join(5)
+    assert order == [0, 1, 2, 3, 4]
+
+
+def _use_slot() -> None:
+    with openai_slot(MODEL):
+        pass
+
+
+def test_full_queue_sheds_immediately():
+    limiter = _limiter(initial_concurrency=1, min_concurrency=1, max_concurrency=1, max_queue=1)
+    release, holder = _hold_slot(limiter)
+    waiter = threading.Thread(target=_use_slot)
+    try:
+        waiter.start()
+        _wait_queue(limiter, 1)
+        started = time.monotonic()
+        with pytest.raises(OpenAIOverloaded) as info:
+            with openai_slot(MODEL):
+                pass
+        assert info.value.reason == "queue_full"
+        assert info.value.retry_after >= 1
+        assert time.monotonic() - started < 0.5
+    finally:
+        release.set()
+        holder.join(5)
+        waiter.join(5)
+
+
+def test_waiting_past_max_wait_sheds_with_timeout():
+    limiter = _limiter(initial_concurrency=1, min_concurrency=1, max_concurrency=1, max_wait_seconds=0.2)
+    release, holder = _hold_slot(limiter)
+    try:
+        started = time.monotonic()
+        with pytest.raises(OpenAIOverloaded) as info:
+            asyncio.run(limiter.acquire_async(MODEL))
+        assert info.value.reason == "timeout"
+        assert 0.2 <= time.monotonic() - started < 1.0
+        assert limiter.stats()["waiting"] == {}
+    finally:
+        release.set()
+        holder.join(5)
+
+
+def test_pause_longer_than_max_wait_sheds_without_waiting():
+    limiter = _limiter(max_wait_seconds=1.0)
+    limiter.on_rate_limited(MODEL, 30.0)
+
+    with pytest.raises(OpenAIOverloaded) as info:
+        with openai_slot(MODEL):
+            pass
+    assert info.value.reason == "paused"
+    assert info.value.retry_after > 29
+
+
+def test_overloaded_maps_to_503_with_retry_after():
+    _limiter(max_wait_seconds=1.0).on_rate_limited(MODEL, 12.5)
+    app = FastAPI()
+    app.add_exception_handler(OpenAIOverloaded, overloaded_handler)
+
+    @app.get("/call")
+    async def call():
+        async with openai_slot_async(MODEL):
+            return {"ok": True}
+
+    resp = TestClient(app).get("/call")
+    assert resp.status_code == 503
+    assert resp.headers["retry-after"] == "13"
+    assert resp.json()["retry_after"] == 13
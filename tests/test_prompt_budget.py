@@ -0,0 +1,75 @@
+# tests/test_prompt_budget.py
+"""
+프롬프트 토큰 예산 (apps/morning_boost/prompt_budget.py, prompt_engine.build_boost_prompt_with_stats).
+"""
+
+import pytest
+
+from apps.morning_boost.prompt_budget import PromptBudget, trim_to_tokens
+from apps.morning_boost.prompt_engine import build_boost_prompt_with_stats
+from scripts.bench.prompt_budget import make_corpus
+
+
+def _diary(**fields):
+    diary = {"emotion": "행복", "write_diary": "짧은 일기.", "file_summation": [], "ai_reply": "답장"}
+    diary.update(fields)
+    return diary
+
+
+def test_under_budget_prompt_is_unchanged():
+    diary = _diary(file_summation=["산책", "산책 ", "커피"], ai_reply=None)
+    raw, _ = build_boost_prompt_with_stats("u", diary, budget=PromptBudget(enabled=False))
+    prompt, stats = build_boost_prompt_with_stats("u", diary, budget=PromptBudget(max_input_tokens=100_000))
+
+    assert prompt == raw
+    assert stats.tokens == stats.raw_tokens
+    assert stats.keywords_dropped == 0
+
+
+@pytest.mark.parametrize("ai_reply", ["답장", None])
+def test_short_diary_outranks_reply_and_huge_keyword(ai_reply):
+    budget = PromptBudget(max_input_tokens=600)
+    diary = _diary(file_summation=["아주긴키워드" * 2000], ai_reply=ai_reply)
+    prompt, stats = build_boost_prompt_with_stats("u", diary, budget=budget)
+
+    assert "짧은 일기." in prompt
+    assert not stats.diary_trimmed
+    assert "None" not in prompt
+    assert stats.tokens <= budget.max_input_tokens
+
+
+def test_keywords_cut_or_dropped_by_budget_are_counted():
+    budget = PromptBudget(max_input_tokens=600)
+    diary = _diary(file_summation=["아주긴키워드" * 2000, "커피", "산책"])
+    prompt, stats = build_boost_prompt_with_stats("u", diary, budget=budget)
+
+    assert "커피" not in prompt
+    assert stats.keywords_dropped == 3
+    assert stats.tokens <= budget.max_input_tokens
+
+
+def test_long_diary_fills_budget_before_reply():
+    budget = PromptBudget(max_input_tokens=800)
+    diary = _diary(write_diary="오늘은 길게 썼다. " * 400, ai_reply="어제 답장. " * 400)
+    prompt, stats = build_boost_prompt_with_stats("u", diary, budget=budget)
+
+    assert stats.diary_trimmed and stats.ai_reply_trimmed
+    # 답장은 일기를 줄이고 남은 자투리만 받는다
+    diary_part = prompt.split("【일기 내용】")[1].split("【")[0]
+    reply_part = prompt.split("【어제 AI가 남긴 답장】")[1].split("위 정보를")[0]
+    assert budget.count(reply_part) < budget.count(diary_part) // 10
+    assert stats.tokens <= budget.max_input_tokens
+
+
+@pytest.mark.parametrize("max_input_tokens", [500, 800, 1200])
+def test_corpus_stays_within_budget(max_input_tokens):
+    budget = PromptBudget(max_input_tokens=max_input_tokens)
+    for diary in make_corpus(100, seed=max_input_tokens):
+        diary["ai_reply"] = None if len(diary["write_diary"]) % 3 == 0 else diary["ai_reply"]
+        _, stats = build_boost_prompt_with_stats("u", diary, budget=budget)
+        assert stats.tokens <= max_input_tokens
+
+
+def test_trim_keeps_text_that_fits():
+    assert trim_to_tokens(" 네 ", 1) == "네"
+    assert trim_to_tokens("네", 0) == ""
@@ -0,0 +1,156 @@
+# tests/test_s3_upload.py
+"""
+생성 음성 S3 업로드 (apps/morning_boost/s3_client.py, /boost?s3=true) 를 moto 로컬 S3 에 붙여서 확인.
+"""
+
+import asyncio
+import time
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from apps.morning_boost import s3_client
+from scripts.bench.fake_servers import create_fake_openai_app
+
+moto = pytest.importorskip("moto")
+
+BUCKET = "test-morning-boost"
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setattr(s3_client, "AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setattr(s3_client, "AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setattr(s3_client, "AWS_S3_BUCKET", BUCKET)
+    monkeypatch.setattr(s3_client, "AWS_S3_ENDPOINT_URL", None)
+    monkeypatch.setattr(s3_client, "AWS_S3_PUBLIC_BASE", None)
+    with moto.mock_aws():
+        # 클라이언트는 mock 안에서 새로 만든다
+        monkeypatch.setattr(s3_client, "_s3", None)
+        client = s3_client.get_s3_client()
+        client.create_bucket(
+            Bucket=BUCKET, CreateBucketConfiguration={"LocationConstraint": s3_client.AWS_REGION}
+        )
+        yield client
+
+
+async def _chunks(data: bytes, size: int, fail_at: int = -1):
+    for n, start in enumerate(range(0, len(data), size)):
+        if n == fail_at:
+            raise RuntimeError("tts failed")
+        yield data[start:start + size]
+
+
+def _object(s3, key: str):
+    obj = s3.get_object(Bucket=BUCKET, Key=key)
+    return obj["Body"].read(), obj["ContentType"]
+
+
+def test_upload_file_key_content_type_and_url(s3, tmp_path):
+    path = tmp_path / "alice_0123.mp3"
+    path.write_bytes(b"\xff\xf3mp3")
+
+    url = s3_client.upload_audio_to_s3(path, "alice")
+
+    key = "morning_boost/alice/alice_0123.mp3"
+    assert _object(s3, key) == (b"\xff\xf3mp3", "audio/mpeg")
+    assert url == f"https://{BUCKET}.s3.{s3_client.AWS_REGION}.amazonaws.com/{key}"
+
+
+def test_upload_file_failure_raises_runtime_error(s3, tmp_path, monkeypatch):
+    path = tmp_path / "alice.mp3"
+    path.write_bytes(b"data")
+    monkeypatch.setattr(s3_client, "AWS_S3_BUCKET", "missing-bucket")
+
+    with pytest.raises(RuntimeError, match="S3 업로드 실패"):
+        s3_client.upload_audio_to_s3(path, "alice")
+
+
+@pytest.mark.parametrize("size", [1000, s3_client.MIN_PART_SIZE * 2 + 123])
+def test_stream_to_s3_small_and_multipart(s3, size):
+    data = bytes(range(256)) * (size // 256) + b"x" * (size % 256)
+    key = s3_client.make_audio_key("bob", "clip.ogg")
+
+    asyncio.run(s3_client.stream_to_s3(_chunks(data, 1024 * 1024), key, content_type="audio/ogg"))
+
+    assert _object(s3, key) == (data, "audio/ogg")
+
+
+def test_failed_stream_aborts_and_background_upload_returns_none(s3):
+    data = b"a" * (s3_client.MIN_PART_SIZE * 2)
+    key = s3_client.make_audio_key("carol", "clip.mp3")
+
+    async def run():
+        return await s3_client.start_background_s3_upload(_chunks(data, 1024 * 1024, fail_at=7), key)
+
+    assert asyncio.run(run()) is None
+    assert s3.list_objects_v2(Bucket=BUCKET).get("KeyCount") == 0
+    # 올라간 파트가 남지 않게 multipart 업로드도 정리된다
+    assert not s3.list_multipart_uploads(Bucket=BUCKET).get("Uploads")
+
+
+@pytest.fixture
+def boost_app(s3, serve, monkeypatch):
+    from apps.morning_boost.router import router
+
+    url = serve(create_fake_openai_app(llm_latency=0.05, tts_latency=0.05, tts_chunks=4))
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("OPENAI_BASE_URL", f"{url}/v1")
+    app = FastAPI()
+    app.include_router(router)
+    with TestClient(app) as http:
+        yield http
+
+
+def _boost(http, user_id: str, **params):
+    body = {
+        "user_id": user_id,
+        "code": 200,
+        "message": "ok",
+        # 멘트 / TTS 캐시에 걸리지 않게 매번 다른 일기
+        "data": {"emotion": "행복", "write_diary": f"산책을 했다 {uuid4().hex}", "file_summation": []},
+    }
+    return http.post("/boost/from-json", params={"s3": "true", "sentences": "false", **params}, json=body)
+
+
+def _wait_for(s3, key: str, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            return _object(s3, key)
+        except s3.exceptions.NoSuchKey:
+            time.sleep(0.02)
+    raise AssertionError(f"{key} was not uploaded")
+
+
+@pytest.mark.parametrize("stream", ["true", "false"])
+def test_boost_uploads_same_audio_under_user_key(s3, boost_app, stream):
+    resp = _boost(boost_app, "dave", stream=stream)
+
+    assert resp.status_code == 200
+    file_name = resp.headers["content-disposition"].split('filename="')[1].rstrip('"')
+    key = f"morning_boost/dave/{file_name}"
+    assert resp.headers["x-audio-s3-url"].endswith(key)
+    assert _wait_for(s3, key) == (resp.content, "audio/mpeg")
+
+
+@pytest.mark.parametrize("stream", ["true", "false"])
+def test_boost_still_serves_audio_when_upload_fails(s3, boost_app, monkeypatch, stream):
+    # 버킷 설정은 있지만 업로드가 실패 (버킷이 없음) → 응답은 그대로, 업로드만 포기
+    monkeypatch.setattr(s3_client, "AWS_S3_BUCKET", "missing-bucket")
+    resp = _boost(boost_app, "erin", stream=stream)
+
+    assert resp.status_code == 200
+    assert resp.content.startswith(b"\xff\xf3")
+    time.sleep(0.2)
+    assert s3.list_objects_v2(Bucket=BUCKET).get("KeyCount") == 0
+
+
+def test_boost_without_bucket_is_503_before_generating(boost_app, monkeypatch):
+    monkeypatch.setattr(s3_client, "AWS_S3_BUCKET", None)
+
+    assert _boost(boost_app, "frank").status_code == 503
@@ -0,0 +1,29 @@
+# tests/test_singleflight.py
+"""
+동시 요청 합치기: 실행 한 번 + 합류 횟수가 /metrics 에 나가는지.
+"""
+
+import asyncio
+
+from apps.morning_boost.metrics import SINGLEFLIGHT_TOTAL, render_metrics
+from apps.morning_boost.singleflight import SingleFlight
+
+
+def test_coalesced_calls_are_exported():
+    flight = SingleFlight("test")
+    runs = []
+
+    async def work():
+        runs.append(1)
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    async def main():
+        return await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["ok"] * 5
+    assert len(runs) == 1
+    assert flight.stats()["coalesced"] == 4
+    assert SINGLEFLIGHT_TOTAL.value("test", "executed") == 1
+    assert SINGLEFLIGHT_TOTAL.value("test", "coalesced") == 4
+    assert 'maumon_singleflight_total{flight="test",outcome="coalesced"} 4.0' in render_metrics()
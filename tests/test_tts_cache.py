@@ -0,0 +1,85 @@
+# tests/test_tts_cache.py
+"""
+TTS 음성 캐시 (apps/morning_boost/tts_cache.py) 를 거치는 stream_tts_async / generate_tts_to_file_async.
+"""
+
+import asyncio
+
+import pytest
+
+from apps.morning_boost import tts_cache
+from apps.morning_boost.tts_cache import TTSCache
+from apps.morning_boost.tts_engine import generate_tts_to_file_async, stream_tts_async
+from scripts.bench.fake_servers import create_fake_openai_app
+
+AUDIO = bytes(range(256)) * 300
+
+
+@pytest.fixture
+def speech(serve, monkeypatch):
+    app = create_fake_openai_app(tts_latency=0.02, tts_chunks=3, tts_audio=AUDIO)
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("OPENAI_BASE_URL", f"{serve(app)}/v1")
+    return app.state.calls
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    (tmp_path / "tts").mkdir()
+    cache = TTSCache(tmp_path / "tts", max_bytes=10 * len(AUDIO))
+    monkeypatch.setattr(tts_cache, "_cache", cache)
+    monkeypatch.setattr(tts_cache, "_cache_initialized", True)
+    return cache
+
+
+def _stream(text, tee_path=None) -> bytes:
+    async def run():
+        return b"".join([chunk async for chunk in stream_tts_async(text, tee_path)])
+
+    return asyncio.run(run())
+
+
+def test_stream_hit_serves_cached_audio_and_tee(speech, cache, tmp_path):
+    assert _stream("좋은 아침") == AUDIO
+    tee = tmp_path / "out" / "clip.mp3"
+
+    assert _stream("좋은 아침", tee) == AUDIO
+    assert tee.read_bytes() == AUDIO
+    assert speech["speech"] == 1
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.parametrize("tee", [False, True])
+def test_stream_treats_file_evicted_after_lookup_as_miss(speech, cache, tmp_path, monkeypatch, tee):
+    _stream("좋은 아침")
+    get = cache.get
+
+    def get_then_evict(key, format):
+        path = get(key, format)
+        path.unlink()   # 다른 요청이 그 사이에 evict
+        return path
+
+    monkeypatch.setattr(cache, "get", get_then_evict)
+    tee_path = tmp_path / "clip.mp3" if tee else None
+
+    assert _stream("좋은 아침", tee_path) == AUDIO
+    assert speech["speech"] == 2
+    assert cache.stats()["hits"] == 0
+    if tee_path is not None:
+        assert tee_path.read_bytes() == AUDIO
+
+
+def test_generate_treats_evicted_file_as_miss(speech, cache, tmp_path, monkeypatch):
+    asyncio.run(generate_tts_to_file_async("좋은 아침", tmp_path / "a.mp3"))
+    get = cache.get
+
+    def get_then_evict(key, format):
+        path = get(key, format)
+        path.unlink()
+        return path
+
+    monkeypatch.setattr(cache, "get", get_then_evict)
+    out = asyncio.run(generate_tts_to_file_async("좋은 아침", tmp_path / "b.mp3"))
+
+    assert out.read_bytes() == AUDIO
+    assert speech["speech"] == 2